@@ -1,55 +1,785 @@
 #!/usr/bin/env python3
 """
 CodeRabbit PTY Wrapper - TTY制約を回避するためのPTYエミュレーター
+
+子プロセスをPTY上で実行し、selectorsベースのイベントループで出力を中継する。
+
+- 読み取りサイズはスループットに応じて READ_MIN..READ_MAX の間で伸縮
+- 小さな書き込みは WRITE_COALESCE バイトまでまとめ、FLUSH_LATENCY 秒以内に必ず吐き出す
+- stdin を子プロセスへ転送（EOF は canonical モードなら VEOF として伝える）
+- --idle-timeout / --timeout をラッパー内部で強制（外側の timeout プロセス不要）
+- --jobs: 1プロセスで N 個のコマンドをそれぞれの PTY で同時実行
+- --strip-ansi: エスケープシーケンス/CR再描画をストリーミングで除去
+- --output FILE: 出力を大きなブロック単位でファイルへ書く
+- --tail-kb N: 直近 N KB だけをリングバッファに保持し、失敗時に stderr へ表示
+
+Usage:
+  coderabbit-pty-wrapper.py [OPTIONS] [--] <command> [args...]
+  coderabbit-pty-wrapper.py --jobs FILE [--report FILE] [OPTIONS]
+
+Options:
+  --timeout SEC  --idle-timeout SEC  --strip-ansi  --output FILE  --tail-kb N
+
+Exit codes:
+  子プロセスの終了コード（シグナル終了時は 128+N、--jobs では最初の非ゼロ）
+  124: タイムアウト（coreutils timeout と同じ）
 """
-import sys
-import pty
+import argparse
+import errno
+import json
 import os
+import pty
+import re
+import select
+import selectors
+import signal
 import subprocess
+import sys
+import termios
+import time
 
-def run_with_pty(command):
-    """PTY経由でコマンドを実行"""
-    try:
-        # PTYを作成してコマンドを実行
-        master, slave = pty.openpty()
-
-        # 子プロセスを起動
-        process = subprocess.Popen(
-            command,
-            stdin=slave,
-            stdout=slave,
-            stderr=slave,
-            close_fds=True
-        )
-
-        # slaveは子プロセスが使用するので閉じる
-        os.close(slave)
-
-        # masterから出力を読み取ってstdoutに書き込む
+# 読み取りバッファの下限/上限（バイト）
+READ_MIN = 1024
+READ_MAX = 64 * 1024
+# この量が溜まったら即座に書き出す
+WRITE_COALESCE = 64 * 1024
+# 溜めたデータを保持してよい最大時間（秒）
+FLUSH_LATENCY = 0.05
+# ファイル出力時のブロックサイズ（バイト）
+FILE_BLOCK = 1024 * 1024
+# 失敗時に表示する末尾出力のデフォルトサイズ（KB）
+TAIL_KB = 16
+# タイムアウト時 SIGTERM から SIGKILL までの猶予（秒）
+KILL_GRACE = 5.0
+# 停止中の子プロセスの終了を確認する間隔（秒）
+REAP_INTERVAL = 0.05
+
+EXIT_TIMEOUT = 124
+
+
+class AdaptiveReader:
+    """スループットに応じて読み取りサイズを倍増/半減する"""
+
+    def __init__(self, minimum=READ_MIN, maximum=READ_MAX):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.size = minimum
+
+    def observe(self, nbytes):
+        """直前の読み取り量から次回の読み取りサイズを決める"""
+        if nbytes >= self.size:
+            # バッファを使い切った: まだ後続がある可能性が高い
+            self.size = min(self.size * 2, self.maximum)
+        elif nbytes < self.size // 4:
+            self.size = max(self.size // 2, self.minimum)
+
+
+class CoalescingWriter:
+    """小さな書き込みをまとめて少ないシステムコールで fd へ流す"""
+
+    def __init__(self, fd, threshold=WRITE_COALESCE, latency=FLUSH_LATENCY, owns_fd=False):
+        self.fd = fd
+        self.threshold = threshold
+        self.latency = latency
+        self.owns_fd = owns_fd
+        self.buffer = bytearray()
+        self.first_pending = None
+
+    def write(self, data):
+        if not self.buffer:
+            self.first_pending = time.monotonic()
+        self.buffer += data
+        if len(self.buffer) >= self.threshold:
+            self.flush()
+
+    def deadline(self):
+        """保留中データの書き出し期限（保留なし、または latency=None なら None）"""
+        if not self.buffer or self.latency is None:
+            return None
+        return self.first_pending + self.latency
+
+    def flush(self):
+        view = memoryview(self.buffer)
+        try:
+            while view:
+                try:
+                    written = os.write(self.fd, view)
+                except InterruptedError:
+                    continue
+                except BlockingIOError:
+                    # 非ブロッキングな出力先: 書けるようになるまで待つ
+                    select.select([], [self.fd], [], FLUSH_LATENCY)
+                    continue
+                view = view[written:]
+        except BrokenPipeError:
+            # 読み手がいなくなった場合は出力を破棄して中継を続ける
+            pass
+        finally:
+            view.release()
+        self.buffer.clear()
+        self.first_pending = None
+
+    def close(self):
+        self.flush()
+        if self.owns_fd:
+            os.close(self.fd)
+            self.owns_fd = False
+
+
+class TaggedWriter:
+    """行単位で "[name] " を付けて共有 writer へ流す（複数コマンドの出力を1本にまとめる）"""
+
+    def __init__(self, writer, name):
+        self.writer = writer
+        self.prefix = f"[{name}] ".encode()
+        self.partial = bytearray()
+
+    def write(self, data):
+        self.partial += data
+        end = self.partial.rfind(b"\n")
+        if end < 0:
+            return
+        lines = self.partial[:end + 1]
+        del self.partial[:end + 1]
+        prefixed = self.prefix + lines[:-1].replace(b"\n", b"\n" + self.prefix) + b"\n"
+        self.writer.write(prefixed)
+
+    def deadline(self):
+        return self.writer.deadline()
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        """改行で終わらなかった最後の行を吐き出す"""
+        if self.partial:
+            self.writer.write(self.prefix + bytes(self.partial) + b"\n")
+            self.partial.clear()
+        self.writer.flush()
+
+
+class AnsiStripper:
+    """ANSIエスケープシーケンスと CR による再描画（スピナー等）を逐次除去する
+
+    チャンク境界で途切れたエスケープシーケンスや未完了の行だけを持ち越すため、
+    全出力に対して正規表現をかけることはなく、保持メモリは MAX_PENDING で頭打ちになる。
+    """
+
+    # CSI / OSC / DCS・PM・APC / 2バイトエスケープ
+    ESCAPE = re.compile(
+        rb"\x1b(?:\[[0-?]*[ -/]*[@-~]"
+        rb"|\][^\x07\x1b]*(?:\x07|\x1b\\)"
+        rb"|[PX^_][^\x1b]*\x1b\\"
+        rb"|[ -/]*[0-OQ-WYZ\\`-~])"
+    )
+    # 行消去 (ESC[K, ESC[2K ...) は再描画の開始なので CR と同じ扱いにする
+    ERASE_LINE = re.compile(rb"\x1b\[[0-2]?K")
+    INCOMPLETE = re.compile(rb"\x1b[\[\]PX^_]?[0-?]*")
+    # 未完了とみなすエスケープシーケンスの最大長（超えたら通常の文字として扱う）
+    MAX_ESCAPE = 4096
+    # 改行の来ない行を保持する上限
+    MAX_PENDING = 64 * 1024
+
+    def __init__(self):
+        self.carry = b""
+        self.line = b""
+
+    def feed(self, data):
+        """チャンクを受け取り、確定したクリーンな出力を返す"""
+        data = self.carry + data
+        self.carry = b""
+
+        # 末尾の未完了エスケープシーケンスは次のチャンクへ持ち越す
+        esc = data.rfind(b"\x1b", max(0, len(data) - self.MAX_ESCAPE))
+        if esc >= 0 and self.ESCAPE.match(data, esc) is None:
+            self.carry = data[esc:]
+            data = data[:esc]
+        # CRLF がチャンク境界で分断された場合に備えて末尾の CR も持ち越す
+        if data.endswith(b"\r"):
+            self.carry = b"\r" + self.carry
+            data = data[:-1]
+
+        if b"\x1b" in data:
+            data = self.ERASE_LINE.sub(b"\r", data)
+            data = self.ESCAPE.sub(b"", data)
+        if b"\x07" in data:
+            data = data.replace(b"\x07", b"")
+        return self._collapse(data)
+
+    def flush(self):
+        """ストリーム終端: 持ち越し分を確定して返す（未完了のエスケープは捨てる）"""
+        carry, self.carry = self.carry.lstrip(b"\r"), b""
+        if carry.startswith(b"\x1b"):
+            carry = self.INCOMPLETE.sub(b"", carry, count=1)
+        out = self._collapse(carry)
+        line, self.line = self.line, b""
+        return out + line
+
+    def _collapse(self, data):
+        data = self.line + data
+        if b"\r" in data:
+            data = data.replace(b"\r\n", b"\n")
+        end = data.rfind(b"\n") + 1
+        done, line = data[:end], data[end:]
+
+        if b"\r" in done:
+            # CR で上書きされた部分は捨て、最後の再描画結果だけを残す
+            done = b"\n".join(
+                part.rstrip(b"\r").rsplit(b"\r", 1)[-1] if b"\r" in part else part
+                for part in done.split(b"\n")
+            )
+        cr = line.rfind(b"\r")
+        if cr >= 0:
+            line = line[cr + 1:]
+        if len(line) > self.MAX_PENDING:
+            done += line
+            line = b""
+        self.line = line
+        return done
+
+
+class RingBuffer:
+    """直近 capacity バイトだけを保持する固定長バッファ"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.buffer = bytearray(capacity)
+        self.pos = 0
+        self.size = 0
+
+    def write(self, data):
+        n = len(data)
+        if n == 0 or self.capacity == 0:
+            return
+        if n >= self.capacity:
+            self.buffer[:] = data[-self.capacity:]
+            self.pos = 0
+            self.size = self.capacity
+            return
+        first = min(n, self.capacity - self.pos)
+        self.buffer[self.pos:self.pos + first] = data[:first]
+        if first < n:
+            self.buffer[:n - first] = data[first:]
+        self.pos = (self.pos + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def getvalue(self):
+        if self.size < self.capacity:
+            return bytes(self.buffer[:self.size])
+        return bytes(self.buffer[self.pos:] + self.buffer[:self.pos])
+
+
+class StreamSink:
+    """出力ステージ: ANSI除去（任意）→ 末尾リングバッファ → 出力先 writer（複数可 = tee）"""
+
+    def __init__(self, writers, strip_ansi=False, tail_kb=0):
+        self.writers = writers
+        self.stripper = AnsiStripper() if strip_ansi else None
+        self.tail = RingBuffer(tail_kb * 1024) if tail_kb else None
+
+    def write(self, data):
+        if self.stripper is not None:
+            data = self.stripper.feed(data)
+            if not data:
+                return
+        if self.tail is not None:
+            self.tail.write(data)
+        for writer in self.writers:
+            writer.write(data)
+
+    def deadline(self):
+        deadlines = [d for d in (w.deadline() for w in self.writers) if d is not None]
+        return min(deadlines) if deadlines else None
+
+    def flush(self):
+        for writer in self.writers:
+            writer.flush()
+
+    def close(self):
+        if self.stripper is not None:
+            rest = self.stripper.flush()
+            if rest:
+                if self.tail is not None:
+                    self.tail.write(rest)
+                for writer in self.writers:
+                    writer.write(rest)
+        for writer in self.writers:
+            writer.close()
+
+    def tail_text(self):
+        if self.tail is None:
+            return ""
+        return self.tail.getvalue().decode("utf-8", errors="replace")
+
+
+class PtyJob:
+    """PTY 上で実行される1つの子プロセスとその出力先"""
+
+    def __init__(self, name, command, sink, timeout=None, idle_timeout=None):
+        self.name = name
+        self.command = command
+        self.sink = sink
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.reader = AdaptiveReader()
+        self.process = None
+        self.master = None
+        self.timed_out = None
+        self.started = None
+        self.last_output = None
+        self.finished_at = None
+        self.kill_deadline = None
+        self.bytes_out = 0
+
+    def start(self):
+        self.master, slave = pty.openpty()
+        try:
+            self.process = subprocess.Popen(
+                self.command,
+                stdin=slave,
+                stdout=slave,
+                stderr=slave,
+                close_fds=True,
+                start_new_session=True,
+            )
+        except BaseException:
+            os.close(self.master)
+            self.master = None
+            raise
+        finally:
+            # slaveは子プロセスが使用するので閉じる
+            os.close(slave)
+        os.set_blocking(self.master, False)
+        self.started = self.last_output = time.monotonic()
+
+    def read(self):
+        """PTY から読み取って出力先へ書く。EOF なら False を返す"""
         try:
-            while True:
+            data = os.read(self.master, self.reader.size)
+        except (BlockingIOError, InterruptedError):
+            return True
+        except OSError as e:
+            # Linux では子プロセス終了後の read が EIO になる
+            if e.errno != errno.EIO:
+                raise
+            data = b""
+        if not data:
+            return False
+        self.reader.observe(len(data))
+        self.sink.write(data)
+        self.bytes_out += len(data)
+        self.last_output = time.monotonic()
+        return True
+
+    def next_deadline(self, now):
+        """次のタイムアウト期限を返す。期限切れなら timed_out を設定して now を返す"""
+        deadlines = []
+        if self.timeout:
+            if now - self.started >= self.timeout:
+                self.timed_out = "total"
+                return now
+            deadlines.append(self.started + self.timeout)
+        if self.idle_timeout:
+            if now - self.last_output >= self.idle_timeout:
+                self.timed_out = "idle"
+                return now
+            deadlines.append(self.last_output + self.idle_timeout)
+        return min(deadlines) if deadlines else None
+
+    def finish(self):
+        """PTY を閉じて終了コードを返す（タイムアウト時は停止を始めて None、reap で回収する）"""
+        self.finished_at = time.monotonic()
+        self.sink.close()
+        os.close(self.master)
+        if self.timed_out:
+            print(f"Error: {self.name}: {self.timed_out} timeout exceeded, child terminated",
+                  file=sys.stderr)
+            self.report_tail()
+            self.terminate()
+            return None
+        returncode = self.process.wait()
+        returncode = 128 - returncode if returncode < 0 else returncode
+        if returncode != 0:
+            self.report_tail()
+        return returncode
+
+    def report_tail(self):
+        """失敗時: リングバッファに残った末尾出力を stderr に表示する"""
+        tail = self.sink.tail_text() if hasattr(self.sink, "tail_text") else ""
+        if tail:
+            print(f"--- {self.name}: last {len(tail.encode())} bytes of output ---\n"
+                  f"{tail.rstrip()}\n--- end of {self.name} output ---", file=sys.stderr)
+
+    def terminate(self):
+        """子プロセスグループに SIGTERM を送り、SIGKILL に切り替える期限を設定する"""
+        self.signal(signal.SIGTERM)
+        self.kill_deadline = time.monotonic() + KILL_GRACE
+
+    def reap(self, now):
+        """停止中の子プロセスを回収する（ブロックしない）
+
+        期限を過ぎても終了していなければ SIGKILL を送る。
+        回収できたら 124、まだ終了していなければ None を返す。
+        """
+        if self.process.poll() is not None:
+            return EXIT_TIMEOUT
+        if self.kill_deadline is not None and now >= self.kill_deadline:
+            self.signal(signal.SIGKILL)
+            self.kill_deadline = None
+        return None
+
+    def reap_deadline(self, now):
+        """次に reap すべき時刻"""
+        if self.kill_deadline is None:
+            return now + REAP_INTERVAL
+        return min(self.kill_deadline, now + REAP_INTERVAL)
+
+    def wait_stopped(self):
+        """停止中の子プロセスを回収するまで待つ（イベントループ外の後始末用）"""
+        while True:
+            returncode = self.reap(time.monotonic())
+            if returncode is not None:
+                return returncode
+            time.sleep(REAP_INTERVAL)
+
+    def signal(self, signum):
+        try:
+            os.killpg(self.process.pid, signum)
+        except ProcessLookupError:
+            pass
+
+
+class PtyMultiplexer:
+    """1つのイベントループで複数の PtyJob を同時に中継する"""
+
+    def __init__(self, jobs, stdin_fd=None):
+        self.jobs = jobs
+        # stdin は先頭ジョブにのみ転送する（単一コマンドモード用）
+        self.stdin_fd = stdin_fd
+        self.results = {}
+
+    def run(self):
+        """全ジョブを起動して完了まで中継し、{name: exit_code} を返す"""
+        previous = self._install_signal_forwarding()
+        # epoll は通常ファイルや /dev/null を登録できないため poll を使う
+        selector = selectors.PollSelector()
+        try:
+            for job in self.jobs:
                 try:
-                    data = os.read(master, 1024)
-                    if not data:
-                        break
-                    os.write(sys.stdout.fileno(), data)
-                except OSError:
-                    break
+                    job.start()
+                except OSError as e:
+                    print(f"Error: {job.name}: {e}", file=sys.stderr)
+                    self.results[job.name] = 127
+                    job.sink.close()
+                    continue
+                selector.register(job.master, selectors.EVENT_READ, job)
+            self._loop(selector)
         finally:
-            os.close(master)
+            for job in self.jobs:
+                if job.name in self.results or job.master is None:
+                    continue
+                returncode = job.finish() if job.finished_at is None else None
+                self.results[job.name] = returncode if returncode is not None \
+                    else job.wait_stopped()
+            selector.close()
+            self._restore_signals(previous)
+        return self.results
+
+    def _loop(self, selector):
+        stdin_job = self.jobs[0] if self.stdin_fd is not None and self.jobs else None
+        stdin_open = stdin_job is not None and stdin_job.master is not None \
+            and self._stdin_forwardable()
+        if stdin_open:
+            selector.register(self.stdin_fd, selectors.EVENT_READ, None)
+        pending_input = bytearray()
+        live = {job for job in self.jobs if job.name not in self.results}
+        # タイムアウトで停止中（SIGTERM 済み、回収待ち）のジョブ
+        stopping = set()
+
+        while live or stopping:
+            now = time.monotonic()
+            deadlines = []
+            for job in list(live):
+                deadline = job.next_deadline(now)
+                if job.timed_out:
+                    if job is stdin_job and stdin_open:
+                        selector.unregister(self.stdin_fd)
+                        stdin_open = False
+                    self._close(selector, job, live, stopping)
+                    continue
+                if deadline is not None:
+                    deadlines.append(deadline)
+                flush_deadline = job.sink.deadline()
+                if flush_deadline is not None:
+                    deadlines.append(flush_deadline)
+            for job in list(stopping):
+                returncode = job.reap(now)
+                if returncode is None:
+                    deadlines.append(job.reap_deadline(now))
+                else:
+                    stopping.discard(job)
+                    self.results[job.name] = returncode
+            if not live and not stopping:
+                break
+            wait = max(0.0, min(deadlines) - now) if deadlines else None
+
+            for key, events in selector.select(wait):
+                job = key.data
+                if job is None:
+                    data = self._read_stdin()
+                    selector.unregister(self.stdin_fd)
+                    if data:
+                        # 子プロセスが読み切るまで stdin の読み取りを止める
+                        pending_input += data
+                        selector.modify(stdin_job.master,
+                                        selectors.EVENT_READ | selectors.EVENT_WRITE, stdin_job)
+                    else:
+                        stdin_open = False
+                        self._send_eof(stdin_job.master)
+                    continue
+                if job not in live:
+                    continue
+
+                if events & selectors.EVENT_WRITE and pending_input:
+                    try:
+                        del pending_input[:os.write(job.master, pending_input)]
+                    except (BlockingIOError, InterruptedError):
+                        pass
+                    if not pending_input:
+                        selector.modify(job.master, selectors.EVENT_READ, job)
+                        if stdin_open:
+                            selector.register(self.stdin_fd, selectors.EVENT_READ, None)
+
+                if events & selectors.EVENT_READ and not job.read():
+                    if job is stdin_job and stdin_open:
+                        selector.unregister(self.stdin_fd)
+                        stdin_open = False
+                    self._close(selector, job, live, stopping)
+
+            now = time.monotonic()
+            for job in live:
+                deadline = job.sink.deadline()
+                if deadline is not None and now >= deadline:
+                    job.sink.flush()
+
+    def _close(self, selector, job, live, stopping):
+        selector.unregister(job.master)
+        live.discard(job)
+        returncode = job.finish()
+        if returncode is None:
+            stopping.add(job)
+        else:
+            self.results[job.name] = returncode
+
+    def _stdin_forwardable(self):
+        try:
+            os.fstat(self.stdin_fd)
+        except OSError:
+            return False
+        # 端末から直接実行された場合はキー入力を転送しない（rawモード未設定のため）
+        return not os.isatty(self.stdin_fd)
+
+    def _read_stdin(self):
+        """stdin から読み取る。EOF または読み取り不能なら空バイト列"""
+        while True:
+            try:
+                return os.read(self.stdin_fd, READ_MAX)
+            except InterruptedError:
+                continue
+            except OSError:
+                return b""
+
+    @staticmethod
+    def _send_eof(master):
+        """子プロセスが canonical モードの場合のみ VEOF で EOF を伝える"""
+        try:
+            attrs = termios.tcgetattr(master)
+            if not attrs[3] & termios.ICANON:
+                # rawモードでは ^D がキー入力として解釈されるため送らない
+                return
+            eof = attrs[6][termios.VEOF]
+            os.write(master, eof if isinstance(eof, bytes) else bytes([eof]))
+        except (OSError, termios.error):
+            pass
+
+    def _install_signal_forwarding(self):
+        previous = {}
+
+        def forward(signum, _frame):
+            running = [job for job in self.jobs
+                       if job.process is not None and job.name not in self.results]
+            if not running:
+                sys.exit(128 + signum)
+            for job in running:
+                job.signal(signum)
+
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            previous[signum] = signal.signal(signum, forward)
+        return previous
+
+    @staticmethod
+    def _restore_signals(previous):
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
 
-        # プロセスの終了を待つ
-        return process.wait()
 
+def open_sink(output=None, tee=False, strip_ansi=False, tail_kb=None,
+              stdout_writer=None, tag=None):
+    """出力ステージを組み立てる
+
+    output 指定時はファイルへ FILE_BLOCK 単位で書き（tee=True なら stdout にも流す）、
+    失敗時の報告用に末尾 tail_kb（省略時 TAIL_KB）を保持する。
+    tag 指定時は stdout へ "[tag] " 付きで流す。
+    """
+    stdout_writer = stdout_writer or CoalescingWriter(sys.stdout.fileno())
+    console = TaggedWriter(stdout_writer, tag) if tag else stdout_writer
+    writers = []
+    if output:
+        fd = os.open(output, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        writers.append(CoalescingWriter(fd, threshold=FILE_BLOCK, latency=None, owns_fd=True))
+        if tee:
+            writers.append(console)
+    else:
+        writers.append(console)
+    if tail_kb is None:
+        # stdout に流している場合は末尾を再表示する必要がない
+        tail_kb = TAIL_KB if output and not tee else 0
+    return StreamSink(writers, strip_ansi=strip_ansi, tail_kb=tail_kb)
+
+
+def run_with_pty(command, timeout=None, idle_timeout=None, **sink_options):
+    """PTY経由でコマンドを実行"""
+    try:
+        job = PtyJob(command[0], command, open_sink(**sink_options),
+                     timeout=timeout, idle_timeout=idle_timeout)
+        results = PtyMultiplexer([job], stdin_fd=sys.stdin.fileno()).run()
+        return results[job.name]
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
 
+
+def load_jobs(path, timeout=None, idle_timeout=None, strip_ansi=False, tail_kb=None):
+    """JSON Lines のジョブ定義を読み込む
+
+    1行1ジョブ: {"name": "...", "argv": [...], "output": "path",
+                 "timeout": SEC, "idle_timeout": SEC, "strip_ansi": bool, "tail_kb": N}
+    output 省略時は stdout に "[name] " タグ付きで出力する。
+    """
+    stdout_writer = CoalescingWriter(sys.stdout.fileno())
+    jobs = []
+    names = set()
+    stream = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        with stream:
+            for lineno, line in enumerate(stream, 1):
+                if not line.strip() or line.lstrip().startswith("#"):
+                    continue
+                spec = json.loads(line)
+                argv = spec.get("argv")
+                if not argv or not isinstance(argv, list):
+                    raise ValueError(f"{path}:{lineno}: 'argv' must be a non-empty list")
+                name = str(spec.get("name") or f"job{len(jobs) + 1}")
+                if name in names:
+                    raise ValueError(f"{path}:{lineno}: duplicate job name '{name}'")
+                names.add(name)
+                sink = open_sink(output=spec.get("output"),
+                                 strip_ansi=spec.get("strip_ansi", strip_ansi),
+                                 tail_kb=spec.get("tail_kb", tail_kb),
+                                 stdout_writer=stdout_writer, tag=name)
+                jobs.append(PtyJob(name, [str(a) for a in argv], sink,
+                                   timeout=spec.get("timeout", timeout),
+                                   idle_timeout=spec.get("idle_timeout", idle_timeout)))
+    except BaseException:
+        for job in jobs:
+            job.sink.close()
+        raise
+    return jobs
+
+
+def run_multi(jobs_path, report_path=None, timeout=None, idle_timeout=None, **sink_options):
+    """複数コマンドをそれぞれの PTY で同時実行し、最初の非ゼロ終了コードを返す"""
+    try:
+        jobs = load_jobs(jobs_path, timeout=timeout, idle_timeout=idle_timeout, **sink_options)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if not jobs:
+        print("Error: no jobs defined", file=sys.stderr)
+        return 1
+
+    results = PtyMultiplexer(jobs).run()
+
+    report = []
+    for job in jobs:
+        duration_ms = 0
+        if job.started is not None and job.finished_at is not None:
+            duration_ms = int((job.finished_at - job.started) * 1000)
+        report.append({
+            "name": job.name,
+            "exit_code": results[job.name],
+            "timed_out": job.timed_out,
+            "duration_ms": duration_ms,
+            "bytes": job.bytes_out,
+        })
+        print(f"[{job.name}] exit={results[job.name]}", file=sys.stderr)
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump({"jobs": report}, f, indent=2)
+            f.write("\n")
+
+    return next((r["exit_code"] for r in report if r["exit_code"] != 0), 0)
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="coderabbit-pty-wrapper.py",
+        usage="%(prog)s [OPTIONS] [--] <command> [args...]\n"
+              "       %(prog)s --jobs FILE [--report FILE] [OPTIONS]",
+    )
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="total timeout in seconds (exit 124 when exceeded)")
+    parser.add_argument("--idle-timeout", type=float, default=None,
+                        help="terminate when the child prints nothing for SEC seconds")
+    parser.add_argument("--jobs", metavar="FILE",
+                        help="run every command in FILE (JSON Lines, '-' for stdin) concurrently")
+    parser.add_argument("--report", metavar="FILE",
+                        help="with --jobs: write per-command exit codes as JSON")
+    parser.add_argument("--strip-ansi", action="store_true",
+                        help="strip ANSI escapes and CR spinner redraws from the output")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write the output to FILE in large blocks instead of stdout")
+    parser.add_argument("--tee", action="store_true",
+                        help="with --output: also copy the output to stdout")
+    parser.add_argument("--tail-kb", type=int, default=None,
+                        help=f"keep the last N KB of output for failure reports "
+                             f"(default: {TAIL_KB} with --output, otherwise 0)")
+    parser.add_argument("command", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+    if args.command and args.command[0] == "--":
+        args.command = args.command[1:]
+    if args.jobs and args.command:
+        parser.error("--jobs cannot be combined with a command")
+    if args.jobs and (args.output or args.tee):
+        parser.error("--output/--tee are per job with --jobs (use the 'output' key)")
+    if not args.jobs and not args.command:
+        parser.error("command is required")
+    return args
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: coderabbit-pty-wrapper.py <command> [args...]", file=sys.stderr)
         sys.exit(1)
 
-    command = sys.argv[1:]
-    exit_code = run_with_pty(command)
+    args = parse_args(sys.argv[1:])
+    if args.jobs:
+        exit_code = run_multi(args.jobs, report_path=args.report,
+                              timeout=args.timeout, idle_timeout=args.idle_timeout,
+                              strip_ansi=args.strip_ansi, tail_kb=args.tail_kb)
+    else:
+        exit_code = run_with_pty(args.command, timeout=args.timeout,
+                                 idle_timeout=args.idle_timeout,
+                                 output=args.output, tee=args.tee,
+                                 strip_ansi=args.strip_ansi, tail_kb=args.tail_kb)
     sys.exit(exit_code)
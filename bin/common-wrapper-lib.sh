@@ -233,6 +233,8 @@ wrapper_apply_timeout() {
 # ============================================================================
 # Purpose: Apply timeout strategy with PTY (pseudo-terminal) support
 #          Required for CLIs like Codex that require TTY
+#          Uses bin/coderabbit-pty-wrapper.py (in-process timeout), falling
+#          back to 'script' + 'timeout' when python3 is unavailable
 # Args:
 #   $1 - Timeout value (seconds or "60s" format)
 #   $2 - Prompt text to pass as argument
@@ -250,6 +252,25 @@ wrapper_apply_timeout_with_pty() {
   if command -v to_seconds >/dev/null 2>&1; then
     timeout_arg="$(to_seconds "$timeout_value")"
   fi
+  timeout_arg="${timeout_arg%s}"
+
+  local exit_code=0
+
+  # Prefer the Python PTY relay: it enforces the timeout itself (exit 124 like
+  # coreutils timeout), so no extra 'timeout' process is stacked on top
+  local pty_wrapper="${SCRIPT_DIR:-$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)}/coderabbit-pty-wrapper.py"
+  if [[ -f "$pty_wrapper" ]] && command -v python3 >/dev/null 2>&1 && \
+     [[ "${WRAPPER_SKIP_TIMEOUT:-}" == "1" || "$timeout_arg" =~ ^[0-9]+$ ]]; then
+    local relay_args=()
+    if [[ "${WRAPPER_SKIP_TIMEOUT:-}" != "1" ]]; then
+      relay_args+=(--timeout "$timeout_arg")
+    fi
+    if [[ -n "${WRAPPER_PTY_IDLE_TIMEOUT:-}" ]]; then
+      relay_args+=(--idle-timeout "$WRAPPER_PTY_IDLE_TIMEOUT")
+    fi
+    python3 "$pty_wrapper" "${relay_args[@]}" -- "${command[@]}" "$prompt" || exit_code=$?
+    return $exit_code
+  fi
 
   # Build command string with properly escaped prompt
   # For Codex: codex exec --sandbox workspace-write "prompt here"
@@ -260,12 +281,10 @@ wrapper_apply_timeout_with_pty() {
   # Add prompt with proper escaping (single quotes)
   cmd_str+="'${prompt//\'/\'\\\'\'}'"
 
-  # Use 'script' command to provide PTY
+  # Fallback: use 'script' command to provide PTY
   # -q: quiet mode (no "Script started" messages)
   # -c: command to execute
   # /dev/null: don't save typescript file
-  local exit_code=0
-
   if [[ "${WRAPPER_SKIP_TIMEOUT:-}" == "1" ]]; then
     # Called from workflow - outer timeout manages execution
     script -q -c "$cmd_str" /dev/null || exit_code=$?
@@ -281,6 +300,63 @@ wrapper_apply_timeout_with_pty() {
   return $exit_code
 }
 
+# ============================================================================
+# 5c. wrapper_pty_job_spec() / wrapper_run_pty_batch()
+# ============================================================================
+# Purpose: Run N PTY-dependent commands concurrently in ONE Python process
+#          (coderabbit-pty-wrapper.py --jobs) instead of one wrapper each
+# Usage:
+#   jobs_file=$(mktemp)
+#   wrapper_pty_job_spec "codex" "$out_dir/codex.log" codex exec "$prompt" >> "$jobs_file"
+#   wrapper_pty_job_spec "coderabbit" "" coderabbit review --prompt-only >> "$jobs_file"
+#   wrapper_run_pty_batch "$jobs_file" 600 "$out_dir/pty-report.json"
+#
+# wrapper_pty_job_spec args:
+#   $1 - Job name (unique, used as "[name]" tag when no output file)
+#   $2 - Output file ("" = tagged lines on stdout)
+#   $3+ - Command array
+# Returns: One JSON Lines job definition on stdout
+#
+# wrapper_run_pty_batch args:
+#   $1 - Jobs file (JSON Lines)
+#   $2 - Per-job timeout in seconds (optional)
+#   $3 - Report file for per-job exit codes (optional)
+# Returns: First non-zero job exit code (124 = timeout), 0 if all succeeded
+
+wrapper_pty_job_spec() {
+  local name="$1"
+  local output="$2"
+  shift 2
+
+  # python3 rather than jq: jq 1.6 parses "-c"-style argv entries as its own options
+  python3 -c '
+import json, sys
+name, output, argv = sys.argv[1], sys.argv[2], sys.argv[3:]
+spec = {"name": name, "argv": argv}
+if output:
+    spec["output"] = output
+print(json.dumps(spec, ensure_ascii=False))
+' "$name" "$output" "$@"
+}
+
+wrapper_run_pty_batch() {
+  local jobs_file="$1"
+  local timeout_value="${2:-}"
+  local report_file="${3:-}"
+
+  local pty_wrapper="${SCRIPT_DIR:-$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)}/coderabbit-pty-wrapper.py"
+  local batch_args=(--jobs "$jobs_file")
+  if [[ -n "$timeout_value" ]]; then
+    if command -v to_seconds >/dev/null 2>&1; then
+      timeout_value="$(to_seconds "$timeout_value")"
+    fi
+    batch_args+=(--timeout "${timeout_value%s}")
+  fi
+  [[ -n "$report_file" ]] && batch_args+=(--report "$report_file")
+
+  python3 "$pty_wrapper" "${batch_args[@]}"
+}
+
 # ============================================================================
 # 6. wrapper_run_ai()
 # ============================================================================
@@ -377,7 +453,7 @@ wrapper_run_ai() {
   local exit_code=0
 
   # Check if AI requires PTY (Codex CLI requires TTY)
-  if [[ "$ai_name" == "Codex" ]] && command -v script >/dev/null 2>&1; then
+  if [[ "$ai_name" == "Codex" ]] && { command -v python3 >/dev/null 2>&1 || command -v script >/dev/null 2>&1; }; then
     # Use PTY wrapper for Codex (requires TTY)
     echo "ℹ️  [$ai_name] Using PTY mode (TTY required)" >&2
 
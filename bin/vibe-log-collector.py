@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+VibeLogger Collector - vibe_log の書き込みをまとめる常駐プロセス
+
+ユーザーごとに1プロセスだけ常駐し、vibe-log-sink.sh から FIFO 経由で届く
+1行1イベントの JSONL をファイルごとにバッファして、まとめて書き出す。
+
+- FLUSH_INTERVAL 秒ごと、またはバッファが FLUSH_BYTES を超えたら書き出す
+- --max-bytes: ファイルがこのサイズを超えたら <名前>.<N>.jsonl に退避して新しいファイルへ
+- 時間ごとのファイル (<tool>_<HH>.jsonl) は次の時間のファイルが来た時点で閉じる
+- --compress: 閉じたセグメント（サイズ退避・時間切り替え）を gzip する
+- 書き込み元プロセスを pidfd で監視し、すべて終了したら書き出して終了する
+
+FIFO ($VIBE_LOG_SINK_DIR/sink) のメッセージ（1行 < PIPE_BUF なので書き込みは不可分）:
+    <ログファイルの絶対パス>\\t<JSON>
+    !hello <pid>            書き込み元の登録
+    !flush <reply_fifo>     書き出して reply_fifo に "ok" を返す
+    !shutdown
+
+Usage:
+    vibe-log-collector.py --dir DIR [--max-bytes N] [--compress] [--foreground]
+"""
+import argparse
+import errno
+import fcntl
+import gzip
+import os
+import re
+import selectors
+import shutil
+import signal
+import sys
+import threading
+import time
+
+FLUSH_INTERVAL = 0.2
+FLUSH_BYTES = 64 * 1024
+# 書き込み元がいなくなってから終了するまでの猶予（秒）
+LINGER_SECONDS = 2.0
+SWEEP_INTERVAL = 1.0
+
+_HOURLY = re.compile(r"^(.*)_\d\d\.jsonl$")
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def compress_segment(path: str):
+    """閉じたセグメントを path.gz に圧縮して元ファイルを消す"""
+    try:
+        with open(path, "rb") as src, gzip.open(path + ".gz", "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class LogFile:
+    __slots__ = ("path", "fd", "size", "pending", "pending_bytes")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd = -1
+        self.size = 0
+        self.pending = []
+        self.pending_bytes = 0
+
+
+class Collector:
+    def __init__(self, sink_dir: str, sink_fd: int, max_bytes: int, compress: bool):
+        self.sink_dir = sink_dir
+        self.sink_path = os.path.join(sink_dir, "sink")
+        self.pid_path = os.path.join(sink_dir, "collector.pid")
+        self.sink_fd = sink_fd
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.buffer = b""
+
+        self.files = {}               # path -> LogFile
+        self.current_hour = {}        # 時間ごとのファイルの stem -> 現在のパス
+        self.pending_bytes = 0
+        self.pending_since = None
+        self.owners = {}              # pid -> pidfd（pidfd なしなら None）
+        self.idle_since = None
+        self.running = True
+        self.events = 0
+
+        self.sel = selectors.DefaultSelector()
+        self.sel.register(sink_fd, selectors.EVENT_READ, None)
+
+    # ------------------------------------------------------------------
+    # 書き込み元の監視
+    # ------------------------------------------------------------------
+
+    def watch(self, pid: int):
+        if pid in self.owners:
+            return
+        pidfd = None
+        try:
+            pidfd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return
+        except (AttributeError, OSError):
+            if not pid_alive(pid):
+                return
+        self.owners[pid] = pidfd
+        if pidfd is not None:
+            self.sel.register(pidfd, selectors.EVENT_READ, pid)
+
+    def reap(self, pid: int):
+        pidfd = self.owners.pop(pid, None)
+        if pidfd is not None:
+            self.sel.unregister(pidfd)
+            os.close(pidfd)
+        self.flush()
+
+    def sweep(self):
+        for pid, pidfd in list(self.owners.items()):
+            if pidfd is None and not pid_alive(pid):
+                self.reap(pid)
+
+    # ------------------------------------------------------------------
+    # バッファと書き出し
+    # ------------------------------------------------------------------
+
+    def append(self, path: str, line: bytes):
+        log = self.files.get(path)
+        if log is None:
+            log = self.files[path] = LogFile(path)
+            match = _HOURLY.match(path)
+            if match:
+                previous = self.current_hour.get(match.group(1))
+                self.current_hour[match.group(1)] = path
+                if previous is not None and previous != path:
+                    self.close(previous, finished=True)
+        log.pending.append(line)
+        log.pending_bytes += len(line)
+        self.pending_bytes += len(line)
+        if self.pending_since is None:
+            self.pending_since = time.monotonic()
+        self.events += 1
+
+    def _open(self, log: LogFile):
+        os.makedirs(os.path.dirname(log.path), exist_ok=True)
+        log.fd = os.open(log.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        log.size = os.fstat(log.fd).st_size
+
+    def _rotate(self, log: LogFile):
+        """サイズ上限を超えたファイルを <名前>.<N>.jsonl に退避する"""
+        os.close(log.fd)
+        log.fd = -1
+        base = log.path[:-len(".jsonl")] if log.path.endswith(".jsonl") else log.path
+        n = 1
+        while (os.path.exists(f"{base}.{n}.jsonl") or
+               os.path.exists(f"{base}.{n}.jsonl.gz")):
+            n += 1
+        segment = f"{base}.{n}.jsonl"
+        os.rename(log.path, segment)
+        if self.compress:
+            self._compress(segment)
+        self._open(log)
+
+    def _write(self, log: LogFile):
+        if not log.pending:
+            return
+        if log.fd < 0:
+            self._open(log)
+        chunk = []
+        chunk_bytes = 0
+        for line in log.pending:
+            if self.max_bytes and log.size + chunk_bytes > 0 and \
+                    log.size + chunk_bytes + len(line) > self.max_bytes:
+                if chunk:
+                    os.write(log.fd, b"".join(chunk))
+                    log.size += chunk_bytes
+                    chunk, chunk_bytes = [], 0
+                if log.size > 0:
+                    self._rotate(log)
+            chunk.append(line)
+            chunk_bytes += len(line)
+        if chunk:
+            os.write(log.fd, b"".join(chunk))
+            log.size += chunk_bytes
+        self.pending_bytes -= log.pending_bytes
+        log.pending = []
+        log.pending_bytes = 0
+
+    def flush(self):
+        for log in self.files.values():
+            try:
+                self._write(log)
+            except OSError as e:
+                print(f"vibe-log-collector: {log.path}: {e}", file=sys.stderr)
+                self.pending_bytes -= log.pending_bytes
+                log.pending = []
+                log.pending_bytes = 0
+        self.pending_bytes = 0
+        self.pending_since = None
+
+    def close(self, path: str, finished: bool = False):
+        log = self.files.pop(path, None)
+        if log is None:
+            return
+        self._write(log)
+        if log.fd >= 0:
+            os.close(log.fd)
+        if finished and self.compress and os.path.exists(path):
+            self._compress(path)
+
+    def _compress(self, path: str):
+        threading.Thread(target=compress_segment, args=(path,), daemon=False).start()
+
+    # ------------------------------------------------------------------
+    # メッセージ
+    # ------------------------------------------------------------------
+
+    def handle(self, message: bytes):
+        if message.startswith(b"!"):
+            parts = message[1:].decode(errors="replace").split()
+            if not parts:
+                return
+            if parts[0] == "hello" and len(parts) == 2 and parts[1].isdigit():
+                self.watch(int(parts[1]))
+            elif parts[0] == "flush" and len(parts) == 2:
+                self.flush()
+                self._reply(parts[1], b"ok\n")
+            elif parts[0] == "shutdown":
+                self.running = False
+            return
+        path, sep, line = message.partition(b"\t")
+        if sep and path.startswith(b"/"):
+            self.append(path.decode(errors="surrogateescape"), line + b"\n")
+
+    @staticmethod
+    def _reply(reply: str, data: bytes):
+        try:
+            fd = os.open(reply, os.O_WRONLY | os.O_NONBLOCK)
+        except OSError:
+            return
+        try:
+            os.write(fd, data)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def read_sink(self) -> list:
+        while True:
+            try:
+                chunk = os.read(self.sink_fd, 1 << 20)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            self.buffer += chunk
+            if len(chunk) < (1 << 20):
+                break
+        if b"\n" not in self.buffer:
+            return []
+        *complete, self.buffer = self.buffer.split(b"\n")
+        return complete
+
+    # ------------------------------------------------------------------
+    # イベントループ
+    # ------------------------------------------------------------------
+
+    def run(self):
+        while self.running:
+            timeout = None
+            if self.pending_since is not None:
+                timeout = max(0.0, FLUSH_INTERVAL - (time.monotonic() - self.pending_since))
+            if any(pidfd is None for pidfd in self.owners.values()):
+                timeout = SWEEP_INTERVAL if timeout is None else min(timeout, SWEEP_INTERVAL)
+            if not self.owners and self.pending_since is None:
+                now = time.monotonic()
+                if self.idle_since is None:
+                    self.idle_since = now
+                elif now - self.idle_since >= LINGER_SECONDS:
+                    break
+                remaining = max(0.0, LINGER_SECONDS - (now - self.idle_since))
+                timeout = remaining if timeout is None else min(timeout, remaining)
+            else:
+                self.idle_since = None
+
+            for key, _ in self.sel.select(timeout):
+                if key.data is None:
+                    for message in self.read_sink():
+                        self.handle(message)
+                else:
+                    self.reap(key.data)
+            self.sweep()
+            if self.pending_bytes >= FLUSH_BYTES or (
+                    self.pending_since is not None and
+                    time.monotonic() - self.pending_since >= FLUSH_INTERVAL):
+                self.flush()
+        self.shutdown()
+
+    def shutdown(self):
+        """FIFO を外してから残りのイベントを書き出して終了する"""
+        for path in (self.pid_path, self.sink_path):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+        time.sleep(0.05)
+        for message in self.read_sink():
+            if not message.startswith(b"!"):
+                self.handle(message)
+        for path in list(self.files):
+            self.close(path)
+
+
+def _open_sink(sink_path: str) -> int:
+    try:
+        os.unlink(sink_path)
+    except FileNotFoundError:
+        pass
+    os.mkfifo(sink_path, 0o600)
+    fd = os.open(sink_path, os.O_RDWR | os.O_NONBLOCK)
+    try:
+        # 書き込み側が詰まらないようにパイプを広げる（Linux のみ）
+        fcntl.fcntl(fd, getattr(fcntl, "F_SETPIPE_SZ", 1031), 1 << 20)
+    except OSError:
+        pass
+    return fd
+
+
+def _detach(keep: set):
+    """setsid し、標準入出力と keep 以外の継承FDを閉じる"""
+    os.setsid()
+    os.chdir("/")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.close(devnull)
+    fd = 3
+    for keep_fd in sorted(keep) + [1024]:
+        if keep_fd > fd:
+            os.closerange(fd, keep_fd)
+        fd = max(fd, keep_fd + 1)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="VibeLogger collector")
+    parser.add_argument("--dir", required=True, help="VIBE_LOG_SINK_DIR")
+    parser.add_argument("--max-bytes", type=int, default=0, help="ファイルごとのサイズ上限（0 で無制限）")
+    parser.add_argument("--compress", action="store_true", help="閉じたセグメントを gzip する")
+    parser.add_argument("--foreground", action="store_true")
+    args = parser.parse_args()
+
+    os.makedirs(args.dir, mode=0o700, exist_ok=True)
+
+    # 起動は1つずつ。すでに動いているコレクターがあれば何もしない
+    start_fd = os.open(os.path.join(args.dir, "start.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+    fcntl.flock(start_fd, fcntl.LOCK_EX)
+    lock_fd = os.open(os.path.join(args.dir, "collector.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError as e:
+        if e.errno in (errno.EAGAIN, errno.EACCES):
+            return 0
+        raise
+
+    sink_fd = _open_sink(os.path.join(args.dir, "sink"))
+    ready_r = ready_w = -1
+    if not args.foreground:
+        ready_r, ready_w = os.pipe()
+        if os.fork() > 0:
+            os.close(ready_w)
+            os.read(ready_r, 1)
+            return 0
+        os.close(ready_r)
+        os.close(start_fd)
+        _detach({lock_fd, sink_fd, ready_w})
+
+    collector = Collector(args.dir, sink_fd, args.max_bytes, args.compress)
+    # select() を起こすため、シグナルは FIFO への shutdown として扱う
+    signal.signal(signal.SIGTERM, lambda *_: os.write(sink_fd, b"!shutdown\n"))
+    with open(collector.pid_path, "w") as f:
+        f.write(f"{os.getpid()}\n")
+    if ready_w >= 0:
+        os.write(ready_w, b"1")
+        os.close(ready_w)
+    else:
+        os.close(start_fd)
+
+    collector.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
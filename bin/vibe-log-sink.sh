@@ -0,0 +1,148 @@
+#!/usr/bin/env bash
+# vibe-log-sink.sh - Shared write path for VibeLogger events
+# Version: 1.0.0
+# Purpose: Write one compact JSONL line per event without forking
+# Used by: bin/vibe-logger-lib.sh, scripts/orchestrate/lib/multi-ai-core.sh
+#
+# Events go to a long-lived collector (bin/vibe-log-collector.py) through a
+# FIFO. The collector batches writes, rotates files by size and can gzip
+# closed segments. If python3 is unavailable, or VIBE_LOG_SINK=direct, each
+# line is appended to its file directly. That path does not fork either.
+#
+# Settings (read when the collector starts):
+#   VIBE_LOG_SINK       auto (default) | direct
+#   VIBE_LOG_MAX_BYTES  rotate a file once it exceeds this size (default 50MB, 0 = never)
+#   VIBE_LOG_COMPRESS   1 = gzip closed segments (default 0)
+
+VIBE_LOG_SINK="${VIBE_LOG_SINK:-auto}"
+VIBE_LOG_SINK_DIR="${VIBE_LOG_SINK_DIR:-${TMPDIR:-/tmp}/vibe-log-sink-${EUID}}"
+VIBE_LOG_MAX_BYTES="${VIBE_LOG_MAX_BYTES:-52428800}"
+VIBE_LOG_COMPRESS="${VIBE_LOG_COMPRESS:-0}"
+VIBE_LOG_COLLECTOR="${VIBE_LOG_COLLECTOR:-$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/vibe-log-collector.py}"
+
+# Lines longer than this are appended directly (FIFO writes up to PIPE_BUF are atomic)
+VIBE_LOG_SINK_MAX_LINE=4000
+
+# Per-process collector registration (deliberately not exported)
+_VIBE_SINK_OWNER=""
+_VIBE_SINK_PID=""
+_VIBE_SINK_REGISTERED=""
+
+# Escape a string as a quoted JSON string into a variable (no subshell)
+# Usage: vibe_json_string <var_name> <string>
+vibe_json_string() {
+    local -n _vibe_json_ref=$1
+    local input="${2-}"
+
+    input="${input//\\/\\\\}"
+    input="${input//\"/\\\"}"
+    input="${input//$'\n'/\\n}"
+    input="${input//$'\r'/\\r}"
+    input="${input//$'\t'/\\t}"
+    input="${input//$'\b'/\\b}"
+    input="${input//$'\f'/\\f}"
+    # Remaining control characters (U+0001-U+001F) as \u00XX; NUL cannot occur in bash strings
+    if [[ "$input" == *[[:cntrl:]]* ]]; then
+        local code hex char
+        for code in 1 2 3 4 5 6 7 11 14 15 16 17 18 19 20 21 22 23 24 25 26 27 28 29 30 31; do
+            printf -v hex '%02x' "$code"
+            printf -v char '%b' "\\x$hex"
+            [[ "$input" == *"$char"* ]] && input="${input//"$char"/\\u00$hex}"
+        done
+    fi
+    _vibe_json_ref="\"$input\""
+}
+
+# UTC timestamp (YYYY-MM-DDTHH:MM:SSZ) into a variable, using printf's strftime
+# Usage: vibe_timestamp <var_name>
+vibe_timestamp() {
+    local TZ=UTC
+    printf -v "$1" '%(%Y-%m-%dT%H:%M:%SZ)T' -1
+}
+
+# Make sure this process is registered with a running collector
+# Returns: 0 if events can be sent to the collector, 1 to write directly
+_vibe_sink_ready() {
+    [[ "$VIBE_LOG_SINK" != "direct" ]] || return 1
+
+    local sink="$VIBE_LOG_SINK_DIR/sink"
+    if [[ "${_VIBE_SINK_OWNER:-}" == "$$" && -p "$sink" ]] && kill -0 "${_VIBE_SINK_PID:-}" 2>/dev/null; then
+        # Subshells share $$ with their parent; register them too so the
+        # collector keeps running while they still write
+        [[ "${_VIBE_SINK_REGISTERED:-}" == "$BASHPID" ]] && return 0
+        printf '!hello %s\n' "$BASHPID" 3<>"$sink" >&3 && [[ -p "$sink" ]] || return 1
+        _VIBE_SINK_REGISTERED=$BASHPID
+        return 0
+    fi
+
+    local pid=""
+    if ! { [[ -p "$sink" && -r "$VIBE_LOG_SINK_DIR/collector.pid" ]] &&
+            read -r pid < "$VIBE_LOG_SINK_DIR/collector.pid" && kill -0 "$pid" 2>/dev/null; }; then
+        [[ -f "$VIBE_LOG_COLLECTOR" ]] && command -v python3 >/dev/null 2>&1 || return 1
+        local -a collector_args=(--dir "$VIBE_LOG_SINK_DIR" --max-bytes "$VIBE_LOG_MAX_BYTES")
+        [[ "$VIBE_LOG_COMPRESS" == "1" ]] && collector_args+=(--compress)
+        # Returns once the collector is ready (or another process already started one)
+        python3 "$VIBE_LOG_COLLECTOR" "${collector_args[@]}" </dev/null >/dev/null 2>&1 || return 1
+        [[ -p "$sink" && -r "$VIBE_LOG_SINK_DIR/collector.pid" ]] &&
+            read -r pid < "$VIBE_LOG_SINK_DIR/collector.pid" || return 1
+    fi
+
+    # The collector exits (after flushing) once every registered process is gone
+    printf '!hello %s\n!hello %s\n' "$$" "$BASHPID" 3<>"$sink" >&3 && [[ -p "$sink" ]] || return 1
+    _VIBE_SINK_OWNER=$$
+    _VIBE_SINK_PID=$pid
+    _VIBE_SINK_REGISTERED=$BASHPID
+    return 0
+}
+
+# Append one compact JSON line to a log file
+# Usage: vibe_sink_write <log_file> <json_line>
+vibe_sink_write() {
+    local log_file="$1"
+    local line="$2"
+    local LC_ALL=C  # byte lengths below
+
+    if [[ "$log_file" == /* ]] && (( ${#log_file} + ${#line} < VIBE_LOG_SINK_MAX_LINE )) && _vibe_sink_ready; then
+        local sink="$VIBE_LOG_SINK_DIR/sink"
+        printf '%s\t%s\n' "$log_file" "$line" 3<>"$sink" >&3 && [[ -p "$sink" ]] && return 0
+        # The collector removed the FIFO between the check and the open, so the
+        # open created a regular file: drop it and append directly instead
+        [[ -p "$sink" ]] || rm -f "$sink"
+    fi
+
+    local log_fd
+    exec {log_fd}>>"$log_file" || return 1
+    # Short lines go out in one O_APPEND write; only long ones need the lock
+    if (( ${#line} >= VIBE_LOG_SINK_MAX_LINE )) && command -v flock >/dev/null 2>&1; then
+        flock -w 5 "$log_fd" || true
+    fi
+    local write_status=0
+    printf '%s\n' "$line" >&"$log_fd" || write_status=$?
+    exec {log_fd}>&-
+    return $write_status
+}
+
+# Wait until the collector has written every event sent so far
+# Usage: vibe_log_flush [timeout_seconds]
+vibe_log_flush() {
+    local timeout="${1:-5}"
+    [[ "${_VIBE_SINK_OWNER:-}" == "$$" && -p "$VIBE_LOG_SINK_DIR/sink" ]] || return 0
+
+    local reply="$VIBE_LOG_SINK_DIR/flush-$BASHPID-$RANDOM"
+    local reply_fd status=""
+    mkfifo -m 600 "$reply" 2>/dev/null || return 1
+    exec {reply_fd}<>"$reply"
+    printf '!flush %s\n' "$reply" 3<>"$VIBE_LOG_SINK_DIR/sink" >&3
+    read -r -t "$timeout" -u "$reply_fd" status || true
+    exec {reply_fd}<&-
+    rm -f "$reply"
+    [[ "$status" == "ok" ]]
+}
+
+export -f vibe_json_string
+export -f vibe_timestamp
+export -f _vibe_sink_ready
+export -f vibe_sink_write
+export -f vibe_log_flush
+export VIBE_LOG_SINK_MAX_LINE
+export VIBE_LOG_SINK VIBE_LOG_SINK_DIR VIBE_LOG_MAX_BYTES VIBE_LOG_COMPRESS VIBE_LOG_COLLECTOR
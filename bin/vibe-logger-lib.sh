@@ -24,6 +24,10 @@ fi
 VIBE_LOG_DIR="${VIBE_LOG_DIR:-$VIBE_PROJECT_ROOT/logs/vibe/$(date +%Y%m%d)}"
 mkdir -p "$VIBE_LOG_DIR"
 
+# Compact JSONL writer (collector process with a direct-append fallback)
+# shellcheck source=bin/vibe-log-sink.sh
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/vibe-log-sink.sh"
+
 # ============================================================================
 # Cross-platform Timestamp Helper
 # ============================================================================
@@ -46,34 +50,33 @@ get_timestamp_ms() {
 # ============================================================================
 
 # Core logging function
+# Writes one compact JSON line to $VIBE_LOG_DIR/<tool_name>_<HH>.jsonl without forking.
 # Usage: vibe_log <event_type> <action> <metadata_json> <human_note> [ai_todo] [tool_name]
 vibe_log() {
     local event_type="$1"
     local action="$2"
-    local metadata="$3"
+    local metadata="${3:-}"
     local human_note="$4"
     local ai_todo="${5:-}"
     local tool_name="${6:-Generic}"
 
-    local timestamp
-    timestamp=$(date -u +%Y-%m-%dT%H:%M:%SZ)
-    local runid="${tool_name}_$(date +%s)_$$"
-
-    cat >> "$VIBE_LOG_DIR/${tool_name}_$(date +%H).jsonl" << EOF
-{
-  "timestamp": "$timestamp",
-  "runid": "$runid",
-  "event": "$event_type",
-  "action": "$action",
-  "metadata": $metadata,
-  "human_note": "$human_note",
-  "ai_context": {
-    "tool": "$tool_name",
-    "integration": "7AI",
-    "todo": "$ai_todo"
-  }
-}
-EOF
+    # JSON whitespace only; raw newlines cannot appear inside JSON strings
+    metadata="${metadata//$'\n'/}"
+    [[ -n "$metadata" ]] || metadata="{}"
+
+    local timestamp hour
+    vibe_timestamp timestamp
+    printf -v hour '%(%H)T' -1
+
+    local safe_event safe_action safe_note safe_todo safe_tool
+    vibe_json_string safe_event "$event_type"
+    vibe_json_string safe_action "$action"
+    vibe_json_string safe_note "$human_note"
+    vibe_json_string safe_todo "$ai_todo"
+    vibe_json_string safe_tool "$tool_name"
+
+    vibe_sink_write "$VIBE_LOG_DIR/${tool_name}_${hour}.jsonl" \
+        "{\"timestamp\":\"$timestamp\",\"runid\":\"${tool_name}_${EPOCHSECONDS}_$$\",\"event\":$safe_event,\"action\":$safe_action,\"metadata\":$metadata,\"human_note\":$safe_note,\"ai_context\":{\"tool\":$safe_tool,\"integration\":\"7AI\",\"todo\":$safe_todo}}"
 }
 
 # ============================================================================
@@ -87,16 +90,10 @@ vibe_wrapper_start() {
     local prompt="$2"
     local timeout="$3"
 
-    local metadata
-    metadata=$(cat << EOF
-{
-  "wrapper": "$wrapper_name",
-  "prompt_length": ${#prompt},
-  "timeout": "$timeout",
-  "timestamp": "$(date +%s)"
-}
-EOF
-)
+    local safe_wrapper_name safe_timeout
+    vibe_json_string safe_wrapper_name "$wrapper_name"
+    vibe_json_string safe_timeout "$timeout"
+    local metadata="{\"wrapper\":$safe_wrapper_name,\"prompt_length\":${#prompt},\"timeout\":$safe_timeout,\"timestamp\":\"$EPOCHSECONDS\"}"
 
     vibe_log "wrapper.start" "${wrapper_name}_execution" "$metadata" \
         "${wrapper_name} 実行開始: タイムアウト $timeout" \
@@ -112,16 +109,10 @@ vibe_wrapper_done() {
     local execution_time="$3"
     local exit_code="$4"
 
-    local metadata
-    metadata=$(cat << EOF
-{
-  "wrapper": "$wrapper_name",
-  "status": "$status",
-  "execution_time_ms": $execution_time,
-  "exit_code": $exit_code
-}
-EOF
-)
+    local safe_wrapper_name safe_status
+    vibe_json_string safe_wrapper_name "$wrapper_name"
+    vibe_json_string safe_status "$status"
+    local metadata="{\"wrapper\":$safe_wrapper_name,\"status\":$safe_status,\"execution_time_ms\":$execution_time,\"exit_code\":$exit_code}"
 
     vibe_log "wrapper.done" "${wrapper_name}_execution" "$metadata" \
         "${wrapper_name} 実行完了: $status (exit: $exit_code)" \
@@ -137,14 +128,10 @@ vibe_wrapper_config() {
     local config_value="$3"
     local note="$4"
 
-    local metadata
-    metadata=$(cat << EOF
-{
-  "config_key": "$config_key",
-  "config_value": "$config_value"
-}
-EOF
-)
+    local safe_config_key safe_config_value
+    vibe_json_string safe_config_key "$config_key"
+    vibe_json_string safe_config_value "$config_value"
+    local metadata="{\"config_key\":$safe_config_key,\"config_value\":$safe_config_value}"
 
     vibe_log "wrapper.config" "${wrapper_name}_config" "$metadata" \
         "$note" \
@@ -163,16 +150,9 @@ vibe_tdd_phase_start() {
     local phase_number="$2"
     local test_count="$3"
 
-    local metadata
-    metadata=$(cat << EOF
-{
-  "phase_name": "$phase_name",
-  "phase_number": $phase_number,
-  "test_count": $test_count,
-  "timestamp": "$(date +%s)"
-}
-EOF
-)
+    local safe_phase_name
+    vibe_json_string safe_phase_name "$phase_name"
+    local metadata="{\"phase_name\":$safe_phase_name,\"phase_number\":$phase_number,\"test_count\":$test_count,\"timestamp\":\"$EPOCHSECONDS\"}"
 
     vibe_log "tdd.phase.start" "tdd_phase_$phase_number" "$metadata" \
         "TDD Phase $phase_number 開始: $phase_name ($test_count テスト)" \
@@ -189,17 +169,9 @@ vibe_tdd_phase_done() {
     local failed="$4"
     local execution_time="$5"
 
-    local metadata
-    metadata=$(cat << EOF
-{
-  "phase_name": "$phase_name",
-  "phase_number": $phase_number,
-  "passed": $passed,
-  "failed": $failed,
-  "execution_time_ms": $execution_time
-}
-EOF
-)
+    local safe_phase_name
+    vibe_json_string safe_phase_name "$phase_name"
+    local metadata="{\"phase_name\":$safe_phase_name,\"phase_number\":$phase_number,\"passed\":$passed,\"failed\":$failed,\"execution_time_ms\":$execution_time}"
 
     vibe_log "tdd.phase.done" "tdd_phase_$phase_number" "$metadata" \
         "TDD Phase $phase_number 完了: $passed 成功, $failed 失敗" \
@@ -215,19 +187,11 @@ vibe_tdd_test_result() {
     local duration="$3"
     local error_msg="${4:-}"
 
-    # Escape quotes in error message
-    error_msg="${error_msg//\"/\\\"}"
-
-    local metadata
-    metadata=$(cat << EOF
-{
-  "test_name": "$test_name",
-  "result": "$result",
-  "duration_ms": $duration,
-  "error": "$error_msg"
-}
-EOF
-)
+    local safe_test_name safe_result safe_error_msg
+    vibe_json_string safe_test_name "$test_name"
+    vibe_json_string safe_result "$result"
+    vibe_json_string safe_error_msg "$error_msg"
+    local metadata="{\"test_name\":$safe_test_name,\"result\":$safe_result,\"duration_ms\":$duration,\"error\":$safe_error_msg}"
 
     vibe_log "tdd.test.result" "test_execution" "$metadata" \
         "テスト '$test_name': $result" \
@@ -241,15 +205,9 @@ vibe_tdd_cycle_start() {
     local cycle_name="$1"
     local total_phases="$2"
 
-    local metadata
-    metadata=$(cat << EOF
-{
-  "cycle_name": "$cycle_name",
-  "total_phases": $total_phases,
-  "timestamp": "$(date +%s)"
-}
-EOF
-)
+    local safe_cycle_name
+    vibe_json_string safe_cycle_name "$cycle_name"
+    local metadata="{\"cycle_name\":$safe_cycle_name,\"total_phases\":$total_phases,\"timestamp\":\"$EPOCHSECONDS\"}"
 
     vibe_log "tdd.cycle.start" "tdd_workflow" "$metadata" \
         "TDD サイクル開始: $cycle_name ($total_phases フェーズ)" \
@@ -270,24 +228,16 @@ vibe_tdd_cycle_done() {
     # Calculate success rate with division by zero protection and guaranteed 2 decimal places
     local success_rate="0.00"
     if [[ $total_tests -gt 0 ]]; then
-        success_rate=$(echo "scale=2; $passed * 100 / $total_tests" | bc)
-        # Ensure exactly 2 decimal places (bc may omit trailing zeros)
-        success_rate=$(printf "%.2f" "$success_rate")
+        # Truncated to 2 decimal places, in shell arithmetic
+        local hundredths=$(( passed * 10000 / total_tests ))
+        printf -v success_rate '%d.%02d' $((hundredths / 100)) $((hundredths % 100))
     fi
 
-    local metadata
-    metadata=$(cat << EOF
-{
-  "cycle_name": "$cycle_name",
-  "status": "$status",
-  "total_execution_time_ms": $total_time,
-  "total_tests": $total_tests,
-  "passed": $passed,
-  "failed": $failed,
-  "success_rate": "$success_rate"
-}
-EOF
-)
+    local safe_cycle_name safe_status safe_success_rate
+    vibe_json_string safe_cycle_name "$cycle_name"
+    vibe_json_string safe_status "$status"
+    vibe_json_string safe_success_rate "$success_rate"
+    local metadata="{\"cycle_name\":$safe_cycle_name,\"status\":$safe_status,\"total_execution_time_ms\":$total_time,\"total_tests\":$total_tests,\"passed\":$passed,\"failed\":$failed,\"success_rate\":$safe_success_rate}"
 
     vibe_log "tdd.cycle.done" "tdd_workflow" "$metadata" \
         "TDD サイクル完了: $cycle_name - $status ($passed/$total_tests 成功)" \
@@ -306,16 +256,10 @@ vibe_pipeline_start() {
     local description="$2"
     local total_phases="$3"
 
-    local metadata
-    metadata=$(cat << EOF
-{
-  "workflow": "$workflow",
-  "description": "$description",
-  "total_phases": $total_phases,
-  "timestamp": "$(date +%s)"
-}
-EOF
-)
+    local safe_workflow safe_description
+    vibe_json_string safe_workflow "$workflow"
+    vibe_json_string safe_description "$description"
+    local metadata="{\"workflow\":$safe_workflow,\"description\":$safe_description,\"total_phases\":$total_phases,\"timestamp\":\"$EPOCHSECONDS\"}"
 
     vibe_log "pipeline.start" "7ai_workflow" "$metadata" \
         "7AIワークフロー開始: $workflow ($total_phases フェーズ)" \
@@ -331,16 +275,10 @@ vibe_pipeline_done() {
     local total_time="$3"
     local ai_participants="$4"
 
-    local metadata
-    metadata=$(cat << EOF
-{
-  "workflow": "$workflow",
-  "status": "$status",
-  "total_execution_time_ms": $total_time,
-  "ai_participants": $ai_participants
-}
-EOF
-)
+    local safe_workflow safe_status
+    vibe_json_string safe_workflow "$workflow"
+    vibe_json_string safe_status "$status"
+    local metadata="{\"workflow\":$safe_workflow,\"status\":$safe_status,\"total_execution_time_ms\":$total_time,\"ai_participants\":$ai_participants}"
 
     vibe_log "pipeline.done" "7ai_workflow" "$metadata" \
         "7AIワークフロー完了: $workflow - $status ($ai_participants AI参加)" \
@@ -360,17 +298,10 @@ vibe_file_prompt_start() {
     local threshold="$3"
     local mode="$4"  # "file" | "command-line"
 
-    local metadata
-    metadata=$(cat << EOF
-{
-  "ai_name": "$ai_name",
-  "prompt_size": $prompt_size,
-  "threshold": $threshold,
-  "routing_mode": "$mode",
-  "timestamp": "$(date +%s)"
-}
-EOF
-)
+    local safe_ai_name safe_mode
+    vibe_json_string safe_ai_name "$ai_name"
+    vibe_json_string safe_mode "$mode"
+    local metadata="{\"ai_name\":$safe_ai_name,\"prompt_size\":$prompt_size,\"threshold\":$threshold,\"routing_mode\":$safe_mode,\"timestamp\":\"$EPOCHSECONDS\"}"
 
     vibe_log "file_prompt.start" "prompt_routing" "$metadata" \
         "ファイルベースプロンプト開始: $ai_name ($prompt_size bytes, mode: $mode)" \
@@ -387,17 +318,10 @@ vibe_file_prompt_done() {
     local duration="$4"
     local exit_code="$5"
 
-    local metadata
-    metadata=$(cat << EOF
-{
-  "ai_name": "$ai_name",
-  "prompt_size": $prompt_size,
-  "routing_mode": "$mode",
-  "duration_ms": $duration,
-  "exit_code": $exit_code
-}
-EOF
-)
+    local safe_ai_name safe_mode
+    vibe_json_string safe_ai_name "$ai_name"
+    vibe_json_string safe_mode "$mode"
+    local metadata="{\"ai_name\":$safe_ai_name,\"prompt_size\":$prompt_size,\"routing_mode\":$safe_mode,\"duration_ms\":$duration,\"exit_code\":$exit_code}"
 
     vibe_log "file_prompt.done" "prompt_routing" "$metadata" \
         "ファイルベースプロンプト完了: $ai_name ($prompt_size bytes, exit: $exit_code)" \
@@ -412,16 +336,10 @@ vibe_file_created() {
     local file_path="$2"
     local file_size="$3"
 
-    local metadata
-    metadata=$(cat << EOF
-{
-  "ai_name": "$ai_name",
-  "file_path": "$file_path",
-  "file_size": $file_size,
-  "permissions": "600"
-}
-EOF
-)
+    local safe_ai_name safe_file_path
+    vibe_json_string safe_ai_name "$ai_name"
+    vibe_json_string safe_file_path "$file_path"
+    local metadata="{\"ai_name\":$safe_ai_name,\"file_path\":$safe_file_path,\"file_size\":$file_size,\"permissions\":\"600\"}"
 
     vibe_log "file_prompt.created" "temp_file_creation" "$metadata" \
         "一時ファイル作成: $file_path ($file_size bytes)" \
@@ -436,15 +354,11 @@ vibe_file_cleanup() {
     local file_path="$2"
     local success="$3"  # "success" | "failed"
 
-    local metadata
-    metadata=$(cat << EOF
-{
-  "ai_name": "$ai_name",
-  "file_path": "$file_path",
-  "cleanup_status": "$success"
-}
-EOF
-)
+    local safe_ai_name safe_file_path safe_success
+    vibe_json_string safe_ai_name "$ai_name"
+    vibe_json_string safe_file_path "$file_path"
+    vibe_json_string safe_success "$success"
+    local metadata="{\"ai_name\":$safe_ai_name,\"file_path\":$safe_file_path,\"cleanup_status\":$safe_success}"
 
     vibe_log "file_prompt.cleanup" "temp_file_cleanup" "$metadata" \
         "一時ファイルクリーンアップ: $file_path ($success)" \
@@ -460,17 +374,15 @@ vibe_prompt_size_analysis() {
     local threshold="$3"
     local decision="$4"  # "use_file" | "use_command_line"
 
-    local metadata
-    metadata=$(cat << EOF
-{
-  "ai_name": "$ai_name",
-  "prompt_size": $prompt_size,
-  "threshold": $threshold,
-  "decision": "$decision",
-  "size_ratio": $(echo "scale=2; $prompt_size / $threshold" | bc)
-}
-EOF
-)
+    local safe_ai_name safe_decision
+    vibe_json_string safe_ai_name "$ai_name"
+    vibe_json_string safe_decision "$decision"
+    local size_ratio="0.00" hundredths
+    if (( threshold > 0 )); then
+        hundredths=$(( prompt_size * 100 / threshold ))
+        printf -v size_ratio '%d.%02d' $((hundredths / 100)) $((hundredths % 100))
+    fi
+    local metadata="{\"ai_name\":$safe_ai_name,\"prompt_size\":$prompt_size,\"threshold\":$threshold,\"decision\":$safe_decision,\"size_ratio\":$size_ratio}"
 
     vibe_log "file_prompt.size_analysis" "routing_decision" "$metadata" \
         "プロンプトサイズ分析: $ai_name ($prompt_size bytes, 閾値: $threshold bytes)" \
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Eva Tetris ステップ速度ベンチマーク
+
+同じ乱数入力列で N ゲームを最後まで進め、steps/sec を比較する。
+- before: 分離前の TetrisGame のゲームロジック（dict ピース + list[list] 盤面）
+- after:  ヘッドレスな TetrisEngine
+
+どちらも描画なしで、ゲームロジックだけを比較する。
+
+Usage:
+    python3 benchmark_eva_tetris.py [GAMES]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from eva_tetris_engine import (
+    TetrisEngine, ACTIONS, SHAPES, COLORS, GRID_WIDTH, GRID_HEIGHT,
+    ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE, ACTION_SOFT_DROP, ACTION_HARD_DROP, ACTION_TICK,
+)
+
+MAX_STEPS = 5000
+
+
+class LegacyGame:
+    """分離前の TetrisGame のロジック部分（比較用にここだけに残す）"""
+
+    def __init__(self):
+        self.board = [[0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+        self.current_piece = self.new_piece()
+        self.next_piece = self.new_piece()
+        self.game_over = False
+        self.score = 0
+        self.level = 1
+        self.lines_cleared = 0
+
+    def new_piece(self):
+        shape_idx = random.randint(0, len(SHAPES) - 1)
+        return {
+            'shape': SHAPES[shape_idx],
+            'color': COLORS[shape_idx],
+            'x': GRID_WIDTH // 2 - len(SHAPES[shape_idx][0]) // 2,
+            'y': 0
+        }
+
+    def rotate_piece(self, shape):
+        return [[shape[y][x] for y in range(len(shape)-1, -1, -1)] for x in range(len(shape[0]))]
+
+    def is_collision(self, piece, x_offset=0, y_offset=0):
+        shape = piece['shape']
+        for y, row in enumerate(shape):
+            for x, cell in enumerate(row):
+                if cell:
+                    pos_x, pos_y = piece['x'] + x + x_offset, piece['y'] + y + y_offset
+                    if (pos_x < 0 or pos_x >= GRID_WIDTH or
+                        pos_y >= GRID_HEIGHT or
+                        (pos_y >= 0 and self.board[pos_y][pos_x])):
+                        return True
+        return False
+
+    def merge_piece(self):
+        for y, row in enumerate(self.current_piece['shape']):
+            for x, cell in enumerate(row):
+                if cell:
+                    pos_x, pos_y = self.current_piece['x'] + x, self.current_piece['y'] + y
+                    if 0 <= pos_y < GRID_HEIGHT and 0 <= pos_x < GRID_WIDTH:
+                        self.board[pos_y][pos_x] = self.current_piece['color']
+
+    def clear_lines(self):
+        lines_to_clear = []
+        for y in range(GRID_HEIGHT):
+            if all(self.board[y]):
+                lines_to_clear.append(y)
+
+        for line in lines_to_clear:
+            del self.board[line]
+            self.board.insert(0, [0 for _ in range(GRID_WIDTH)])
+
+        if lines_to_clear:
+            self.lines_cleared += len(lines_to_clear)
+            self.score += [100, 300, 500, 800][min(len(lines_to_clear)-1, 3)] * self.level
+            self.level = self.lines_cleared // 10 + 1
+
+    def update(self):
+        if self.game_over:
+            return
+        if not self.is_collision(self.current_piece, 0, 1):
+            self.current_piece['y'] += 1
+        else:
+            self.merge_piece()
+            self.clear_lines()
+            self.current_piece = self.next_piece
+            self.next_piece = self.new_piece()
+            if self.is_collision(self.current_piece):
+                self.game_over = True
+
+    def move(self, dx):
+        if not self.is_collision(self.current_piece, dx, 0):
+            self.current_piece['x'] += dx
+
+    def rotate(self):
+        original_shape = self.current_piece['shape']
+        self.current_piece['shape'] = self.rotate_piece(original_shape)
+        if self.is_collision(self.current_piece):
+            self.current_piece['shape'] = original_shape
+
+    def hard_drop(self):
+        while not self.is_collision(self.current_piece, 0, 1):
+            self.current_piece['y'] += 1
+        self.update()
+
+    def step(self, action):
+        """TetrisEngine.step と同じ入力を、以前のキー処理と同じ操作に割り当てる"""
+        if self.game_over:
+            return True
+        if action == ACTION_LEFT:
+            self.move(-1)
+        elif action == ACTION_RIGHT:
+            self.move(1)
+        elif action == ACTION_ROTATE:
+            self.rotate()
+        elif action == ACTION_SOFT_DROP:
+            if not self.is_collision(self.current_piece, 0, 1):
+                self.current_piece['y'] += 1
+        elif action == ACTION_HARD_DROP:
+            self.hard_drop()
+        elif action == ACTION_TICK:
+            self.update()
+        return self.game_over
+
+
+def play(factory, games: int, seed: int = 42):
+    """games 回ゲームを実行し (steps, 経過秒) を返す"""
+    rng = random.Random(seed)
+    random.seed(seed)
+    steps = 0
+    start = time.perf_counter()
+    for _ in range(games):
+        engine = factory()
+        for _ in range(MAX_STEPS):
+            steps += 1
+            if engine.step(rng.choice(ACTIONS)):
+                break
+    return steps, time.perf_counter() - start
+
+
+def report(label: str, steps: int, elapsed: float) -> float:
+    rate = steps / elapsed if elapsed > 0 else 0.0
+    print(f"  {label:<28} {steps:8d} steps  {elapsed * 1000:8.1f}ms  {rate:12,.0f} steps/sec")
+    return rate
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print("=== Eva Tetris Step Benchmark ===")
+    print(f"Games: {games}, max {MAX_STEPS} steps/game")
+    print("")
+
+    before = report("before (legacy logic)", *play(LegacyGame, games))
+    after = report("after (TetrisEngine)", *play(TetrisEngine, games))
+
+    print("")
+    print("  📊 Results:")
+    print(f"    - Speedup: {after / before:.1f}x")
+    print(f"    - Headless: {after:,.0f} steps/sec")
+
+
+if __name__ == "__main__":
+    main()
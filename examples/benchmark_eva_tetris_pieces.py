@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Eva Tetris ピース操作ベンチマーク
+
+回転・移動・衝突判定をそれぞれ N 回（既定 100万回）実行し、時間と
+tracemalloc で見たメモリ確保量を比較する。
+- before: dict ピース + rotate_piece() による行列の作り直し + list[list] 盤面
+- after:  向きテーブルの添字を持つ Piece + ビットボード（TetrisEngine）
+
+メモリ確保は別途サンプル呼び出しごとに tracemalloc のピークを測り、
+「確保が発生した呼び出しの割合」と「1回あたりの一時確保バイト数」を出す。
+
+Usage:
+    python3 benchmark_eva_tetris_pieces.py [CALLS] [ALLOC_SAMPLES]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from eva_tetris_engine import TetrisEngine, SHAPES, COLORS, GRID_WIDTH, GRID_HEIGHT
+
+
+class LegacyPieces:
+    """以前の実装（比較用にここだけに残す）"""
+
+    def __init__(self):
+        self.board = [[0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+        self.current_piece = {'shape': SHAPES[1], 'color': COLORS[1], 'x': 4, 'y': 8}
+
+    def rotate_piece(self, shape):
+        return [[shape[y][x] for y in range(len(shape)-1, -1, -1)] for x in range(len(shape[0]))]
+
+    def is_collision(self, piece, x_offset=0, y_offset=0):
+        shape = piece['shape']
+        for y, row in enumerate(shape):
+            for x, cell in enumerate(row):
+                if cell:
+                    pos_x, pos_y = piece['x'] + x + x_offset, piece['y'] + y + y_offset
+                    if (pos_x < 0 or pos_x >= GRID_WIDTH or
+                        pos_y >= GRID_HEIGHT or
+                        (pos_y >= 0 and self.board[pos_y][pos_x])):
+                        return True
+        return False
+
+    def move(self, dx):
+        if not self.is_collision(self.current_piece, dx, 0):
+            self.current_piece['x'] += dx
+
+    def rotate(self):
+        original_shape = self.current_piece['shape']
+        self.current_piece['shape'] = self.rotate_piece(original_shape)
+        if self.is_collision(self.current_piece):
+            self.current_piece['shape'] = original_shape
+
+
+def operations(game):
+    """(名前, 引数なしで呼べる操作) のリスト。盤面中央のTピースを対象にする"""
+    game.current_piece = {'shape': SHAPES[1], 'color': COLORS[1], 'x': 4, 'y': 8}
+    piece = game.current_piece
+    direction = [1]
+
+    def move():
+        game.move(direction[0])
+        direction[0] = -direction[0]
+
+    return [
+        ("rotate", game.rotate),
+        ("move", move),
+        ("is_collision", lambda: game.is_collision(piece, 0, 1)),
+    ]
+
+
+def time_op(op, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        op()
+    return time.perf_counter() - start
+
+
+def allocation_profile(op, samples: int):
+    """(確保が発生した呼び出し数, 1回あたりの平均一時確保バイト数)"""
+    get = tracemalloc.get_traced_memory
+    reset = tracemalloc.reset_peak
+
+    def sample(fn):
+        hits = 0
+        total = 0
+        for _ in range(samples):
+            before = get()[0]
+            reset()
+            fn()
+            peak = get()[1]
+            if peak > before:
+                hits += 1
+                total += peak - before
+        return hits, total
+
+    tracemalloc.start()
+    try:
+        # 計測そのもののオーバーヘッドを空の呼び出しで見積もって差し引く
+        base_hits, base_total = sample(lambda: None)
+        hits, total = sample(op)
+    finally:
+        tracemalloc.stop()
+    overhead = base_total / samples
+    allocating = max(0, hits - base_hits)
+    return allocating, max(0.0, total / samples - overhead)
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    samples = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+
+    print("=== Eva Tetris Piece Operation Benchmark ===")
+    print(f"Calls: {calls:,} per operation, allocation samples: {samples:,}")
+    print("")
+
+    results = {}
+    for label, factory in (("before (dict)", LegacyPieces), ("after (Piece)", TetrisEngine)):
+        print(f"  {label}")
+        for name, op in operations(factory()):
+            elapsed = time_op(op, calls)
+            allocating, per_call = allocation_profile(op, samples)
+            results[(label, name)] = elapsed
+            print(f"    {name:<14} {elapsed * 1000:9.1f}ms  {elapsed / calls * 1e9:7.0f}ns/call"
+                  f"  allocating calls {allocating:6d}/{samples}  {per_call:7.1f} B/call")
+        print("")
+
+    print("  📊 Results:")
+    for name in ("rotate", "move", "is_collision"):
+        before = results[("before (dict)", name)]
+        after = results[("after (Piece)", name)]
+        print(f"    - {name:<14} {before / after:5.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
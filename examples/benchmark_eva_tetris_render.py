@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Eva Tetris 描画コストベンチマーク
+
+同じ乱数入力で進むゲームを N フレーム描画し、1フレームあたりの
+描画＋転送コストの p50/p99 を比較する。
+- before: 毎フレーム全体を描き直して display.flip()（以前の TetrisGame.run の描画部分）
+- after:  TetrisGame.render() の差分描画 + display.update(dirty_rects)
+
+最後に両者の最終画面がピクセル単位で一致するかも確認する。
+
+Usage:
+    SDL_VIDEODRIVER=dummy python3 benchmark_eva_tetris_render.py [FRAMES]
+"""
+
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pygame
+
+from eva_tetris import (
+    TetrisGame, FrameStats, GAME_AREA, SIDEBAR_AREA, CONTROLS, AI_INFO,
+    SCREEN_WIDTH, SCREEN_HEIGHT, GRID_SIZE, GRID_WIDTH, GRID_HEIGHT,
+)
+from eva_tetris_engine import BLACK, WHITE, GRAY, RED, CYAN, YELLOW, ACTIONS, ACTION_TICK
+
+
+def legacy_draw(game):
+    """以前の毎フレーム全体描画（比較用にここだけに残す）"""
+    screen = game.screen
+    screen.fill(BLACK)
+    title = game.font.render("Eva Tetris", True, CYAN)
+    screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 10))
+
+    pygame.draw.rect(screen, GRAY, GAME_AREA)
+    pygame.draw.rect(screen, WHITE, GAME_AREA, 2)
+    for y in range(GRID_HEIGHT):
+        for x in range(GRID_WIDTH):
+            if game.board[y][x]:
+                rect = pygame.Rect(GAME_AREA.left + x * GRID_SIZE, GAME_AREA.top + y * GRID_SIZE,
+                                   GRID_SIZE - 1, GRID_SIZE - 1)
+                pygame.draw.rect(screen, game.board[y][x], rect)
+                pygame.draw.rect(screen, WHITE, rect, 1)
+    if not game.game_over:
+        piece = game.current_piece
+        for y, row in enumerate(piece['shape']):
+            for x, cell in enumerate(row):
+                if cell:
+                    rect = pygame.Rect(GAME_AREA.left + (piece['x'] + x) * GRID_SIZE,
+                                       GAME_AREA.top + (piece['y'] + y) * GRID_SIZE,
+                                       GRID_SIZE - 1, GRID_SIZE - 1)
+                    pygame.draw.rect(screen, piece['color'], rect)
+                    pygame.draw.rect(screen, WHITE, rect, 1)
+
+    sidebar = SIDEBAR_AREA
+    pygame.draw.rect(screen, (50, 50, 50), sidebar)
+    pygame.draw.rect(screen, WHITE, sidebar, 2)
+    screen.blit(game.font.render("Next:", True, WHITE), (sidebar.left + 10, sidebar.top + 20))
+    for y, row in enumerate(game.next_piece['shape']):
+        for x, cell in enumerate(row):
+            if cell:
+                rect = pygame.Rect(sidebar.left + 40 + x * GRID_SIZE, sidebar.top + 70 + y * GRID_SIZE,
+                                   GRID_SIZE - 1, GRID_SIZE - 1)
+                pygame.draw.rect(screen, game.next_piece['color'], rect)
+                pygame.draw.rect(screen, WHITE, rect, 1)
+    for i, text in enumerate((f"Score: {game.score}", f"Level: {game.level}",
+                              f"Lines: {game.lines_cleared}")):
+        screen.blit(game.small_font.render(text, True, WHITE), (sidebar.left + 10, sidebar.top + 150 + i * 30))
+    for i, text in enumerate(CONTROLS):
+        screen.blit(game.small_font.render(text, True, WHITE), (sidebar.left + 10, sidebar.top + 280 + i * 25))
+    for i, text in enumerate(AI_INFO):
+        color = YELLOW if i == 0 else WHITE
+        screen.blit(game.small_font.render(text, True, color), (sidebar.left + 10, sidebar.top + 460 + i * 22))
+
+    if game.game_over:
+        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 180))
+        screen.blit(overlay, (0, 0))
+        game_over_text = game.font.render("GAME OVER", True, RED)
+        restart_text = game.small_font.render("Press R to Restart", True, WHITE)
+        screen.blit(game_over_text, game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2)))
+        screen.blit(restart_text, restart_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50)))
+    pygame.display.flip()
+
+
+def dirty_draw(game):
+    dirty = game.render()
+    if dirty:
+        pygame.display.update(dirty)
+
+
+def play(draw, frames: int, seed: int = 42):
+    """60fps相当のフレームを frames 回描画し、(FrameStats, 最終画面) を返す"""
+    random.seed(seed)
+    rng = random.Random(seed)
+    game = TetrisGame()
+    stats = FrameStats(window=frames)
+    for frame in range(frames):
+        # 数フレームに1回のキー入力と、30フレームごとの自動落下
+        if rng.random() < 0.15:
+            game.step(rng.choice(ACTIONS))
+        if frame % 30 == 29:
+            game.step(ACTION_TICK)
+        if game.game_over and frame % 120 == 0:
+            game.reset_game()
+        start = time.perf_counter()
+        draw(game)
+        stats.add((time.perf_counter() - start) * 1000)
+    screen = pygame.image.tostring(game.screen, "RGB")
+    pygame.quit()
+    return stats, screen
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+
+    print("=== Eva Tetris Render Benchmark ===")
+    print(f"Frames: {frames}")
+    print("")
+
+    before, before_screen = play(legacy_draw, frames)
+    after, after_screen = play(dirty_draw, frames)
+    for label, stats in (("full redraw + flip", before), ("dirty rects + update", after)):
+        print(f"  {label:<24} p50 {stats.percentile(50):7.3f}ms  p99 {stats.percentile(99):7.3f}ms")
+
+    print("")
+    print("  📊 Results:")
+    p50 = after.percentile(50)
+    print(f"    - p50 frame cost: {before.percentile(50) / p50 if p50 else float('inf'):.1f}x lower")
+    print(f"    - p99 frame cost: {before.percentile(99) / max(after.percentile(99), 1e-6):.1f}x lower")
+    print(f"    - Final frame identical: {'yes' if before_screen == after_screen else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
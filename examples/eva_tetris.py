@@ -12,49 +12,114 @@ PM自己紹介: 私は高速プロトタイパーAmpです。37秒以内に実
 - Cursor (統合担当): Codex推奨事項の反映 + テスト追加
 """
 
+import argparse
+import time
+from collections import deque
+from typing import Optional
+
 import pygame
-import random
 import sys
-from typing import List, Dict, Tuple
+
+from eva_tetris_engine import (
+    TetrisEngine, GRID_WIDTH, GRID_HEIGHT, SHAPES, COLORS,
+    BLACK, WHITE, GRAY, RED, GREEN, BLUE, CYAN, MAGENTA, YELLOW, ORANGE,
+    ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE, ACTION_SOFT_DROP, ACTION_HARD_DROP,
+    ACTION_TICK,
+)
 
 # 定数定義
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 700
 GRID_SIZE = 30
-GRID_WIDTH = 10
-GRID_HEIGHT = 20
 SIDEBAR_WIDTH = 200
 
-# 色の定義
-BLACK = (0, 0, 0)
-WHITE = (255, 255, 255)
-GRAY = (128, 128, 128)
-RED = (255, 0, 0)
-GREEN = (0, 255, 0)
-BLUE = (0, 0, 255)
-CYAN = (0, 255, 255)
-MAGENTA = (255, 0, 255)
-YELLOW = (255, 255, 0)
-ORANGE = (255, 165, 0)
+# 画面レイアウト（毎フレーム計算しないよう固定）
+GAME_AREA = pygame.Rect(
+    (SCREEN_WIDTH - SIDEBAR_WIDTH) // 2 - (GRID_SIZE * GRID_WIDTH) // 2,
+    50,
+    GRID_SIZE * GRID_WIDTH,
+    GRID_SIZE * GRID_HEIGHT
+)
+SIDEBAR_AREA = pygame.Rect(
+    (SCREEN_WIDTH - SIDEBAR_WIDTH) // 2 + (GRID_SIZE * GRID_WIDTH) // 2 + 20,
+    50,
+    SIDEBAR_WIDTH - 20, GRID_HEIGHT * GRID_SIZE
+)
+NEXT_PIECE_AREA = pygame.Rect(SIDEBAR_AREA.left + 40, SIDEBAR_AREA.top + 70,
+                              GRID_SIZE * 4, GRID_SIZE * 2)
+FRAME_STATS_POS = (10, SCREEN_HEIGHT - 30)
+
+# オートプレイで1手打つ間隔（ms）
+AUTOPLAY_INTERVAL = 150
+
+# 操作説明
+CONTROLS = [
+    "Controls:",
+    "← → : Move",
+    "↑ : Rotate",
+    "↓ : Soft Drop",
+    "Space : Hard Drop",
+    "R : Restart",
+    "Q : Quit"
+]
 
-# テトリミノの形状
-SHAPES = [
-    [[1, 1, 1, 1]],  # I
-    [[1, 1, 1], [0, 1, 0]],  # T
-    [[1, 1, 1], [1, 0, 0]],  # L
-    [[1, 1, 1], [0, 0, 1]],  # J
-    [[1, 1], [1, 1]],  # O
-    [[0, 1, 1], [1, 1, 0]],  # S
-    [[1, 1, 0], [0, 1, 1]]   # Z
+# AI協調情報
+AI_INFO = [
+    "Multi-AI Team:",
+    "PM: Amp",
+    "Architect: Claude",
+    "Research: Gemini",
+    "Proto: Qwen",
+    "Review: Codex",
+    "Integration: Cursor"
 ]
 
-# 色のリスト
-COLORS = [CYAN, MAGENTA, ORANGE, BLUE, YELLOW, GREEN, RED]
+# ウィンドウが隠れた後などに全体の再描画が必要になるイベント
+EXPOSE_EVENTS = tuple(getattr(pygame, name) for name in ("VIDEOEXPOSE", "WINDOWEXPOSED")
+                      if hasattr(pygame, name))
+
+# キー入力とエンジン入力の対応
+KEY_ACTIONS = {
+    pygame.K_LEFT: ACTION_LEFT,
+    pygame.K_RIGHT: ACTION_RIGHT,
+    pygame.K_UP: ACTION_ROTATE,
+    pygame.K_DOWN: ACTION_SOFT_DROP,
+    pygame.K_SPACE: ACTION_HARD_DROP,
+}
+
+
+class FrameStats:
+    """直近 window フレームの処理時間（ms）から p50/p99 を求める"""
 
-class TetrisGame:
-    """Tetrisゲームのメインクラス"""
+    def __init__(self, window: int = 600):
+        self.samples = deque(maxlen=window)
+        self.frames = 0
+
+    def add(self, ms: float):
+        self.samples.append(ms)
+        self.frames += 1
+
+    def percentile(self, p: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def summary(self) -> str:
+        return f"frame p50 {self.percentile(50):.2f}ms  p99 {self.percentile(99):.2f}ms"
+
+
+class TetrisGame(TetrisEngine):
+    """
+    Tetrisゲームのメインクラス（TetrisEngine上のpygameレンダラー）
+
+    背景・固定テキストは起動時に一度だけ描いたサーフェスを使い回し、
+    毎フレームは前フレームから変わったセルと数値だけを描き直して
+    pygame.display.update(dirty_rects) で転送する。
+    """
     
-    def __init__(self):
+    def __init__(self, show_frame_stats: bool = False, autoplay: bool = False,
+                 seed: Optional[int] = None, record_path: Optional[str] = None):
         """ゲームの初期化"""
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -63,184 +128,161 @@ class TetrisGame:
         self.font = pygame.font.SysFont(None, 36)
         self.small_font = pygame.font.SysFont(None, 24)
         
-        self.reset_game()
+        self.show_frame_stats = show_frame_stats
+        self.autoplay = None
+        if autoplay:
+            # NumPyが必要なのでオートプレイ時だけ読み込む
+            from eva_tetris_ai import best_placement
+            self.autoplay = best_placement
+        self.autoplay_time = 0
+        self.frame = 0
+        self.frame_stats = FrameStats()
+        self.background = self.build_background()
+        self.cell_surfaces = {}
+        self.text_cache = {}
+        
+        super().__init__(seed)
+        
+        self.recorder = None
+        if record_path:
+            from eva_tetris_replay import Recorder
+            self.recorder = Recorder(record_path, self.seed)
         
     def reset_game(self):
         """ゲーム状態をリセット"""
-        self.board = [[0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-        self.current_piece = self.new_piece()
-        self.next_piece = self.new_piece()
-        self.game_over = False
-        self.score = 0
-        self.level = 1
-        self.lines_cleared = 0
+        super().reset_game()
         self.drop_time = 0  # Codex推奨: タイマーリセット
-        
-    def new_piece(self) -> Dict:
-        """新しいテトリミノを生成"""
-        shape_idx = random.randint(0, len(SHAPES) - 1)
-        return {
-            'shape': SHAPES[shape_idx],
-            'color': COLORS[shape_idx],
-            'x': GRID_WIDTH // 2 - len(SHAPES[shape_idx][0]) // 2,
-            'y': 0
-        }
-    
-    def rotate_piece(self, shape: List[List[int]]) -> List[List[int]]:
-        """ピースを回転（転置して各行を反転させることで90度回転）"""
-        return [[shape[y][x] for y in range(len(shape)-1, -1, -1)] for x in range(len(shape[0]))]
-    
-    def is_collision(self, piece: Dict, x_offset: int = 0, y_offset: int = 0) -> bool:
-        """衝突チェック"""
-        shape = piece['shape']
-        for y, row in enumerate(shape):
-            for x, cell in enumerate(row):
-                if cell:
-                    pos_x, pos_y = piece['x'] + x + x_offset, piece['y'] + y + y_offset
-                    if (pos_x < 0 or pos_x >= GRID_WIDTH or 
-                        pos_y >= GRID_HEIGHT or 
-                        (pos_y >= 0 and self.board[pos_y][pos_x])):
-                        return True
-        return False
+        self.invalidate()
     
-    def merge_piece(self):
-        """ピースをボードに固定"""
-        for y, row in enumerate(self.current_piece['shape']):
-            for x, cell in enumerate(row):
-                if cell:
-                    pos_x, pos_y = self.current_piece['x'] + x, self.current_piece['y'] + y
-                    if 0 <= pos_y < GRID_HEIGHT and 0 <= pos_x < GRID_WIDTH:
-                        self.board[pos_y][pos_x] = self.current_piece['color']
+    def invalidate(self):
+        """次のフレームで画面全体を描き直す"""
+        self.needs_full_redraw = True
     
-    def clear_lines(self):
-        """揃ったラインを消去"""
-        lines_to_clear = []
-        for y in range(GRID_HEIGHT):
-            if all(self.board[y]):
-                lines_to_clear.append(y)
-        
-        for line in lines_to_clear:
-            del self.board[line]
-            self.board.insert(0, [0 for _ in range(GRID_WIDTH)])
+    def build_background(self) -> pygame.Surface:
+        """変化しない部分（タイトル・枠・操作説明など）を1枚のサーフェスに描く"""
+        background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        background.fill(BLACK)
         
-        # スコア計算
-        if lines_to_clear:
-            self.lines_cleared += len(lines_to_clear)
-            self.score += [100, 300, 500, 800][min(len(lines_to_clear)-1, 3)] * self.level
-            self.level = self.lines_cleared // 10 + 1
-    
-    def get_drop_interval(self) -> int:
-        """Codex推奨: レベルに応じた落下速度を動的に計算"""
-        return max(100, 1000 - (self.level - 1) * 100)
-    
-    def draw_board(self):
-        """ボードを描画"""
-        # メインゲームエリア
-        game_area = pygame.Rect(
-            (SCREEN_WIDTH - SIDEBAR_WIDTH) // 2 - (GRID_SIZE * GRID_WIDTH) // 2,
-            50,
-            GRID_SIZE * GRID_WIDTH,
-            GRID_SIZE * GRID_HEIGHT
-        )
+        # タイトル
+        title = self.font.render("Eva Tetris", True, CYAN)
+        background.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 10))
         
         # ゲームボードの背景
-        pygame.draw.rect(self.screen, GRAY, game_area)
-        pygame.draw.rect(self.screen, WHITE, game_area, 2)
-        
-        # 固定されたブロックを描画
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                if self.board[y][x]:
-                    rect = pygame.Rect(
-                        game_area.left + x * GRID_SIZE,
-                        game_area.top + y * GRID_SIZE,
-                        GRID_SIZE - 1, GRID_SIZE - 1
-                    )
-                    pygame.draw.rect(self.screen, self.board[y][x], rect)
-                    pygame.draw.rect(self.screen, WHITE, rect, 1)
-        
-        # 現在のピースを描画
-        if not self.game_over:
-            for y, row in enumerate(self.current_piece['shape']):
-                for x, cell in enumerate(row):
-                    if cell:
-                        rect = pygame.Rect(
-                            game_area.left + (self.current_piece['x'] + x) * GRID_SIZE,
-                            game_area.top + (self.current_piece['y'] + y) * GRID_SIZE,
-                            GRID_SIZE - 1, GRID_SIZE - 1
-                        )
-                        pygame.draw.rect(self.screen, self.current_piece['color'], rect)
-                        pygame.draw.rect(self.screen, WHITE, rect, 1)
-    
-    def draw_sidebar(self):
-        """サイドバーを描画"""
-        sidebar = pygame.Rect(
-            (SCREEN_WIDTH - SIDEBAR_WIDTH) // 2 + (GRID_SIZE * GRID_WIDTH) // 2 + 20,
-            50,
-            SIDEBAR_WIDTH - 20, GRID_HEIGHT * GRID_SIZE
-        )
+        pygame.draw.rect(background, GRAY, GAME_AREA)
+        pygame.draw.rect(background, WHITE, GAME_AREA, 2)
         
         # サイドバーの背景
-        pygame.draw.rect(self.screen, (50, 50, 50), sidebar)
-        pygame.draw.rect(self.screen, WHITE, sidebar, 2)
+        sidebar = SIDEBAR_AREA
+        pygame.draw.rect(background, (50, 50, 50), sidebar)
+        pygame.draw.rect(background, WHITE, sidebar, 2)
         
-        # 次のピースを表示
         next_text = self.font.render("Next:", True, WHITE)
-        self.screen.blit(next_text, (sidebar.left + 10, sidebar.top + 20))
+        background.blit(next_text, (sidebar.left + 10, sidebar.top + 20))
         
-        # 次のピースを描画
-        for y, row in enumerate(self.next_piece['shape']):
-            for x, cell in enumerate(row):
-                if cell:
-                    rect = pygame.Rect(
-                        sidebar.left + 40 + x * GRID_SIZE,
-                        sidebar.top + 70 + y * GRID_SIZE,
-                        GRID_SIZE - 1, GRID_SIZE - 1
-                    )
-                    pygame.draw.rect(self.screen, self.next_piece['color'], rect)
-                    pygame.draw.rect(self.screen, WHITE, rect, 1)
-        
-        # スコア情報を表示
-        score_text = self.small_font.render(f"Score: {self.score}", True, WHITE)
-        level_text = self.small_font.render(f"Level: {self.level}", True, WHITE)
-        lines_text = self.small_font.render(f"Lines: {self.lines_cleared}", True, WHITE)
+        for i, text in enumerate(CONTROLS):
+            ctrl_text = self.small_font.render(text, True, WHITE)
+            background.blit(ctrl_text, (sidebar.left + 10, sidebar.top + 280 + i * 25))
         
-        self.screen.blit(score_text, (sidebar.left + 10, sidebar.top + 150))
-        self.screen.blit(level_text, (sidebar.left + 10, sidebar.top + 180))
-        self.screen.blit(lines_text, (sidebar.left + 10, sidebar.top + 210))
+        for i, text in enumerate(AI_INFO):
+            color = YELLOW if i == 0 else WHITE
+            ai_text = self.small_font.render(text, True, color)
+            background.blit(ai_text, (sidebar.left + 10, sidebar.top + 460 + i * 22))
         
-        # 操作説明
-        controls = [
-            "Controls:",
-            "← → : Move",
-            "↑ : Rotate",
-            "↓ : Soft Drop",
-            "Space : Hard Drop",
-            "R : Restart",
-            "Q : Quit"
-        ]
+        return background.convert()
+    
+    def cell_surface(self, color) -> pygame.Surface:
+        """色ごとにキャッシュしたブロック1マス分のサーフェス"""
+        surface = self.cell_surfaces.get(color)
+        if surface is None:
+            surface = pygame.Surface((GRID_SIZE - 1, GRID_SIZE - 1))
+            surface.fill(color)
+            pygame.draw.rect(surface, WHITE, surface.get_rect(), 1)
+            self.cell_surfaces[color] = surface
+        return surface
+    
+    def render_text(self, text: str, color=WHITE) -> pygame.Surface:
+        """値が変わったときだけ font.render する"""
+        key = (text, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            if len(self.text_cache) > 256:
+                self.text_cache.clear()
+            surface = self.small_font.render(text, True, color)
+            self.text_cache[key] = surface
+        return surface
+    
+    def restore(self, rect: pygame.Rect):
+        """rect の範囲を背景で塗り戻す"""
+        self.screen.blit(self.background, rect, rect)
+    
+    def visible_cells(self) -> list:
+        """盤面に現在のピースを重ねた、表示すべきセルの色（行ごとのリスト）"""
+        cells = [list(row) for row in self.board]
+        if not self.game_over:
+            piece = self.current_piece
+            for x, y in piece.orientation.cells:
+                pos_x, pos_y = piece.x + x, piece.y + y
+                if 0 <= pos_y < GRID_HEIGHT and 0 <= pos_x < GRID_WIDTH:
+                    cells[pos_y][pos_x] = piece.color
+        return cells
+    
+    def draw_board(self) -> list:
+        """前フレームから変わったセルだけを描き、更新した矩形を返す"""
+        cells = self.visible_cells()
+        drawn = self.drawn_cells
+        dirty = []
+        for y in range(GRID_HEIGHT):
+            row = cells[y]
+            if row == drawn[y]:
+                continue
+            previous = drawn[y]
+            for x in range(GRID_WIDTH):
+                if row[x] == previous[x]:
+                    continue
+                rect = pygame.Rect(
+                    GAME_AREA.left + x * GRID_SIZE,
+                    GAME_AREA.top + y * GRID_SIZE,
+                    GRID_SIZE - 1, GRID_SIZE - 1
+                )
+                if row[x]:
+                    self.screen.blit(self.cell_surface(row[x]), rect)
+                else:
+                    self.restore(rect)
+                dirty.append(rect)
+        self.drawn_cells = cells
+        return dirty
+    
+    def draw_sidebar(self) -> list:
+        """次のピースとスコア類のうち、変わったものだけを描く"""
+        dirty = []
+        sidebar = SIDEBAR_AREA
         
-        for i, text in enumerate(controls):
-            ctrl_text = self.small_font.render(text, True, WHITE)
-            self.screen.blit(ctrl_text, (sidebar.left + 10, sidebar.top + 280 + i * 25))
+        # 次のピース
+        next_key = (id(self.next_piece.shape), self.next_piece.color)
+        if next_key != self.drawn_next:
+            self.restore(NEXT_PIECE_AREA)
+            surface = self.cell_surface(self.next_piece.color)
+            for x, y in self.next_piece.orientation.cells:
+                self.screen.blit(surface, (NEXT_PIECE_AREA.left + x * GRID_SIZE,
+                                           NEXT_PIECE_AREA.top + y * GRID_SIZE))
+            self.drawn_next = next_key
+            dirty.append(NEXT_PIECE_AREA)
         
-        # AI協調情報
-        ai_info = [
-            "Multi-AI Team:",
-            "PM: Amp",
-            "Architect: Claude",
-            "Research: Gemini",
-            "Proto: Qwen",
-            "Review: Codex",
-            "Integration: Cursor"
-        ]
+        # スコア情報
+        stats = (f"Score: {self.score}", f"Level: {self.level}", f"Lines: {self.lines_cleared}")
+        for i, text in enumerate(stats):
+            if text == self.drawn_stats[i]:
+                continue
+            rect = pygame.Rect(sidebar.left + 10, sidebar.top + 150 + i * 30,
+                               sidebar.width - 20, 25)
+            self.restore(rect)
+            self.screen.blit(self.render_text(text), rect)
+            dirty.append(rect)
+        self.drawn_stats = stats
         
-        for i, text in enumerate(ai_info):
-            color = YELLOW if i == 0 else WHITE
-            ai_text = self.small_font.render(text, True, color)
-            self.screen.blit(ai_text, (sidebar.left + 10, sidebar.top + 460 + i * 22))
+        return dirty
     
-    def draw_game_over(self):
+    def draw_game_over(self) -> list:
         """ゲームオーバー表示"""
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))
@@ -254,55 +296,62 @@ class TetrisGame:
         
         self.screen.blit(game_over_text, game_over_rect)
         self.screen.blit(restart_text, restart_rect)
+        return [self.screen.get_rect()]
     
-    def update(self):
-        """ゲーム状態を更新"""
+    def draw_frame_stats(self) -> list:
+        """フレーム処理時間の p50/p99 を左下に表示"""
+        text = self.frame_stats.summary()
+        if text == self.drawn_frame_stats:
+            return []
+        surface = self.render_text(text, GREEN)
+        rect = pygame.Rect(FRAME_STATS_POS, (SCREEN_WIDTH // 2, surface.get_height()))
+        self.restore(rect)
+        self.screen.blit(surface, rect)
+        self.drawn_frame_stats = text
+        return [rect]
+    
+    def render(self) -> list:
+        """1フレーム分を描画し、転送が必要な矩形のリストを返す"""
+        full_redraw = self.needs_full_redraw
+        if full_redraw:
+            self.screen.blit(self.background, (0, 0))
+            self.drawn_cells = [[0] * GRID_WIDTH for _ in range(GRID_HEIGHT)]
+            self.drawn_next = None
+            self.drawn_stats = (None, None, None)
+            self.drawn_frame_stats = None
+            self.drawn_game_over = False
+            self.needs_full_redraw = False
+        
+        # ゲームオーバー画面は表示した時点で静止するので描き直さない
+        if self.drawn_game_over:
+            return []
+        
+        dirty = self.draw_board()
+        dirty += self.draw_sidebar()
+        if self.show_frame_stats and self.frame_stats.frames % 30 == 0:
+            dirty += self.draw_frame_stats()
         if self.game_over:
-            return
-            
-        # ピースを下に移動
-        if not self.is_collision(self.current_piece, 0, 1):
-            self.current_piece['y'] += 1
-        else:
-            # ピースを固定して新しいピースを生成
-            self.merge_piece()
-            self.clear_lines()
-            
-            self.current_piece = self.next_piece
-            self.next_piece = self.new_piece()
-            
-            # 新しいピースの位置に衝突があればゲームオーバー
-            if self.is_collision(self.current_piece):
-                self.game_over = True
+            dirty += self.draw_game_over()
+            self.drawn_game_over = True
+        return [self.screen.get_rect()] if full_redraw else dirty
     
-    def move(self, dx: int):
-        """ピースを横に移動"""
-        if not self.is_collision(self.current_piece, dx, 0):
-            self.current_piece['x'] += dx
+    def apply_action(self, action: int):
+        """入力をエンジンに渡す（記録中なら記録もする）"""
+        if self.recorder:
+            self.recorder.action(self.frame, action)
+        self.step(action)
     
-    def rotate(self):
-        """ピースを回転"""
-        original_shape = self.current_piece['shape']
-        self.current_piece['shape'] = self.rotate_piece(original_shape)
-        if self.is_collision(self.current_piece):
-            self.current_piece['shape'] = original_shape
+    def apply_placement(self, rotation: int, x: int):
+        """AIが選んだ配置を適用する（記録中なら記録もする）"""
+        if self.recorder:
+            self.recorder.place(self.frame, rotation, x)
+        self.place(rotation, x)
     
-    def hard_drop(self):
-        """
-        Codex推奨修正: ハードドロップ時のブロック上書きバグ修正
-        
-        元のバグ: 衝突するまで移動した後、そのままupdate()を呼ぶと
-        ピースがスタックに重なった状態でmerge_piece()が実行され、
-        既存のブロックを上書きしてしまう。
-        
-        修正: 衝突する直前（1行上）で停止してからupdate()を呼ぶ。
-        """
-        # 衝突するまで下に移動
-        while not self.is_collision(self.current_piece, 0, 1):
-            self.current_piece['y'] += 1
-        # この時点でcurrent_piece['y']は「次に移動すると衝突する」位置
-        # つまり正しい着地位置なので、そのままupdate()を呼んでOK
-        self.update()
+    def restart(self):
+        """ゲームをやり直す（記録中なら記録もする）"""
+        if self.recorder:
+            self.recorder.reset(self.frame)
+        self.reset_game()
     
     def run(self):
         """ゲームループ"""
@@ -310,6 +359,8 @@ class TetrisGame:
         
         while True:
             dt = self.clock.tick(60)
+            frame_start = time.perf_counter()
+            self.frame += 1
             self.drop_time += dt
             
             # Codex推奨: 動的な落下速度計算
@@ -318,62 +369,86 @@ class TetrisGame:
             # イベント処理
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                    self.quit()
                 
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_q:
-                        pygame.quit()
-                        sys.exit()
+                        self.quit()
                     
                     if self.game_over and event.key == pygame.K_r:
-                        self.reset_game()
+                        self.restart()
                         self.drop_time = 0  # Codex推奨: リセット時のタイマークリア
                     
                     if not self.game_over:
-                        if event.key == pygame.K_LEFT:
-                            self.move(-1)
-                        elif event.key == pygame.K_RIGHT:
-                            self.move(1)
-                        elif event.key == pygame.K_DOWN:
-                            if not self.is_collision(self.current_piece, 0, 1):
-                                self.current_piece['y'] += 1
-                        elif event.key == pygame.K_UP:
-                            self.rotate()
-                        elif event.key == pygame.K_SPACE:
-                            self.hard_drop()
-                            self.drop_time = 0  # Codex推奨: ハードドロップ後のタイマーリセット
+                        if event.key in KEY_ACTIONS:
+                            self.apply_action(KEY_ACTIONS[event.key])
+                            if event.key == pygame.K_SPACE:
+                                self.drop_time = 0  # Codex推奨: ハードドロップ後のタイマーリセット
                         elif event.key == pygame.K_r and not self.game_over:
-                            self.reset_game()
+                            self.restart()
                             self.drop_time = 0
+                
+                if event.type in EXPOSE_EVENTS:
+                    self.invalidate()
+            
+            # オートプレイ: 一定間隔で評価関数が選んだ位置に置く
+            if self.autoplay and not self.game_over:
+                self.autoplay_time += dt
+                if self.autoplay_time > AUTOPLAY_INTERVAL:
+                    self.autoplay_time = 0
+                    choice = self.autoplay(self)
+                    if choice is None:
+                        # 置ける場所がなければそのまま落とす
+                        self.apply_action(ACTION_HARD_DROP)
+                    else:
+                        self.apply_placement(*choice)
+                    self.drop_time = 0
             
             # ピースの自動落下
             if not self.game_over and self.drop_time > drop_interval:
                 self.drop_time = 0
-                self.update()
-            
-            # 画面描画
-            self.screen.fill(BLACK)
-            
-            # タイトル
-            title = self.font.render("Eva Tetris", True, CYAN)
-            self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, 10))
-            
-            self.draw_board()
-            self.draw_sidebar()
+                self.apply_action(ACTION_TICK)
             
-            if self.game_over:
-                self.draw_game_over()
+            # 変化した部分だけを描画・転送
+            dirty = self.render()
+            if dirty:
+                pygame.display.update(dirty)
             
-            pygame.display.flip()
+            if self.show_frame_stats:
+                self.frame_stats.add((time.perf_counter() - frame_start) * 1000)
+    
+    def quit(self):
+        """pygameを終了してプロセスを終える"""
+        if self.recorder:
+            self.recorder.close(self)
+            print(f"Recorded {self.recorder.events} events to {self.recorder.path}")
+        if self.show_frame_stats:
+            print(self.frame_stats.summary())
+        pygame.quit()
+        sys.exit()
 
 def main():
     """メイン関数"""
+    parser = argparse.ArgumentParser(description="Eva Tetris")
+    parser.add_argument("--frame-stats", action="store_true",
+                        help="フレーム処理時間の p50/p99 を画面に表示する")
+    parser.add_argument("--autoplay", action="store_true",
+                        help="AI（eva_tetris_ai.py、NumPyが必要）に自動でプレイさせる")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="ピース出現順の乱数シード（省略時はランダム）")
+    parser.add_argument("--record", metavar="FILE", default=None,
+                        help="入力を記録する（eva_tetris_replay.py で再生できる）")
+    args = parser.parse_args()
+    
+    game = None
     try:
-        game = TetrisGame()
+        game = TetrisGame(show_frame_stats=args.frame_stats, autoplay=args.autoplay,
+                          seed=args.seed, record_path=args.record)
         game.run()
     except KeyboardInterrupt:
         print("\nGame interrupted by user.")
+        if game is not None:
+            game.quit()
         pygame.quit()
         sys.exit()
     except Exception as e:
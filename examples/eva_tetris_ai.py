@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Eva Tetris AI - NumPyによる配置候補の一括評価と自己対戦
+
+現在のピースについて（向き, 列）の全配置をハードドロップと同じ規則で着地させ、
+穴の数・高さの合計・凹凸・消去ライン数の線形ヒューリスティックで評価する。
+候補盤面は (候補数, 高さ, 幅) の配列としてまとめて評価し、Pythonのループは使わない。
+
+自己対戦は独立したゲームをプロセスプールで並列に実行する。
+
+Usage:
+    python3 eva_tetris_ai.py [--games N] [--workers 1,2,4] [--max-moves N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from eva_tetris_engine import TetrisEngine, GRID_WIDTH, GRID_HEIGHT
+
+# 評価関数の重み（高さの合計, 消去ライン数, 穴の数, 凹凸）
+WEIGHT_HEIGHT = -0.510066
+WEIGHT_LINES = 0.760666
+WEIGHT_HOLES = -0.35663
+WEIGHT_BUMPINESS = -0.184483
+
+_COLUMN_BITS = np.arange(GRID_WIDTH, dtype=np.int64)
+
+
+class PlacementSet:
+    """
+    ある向きテーブル（ピースの種類）に対する全配置候補の事前計算結果。
+
+    rotations / xs:   候補ごとの向き番号とピースのx座標
+    cell_dx / cell_dy: 候補ごとのセル位置（ピース原点からの相対、4セル分）
+    col_dx / col_bottom: 候補ごとの各列のx位置と、その列で最も下のセルのdy
+    """
+
+    def __init__(self, table: tuple):
+        rotations, xs, cells, columns = [], [], [], []
+        seen = set()
+        for rotation, orientation in enumerate(table):
+            key = tuple(map(tuple, orientation.shape))
+            if orientation.empty or key in seen:
+                continue
+            seen.add(key)
+            bottoms: Dict[int, int] = {}
+            for dx, dy in orientation.cells:
+                bottoms[dx] = max(bottoms.get(dx, dy), dy)
+            for x in range(orientation.x_min, orientation.x_max + 1):
+                rotations.append(rotation)
+                xs.append(x)
+                cells.append(orientation.cells)
+                columns.append(sorted(bottoms.items()))
+
+        width = max(len(c) for c in cells)
+        ncols = max(len(c) for c in columns)
+        # セル数・列数が揃わない形状は先頭要素で埋める（同じセルを重ねて塗るだけで結果は変わらない）
+        cells = [list(c) + [c[0]] * (width - len(c)) for c in cells]
+        columns = [c + [c[0]] * (ncols - len(c)) for c in columns]
+
+        self.rotations = np.array(rotations, dtype=np.int64)
+        self.xs = np.array(xs, dtype=np.int64)
+        self.cell_dx = np.array([[dx for dx, _ in c] for c in cells], dtype=np.int64)
+        self.cell_dy = np.array([[dy for _, dy in c] for c in cells], dtype=np.int64)
+        self.col_dx = np.array([[dx for dx, _ in c] for c in columns], dtype=np.int64)
+        self.col_bottom = np.array([[b for _, b in c] for c in columns], dtype=np.int64)
+        self.cell_x = self.xs[:, None] + self.cell_dx
+        self.col_x = self.xs[:, None] + self.col_dx
+
+    def __len__(self):
+        return len(self.xs)
+
+
+_PLACEMENT_SETS: Dict[int, Tuple[tuple, PlacementSet]] = {}
+
+
+def placement_set(table: tuple) -> PlacementSet:
+    """向きテーブルごとの PlacementSet（初回だけ計算してキャッシュ）"""
+    entry = _PLACEMENT_SETS.get(id(table))
+    if entry is None or entry[0] is not table:
+        entry = (table, PlacementSet(table))
+        _PLACEMENT_SETS[id(table)] = entry
+    return entry[1]
+
+
+def board_array(engine: TetrisEngine) -> np.ndarray:
+    """盤面の行マスクから (高さ, 幅) の占有配列を作る"""
+    masks = np.fromiter((row.mask for row in engine.board), dtype=np.int64, count=GRID_HEIGHT)
+    return ((masks[:, None] >> _COLUMN_BITS) & 1).astype(bool)
+
+
+def evaluate_placements(board: np.ndarray, placements: PlacementSet, start_y: int) -> dict:
+    """
+    全候補を一括で着地させて評価する。
+
+    開始位置 start_y で衝突する候補は無効（エンジンの place() と同じ判定）。
+    有効な候補は真下に落ちるので、各列について「ピースのその列の最下セルより下にある
+    最初のブロック - 最下セル - 1」の最小値が着地位置になる（ハードドロップと同じ）。
+    ピースより上のブロック（オーバーハング）は着地位置に影響しない。
+
+    Returns:
+        landing, lines, holes, height, bumpiness, score, valid の各配列（候補数の長さ）
+    """
+    count = len(placements)
+
+    # 開始位置での衝突判定（盤面より上のセルは空き扱い）
+    start_cell_y = start_y + placements.cell_dy
+    hit = board[np.clip(start_cell_y, 0, GRID_HEIGHT - 1), placements.cell_x] & (start_cell_y >= 0)
+    valid = ((start_cell_y < GRID_HEIGHT) & ~hit).all(axis=1)
+
+    # below[r, x]: 行 r 以下で列 x の最初のブロックの行（なければ GRID_HEIGHT）
+    rows = np.where(board, np.arange(GRID_HEIGHT)[:, None], GRID_HEIGHT)
+    below = np.vstack([np.minimum.accumulate(rows[::-1], axis=0)[::-1],
+                       np.full((1, GRID_WIDTH), GRID_HEIGHT)])
+    scan_from = np.clip(start_y + placements.col_bottom + 1, 0, GRID_HEIGHT)
+    landing = (below[scan_from, placements.col_x] - placements.col_bottom - 1).min(axis=1)
+    landing = np.where(valid, landing, 0)
+
+    # 候補ごとの盤面を作ってピースを置く
+    boards = np.broadcast_to(board, (count, GRID_HEIGHT, GRID_WIDTH)).copy()
+    cell_y = landing[:, None] + placements.cell_dy
+    boards[np.arange(count)[:, None], cell_y, placements.cell_x] = True
+
+    # 揃った行は消えたものとして扱う
+    full = boards.all(axis=2)
+    lines = full.sum(axis=1)
+    kept = boards & ~full[:, :, None]
+
+    # 各列の高さ = 一番上の残りブロックから下にある「消えない行」の数
+    remaining_below = np.cumsum((~full)[:, ::-1], axis=1)[:, ::-1]
+    has_block = kept.any(axis=1)
+    top_kept = kept.argmax(axis=1)
+    heights = np.where(has_block,
+                       np.take_along_axis(remaining_below, top_kept, axis=1), 0)
+    holes = (heights - kept.sum(axis=1)).sum(axis=1)
+    aggregate = heights.sum(axis=1)
+    bumpiness = np.abs(np.diff(heights, axis=1)).sum(axis=1)
+
+    score = (WEIGHT_HEIGHT * aggregate + WEIGHT_LINES * lines +
+             WEIGHT_HOLES * holes + WEIGHT_BUMPINESS * bumpiness)
+    score = np.where(valid, score, -np.inf)
+    return {
+        'landing': landing, 'lines': lines, 'holes': holes, 'height': aggregate,
+        'bumpiness': bumpiness, 'score': score, 'valid': valid,
+    }
+
+
+def best_placement(engine: TetrisEngine) -> Optional[Tuple[int, int]]:
+    """最も評価の高い (向き番号, x) を返す。置ける場所がなければ None"""
+    piece = engine.current_piece
+    placements = placement_set(piece.table)
+    result = evaluate_placements(board_array(engine), placements, piece.y)
+    best = int(np.argmax(result['score']))
+    if not result['valid'][best]:
+        return None
+    return int(placements.rotations[best]), int(placements.xs[best])
+
+
+def play_move(engine: TetrisEngine) -> bool:
+    """最善の配置にピースを置いてハードドロップする。置けなければ False"""
+    choice = best_placement(engine)
+    if choice is None:
+        engine.game_over = True
+        return False
+    return engine.place(*choice)
+
+
+def play_game(seed: int, max_moves: int = 500) -> Tuple[int, int, int]:
+    """1ゲームを自動で進め、(手数, 消去ライン数, スコア) を返す"""
+    engine = TetrisEngine(seed)
+    moves = 0
+    while not engine.game_over and moves < max_moves:
+        if not play_move(engine):
+            break
+        moves += 1
+    return moves, engine.lines_cleared, engine.score
+
+
+def _play_game_args(args: Tuple[int, int]) -> Tuple[int, int, int]:
+    return play_game(*args)
+
+
+def run_selfplay(games: int, workers: int, max_moves: int = 500,
+                 seed: int = 0) -> List[Tuple[int, int, int]]:
+    """games 回の自己対戦を workers プロセスで実行する（workers=1 は同一プロセス）"""
+    jobs = [(seed + i, max_moves) for i in range(games)]
+    if workers <= 1:
+        return [_play_game_args(job) for job in jobs]
+    chunksize = max(1, games // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_play_game_args, jobs, chunksize=chunksize))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Eva Tetris self-play benchmark")
+    parser.add_argument("--games", type=int, default=40, help="ゲーム数")
+    parser.add_argument("--workers", default="1,2,4",
+                        help="比較するワーカー数（カンマ区切り）")
+    parser.add_argument("--max-moves", type=int, default=500, help="1ゲームの最大手数")
+    parser.add_argument("--seed", type=int, default=0, help="最初のゲームの乱数シード")
+    args = parser.parse_args()
+    worker_counts = [int(w) for w in args.workers.split(",") if w]
+
+    print("=== Eva Tetris Self-Play Benchmark ===")
+    print(f"Games: {args.games}, max {args.max_moves} moves/game, CPUs: {os.cpu_count()}")
+    print("")
+
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        results = run_selfplay(args.games, workers, args.max_moves, args.seed)
+        elapsed = time.perf_counter() - start
+        moves = sum(r[0] for r in results)
+        lines = sum(r[1] for r in results)
+        games_per_sec = args.games / elapsed
+        baseline = baseline or games_per_sec
+        print(f"  workers={workers:<3} {elapsed * 1000:9.1f}ms  {games_per_sec:8.2f} games/sec"
+              f"  {moves / elapsed:9.0f} moves/sec  {lines:6d} lines  "
+              f"({games_per_sec / baseline:.2f}x)")
+
+    print("")
+    print("=== Benchmark Complete ===")
+
+
+if __name__ == "__main__":
+    main()
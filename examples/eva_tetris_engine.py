@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Eva Tetris Engine - pygame非依存のヘッドレス・シミュレーションコア
+
+ボード、ピース、衝突判定、ライン消去、スコア計算のみを担当する。
+描画・入力・フレームクロックは eva_tetris.TetrisGame（pygameレンダラー）が担当し、
+CIやシミュレーションではこのエンジンを直接 step() で駆動できる。
+"""
+
+import random
+from collections.abc import Mapping
+from typing import List, Dict, Optional
+
+# 盤面サイズ
+GRID_WIDTH = 10
+GRID_HEIGHT = 20
+
+# 色の定義
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+GRAY = (128, 128, 128)
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+CYAN = (0, 255, 255)
+MAGENTA = (255, 0, 255)
+YELLOW = (255, 255, 0)
+ORANGE = (255, 165, 0)
+
+# テトリミノの形状
+SHAPES = [
+    [[1, 1, 1, 1]],  # I
+    [[1, 1, 1], [0, 1, 0]],  # T
+    [[1, 1, 1], [1, 0, 0]],  # L
+    [[1, 1, 1], [0, 0, 1]],  # J
+    [[1, 1], [1, 1]],  # O
+    [[0, 1, 1], [1, 1, 0]],  # S
+    [[1, 1, 0], [0, 1, 1]]   # Z
+]
+
+# 色のリスト
+COLORS = [CYAN, MAGENTA, ORANGE, BLUE, YELLOW, GREEN, RED]
+
+# step() に渡す入力
+ACTION_NONE = 0       # 何もしない
+ACTION_LEFT = 1       # 左移動
+ACTION_RIGHT = 2      # 右移動
+ACTION_ROTATE = 3     # 回転
+ACTION_SOFT_DROP = 4  # 1マス落下
+ACTION_HARD_DROP = 5  # ハードドロップ
+ACTION_TICK = 6       # 自動落下（重力）1回分
+ACTIONS = (ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE,
+           ACTION_SOFT_DROP, ACTION_HARD_DROP, ACTION_TICK)
+
+# 1行すべてが埋まった状態のビットマスク（bit x = 列 x）
+FULL_ROW_MASK = (1 << GRID_WIDTH) - 1
+
+
+class BoardRow(list):
+    """
+    ボードの1行。要素は従来どおり色（空きは0）で、
+    埋まっている列をビットマスク mask として同時に保持する。
+
+    board[y][x] = color の書き込みで mask も更新されるため、
+    既存コードやテストからはこれまでの list と同じように扱える。
+    """
+
+    __slots__ = ('mask',)
+
+    def __init__(self, cells=None):
+        if cells is None:
+            super().__init__([0] * GRID_WIDTH)
+            self.mask = 0
+        else:
+            super().__init__(cells)
+            self._recompute()
+
+    def _recompute(self):
+        mask = 0
+        for x, cell in enumerate(self):
+            if cell:
+                mask |= 1 << x
+        self.mask = mask
+
+    def __setitem__(self, index, value):
+        list.__setitem__(self, index, value)
+        if isinstance(index, slice):
+            self._recompute()
+            return
+        bit = 1 << (index % len(self))
+        if value:
+            self.mask |= bit
+        else:
+            self.mask &= ~bit
+
+
+class Board(list):
+    """BoardRow のリスト。行を丸ごと代入した場合も BoardRow に変換する"""
+
+    __slots__ = ()
+
+    def __init__(self, rows=None):
+        if rows is None:
+            super().__init__(BoardRow() for _ in range(GRID_HEIGHT))
+        else:
+            super().__init__(_as_row(row) for row in rows)
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [_as_row(row) for row in value]
+        else:
+            value = _as_row(value)
+        list.__setitem__(self, index, value)
+
+
+def _as_row(row) -> BoardRow:
+    return row if isinstance(row, BoardRow) else BoardRow(row)
+
+
+def _rotate_shape(shape: List[List[int]]) -> List[List[int]]:
+    """shapeを時計回りに90度回転（転置して各行を反転）"""
+    return [[shape[y][x] for y in range(len(shape)-1, -1, -1)] for x in range(len(shape[0]))]
+
+
+class Orientation:
+    """
+    ピースの1つの向き。import時（未知の形状は初回使用時）に一度だけ計算する。
+
+    shape:   従来どおりのネストしたリスト（描画・互換用）
+    cells:   埋まっているセルの (dx, dy)
+    shifted: ピースのx座標ごとに、行マスクを盤面の列位置までシフト済みのタプル
+             （4行以下の形状は4要素に0埋めし unrolled=True）
+    x_min / x_max / y_max: 壁・床に当たらないピース座標の範囲
+    """
+
+    __slots__ = ('shape', 'cells', 'shifted', 'x_min', 'x_max', 'y_max', 'empty', 'unrolled')
+
+    def __init__(self, shape: List[List[int]]):
+        self.shape = shape
+        self.cells = tuple((x, y) for y, row in enumerate(shape)
+                           for x, cell in enumerate(row) if cell)
+        self.empty = not self.cells
+        if self.empty:
+            self.shifted = ()
+            self.unrolled = False
+            self.x_min = self.x_max = self.y_max = 0
+            return
+
+        masks = [0] * len(shape)
+        for x, y in self.cells:
+            masks[y] |= 1 << x
+        left = min(x for x, _ in self.cells)
+        right = max(x for x, _ in self.cells)
+        self.x_min = -left
+        self.x_max = GRID_WIDTH - 1 - right
+        self.y_max = GRID_HEIGHT - 1 - max(y for _, y in self.cells)
+        # 4行以下なら0で埋めて4要素に揃え、衝突判定をループなしで行えるようにする
+        self.unrolled = len(masks) <= 4
+        if self.unrolled:
+            masks += [0] * (4 - len(masks))
+        self.shifted = tuple(
+            tuple(m << px if px >= 0 else m >> -px for m in masks)
+            for px in range(self.x_min, self.x_max + 1)
+        )
+
+
+# 形状（行タプルのタプル）→ (向きテーブル, その形状の向き番号)
+_ORIENTATION_INDEX: Dict[tuple, tuple] = {}
+
+
+def _shape_key(shape) -> tuple:
+    return tuple(tuple(row) for row in shape)
+
+
+def orientation_table(shape: List[List[int]]) -> tuple:
+    """
+    shapeに対応する (4方向の Orientation タプル, 向き番号) を返す。
+    SHAPESとその回転は事前登録済み。それ以外の形状は初回だけテーブルを作る。
+    """
+    key = _shape_key(shape)
+    found = _ORIENTATION_INDEX.get(key)
+    if found is not None:
+        return found
+
+    shapes = [shape if any(shape is s for s in SHAPES) else [list(row) for row in shape]]
+    for _ in range(3):
+        shapes.append(_rotate_shape(shapes[-1]))
+    table = tuple(Orientation(s) for s in shapes)
+    for rotation, rotated in enumerate(shapes):
+        _ORIENTATION_INDEX.setdefault(_shape_key(rotated), (table, rotation))
+    return table, 0
+
+
+# SHAPES[i] の4方向テーブル
+SHAPE_TABLES = tuple(orientation_table(shape)[0] for shape in SHAPES)
+
+
+class Piece(Mapping):
+    """
+    落下中のテトリミノ。形状は行列のコピーではなく向きテーブルの添字で持つため、
+    回転・移動・落下ではオブジェクトを一切生成しない。
+
+    従来の dict 表現との互換のため piece['shape'] / piece['x'] などの
+    添字アクセスと代入にも対応する。
+    """
+
+    __slots__ = ('table', 'rotation', 'x', 'y', 'color')
+    _KEYS = ('shape', 'color', 'x', 'y')
+
+    def __init__(self, table: tuple, color, x: int, y: int, rotation: int = 0):
+        self.table = table
+        self.rotation = rotation
+        self.color = color
+        self.x = x
+        self.y = y
+
+    @classmethod
+    def from_mapping(cls, piece) -> 'Piece':
+        """dict 形式のピースを Piece に変換する（Piece はそのまま返す）"""
+        if isinstance(piece, Piece):
+            return piece
+        table, rotation = orientation_table(piece['shape'])
+        return cls(table, piece['color'], piece['x'], piece['y'], rotation)
+
+    @property
+    def orientation(self) -> Orientation:
+        return self.table[self.rotation]
+
+    @property
+    def shape(self) -> List[List[int]]:
+        return self.table[self.rotation].shape
+
+    @shape.setter
+    def shape(self, shape: List[List[int]]):
+        self.table, self.rotation = orientation_table(shape)
+
+    def __getitem__(self, key):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self._KEYS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self):
+        return iter(self._KEYS)
+
+    def __len__(self):
+        return len(self._KEYS)
+
+    def __repr__(self):
+        return (f"Piece(shape={self.shape!r}, color={self.color!r}, "
+                f"x={self.x}, y={self.y})")
+
+
+class TetrisEngine:
+    """
+    Tetrisのゲームロジック（表示なし）
+
+    ピースの出現順はゲームごとの乱数 self.rng だけで決まるため、
+    同じ seed と同じ入力列を与えれば必ず同じ結果になる（リプレイ用）。
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        """ゲームの初期化（seed 省略時はランダムに選んで self.seed に残す）"""
+        self.seed = random.getrandbits(32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.reset_game()
+
+    def reset_game(self):
+        """ゲーム状態をリセット"""
+        self.board = Board()
+        self.current_piece = self.new_piece()
+        self.next_piece = self.new_piece()
+        self.game_over = False
+        self.score = 0
+        self.level = 1
+        self.lines_cleared = 0
+
+    @property
+    def current_piece(self) -> Piece:
+        """落下中のピース（dict を代入した場合は Piece に変換される）"""
+        return self._piece
+
+    @current_piece.setter
+    def current_piece(self, piece):
+        self._piece = Piece.from_mapping(piece)
+
+    def new_piece(self) -> Piece:
+        """新しいテトリミノを生成"""
+        shape_idx = self.rng.randint(0, len(SHAPES) - 1)
+        return Piece(SHAPE_TABLES[shape_idx], COLORS[shape_idx],
+                     GRID_WIDTH // 2 - len(SHAPES[shape_idx][0]) // 2, 0)
+
+    def rotate_piece(self, shape: List[List[int]]) -> List[List[int]]:
+        """ピースを回転（転置して各行を反転させることで90度回転）"""
+        return [[shape[y][x] for y in range(len(shape)-1, -1, -1)] for x in range(len(shape[0]))]
+
+    def is_collision(self, piece: Piece, x_offset: int = 0, y_offset: int = 0) -> bool:
+        """衝突チェック（シフト済みのピース行マスクと盤面の行マスクのAND）"""
+        if piece.__class__ is not Piece:
+            piece = Piece.from_mapping(piece)
+        orientation = piece.table[piece.rotation]
+        if orientation.empty:
+            return False
+        pos_x = piece.x + x_offset
+        pos_y = piece.y + y_offset
+        if pos_x < orientation.x_min or pos_x > orientation.x_max or pos_y > orientation.y_max:
+            return True
+
+        board = self.board
+        masks = orientation.shifted[pos_x - orientation.x_min]
+        if pos_y >= 0 and orientation.unrolled:
+            # テトリミノは高々4行なので展開して比較する（イテレータも生成しない）
+            m0, m1, m2, m3 = masks
+            return bool(
+                (m0 and board[pos_y].mask & m0) or
+                (m1 and board[pos_y + 1].mask & m1) or
+                (m2 and board[pos_y + 2].mask & m2) or
+                (m3 and board[pos_y + 3].mask & m3)
+            )
+
+        # 盤面より上にはみ出している場合や5行以上の形状
+        i = 0
+        rows = len(masks)
+        while i < rows:
+            mask = masks[i]
+            y = pos_y + i
+            # 盤面より上（y < 0）は壁判定のみ
+            if mask and y >= 0 and board[y].mask & mask:
+                return True
+            i += 1
+        return False
+
+    def merge_piece(self):
+        """ピースをボードに固定"""
+        piece = self._piece
+        for x, y in piece.table[piece.rotation].cells:
+            pos_x, pos_y = piece.x + x, piece.y + y
+            if 0 <= pos_y < GRID_HEIGHT and 0 <= pos_x < GRID_WIDTH:
+                self.board[pos_y][pos_x] = piece.color
+
+    def clear_lines(self):
+        """揃ったラインを消去"""
+        # 揃っていない行だけを残し、消えた行数分の空行を上に積んで一度に作り直す
+        remaining = [row for row in self.board if row.mask != FULL_ROW_MASK]
+        cleared = len(self.board) - len(remaining)
+        if cleared:
+            self.board[:] = [BoardRow() for _ in range(cleared)] + remaining
+
+        # スコア計算
+        if cleared:
+            self.lines_cleared += cleared
+            self.score += [100, 300, 500, 800][min(cleared-1, 3)] * self.level
+            self.level = self.lines_cleared // 10 + 1
+
+    def get_drop_interval(self) -> int:
+        """Codex推奨: レベルに応じた落下速度を動的に計算"""
+        return max(100, 1000 - (self.level - 1) * 100)
+
+    def update(self):
+        """ゲーム状態を更新"""
+        if self.game_over:
+            return
+
+        # ピースを下に移動
+        piece = self._piece
+        if not self.is_collision(piece, 0, 1):
+            piece.y += 1
+        else:
+            # ピースを固定して新しいピースを生成
+            self.merge_piece()
+            self.clear_lines()
+
+            self.current_piece = self.next_piece
+            self.next_piece = self.new_piece()
+
+            # 新しいピースの位置に衝突があればゲームオーバー
+            if self.is_collision(self._piece):
+                self.game_over = True
+
+    def move(self, dx: int):
+        """ピースを横に移動"""
+        piece = self._piece
+        if not self.is_collision(piece, dx, 0):
+            piece.x += dx
+
+    def rotate(self):
+        """ピースを回転（向きテーブルの添字を進めるだけ）"""
+        piece = self._piece
+        original = piece.rotation
+        piece.rotation = (original + 1) & 3
+        if self.is_collision(piece):
+            piece.rotation = original
+
+    def soft_drop(self):
+        """ピースを1マス下に移動（着地していれば何もしない）"""
+        piece = self._piece
+        if not self.is_collision(piece, 0, 1):
+            piece.y += 1
+
+    def hard_drop(self):
+        """
+        Codex推奨修正: ハードドロップ時のブロック上書きバグ修正
+
+        元のバグ: 衝突するまで移動した後、そのままupdate()を呼ぶと
+        ピースがスタックに重なった状態でmerge_piece()が実行され、
+        既存のブロックを上書きしてしまう。
+
+        修正: 衝突する直前（1行上）で停止してからupdate()を呼ぶ。
+        """
+        # 衝突するまで下に移動
+        piece = self._piece
+        while not self.is_collision(piece, 0, 1):
+            piece.y += 1
+        # この時点でcurrent_piece['y']は「次に移動すると衝突する」位置
+        # つまり正しい着地位置なので、そのままupdate()を呼んでOK
+        self.update()
+
+    def place(self, rotation: int, x: int) -> bool:
+        """
+        ピースを指定の向き・x座標に置き直してハードドロップする（AI用）。
+        その位置で衝突する場合は何もせず False を返す。
+        """
+        piece = self._piece
+        original = (piece.rotation, piece.x)
+        piece.rotation, piece.x = rotation & 3, x
+        if self.is_collision(piece):
+            piece.rotation, piece.x = original
+            return False
+        self.hard_drop()
+        return True
+
+    def step(self, action: int) -> bool:
+        """入力を1つ適用する。ゲームオーバーなら True を返す"""
+        if self.game_over:
+            return True
+        if action == ACTION_LEFT:
+            self.move(-1)
+        elif action == ACTION_RIGHT:
+            self.move(1)
+        elif action == ACTION_ROTATE:
+            self.rotate()
+        elif action == ACTION_SOFT_DROP:
+            self.soft_drop()
+        elif action == ACTION_HARD_DROP:
+            self.hard_drop()
+        elif action == ACTION_TICK:
+            self.update()
+        return self.game_over
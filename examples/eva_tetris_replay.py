@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Eva Tetris リプレイ - 入力の記録と再生
+
+ゲームごとの乱数シードと (フレーム番号, 入力) の列だけを小さなバイナリに記録し、
+フレームクロックなしで最速で再生して最終盤面・スコアのハッシュを照合する。
+ゲームロジックや描画の性能回帰テスト用に、同じ負荷を何度でも再現できる。
+
+ファイル形式:
+    b"EVTR" + バージョン(1バイト) + varint(シード)
+    イベント: varint((前イベントからのフレーム差 << 3) | 種類)
+        種類 1..6: ACTION_LEFT .. ACTION_TICK
+        種類 0:    制御イベント。続く1バイトで
+                   0 = 終端（続いて最終状態の SHA-256 32バイト）
+                   1 = リセット
+                   2 = 配置（varint 向き, zigzag varint x）
+
+Usage:
+    python3 eva_tetris_replay.py record OUT [--seed N] [--frames N]
+    python3 eva_tetris_replay.py replay FILE [--render] [--repeat N]
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+from typing import BinaryIO, Iterator, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from eva_tetris_engine import TetrisEngine, ACTION_LEFT, ACTION_TICK, ACTIONS
+
+MAGIC = b"EVTR"
+VERSION = 1
+
+KIND_CONTROL = 0
+CONTROL_END = 0
+CONTROL_RESET = 1
+CONTROL_PLACE = 2
+
+# 再生時のイベント種別（記録ファイルの種類とは別に、呼び出し側で扱いやすい形にする）
+EVENT_RESET = "reset"
+EVENT_PLACE = "place"
+
+
+class ReplayError(Exception):
+    """記録ファイルが壊れている・形式が違う"""
+
+
+def encode_varint(value: int, out: bytearray):
+    """非負整数を LEB128 形式で out に追加する"""
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """data[pos:] から varint を1つ読み、(値, 次の位置) を返す"""
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError("truncated varint")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def state_hash(engine: TetrisEngine) -> bytes:
+    """盤面・スコア・レベル・消去ライン数・ゲームオーバーの SHA-256"""
+    digest = hashlib.sha256()
+    for row in engine.board:
+        digest.update(repr(tuple(row)).encode())
+    digest.update(repr((engine.score, engine.level, engine.lines_cleared,
+                        engine.game_over)).encode())
+    return digest.digest()
+
+
+class Recorder:
+    """
+    入力をメモリ上に varint で書きため、close() でファイルに書き出す。
+
+    記録するのはゲーム状態を変える入力だけ:
+    step() に渡したアクション、リセット、AIの配置。
+    """
+
+    def __init__(self, path: str, seed: int):
+        self.path = path
+        self.buffer = bytearray(MAGIC)
+        self.buffer.append(VERSION)
+        encode_varint(seed, self.buffer)
+        self.last_frame = 0
+        self.events = 0
+
+    def _event(self, frame: int, kind: int):
+        delta = frame - self.last_frame
+        if delta < 0:
+            raise ValueError("frames must not go backwards")
+        encode_varint((delta << 3) | kind, self.buffer)
+        self.last_frame = frame
+        self.events += 1
+
+    def action(self, frame: int, action: int):
+        """step(action) を記録する（ACTION_NONE は状態を変えないので記録しない）"""
+        if ACTION_LEFT <= action <= ACTION_TICK:
+            self._event(frame, action)
+
+    def reset(self, frame: int):
+        self._event(frame, KIND_CONTROL)
+        self.buffer.append(CONTROL_RESET)
+
+    def place(self, frame: int, rotation: int, x: int):
+        self._event(frame, KIND_CONTROL)
+        self.buffer.append(CONTROL_PLACE)
+        encode_varint(rotation, self.buffer)
+        encode_varint(_zigzag(x), self.buffer)
+
+    def close(self, engine: TetrisEngine):
+        """終端と最終状態のハッシュを付けて書き出す"""
+        self._event(self.last_frame, KIND_CONTROL)
+        self.buffer.append(CONTROL_END)
+        self.buffer += state_hash(engine)
+        with open(self.path, "wb") as f:
+            f.write(self.buffer)
+
+
+class Recording:
+    """読み込んだ記録ファイル"""
+
+    def __init__(self, data: bytes):
+        if data[:4] != MAGIC:
+            raise ReplayError("not an Eva Tetris recording")
+        if len(data) < 5 or data[4] != VERSION:
+            raise ReplayError(f"unsupported recording version: {data[4:5]!r}")
+        self.data = data
+        self.seed, self.events_start = decode_varint(data, 5)
+        self.expected_hash: Optional[bytes] = None
+
+    @classmethod
+    def load(cls, path: str) -> 'Recording':
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def events(self) -> Iterator[tuple]:
+        """(フレーム番号, アクション or EVENT_RESET or EVENT_PLACE, 引数...) を順に返す"""
+        data = self.data
+        pos = self.events_start
+        frame = 0
+        while True:
+            code, pos = decode_varint(data, pos)
+            frame += code >> 3
+            kind = code & 7
+            if kind != KIND_CONTROL:
+                if kind > ACTION_TICK:
+                    raise ReplayError(f"unknown action {kind} at offset {pos}")
+                yield frame, kind
+                continue
+
+            if pos >= len(data):
+                raise ReplayError("truncated control event")
+            control = data[pos]
+            pos += 1
+            if control == CONTROL_END:
+                self.expected_hash = bytes(data[pos:pos + 32])
+                if len(self.expected_hash) != 32:
+                    raise ReplayError("truncated final hash")
+                return
+            if control == CONTROL_RESET:
+                yield frame, EVENT_RESET
+            elif control == CONTROL_PLACE:
+                rotation, pos = decode_varint(data, pos)
+                x, pos = decode_varint(data, pos)
+                yield frame, EVENT_PLACE, rotation, _unzigzag(x)
+            else:
+                raise ReplayError(f"unknown control event {control} at offset {pos}")
+
+
+def replay(recording: Recording, game: Optional[TetrisEngine] = None,
+           render=None) -> Tuple[TetrisEngine, int, bool]:
+    """
+    記録をフレームクロックなしで最後まで再生する。
+
+    Args:
+        recording: 再生する記録
+        game: 再生に使うエンジン（省略時は記録のシードで TetrisEngine を作る）
+        render: フレームが進むたびに呼ぶ描画関数（描画込みの計測用）
+
+    Returns:
+        (エンジン, フレーム数, 最終状態のハッシュが記録と一致したか)
+    """
+    if game is None:
+        game = TetrisEngine(recording.seed)
+    step = game.step
+    frame = 0
+    for event in recording.events():
+        if render is not None and event[0] != frame:
+            render()
+        frame = event[0]
+        kind = event[1]
+        if kind == EVENT_RESET:
+            game.reset_game()
+        elif kind == EVENT_PLACE:
+            game.place(event[2], event[3])
+        else:
+            step(kind)
+    if render is not None:
+        render()
+    return game, frame, state_hash(game) == recording.expected_hash
+
+
+def record_random_session(path: str, seed: int, frames: int) -> Recorder:
+    """
+    人の操作を模した入力（数フレームに1回のキー入力と30フレームごとの自動落下）で
+    frames フレーム分を記録する。ゲームオーバーになったらリセットして続ける。
+    """
+    engine = TetrisEngine(seed)
+    recorder = Recorder(path, engine.seed)
+    rng = random.Random(seed)
+    keys = [a for a in ACTIONS if ACTION_LEFT <= a < ACTION_TICK]
+    for frame in range(frames):
+        if engine.game_over:
+            engine.reset_game()
+            recorder.reset(frame)
+            continue
+        if rng.random() < 0.15:
+            action = rng.choice(keys)
+            engine.step(action)
+            recorder.action(frame, action)
+        if frame % 30 == 29:
+            engine.step(ACTION_TICK)
+            recorder.action(frame, ACTION_TICK)
+    recorder.close(engine)
+    return recorder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Eva Tetris input recording / replay")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="ランダム入力のセッションを記録する")
+    rec.add_argument("output")
+    rec.add_argument("--seed", type=int, default=1)
+    rec.add_argument("--frames", type=int, default=216000, help="記録するフレーム数（既定: 60fpsで1時間）")
+
+    play = sub.add_parser("replay", help="記録を最速で再生してハッシュを照合する")
+    play.add_argument("recording")
+    play.add_argument("--render", action="store_true", help="pygameの描画（差分描画）も含めて再生する")
+    play.add_argument("--repeat", type=int, default=1, help="繰り返し回数（最速値を表示）")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        recorder = record_random_session(args.output, args.seed, args.frames)
+        size = os.path.getsize(args.output)
+        print(f"Recorded {recorder.events} events over {args.frames} frames "
+              f"to {args.output} ({size} bytes, {size / max(recorder.events, 1):.2f} bytes/event)")
+        return 0
+
+    recording = Recording.load(args.recording)
+    best = None
+    ok = True
+    for _ in range(args.repeat):
+        game = render = None
+        if args.render:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            import pygame
+            from eva_tetris import TetrisGame
+            game = TetrisGame(seed=recording.seed)
+
+            def render():
+                dirty = game.render()
+                if dirty:
+                    pygame.display.update(dirty)
+
+        start = time.perf_counter()
+        engine, frames, matched = replay(recording, game, render)
+        elapsed = time.perf_counter() - start
+        ok = ok and matched
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f"Replayed {frames} frames in {best * 1000:.1f}ms "
+          f"({frames / best:,.0f} frames/sec), score={engine.score} lines={engine.lines_cleared}")
+    print(f"Final state hash: {'OK' if ok else 'MISMATCH'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
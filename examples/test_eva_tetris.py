@@ -13,7 +13,7 @@ import pygame
 
 # eva_tetris.pyをインポート
 sys.path.insert(0, '.')
-from eva_tetris import TetrisGame, SHAPES, COLORS, GRID_WIDTH, GRID_HEIGHT
+from eva_tetris import TetrisGame, SHAPES, COLORS, GRID_WIDTH, GRID_HEIGHT, FrameStats
 
 
 class TestTetrisGameInitialization(unittest.TestCase):
@@ -268,6 +268,63 @@ class TestGameOverCondition(unittest.TestCase):
         self.assertTrue(self.game.game_over)
 
 
+class TestDirtyRendering(unittest.TestCase):
+    """差分描画のテスト"""
+    
+    def setUp(self):
+        pygame.init()
+        self.game = TetrisGame()
+    
+    def tearDown(self):
+        pygame.quit()
+    
+    def full_redraw(self):
+        """画面全体を描き直した結果のピクセル列"""
+        self.game.invalidate()
+        self.game.render()
+        return pygame.image.tostring(self.game.screen, "RGB")
+    
+    def test_first_frame_updates_whole_screen(self):
+        """最初のフレームは画面全体を更新するか"""
+        dirty = self.game.render()
+        self.assertEqual(dirty, [self.game.screen.get_rect()])
+    
+    def test_idle_frame_updates_nothing(self):
+        """何も変わらないフレームでは何も更新しないか"""
+        self.game.render()
+        self.assertEqual(self.game.render(), [])
+    
+    def test_move_updates_only_changed_cells(self):
+        """移動したときは変化したセルだけを更新するか"""
+        self.game.current_piece = {'shape': SHAPES[4], 'color': COLORS[4], 'x': 4, 'y': 5}
+        self.game.render()
+        self.game.move(1)
+        dirty = self.game.render()
+        # Oミノが1マス右へ: 左列2セルが消え、右列2セルが増える
+        self.assertEqual(len(dirty), 4)
+    
+    def test_incremental_frames_match_full_redraw(self):
+        """差分描画を重ねた画面が、全体を描き直した画面と一致するか"""
+        import random
+        rng = random.Random(7)
+        self.game.render()
+        for _ in range(300):
+            self.game.step(rng.randrange(7))
+            self.game.render()
+            if self.game.game_over:
+                break
+        incremental = pygame.image.tostring(self.game.screen, "RGB")
+        self.assertEqual(incremental, self.full_redraw())
+    
+    def test_frame_stats_percentiles(self):
+        """フレーム時間の p50/p99 が計算できるか"""
+        stats = FrameStats(window=100)
+        for ms in range(1, 101):
+            stats.add(float(ms))
+        self.assertEqual(stats.percentile(50), 51.0)
+        self.assertEqual(stats.percentile(99), 100.0)
+
+
 def run_tests():
     """テストスイート実行"""
     # テストスイートを作成
@@ -280,6 +337,7 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestCodexRecommendations))
     suite.addTests(loader.loadTestsFromTestCase(TestLineClearingAndScoring))
     suite.addTests(loader.loadTestsFromTestCase(TestGameOverCondition))
+    suite.addTests(loader.loadTestsFromTestCase(TestDirtyRendering))
     
     # テスト実行
     runner = unittest.TextTestRunner(verbosity=2)
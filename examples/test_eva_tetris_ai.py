@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Eva Tetris AI テストスイート
+
+一括評価の着地位置・消去ライン数・盤面特徴量が、
+エンジンで1候補ずつハードドロップした結果と一致するかを確認する。
+"""
+
+import random
+import sys
+import unittest
+
+sys.path.insert(0, '.')
+from eva_tetris_engine import TetrisEngine, Board, SHAPES, COLORS, GRID_WIDTH, GRID_HEIGHT
+from eva_tetris_ai import (
+    board_array, evaluate_placements, placement_set, best_placement,
+    play_game, run_selfplay,
+)
+
+
+def features(board):
+    """盤面の (高さの合計, 穴の数, 凹凸) を素直なPythonで計算する"""
+    heights = []
+    holes = 0
+    for x in range(GRID_WIDTH):
+        column = [bool(board[y][x]) for y in range(GRID_HEIGHT)]
+        top = column.index(True) if any(column) else GRID_HEIGHT
+        heights.append(GRID_HEIGHT - top)
+        holes += sum(1 for y in range(top, GRID_HEIGHT) if not column[y])
+    bumpiness = sum(abs(a - b) for a, b in zip(heights, heights[1:]))
+    return sum(heights), holes, bumpiness
+
+
+def random_engine(rng):
+    """ランダムに積まれた盤面（揃いかけの行を含む）を持つエンジン"""
+    engine = TetrisEngine()
+    depth = rng.randrange(0, 12)
+    for y in range(GRID_HEIGHT - depth, GRID_HEIGHT):
+        gap = rng.randrange(GRID_WIDTH)
+        for x in range(GRID_WIDTH):
+            if x != gap and rng.random() < 0.85:
+                engine.board[y][x] = COLORS[0]
+    kind = rng.randrange(len(SHAPES))
+    engine.current_piece = {'shape': SHAPES[kind], 'color': COLORS[kind], 'x': 3, 'y': 0}
+    return engine
+
+
+class TestBatchEvaluation(unittest.TestCase):
+    """一括評価と逐次ハードドロップの差分テスト"""
+
+    def test_matches_sequential_hard_drop(self):
+        rng = random.Random(99)
+        checked = 0
+        for _ in range(60):
+            engine = random_engine(rng)
+            piece = engine.current_piece
+            placements = placement_set(piece.table)
+            result = evaluate_placements(board_array(engine), placements, piece.y)
+
+            for i in range(len(placements)):
+                trial = TetrisEngine()
+                trial.board = Board([list(row) for row in engine.board])
+                trial.current_piece = {'shape': piece.table[int(placements.rotations[i])].shape,
+                                       'color': piece.color, 'x': int(placements.xs[i]), 'y': piece.y}
+                valid = not trial.is_collision(trial.current_piece)
+                self.assertEqual(bool(result['valid'][i]), valid)
+                if not valid:
+                    continue
+                trial.hard_drop()
+                self.assertEqual(int(result['lines'][i]), trial.lines_cleared)
+                self.assertEqual((int(result['height'][i]), int(result['holes'][i]),
+                                  int(result['bumpiness'][i])), features(trial.board))
+                checked += 1
+        self.assertGreater(checked, 500)
+
+    def test_overhang_below_start_position(self):
+        """ピースがオーバーハングの下から始まる候補もエンジンと同じく有効か"""
+        engine = TetrisEngine()
+        for x in range(GRID_WIDTH):
+            if x not in (3, 4, 5):
+                engine.board[4][x] = COLORS[0]
+        engine.board[GRID_HEIGHT - 1][0] = COLORS[0]
+        piece = engine.current_piece
+        piece.y = 8
+        placements = placement_set(piece.table)
+        result = evaluate_placements(board_array(engine), placements, piece.y)
+
+        checked = 0
+        for i in range(len(placements)):
+            trial = TetrisEngine()
+            trial.board = Board([list(row) for row in engine.board])
+            trial.current_piece = {'shape': piece.table[int(placements.rotations[i])].shape,
+                                   'color': piece.color, 'x': int(placements.xs[i]), 'y': piece.y}
+            self.assertTrue(result['valid'][i])
+            trial.hard_drop()
+            self.assertEqual(int(result['landing'][i]) + placements.cell_dy[i].min(),
+                             min(y for y in range(GRID_HEIGHT) if trial.board[y] != engine.board[y]))
+            self.assertEqual(int(result['holes'][i]), features(trial.board)[1])
+            checked += 1
+        self.assertEqual(checked, len(placements))
+
+    def test_no_valid_placement(self):
+        """置ける場所がなければ None を返すか"""
+        engine = TetrisEngine()
+        for x in range(GRID_WIDTH):
+            engine.board[0][x] = COLORS[0]
+        self.assertIsNone(best_placement(engine))
+
+
+class TestSelfPlay(unittest.TestCase):
+    """自己対戦のテスト"""
+
+    def test_play_game_is_deterministic_and_clears_lines(self):
+        first = play_game(3, max_moves=200)
+        self.assertEqual(first, play_game(3, max_moves=200))
+        moves, lines, score = first
+        self.assertEqual(moves, 200)
+        self.assertGreater(lines, 50)
+        self.assertGreater(score, 0)
+
+    def test_process_pool_matches_inline(self):
+        inline = run_selfplay(4, workers=1, max_moves=50)
+        pooled = run_selfplay(4, workers=2, max_moves=50)
+        self.assertEqual(inline, pooled)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
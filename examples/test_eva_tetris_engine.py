@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Eva Tetris Engine テストスイート
+
+pygameを一切読み込まずにヘッドレスエンジンを検証する。
+"""
+
+import os
+import random
+import subprocess
+import sys
+import unittest
+
+sys.path.insert(0, '.')
+from eva_tetris_engine import (
+    TetrisEngine, SHAPES, COLORS, GRID_WIDTH, GRID_HEIGHT, ACTIONS,
+    ACTION_NONE, ACTION_LEFT, ACTION_RIGHT, ACTION_ROTATE,
+    ACTION_SOFT_DROP, ACTION_HARD_DROP, ACTION_TICK, FULL_ROW_MASK,
+    Piece, SHAPE_TABLES,
+)
+
+
+class LegacyTetris:
+    """差分テスト用の参照実装（list[list] ボードの旧ロジックそのまま）"""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.board = [[0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+        self.current_piece = self.new_piece()
+        self.next_piece = self.new_piece()
+        self.game_over = False
+        self.score = 0
+        self.level = 1
+        self.lines_cleared = 0
+
+    def new_piece(self):
+        shape_idx = self.rng.randint(0, len(SHAPES) - 1)
+        return {
+            'shape': SHAPES[shape_idx],
+            'color': COLORS[shape_idx],
+            'x': GRID_WIDTH // 2 - len(SHAPES[shape_idx][0]) // 2,
+            'y': 0
+        }
+
+    def is_collision(self, piece, x_offset=0, y_offset=0):
+        for y, row in enumerate(piece['shape']):
+            for x, cell in enumerate(row):
+                if cell:
+                    pos_x, pos_y = piece['x'] + x + x_offset, piece['y'] + y + y_offset
+                    if (pos_x < 0 or pos_x >= GRID_WIDTH or
+                        pos_y >= GRID_HEIGHT or
+                        (pos_y >= 0 and self.board[pos_y][pos_x])):
+                        return True
+        return False
+
+    def merge_piece(self):
+        for y, row in enumerate(self.current_piece['shape']):
+            for x, cell in enumerate(row):
+                if cell:
+                    pos_x, pos_y = self.current_piece['x'] + x, self.current_piece['y'] + y
+                    if 0 <= pos_y < GRID_HEIGHT and 0 <= pos_x < GRID_WIDTH:
+                        self.board[pos_y][pos_x] = self.current_piece['color']
+
+    def clear_lines(self):
+        lines_to_clear = [y for y in range(GRID_HEIGHT) if all(self.board[y])]
+        for line in lines_to_clear:
+            del self.board[line]
+            self.board.insert(0, [0 for _ in range(GRID_WIDTH)])
+        if lines_to_clear:
+            self.lines_cleared += len(lines_to_clear)
+            self.score += [100, 300, 500, 800][min(len(lines_to_clear)-1, 3)] * self.level
+            self.level = self.lines_cleared // 10 + 1
+
+    def update(self):
+        if self.game_over:
+            return
+        if not self.is_collision(self.current_piece, 0, 1):
+            self.current_piece['y'] += 1
+        else:
+            self.merge_piece()
+            self.clear_lines()
+            self.current_piece = self.next_piece
+            self.next_piece = self.new_piece()
+            if self.is_collision(self.current_piece):
+                self.game_over = True
+
+    def step(self, action):
+        if self.game_over:
+            return True
+        piece = self.current_piece
+        if action == ACTION_LEFT and not self.is_collision(piece, -1, 0):
+            piece['x'] -= 1
+        elif action == ACTION_RIGHT and not self.is_collision(piece, 1, 0):
+            piece['x'] += 1
+        elif action == ACTION_ROTATE:
+            original = piece['shape']
+            piece['shape'] = [[original[y][x] for y in range(len(original)-1, -1, -1)]
+                              for x in range(len(original[0]))]
+            if self.is_collision(piece):
+                piece['shape'] = original
+        elif action == ACTION_SOFT_DROP and not self.is_collision(piece, 0, 1):
+            piece['y'] += 1
+        elif action == ACTION_HARD_DROP:
+            while not self.is_collision(piece, 0, 1):
+                piece['y'] += 1
+            self.update()
+        elif action == ACTION_TICK:
+            self.update()
+        return self.game_over
+
+
+def snapshot(game):
+    """比較用にゲーム状態を素のデータへ変換する"""
+    piece = game.current_piece
+    return ([list(row) for row in game.board], game.score, game.level,
+            game.lines_cleared, game.game_over,
+            [list(r) for r in piece['shape']], piece['x'], piece['y'], piece['color'])
+
+
+def play_recorded(factory, seed, garbage_rows=0, max_steps=3000):
+    """同じ乱数列でゲームを進め、各ステップのスナップショットを返す"""
+    game = factory(seed)
+    rng = random.Random(seed)
+    for y in range(GRID_HEIGHT - garbage_rows, GRID_HEIGHT):
+        for x in range(GRID_WIDTH):
+            if rng.random() < 0.8:
+                game.board[y][x] = COLORS[rng.randrange(len(COLORS))]
+    states = [snapshot(game)]
+    for _ in range(max_steps):
+        done = game.step(rng.choice(ACTIONS))
+        states.append(snapshot(game))
+        if done:
+            break
+    return states
+
+
+class TestHeadlessEngine(unittest.TestCase):
+    """ヘッドレスエンジンの基本動作"""
+
+    def test_does_not_import_pygame(self):
+        """エンジンのインポートでpygameが読み込まれないか"""
+        code = "import sys, eva_tetris_engine; sys.exit('pygame' in sys.modules)"
+        result = subprocess.run([sys.executable, '-c', code],
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.returncode, 0)
+
+    def test_initial_state(self):
+        """初期状態が正しいか"""
+        engine = TetrisEngine()
+        self.assertEqual(len(engine.board), GRID_HEIGHT)
+        self.assertEqual(len(engine.board[0]), GRID_WIDTH)
+        self.assertEqual(engine.score, 0)
+        self.assertEqual(engine.level, 1)
+        self.assertFalse(engine.game_over)
+        self.assertIn(engine.current_piece['shape'], SHAPES)
+        self.assertIn(engine.current_piece['color'], COLORS)
+
+    def test_step_moves_piece(self):
+        """step() で左右移動・落下できるか"""
+        engine = TetrisEngine()
+        x, y = engine.current_piece['x'], engine.current_piece['y']
+        engine.step(ACTION_LEFT)
+        self.assertEqual(engine.current_piece['x'], x - 1)
+        engine.step(ACTION_RIGHT)
+        engine.step(ACTION_RIGHT)
+        self.assertEqual(engine.current_piece['x'], x + 1)
+        engine.step(ACTION_SOFT_DROP)
+        engine.step(ACTION_TICK)
+        self.assertEqual(engine.current_piece['y'], y + 2)
+        engine.step(ACTION_NONE)
+        self.assertEqual(engine.current_piece['y'], y + 2)
+
+    def test_step_rotate(self):
+        """step() で回転できるか"""
+        engine = TetrisEngine()
+        engine.current_piece = {
+            'shape': SHAPES[0], 'color': COLORS[0], 'x': 3, 'y': 5
+        }
+        engine.step(ACTION_ROTATE)
+        self.assertEqual(engine.current_piece['shape'], [[1], [1], [1], [1]])
+
+    def test_hard_drop_locks_piece(self):
+        """ハードドロップでピースが底に固定されるか"""
+        engine = TetrisEngine()
+        engine.current_piece = {
+            'shape': SHAPES[4], 'color': COLORS[4], 'x': 0, 'y': 0
+        }
+        engine.step(ACTION_HARD_DROP)
+        self.assertEqual(engine.board[GRID_HEIGHT - 1][0], COLORS[4])
+        self.assertEqual(engine.board[GRID_HEIGHT - 2][1], COLORS[4])
+
+    def test_step_after_game_over(self):
+        """ゲームオーバー後の step() は何もせず True を返すか"""
+        engine = TetrisEngine()
+        engine.game_over = True
+        piece = dict(engine.current_piece)
+        self.assertTrue(engine.step(ACTION_HARD_DROP))
+        self.assertEqual(engine.current_piece, piece)
+
+    def test_random_games_terminate(self):
+        """ランダム入力でゲームが最後まで進行するか"""
+        rng = random.Random(1234)
+        random.seed(1234)
+        for _ in range(20):
+            engine = TetrisEngine()
+            for _ in range(100000):
+                if engine.step(rng.choice(ACTIONS)):
+                    break
+            self.assertTrue(engine.game_over)
+            for row in engine.board:
+                self.assertEqual(len(row), GRID_WIDTH)
+
+
+class TestBitboardMatchesLegacy(unittest.TestCase):
+    """ビットボード実装が旧 list[list] 実装と完全に一致するかの差分テスト"""
+
+    def test_random_games_match(self):
+        for seed in range(40):
+            with self.subTest(seed=seed):
+                self.assertEqual(play_recorded(TetrisEngine, seed),
+                                 play_recorded(LegacyTetris, seed))
+
+    def test_garbage_boards_match(self):
+        """穴あき・揃った行を含む盤面からでも一致するか"""
+        for seed in range(40):
+            with self.subTest(seed=seed):
+                rows = seed % 12
+                self.assertEqual(play_recorded(TetrisEngine, seed, garbage_rows=rows),
+                                 play_recorded(LegacyTetris, seed, garbage_rows=rows))
+
+    def test_row_masks_follow_cell_writes(self):
+        """board[y][x] への書き込みと行の置き換えでマスクが追従するか"""
+        engine = TetrisEngine()
+        engine.board[3][0] = COLORS[1]
+        engine.board[3][-1] = COLORS[2]
+        self.assertEqual(engine.board[3].mask, 1 | (1 << (GRID_WIDTH - 1)))
+        engine.board[3][0] = 0
+        self.assertEqual(engine.board[3].mask, 1 << (GRID_WIDTH - 1))
+        engine.board[4] = [COLORS[0]] * GRID_WIDTH
+        self.assertEqual(engine.board[4].mask, FULL_ROW_MASK)
+        engine.clear_lines()
+        self.assertEqual(engine.lines_cleared, 1)
+        self.assertEqual(engine.board[0].mask, 0)
+        self.assertEqual(engine.board[4].mask, 1 << (GRID_WIDTH - 1))
+
+
+class TestOrientationTables(unittest.TestCase):
+    """向きテーブルと Piece のテスト"""
+
+    def test_tables_match_rotate_piece(self):
+        """事前計算した向きが rotate_piece の結果と一致するか"""
+        engine = TetrisEngine()
+        for shape, table in zip(SHAPES, SHAPE_TABLES):
+            self.assertIs(table[0].shape, shape)
+            expected = shape
+            for orientation in table:
+                self.assertEqual(orientation.shape, expected)
+                expected = engine.rotate_piece(expected)
+            self.assertEqual(expected, shape)
+
+    def test_piece_behaves_like_dict(self):
+        """Piece が従来の dict と同じキーで読み書きできるか"""
+        engine = TetrisEngine()
+        piece = engine.new_piece()
+        self.assertIsInstance(piece, Piece)
+        self.assertEqual(set(piece), {'shape', 'color', 'x', 'y'})
+        piece['y'] += 2
+        self.assertEqual(piece.y, 2)
+        piece['shape'] = [[1], [1], [1], [1]]
+        self.assertIs(piece.table, SHAPE_TABLES[0])
+        self.assertEqual(piece.rotation, 1)
+        with self.assertRaises(KeyError):
+            piece['rotation']
+
+    def test_dict_assignment_converts_to_piece(self):
+        """current_piece に dict を代入すると Piece になるか（未知の形状も含む）"""
+        engine = TetrisEngine()
+        engine.current_piece = {'shape': [[1, 0, 1]], 'color': COLORS[1], 'x': 2, 'y': 3}
+        piece = engine.current_piece
+        self.assertIsInstance(piece, Piece)
+        self.assertEqual(piece['shape'], [[1, 0, 1]])
+        engine.rotate()
+        self.assertEqual(piece['shape'], [[1], [0], [1]])
+        self.assertTrue(engine.is_collision({'shape': [[1]], 'color': 0, 'x': -1, 'y': 0}))
+
+    def test_rotate_and_move_do_not_allocate_shapes(self):
+        """回転・移動でピースや形状オブジェクトが作り直されないか"""
+        engine = TetrisEngine()
+        engine.current_piece = {'shape': SHAPES[1], 'color': COLORS[1], 'x': 4, 'y': 5}
+        piece = engine.current_piece
+        shapes = {id(o.shape) for o in piece.table}
+        for _ in range(8):
+            engine.rotate()
+            engine.move(1)
+            engine.move(-1)
+            self.assertIs(engine.current_piece, piece)
+            self.assertIn(id(piece['shape']), shapes)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Eva Tetris リプレイ テストスイート
+"""
+
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, '.')
+from eva_tetris_engine import TetrisEngine, ACTIONS, ACTION_TICK
+from eva_tetris_replay import (
+    Recorder, Recording, ReplayError, replay, state_hash, record_random_session,
+    encode_varint, decode_varint,
+)
+
+
+class TestSeededEngine(unittest.TestCase):
+    """ゲームごとの乱数シードのテスト"""
+
+    def test_same_seed_same_pieces(self):
+        a, b = TetrisEngine(5), TetrisEngine(5)
+        for _ in range(50):
+            self.assertEqual(a.new_piece(), b.new_piece())
+
+    def test_global_random_does_not_affect_seeded_engine(self):
+        a = TetrisEngine(5)
+        random.seed(0)
+        b = TetrisEngine(5)
+        random.random()
+        self.assertEqual([a.new_piece()['shape'] for _ in range(20)],
+                         [b.new_piece()['shape'] for _ in range(20)])
+
+
+class TestReplay(unittest.TestCase):
+    """記録と再生のテスト"""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".evtr")
+        os.close(handle)
+
+    def tearDown(self):
+        os.unlink(self.path)
+
+    def test_varint_round_trip(self):
+        out = bytearray()
+        values = [0, 1, 127, 128, 300, 2 ** 32 - 1, 2 ** 40]
+        for value in values:
+            encode_varint(value, out)
+        pos = 0
+        for value in values:
+            decoded, pos = decode_varint(bytes(out), pos)
+            self.assertEqual(decoded, value)
+        self.assertEqual(pos, len(out))
+
+    def test_recorded_session_replays_to_same_state(self):
+        recorder = record_random_session(self.path, seed=11, frames=20000)
+        recording = Recording.load(self.path)
+        engine, frames, matched = replay(recording)
+        self.assertTrue(matched)
+        self.assertGreater(engine.score + engine.lines_cleared + frames, 0)
+        # 入力1件あたり2バイト未満に収まること
+        self.assertLess(os.path.getsize(self.path), recorder.events * 2)
+
+    def test_resets_and_placements_replay(self):
+        engine = TetrisEngine(3)
+        recorder = Recorder(self.path, engine.seed)
+        rng = random.Random(3)
+        for frame in range(0, 3000, 3):
+            if frame % 900 == 0:
+                engine.reset_game()
+                recorder.reset(frame)
+            elif frame % 7 == 0:
+                rotation, x = rng.randrange(4), rng.randrange(-2, 10)
+                engine.place(rotation, x)
+                recorder.place(frame, rotation, x)
+            else:
+                action = rng.choice(ACTIONS)
+                engine.step(action)
+                recorder.action(frame, action)
+        recorder.close(engine)
+
+        replayed, _, matched = replay(Recording.load(self.path))
+        self.assertTrue(matched)
+        self.assertEqual(state_hash(replayed), state_hash(engine))
+
+    def test_hash_mismatch_detected(self):
+        engine = TetrisEngine(1)
+        recorder = Recorder(self.path, engine.seed)
+        recorder.action(10, ACTION_TICK)
+        engine.step(ACTION_TICK)
+        recorder.close(engine)
+        with open(self.path, "rb") as f:
+            data = bytearray(f.read())
+        data[-1] ^= 0xFF
+        _, _, matched = replay(Recording(bytes(data)))
+        self.assertFalse(matched)
+
+    def test_rejects_foreign_file(self):
+        with self.assertRaises(ReplayError):
+            Recording(b"NOPE\x01\x00")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
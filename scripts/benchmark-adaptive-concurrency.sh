@@ -0,0 +1,107 @@
+#!/usr/bin/env bash
+# Adaptive Concurrency Benchmark
+# Purpose: Compare fixed concurrency with the latency-driven per-AI limiter of
+#          scripts/lib/adaptive-concurrency.sh against a load-sensitive stub AI
+#
+# Usage:
+#   bash scripts/benchmark-adaptive-concurrency.sh [TASKS] [BASE_MS] [KNEE] [RATE_LIMIT]
+#
+# The stub AI CLI answers in BASE_MS while at most KNEE requests are in flight;
+# beyond that its latency grows with load (BASE_MS * load / KNEE), and above
+# RATE_LIMIT concurrent requests it fails with "429 Too Many Requests".
+# Each configuration runs TASKS tasks; failed tasks are reported, not retried.
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+
+TASKS="${1:-60}"
+BASE_MS="${2:-300}"
+KNEE="${3:-6}"
+RATE_LIMIT="${4:-12}"
+
+WORK_DIR="$(mktemp -d)"
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+STUB="$WORK_DIR/qwen"
+STATE="$WORK_DIR/state"
+mkdir -p "$STATE"
+
+# Load-sensitive stub AI: in-flight count shared through a locked counter file
+cat > "$STUB" <<EOF
+#!/usr/bin/env bash
+exec 9> "$STATE/lock"
+flock 9
+load=\$(( \$(cat "$STATE/load" 2>/dev/null || echo 0) + 1 ))
+echo "\$load" > "$STATE/load"
+flock -u 9
+
+release() {
+    flock 9
+    echo \$(( \$(cat "$STATE/load") - 1 )) > "$STATE/load"
+    flock -u 9
+}
+
+if (( load > $RATE_LIMIT )); then
+    sleep 0.05
+    release
+    echo "Error: 429 Too Many Requests (rate limit exceeded)" >&2
+    exit 1
+fi
+
+latency_ms=$BASE_MS
+if (( load > $KNEE )); then
+    latency_ms=\$(( $BASE_MS * load / $KNEE ))
+fi
+sleep "\$(printf '%d.%03d' \$((latency_ms / 1000)) \$((latency_ms % 1000)))"
+release
+echo "answer for: \$1"
+EOF
+chmod +x "$STUB"
+
+# run_config <label> <min> <max> <initial>
+run_config() {
+    local label="$1"
+    echo 0 > "$STATE/load"
+
+    (
+        export PROJECT_ROOT VIBE_LOG_DIR="$WORK_DIR/logs"
+        export ADAPTIVE_MIN_CONCURRENCY="$2" ADAPTIVE_MAX_CONCURRENCY="$3"
+        export ADAPTIVE_INITIAL_CONCURRENCY="$4"
+        # shellcheck source=lib/adaptive-concurrency.sh
+        source "$PROJECT_ROOT/scripts/lib/adaptive-concurrency.sh"
+
+        run_task() { "$STUB" "task $1" > /dev/null; }
+
+        local ids=() start end failed=0
+        for ((i = 1; i <= TASKS; i++)); do ids+=("$i"); done
+
+        start=${EPOCHREALTIME/./}
+        adaptive_run_queue qwen run_task "${ids[@]}" 2> /dev/null || failed=$?
+        end=${EPOCHREALTIME/./}
+
+        printf "  %-24s %8dms %8d %8d %12d\n" "$label" $(( (end - start) / 1000 )) \
+            $(( TASKS - failed )) "$failed" "$(adaptive_get_limit qwen)"
+        if [[ "$label" == "adaptive (from 2)" ]]; then
+            adaptive_concurrency_status > "$WORK_DIR/adaptive-status.json"
+        fi
+    )
+}
+
+echo ""
+echo "=== Adaptive Concurrency Benchmark ==="
+echo "Tasks: $TASKS, stub latency: ${BASE_MS}ms up to $KNEE in flight, 429 above $RATE_LIMIT in flight"
+echo ""
+
+printf "  %-24s %10s %8s %8s %12s\n" "" "wall" "ok" "failed" "final limit"
+run_config "fixed 2" 2 2 2
+run_config "fixed $KNEE (ideal)" "$KNEE" "$KNEE" "$KNEE"
+run_config "fixed $((RATE_LIMIT + 4))" $((RATE_LIMIT + 4)) $((RATE_LIMIT + 4)) $((RATE_LIMIT + 4))
+run_config "adaptive (from 2)" 1 32 2
+run_config "adaptive (from $((RATE_LIMIT + 4)))" 1 32 $((RATE_LIMIT + 4))
+
+echo ""
+echo "  📊 Results:"
+echo "    - Adaptive limiter state: $(cat "$WORK_DIR/adaptive-status.json")"
+echo ""
+echo "=== Benchmark Complete ==="
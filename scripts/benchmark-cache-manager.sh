@@ -0,0 +1,142 @@
+#!/usr/bin/env bash
+# Spec Cache Lookup Benchmark
+# Purpose: Compare forks and wall time per 1000 lookups between the
+#          index-backed scripts/lib/cache-manager.sh and the previous
+#          sha256sum|awk + date + stat implementation
+#
+# Usage:
+#   bash scripts/benchmark-cache-manager.sh [LOOKUPS] [SPEC_FILES]
+#
+# Forks are counted from /proc/sys/kernel/ns_last_pid (Linux), so run it on
+# an otherwise idle machine. Logging is stubbed out for every case; it is
+# the same for both implementations and is measured separately.
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+
+LOOKUPS="${1:-1000}"
+SPEC_FILES="${2:-100}"
+BATCH_SIZE=100
+
+WORK_DIR="$(mktemp -d)"
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+export CACHE_DIR="$WORK_DIR/cache"
+# shellcheck source=lib/cache-manager.sh
+source "$PROJECT_ROOT/scripts/lib/cache-manager.sh"
+vibe_log() { :; }
+
+# Previous lookup path (kept here only as the baseline)
+legacy_generate_cache_key() {
+    sha256sum "$1" | awk '{print $1}'
+}
+legacy_is_cache_valid() {
+    local cache_path="$1"
+    [[ -f "$cache_path" ]] || return 1
+    local current_time file_mtime
+    current_time=$(date +%s)
+    file_mtime=$(stat -c %Y "$cache_path" 2>/dev/null || stat -f %m "$cache_path" 2>/dev/null || echo 0)
+    (( current_time - file_mtime <= CACHE_TTL ))
+}
+legacy_get_cached_spec() {
+    local cache_key cache_path
+    cache_key=$(legacy_generate_cache_key "$1") || return 1
+    cache_path="$CACHE_DIR/${cache_key}.json"
+    legacy_is_cache_valid "$cache_path" && cat "$cache_path"
+}
+
+last_pid() {
+    local pid
+    read -r pid < /proc/sys/kernel/ns_last_pid
+    printf -v "$1" '%s' "$pid"
+}
+
+if [[ ! -r /proc/sys/kernel/ns_last_pid ]]; then
+    echo "❌ /proc/sys/kernel/ns_last_pid is not readable; fork counts need Linux" >&2
+    exit 1
+fi
+
+# Spec files and their cached task lists
+echo "Preparing $SPEC_FILES spec files..."
+declare -a specs=()
+declare -A spec_tasks=()
+for ((i=0; i<SPEC_FILES; i++)); do
+    spec="$WORK_DIR/spec-$i.md"
+    printf '# Spec %d\n\n- [ ] task %d\n' "$i" "$i" > "$spec"
+    specs+=("$spec")
+    spec_tasks["$spec"]="{\"tasks\": [\"task $i\"]}"
+done
+cache_spec_files spec_tasks
+
+declare -a lookups=()
+for ((i=0; i<LOOKUPS; i++)); do
+    lookups+=("${specs[i % SPEC_FILES]}")
+done
+
+CASE_MS=0
+CASE_FORKS=0
+
+run_case() {
+    local label="$1"
+    shift
+    local start end pid_start pid_end
+    last_pid pid_start
+    start=$(date +%s%N)
+    "$@"
+    end=$(date +%s%N)
+    last_pid pid_end
+    CASE_MS=$(( (end - start) / 1000000 ))
+    # the two date calls above are not part of the measured work
+    CASE_FORKS=$(( pid_end - pid_start - 2 ))
+    printf "  %-28s %7dms  %7d forks  %6d.%02d forks/lookup\n" "$label" "$CASE_MS" "$CASE_FORKS" \
+        $((CASE_FORKS / LOOKUPS)) $((CASE_FORKS * 100 / LOOKUPS % 100))
+}
+
+legacy_lookups() {
+    local spec
+    for spec in "${lookups[@]}"; do
+        legacy_get_cached_spec "$spec" >/dev/null
+    done
+}
+
+single_lookups() {
+    local spec
+    for spec in "${lookups[@]}"; do
+        get_cached_spec "$spec" >/dev/null
+    done
+}
+
+batch_lookups() {
+    local -A found=()
+    local i
+    for ((i=0; i<LOOKUPS; i+=BATCH_SIZE)); do
+        found=()
+        get_cached_specs found "${lookups[@]:i:BATCH_SIZE}"
+    done
+}
+
+echo ""
+echo "=== Spec Cache Lookup Benchmark ==="
+echo "Lookups: $LOOKUPS over $SPEC_FILES spec files (batch size $BATCH_SIZE)"
+echo ""
+
+run_case "legacy get_cached_spec" legacy_lookups
+legacy_ms=$CASE_MS
+legacy_forks=$CASE_FORKS
+run_case "indexed get_cached_spec" single_lookups
+single_ms=$CASE_MS
+single_forks=$CASE_FORKS
+run_case "get_cached_specs (batch)" batch_lookups
+batch_ms=$CASE_MS
+batch_forks=$CASE_FORKS
+
+echo ""
+echo "  📊 Results (per $LOOKUPS lookups):"
+echo "    - Single lookups: ${legacy_forks} → ${single_forks} forks, ${legacy_ms}ms → ${single_ms}ms"
+echo "    - Batched:        ${legacy_forks} → ${batch_forks} forks, ${legacy_ms}ms → ${batch_ms}ms"
+if (( batch_ms > 0 )); then
+    echo "    - Batch speedup:  $(( legacy_ms / batch_ms ))x"
+fi
+echo ""
+echo "=== Benchmark Complete ==="
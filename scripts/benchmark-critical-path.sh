@@ -0,0 +1,257 @@
+#!/usr/bin/env bash
+# Critical-Path Scaling Benchmark
+# Purpose: Measure scripts/orchestrate/lib/critical-path.sh on fork/join DAGs
+#          from 10 to 5,000 nodes: a full CPM pass before and after the
+#          adjacency indexes, and the incremental update used for live re-planning
+#
+# Usage:
+#   bash scripts/benchmark-critical-path.sh [MAX_NODES] [UPDATES] [LEGACY_MAX]
+#
+# Per size:
+#   - legacy full pass (successor scan over every edge, grep per edge weight);
+#     only run up to LEGACY_MAX nodes because it grows quadratically
+#   - full pass (cpm_calculate_all)
+#   - incremental update: UPDATES random duration/status changes, each checked
+#     against a full pass afterwards
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+
+MAX_NODES="${1:-5000}"
+UPDATES="${2:-20}"
+LEGACY_MAX="${3:-500}"
+SIZES=(10 100 500 1000 2000 5000)
+
+# shellcheck source=orchestrate/lib/dag-builder.sh
+source "$PROJECT_ROOT/scripts/orchestrate/lib/dag-builder.sh"
+# shellcheck source=orchestrate/lib/critical-path.sh
+source "$PROJECT_ROOT/scripts/orchestrate/lib/critical-path.sh"
+
+# Previous DAG queries and CPM passes (kept here only as the baseline)
+legacy_get_node_type() {
+    echo "${DAG_NODES[$1]}" | grep -oP "type:\K[^|]+"
+}
+legacy_get_edge_weight() {
+    local edge_key="${1}->${2}"
+    if [[ ! -v "DAG_EDGES[$edge_key]" ]]; then
+        echo "0"
+        return
+    fi
+    echo "${DAG_EDGES[$edge_key]}" | grep -oP 'weight:\K\d+'
+}
+legacy_get_predecessors() {
+    [[ -v "DAG_REVERSE_EDGES[$1]" ]] || return 0
+    echo "${DAG_REVERSE_EDGES[$1]}" | tr ',' '\n'
+}
+legacy_get_successors() {
+    for edge_key in "${!DAG_EDGES[@]}"; do
+        if [[ "${edge_key%%->*}" == "$1" ]]; then
+            echo "${edge_key##*->}"
+        fi
+    done
+}
+legacy_topological_sort() {
+    DAG_TOPO_ORDER=()
+    declare -A in_degree
+    for node_id in "${!DAG_NODES[@]}"; do
+        in_degree["$node_id"]=0
+    done
+    for edge_key in "${!DAG_EDGES[@]}"; do
+        local to="${edge_key##*->}"
+        in_degree["$to"]=$((in_degree["$to"] + 1))
+    done
+    local queue=()
+    for node_id in "${!in_degree[@]}"; do
+        if [[ ${in_degree["$node_id"]} -eq 0 ]]; then
+            queue+=("$node_id")
+        fi
+    done
+    while [[ ${#queue[@]} -gt 0 ]]; do
+        local current="${queue[0]}"
+        queue=("${queue[@]:1}")
+        DAG_TOPO_ORDER+=("$current")
+        for successor in $(legacy_get_successors "$current"); do
+            in_degree["$successor"]=$((in_degree["$successor"] - 1))
+            if [[ ${in_degree["$successor"]} -eq 0 ]]; then
+                queue+=("$successor")
+            fi
+        done
+    done
+}
+legacy_calculate_all() {
+    legacy_topological_sort
+
+    CPM_EST=()
+    for node_id in "${DAG_TOPO_ORDER[@]}"; do
+        local max_est=0
+        for pred in $(legacy_get_predecessors "$node_id"); do
+            local pred_finish_time=$(( ${CPM_EST[$pred]} + $(legacy_get_edge_weight "$pred" "$node_id") ))
+            if [[ $pred_finish_time -gt $max_est ]]; then
+                max_est=$pred_finish_time
+            fi
+        done
+        CPM_EST["$node_id"]=$max_est
+    done
+
+    CPM_LFT=()
+    local end_node=""
+    for node_id in "${DAG_TOPO_ORDER[@]}"; do
+        if [[ "$(legacy_get_node_type "$node_id")" == "END" ]]; then
+            end_node="$node_id"
+            break
+        fi
+    done
+    CPM_TOTAL_DURATION=${CPM_EST[$end_node]}
+    CPM_LFT["$end_node"]=$CPM_TOTAL_DURATION
+    for ((i=${#DAG_TOPO_ORDER[@]}-1; i>=0; i--)); do
+        node_id="${DAG_TOPO_ORDER[$i]}"
+        [[ "$node_id" != "$end_node" ]] || continue
+        local successors=$(legacy_get_successors "$node_id")
+        local min_lft=$CPM_TOTAL_DURATION
+        for succ in $successors; do
+            local required_finish_time=$(( ${CPM_LFT[$succ]} - $(legacy_get_edge_weight "$node_id" "$succ") ))
+            if [[ $required_finish_time -lt $min_lft ]]; then
+                min_lft=$required_finish_time
+            fi
+        done
+        CPM_LFT["$node_id"]=$min_lft
+    done
+
+    CPM_SLACK=()
+    for node_id in "${!DAG_NODES[@]}"; do
+        CPM_SLACK["$node_id"]=$(( ${CPM_LFT[$node_id]} - ${CPM_EST[$node_id]} ))
+    done
+}
+
+# build_dag <nodes>: START -> stages of parallel forks, each closed by a join -> END
+# Forks in a stage depend on the previous join; every fourth one also depends on
+# a fork from the previous stage, so updates reach differently sized subgraphs.
+build_dag() {
+    local nodes=$1 width=8 stage=0 count=2 prev="START" prev_forks=() forks i fork join
+
+    dag_reset
+    RANDOM=42
+    dag_add_node "START" "START"
+    while (( count < nodes )); do
+        forks=()
+        for ((i=0; i<width && count < nodes - 1; i++)); do
+            fork="fork-${stage}-${i}"
+            dag_add_node "$fork" "FORK" "worker:bench" "timeout:300"
+            dag_add_edge "$prev" "$fork" $((RANDOM % 300 + 30))
+            if (( i % 4 == 3 && ${#prev_forks[@]} > 0 )); then
+                dag_add_edge "${prev_forks[RANDOM % ${#prev_forks[@]}]}" "$fork" $((RANDOM % 300 + 30))
+            fi
+            forks+=("$fork")
+            count=$((count + 1))
+        done
+        join="join-${stage}"
+        dag_add_node "$join" "JOIN" "blocking:true"
+        for fork in "${forks[@]}"; do
+            dag_add_edge "$fork" "$join" 0
+        done
+        count=$((count + 1))
+        prev="$join"
+        prev_forks=("${forks[@]}")
+        stage=$((stage + 1))
+    done
+    dag_add_node "END" "END"
+    dag_add_edge "$prev" "END" 0
+}
+
+# elapsed_ms <var> <start>
+elapsed_ms() {
+    local end=$EPOCHREALTIME
+    printf -v "$1" '%d.%d' $(( (${end/./} - ${2/./}) / 1000 )) $(( (${end/./} - ${2/./}) / 100 % 10 ))
+}
+
+# cpm_snapshot <var>: EST/LFT/slack of every node, for comparing two passes
+cpm_snapshot() {
+    local -n _snapshot=$1
+    local node_id
+    _snapshot="$CPM_TOTAL_DURATION ${CPM_CRITICAL_PATH[*]}"
+    for node_id in "${DAG_TOPO_ORDER[@]}"; do
+        _snapshot+=" ${CPM_EST[$node_id]}/${CPM_LFT[$node_id]}/${CPM_SLACK[$node_id]}"
+    done
+}
+
+echo ""
+echo "=== Critical-Path Scaling Benchmark ==="
+echo "Sizes up to $MAX_NODES nodes, $UPDATES incremental updates per size, legacy up to $LEGACY_MAX nodes"
+echo ""
+printf "  %7s %7s | %12s %12s | %14s %10s | %s\n" \
+    "nodes" "edges" "legacy full" "full" "incremental" "recomputed" "consistent"
+
+declare -A FULL_MS=() INCR_MS=() LEGACY_MS=()
+mismatches=0
+for nodes in "${SIZES[@]}"; do
+    (( nodes <= MAX_NODES )) || continue
+    build_dag "$nodes"
+
+    legacy_cell="skipped"
+    if (( nodes <= LEGACY_MAX )); then
+        start=$EPOCHREALTIME
+        legacy_calculate_all
+        elapsed_ms legacy_ms "$start"
+        LEGACY_MS[$nodes]=$legacy_ms
+        legacy_cell="${legacy_ms}ms"
+    fi
+
+    DAG_TOPO_ORDER=()
+    start=$EPOCHREALTIME
+    cpm_calculate_all 2>/dev/null
+    elapsed_ms full_ms "$start"
+    FULL_MS[$nodes]=$full_ms
+
+    # Random forks finish early/late, get skipped, or are re-estimated
+    mapfile -t fork_ids < <(printf '%s\n' "${!DAG_NODES[@]}" | grep '^fork-')
+    recomputed=0
+    incremental_us=0
+    RANDOM=7
+    for ((u=0; u<UPDATES; u++)); do
+        fork="${fork_ids[RANDOM % ${#fork_ids[@]}]}"
+        start=$EPOCHREALTIME
+        case $((u % 3)) in
+            0) cpm_update_node_status "$fork" completed $((RANDOM % 300)) ;;
+            1) cpm_update_node_status "$fork" skipped ;;
+            2) cpm_update_node_duration "$fork" $((RANDOM % 600 + 30)) ;;
+        esac
+        end=$EPOCHREALTIME
+        incremental_us=$(( incremental_us + ${end/./} - ${start/./} ))
+        recomputed=$((recomputed + CPM_LAST_RECOMPUTED))
+    done
+    incremental_ms=$(printf '%d.%02d' $((incremental_us / UPDATES / 1000)) $((incremental_us / UPDATES / 10 % 100)))
+    INCR_MS[$nodes]=$incremental_ms
+
+    cpm_snapshot after_incremental
+    cpm_calculate_all 2>/dev/null
+    cpm_snapshot after_full
+    consistent="✅"
+    if [[ "$after_incremental" != "$after_full" ]]; then
+        consistent="❌"
+        mismatches=$((mismatches + 1))
+    fi
+
+    printf "  %7d %7d | %12s %10sms | %10sms/op %10d | %s\n" \
+        "${#DAG_NODES[@]}" "${#DAG_EDGES[@]}" "$legacy_cell" "$full_ms" "$incremental_ms" \
+        $((recomputed / UPDATES)) "$consistent"
+done
+
+largest=0
+largest_legacy=0
+for nodes in "${!FULL_MS[@]}"; do
+    (( nodes > largest )) && largest=$nodes
+done
+for nodes in "${!LEGACY_MS[@]}"; do
+    (( nodes > largest_legacy )) && largest_legacy=$nodes
+done
+
+echo ""
+echo "  📊 Results:"
+if (( largest_legacy > 0 )); then
+    echo "    - Full pass @ ${largest_legacy} nodes: ${LEGACY_MS[$largest_legacy]}ms (legacy) → ${FULL_MS[$largest_legacy]}ms"
+fi
+echo "    - Re-plan @ ${largest} nodes: ${FULL_MS[$largest]}ms (full pass) → ${INCR_MS[$largest]}ms (incremental update)"
+echo "    - Incremental results matching a full pass: $(( ${#FULL_MS[@]} - mismatches ))/${#FULL_MS[@]} sizes"
+echo ""
+echo "=== Benchmark Complete ==="
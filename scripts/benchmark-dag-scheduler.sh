@@ -0,0 +1,176 @@
+#!/usr/bin/env bash
+# DAG Scheduler Makespan Benchmark
+# Purpose: Compare makespan of fixed-order JOIN barriers (the join_policy_* style
+#          "wait $first_pid before the next one") with the critical-path priority
+#          ready queue in scripts/orchestrate/lib/dag-scheduler.sh
+#
+# Usage:
+#   bash scripts/benchmark-dag-scheduler.sh [TASKS] [CAPACITY] [RUNS] [UNIT_MS]
+#
+# Each run builds a random fork DAG (START -> TASKS forks -> END). Every fork has
+# an estimated duration (its DAG weight) and an actual duration that differs by up
+# to ±50%; tasks are `sleep` calls of the actual duration. Both schedulers run the
+# same DAG and are reported against the CPM lower bound
+# max(critical path, total work / capacity) computed from the actual durations.
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+
+TASKS="${1:-20}"
+CAPACITY="${2:-3}"
+RUNS="${3:-3}"
+export DAG_SCHED_TIME_UNIT_MS="${4:-40}"
+
+# shellcheck source=orchestrate/lib/dag-builder.sh
+source "$PROJECT_ROOT/scripts/orchestrate/lib/dag-builder.sh"
+# shellcheck source=orchestrate/lib/critical-path.sh
+source "$PROJECT_ROOT/scripts/orchestrate/lib/critical-path.sh"
+# shellcheck source=orchestrate/lib/dag-scheduler.sh
+source "$PROJECT_ROOT/scripts/orchestrate/lib/dag-scheduler.sh"
+
+declare -A ACTUAL_SECONDS=()
+
+# Benchmark task: sleep for the fork's actual duration
+sleep_runner() {
+    sleep "${ACTUAL_SECONDS[$1]}"
+}
+
+# build_dag <seed>: random fork DAG, each fork depending on 0-2 earlier forks
+build_dag() {
+    local i j pred estimate actual_ms deps
+
+    dag_reset
+    cpm_reset
+    ACTUAL_SECONDS=()
+    RANDOM=$1
+    dag_add_node "START" "START"
+    dag_add_node "END" "END"
+    for ((i=0; i<TASKS; i++)); do
+        dag_add_node "fork-$i" "FORK" "worker:bench"
+    done
+    for ((i=0; i<TASKS; i++)); do
+        estimate=$((RANDOM % 8 + 1))
+        actual_ms=$(( estimate * DAG_SCHED_TIME_UNIT_MS * (50 + RANDOM % 101) / 100 ))
+        ACTUAL_SECONDS["fork-$i"]=$(printf '%d.%03d' $((actual_ms / 1000)) $((actual_ms % 1000)))
+        dag_set_node_attr "fork-$i" timeout "$estimate"
+
+        deps=$(( i < 3 ? 0 : RANDOM % 3 ))
+        if [[ $deps -eq 0 ]]; then
+            dag_add_edge "START" "fork-$i" "$estimate"
+        fi
+        for ((j=0; j<deps; j++)); do
+            pred=$(( i - 1 - RANDOM % (i < 6 ? i : 6) ))
+            [[ -v "DAG_EDGES[fork-${pred}->fork-$i]" ]] || dag_add_edge "fork-$pred" "fork-$i" "$estimate"
+        done
+    done
+    for ((i=0; i<TASKS; i++)); do
+        [[ -v "DAG_FORWARD_EDGES[fork-$i]" ]] || dag_add_edge "fork-$i" "END" 0
+    done
+}
+
+# Fixed-order barriers (baseline): ready forks start in declaration order and the
+# dispatcher always blocks on the oldest running fork, like `wait $qwen_pid`
+# before Droid. Successors of a fast fork wait until that blocking wait returns.
+fixed_order_run() {
+    local runner=$1 capacity=$2
+    local -A waiting=() pid_node=()
+    local -a ready=() running=()
+    local node_id pred succ adjacent pid finished=0 total=${#DAG_NODES[@]}
+    local _dag_sched_epoch=$EPOCHREALTIME now_ms
+
+    DAG_SCHED_START_MS=()
+    DAG_SCHED_END_MS=()
+    DAG_SCHED_CAPACITY=$capacity
+    for node_id in "${DAG_TOPO_ORDER[@]}"; do
+        adjacent="${DAG_REVERSE_EDGES[$node_id]:-}"
+        waiting["$node_id"]=0
+        for pred in ${adjacent//,/ }; do
+            waiting["$node_id"]=$(( ${waiting[$node_id]} + 1 ))
+        done
+        [[ ${waiting[$node_id]} -gt 0 ]] || ready+=("$node_id")
+    done
+
+    # fixed_complete <node>: release successors in declaration order
+    fixed_complete() {
+        adjacent="${DAG_FORWARD_EDGES[$1]:-}"
+        for succ in ${adjacent//,/ }; do
+            waiting["$succ"]=$(( ${waiting[$succ]} - 1 ))
+            [[ ${waiting[$succ]} -gt 0 ]] || ready+=("$succ")
+        done
+        finished=$((finished + 1))
+    }
+
+    while [[ $finished -lt $total ]]; do
+        while [[ ${#ready[@]} -gt 0 ]]; do
+            node_id="${ready[0]}"
+            if [[ "${DAG_NODE_TYPES[$node_id]}" != "FORK" ]]; then
+                ready=("${ready[@]:1}")
+                fixed_complete "$node_id"
+                continue
+            fi
+            [[ ${#running[@]} -lt $capacity ]] || break
+            ready=("${ready[@]:1}")
+            _dag_sched_now_ms now_ms
+            DAG_SCHED_START_MS["$node_id"]=$now_ms
+            "$runner" "$node_id" &
+            running+=($!)
+            pid_node[$!]="$node_id"
+        done
+        [[ ${#running[@]} -gt 0 ]] || continue
+
+        pid=${running[0]}
+        running=("${running[@]:1}")
+        wait "$pid"
+        _dag_sched_now_ms now_ms
+        DAG_SCHED_END_MS["${pid_node[$pid]}"]=$now_ms
+        fixed_complete "${pid_node[$pid]}"
+    done
+
+    _dag_sched_now_ms DAG_SCHED_MAKESPAN_MS
+    _dag_sched_compute_lower_bound
+}
+
+# pct_over <value_ms> <lower_bound_ms>: makespan as percent above the lower bound
+pct_over() {
+    printf '+%d%%' $(( ($1 - $2) * 100 / ($2 > 0 ? $2 : 1) ))
+}
+
+echo ""
+echo "=== DAG Scheduler Makespan Benchmark ==="
+echo "Tasks: $TASKS, capacity: $CAPACITY, runs: $RUNS, unit: ${DAG_SCHED_TIME_UNIT_MS}ms"
+echo ""
+
+fixed_total=0
+ready_total=0
+bound_total=0
+for ((run=1; run<=RUNS; run++)); do
+    build_dag $((run * 7919))
+    dag_topological_sort
+
+    fixed_order_run sleep_runner "$CAPACITY"
+    fixed_ms=$DAG_SCHED_MAKESPAN_MS
+    fixed_bound=$DAG_SCHED_LOWER_BOUND_MS
+
+    cpm_calculate_all 2>/dev/null
+    dag_schedule_run sleep_runner "$CAPACITY" 2>/dev/null
+    ready_ms=$DAG_SCHED_MAKESPAN_MS
+    ready_bound=$DAG_SCHED_LOWER_BOUND_MS
+
+    # Both runs see the same actual durations (up to sleep jitter); use the smaller bound
+    bound=$(( fixed_bound < ready_bound ? fixed_bound : ready_bound ))
+    fixed_total=$((fixed_total + fixed_ms))
+    ready_total=$((ready_total + ready_ms))
+    bound_total=$((bound_total + bound))
+
+    printf "  run %d: lower bound %6dms | fixed-order %6dms (%5s) | ready queue %6dms (%5s)\n" \
+        "$run" "$bound" "$fixed_ms" "$(pct_over "$fixed_ms" "$bound")" \
+        "$ready_ms" "$(pct_over "$ready_ms" "$bound")"
+done
+
+echo ""
+echo "  📊 Results:"
+echo "    - Mean makespan: $((fixed_total / RUNS))ms (fixed-order) → $((ready_total / RUNS))ms (ready queue)"
+echo "    - Above CPM lower bound: $(pct_over "$fixed_total" "$bound_total") → $(pct_over "$ready_total" "$bound_total")"
+echo ""
+echo "=== Benchmark Complete ==="
@@ -0,0 +1,121 @@
+#!/usr/bin/env bash
+# Hedged Fallback Benchmark
+# Purpose: Compare the sequential call_ai_with_fallback with hedged execution
+#          (fallback started once the primary passes its p95 latency) against
+#          a primary stub AI with a heavy latency tail
+#
+# Usage:
+#   bash scripts/benchmark-hedged-fallback.sh [CALLS] [BASE_MS] [TAIL_MS] [TAIL_PERCENT]
+#
+# The primary stub (qwen) answers in BASE_MS, except TAIL_PERCENT% of calls
+# (deterministic, every Nth call) which take TAIL_MS. The fallback stub (droid)
+# always answers in 2 * BASE_MS. Both modes run the same CALLS calls after a
+# warmup that fills the latency history.
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+BENCH_ROOT="$PROJECT_ROOT"
+
+CALLS="${1:-40}"
+BASE_MS="${2:-200}"
+TAIL_MS="${3:-3000}"
+TAIL_PERCENT="${4:-10}"
+
+WORK_DIR="$(mktemp -d)"
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+STUB_ROOT="$WORK_DIR/root"
+mkdir -p "$STUB_ROOT/bin" "$WORK_DIR/path"
+
+# Primary stub: the call number comes from a locked counter so both modes see the same tail
+cat > "$STUB_ROOT/bin/qwen-wrapper.sh" <<EOF
+#!/usr/bin/env bash
+exec 9>> "$WORK_DIR/qwen.lock"
+flock 9
+n=\$(( \$(cat "$WORK_DIR/qwen.count" 2>/dev/null || echo 0) + 1 ))
+echo "\$n" > "$WORK_DIR/qwen.count"
+flock -u 9
+latency_ms=$BASE_MS
+if (( n % (100 / $TAIL_PERCENT) == 0 )); then
+    latency_ms=$TAIL_MS
+fi
+sleep "\$(printf '%d.%03d' \$((latency_ms / 1000)) \$((latency_ms % 1000)))"
+echo "qwen answer"
+EOF
+cat > "$STUB_ROOT/bin/droid-wrapper.sh" <<EOF
+#!/usr/bin/env bash
+sleep "\$(printf '%d.%03d' \$(($BASE_MS * 2 / 1000)) \$(($BASE_MS * 2 % 1000)))"
+echo "droid answer"
+EOF
+chmod +x "$STUB_ROOT/bin/qwen-wrapper.sh" "$STUB_ROOT/bin/droid-wrapper.sh"
+ln -s "$STUB_ROOT/bin/qwen-wrapper.sh" "$WORK_DIR/path/qwen"
+ln -s "$STUB_ROOT/bin/droid-wrapper.sh" "$WORK_DIR/path/droid"
+
+# run_mode <label> <hedge_enabled>: prints one table row
+run_mode() {
+    local label="$1"
+    local hedge_enabled="$2"
+    (
+        export PATH="$WORK_DIR/path:$PATH"
+        export PROJECT_ROOT="$STUB_ROOT"
+        export AI_CACHE_ENABLED=0
+        export AI_HEDGE_ENABLED="$hedge_enabled"
+        export AI_HEDGE_BUDGET="$CALLS"
+        export WRAPPER_NON_INTERACTIVE=1
+        export MULTI_AI_INIT=test  # skips the yq check, only call_ai is used
+        rm -rf "$STUB_ROOT/.cache" "$WORK_DIR/qwen.count"
+        cd "$WORK_DIR"
+        # shellcheck source=orchestrate/orchestrate-multi-ai.sh
+        source "$BENCH_ROOT/scripts/orchestrate/orchestrate-multi-ai.sh" >/dev/null 2>&1
+        set +e
+
+        # Warmup below the tail fills the latency history
+        local i
+        for ((i = 0; i < AI_HEDGE_MIN_SAMPLES; i++)); do
+            call_ai qwen "warmup" 30 "$WORK_DIR/out.txt" >/dev/null 2>&1
+        done
+        echo 0 > "$WORK_DIR/qwen.count"
+
+        local start end
+        local -a latencies=()
+        for ((i = 0; i < CALLS; i++)); do
+            start=${EPOCHREALTIME/./}
+            call_ai_with_fallback qwen droid "Review call $i" 30 "$WORK_DIR/out.txt" >/dev/null 2>&1
+            end=${EPOCHREALTIME/./}
+            latencies+=($(( (end - start) / 1000 )))
+        done
+
+        local hedges
+        hedges=$(awk '$NF == "hedge" { n++ } END { print n + 0 }' "$API_CALL_LOG" 2>/dev/null || echo 0)
+        printf '%s\n' "${latencies[@]}" | sort -n | awk -v label="$label" -v hedges="$hedges" '
+            { v[NR] = $1; sum += $1 }
+            function pct(p,   r) { r = int(NR * p); if (r < NR * p) r++; return v[r] }
+            END {
+                printf "  %-18s %8dms %8dms %8dms %8dms %8dms %8d\n", label, sum / NR, pct(0.5), pct(0.95), pct(0.99), v[NR], hedges
+            }'
+
+        # Release the orchestrator's slots here so its exit trap stays quiet
+        cleanup_ai_slots >/dev/null 2>&1 || true
+        trap - EXIT
+    )
+}
+
+echo ""
+echo "=== Hedged Fallback Benchmark ==="
+echo "Calls: $CALLS, primary: ${BASE_MS}ms (${TAIL_PERCENT}% at ${TAIL_MS}ms), fallback: $((BASE_MS * 2))ms"
+echo ""
+
+printf "  %-18s %10s %10s %10s %10s %10s %8s\n" "" "mean" "p50" "p95" "p99" "max" "hedges"
+run_mode "sequential" false | tee "$WORK_DIR/sequential.txt"
+run_mode "hedged" true | tee "$WORK_DIR/hedged.txt"
+
+read -r _ _ _ seq_p99 _ < <(awk '{ print $2, $3, $4, $5, $6 }' "$WORK_DIR/sequential.txt" | tr -d 'ms')
+read -r _ _ _ hedge_p99 _ < <(awk '{ print $2, $3, $4, $5, $6 }' "$WORK_DIR/hedged.txt" | tr -d 'ms')
+
+echo ""
+echo "  📊 Results:"
+echo "    - p99 latency:          sequential ${seq_p99}ms, hedged ${hedge_p99}ms"
+echo "    - Extra calls spent:    $(awk '{ print $NF }' "$WORK_DIR/hedged.txt") of $CALLS (budget $CALLS/hour)"
+echo ""
+echo "=== Benchmark Complete ==="
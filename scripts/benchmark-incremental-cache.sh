@@ -0,0 +1,209 @@
+#!/usr/bin/env bash
+# Incremental Cache Benchmark
+# Purpose: Compare disk usage and cache-validation time of the per-workflow
+#          phase cache with the content-addressed blob store in
+#          scripts/orchestrate/lib/incremental-cache.sh
+#
+# Usage:
+#   bash scripts/benchmark-incremental-cache.sh [RUNS] [WORKFLOWS] [PHASES] [OUTPUT_KB]
+#
+# Simulates RUNS rounds of WORKFLOWS 7-AI workflows (PHASES phases each, one
+# output of ~OUTPUT_KB per phase). Each workflow has its own ID, as different
+# tasks do. Outputs repeat across workflows and runs, except one phase per run
+# whose output changes. Every workflow is saved once and then validated again,
+# like a re-run (dependency hashes + check_phase_cache_valid for every phase).
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+export PROJECT_ROOT
+
+RUNS="${1:-5}"
+WORKFLOWS="${2:-3}"
+PHASES="${3:-7}"
+OUTPUT_KB="${4:-40}"
+
+WORK_DIR="$(mktemp -d)"
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+export INCREMENTAL_CACHE_DIR="$WORK_DIR/blob-store"
+# shellcheck source=orchestrate/lib/incremental-cache.sh
+source "$PROJECT_ROOT/scripts/orchestrate/lib/incremental-cache.sh"
+
+LEGACY_CACHE_DIR="$WORK_DIR/legacy"
+
+# Previous incremental-cache.sh + execute_phase caching (kept here only as the baseline)
+legacy_save_phase() {
+    local workflow_id="$1"
+    local phase_idx="$2"
+    local output_file="$3"
+    local dependency_hashes="${4:-{}}"
+
+    local meta_dir="$LEGACY_CACHE_DIR/${workflow_id}"
+    mkdir -p "$meta_dir"
+    local output_hash
+    output_hash=$(sha256sum "$output_file" 2>/dev/null | cut -d' ' -f1)
+    local timestamp=$(date +%s)
+    if ! echo "$dependency_hashes" | jq empty 2>/dev/null; then
+        dependency_hashes="{}"
+    fi
+    jq -n --arg phase_idx "$phase_idx" --arg ai "claude" --arg role "role" \
+        --arg output_hash "$output_hash" --arg output_file "$output_file" \
+        --argjson dependency_hashes "$dependency_hashes" --arg timestamp "$timestamp" \
+        --arg ttl "$INCREMENTAL_CACHE_TTL" \
+        '{phase_idx: ($phase_idx | tonumber), ai: $ai, role: $role, output_hash: $output_hash,
+          output_file: $output_file, dependency_hashes: $dependency_hashes,
+          timestamp: ($timestamp | tonumber), ttl: ($ttl | tonumber)}' > "$meta_dir/phase_${phase_idx}.meta"
+    # execute_phase also copied every output into the workflow's cache directory
+    cp "$output_file" "$meta_dir/phase_${phase_idx}.cache"
+}
+legacy_get_phase_output_hash() {
+    local meta_file="$LEGACY_CACHE_DIR/${1}/phase_${2}.meta"
+    [[ -f "$meta_file" ]] || return 1
+    jq -r '.output_hash' "$meta_file" 2>/dev/null
+}
+legacy_build_dependency_hashes() {
+    local workflow_id="$1"
+    shift
+    local dependency_hashes="{}"
+    for dep_idx in "$@"; do
+        local dep_hash
+        dep_hash=$(legacy_get_phase_output_hash "$workflow_id" "$dep_idx")
+        if [[ -n "$dep_hash" ]]; then
+            dependency_hashes=$(echo "$dependency_hashes" | \
+                jq --arg idx "$dep_idx" --arg hash "$dep_hash" '. + {("phase_" + $idx): $hash}' 2>/dev/null)
+        fi
+    done
+    echo "$dependency_hashes"
+}
+legacy_check_phase_cache_valid() {
+    local workflow_id="$1"
+    local phase_idx="$2"
+    local current_dependency_hashes="${3:-{}}"
+    local meta_file="$LEGACY_CACHE_DIR/${workflow_id}/phase_${phase_idx}.meta"
+
+    [[ -f "$meta_file" ]] || return 1
+    jq empty "$meta_file" 2>/dev/null || return 1
+    local cached_timestamp
+    cached_timestamp=$(jq -r '.timestamp' "$meta_file" 2>/dev/null)
+    local age=$(( $(date +%s) - cached_timestamp ))
+    local cached_ttl
+    cached_ttl=$(jq -r '.ttl' "$meta_file" 2>/dev/null)
+    [[ $age -le $cached_ttl ]] || return 1
+    local output_file
+    output_file=$(jq -r '.output_file' "$meta_file" 2>/dev/null)
+    [[ -f "$output_file" ]] || return 1
+    local cached_dependency_hashes
+    cached_dependency_hashes=$(jq -c '.dependency_hashes' "$meta_file" 2>/dev/null)
+    local cached_deps_normalized current_deps_normalized
+    cached_deps_normalized=$(echo "$cached_dependency_hashes" | jq -S '.' 2>/dev/null) || cached_deps_normalized="{}"
+    current_deps_normalized=$(echo "$current_dependency_hashes" | jq -S '.' 2>/dev/null) || current_deps_normalized="{}"
+    [[ "$cached_deps_normalized" == "$current_deps_normalized" ]]
+}
+
+# write_output <file> <phase> <variant>: markdown-like phase output of ~OUTPUT_KB
+write_output() {
+    local file="$1" phase="$2" variant="$3" line
+    {
+        echo "# Phase $phase output (variant $variant)"
+        for ((line=0; line < OUTPUT_KB * 1024 / 80; line++)); do
+            printf -- '- finding %d/%d: %s\n' "$phase" "$line" \
+                "$(( (line * 7919 + phase * 104729 + variant * 1299709) % 1000003 )) requires review of module $((line % 37))"
+        done
+    } > "$file"
+}
+
+# elapsed_ms <var> <start>
+elapsed_ms() {
+    local end=$EPOCHREALTIME
+    printf -v "$1" '%d' $(( (${end/./} - ${2/./}) / 1000 ))
+}
+
+echo ""
+echo "=== Incremental Cache Benchmark ==="
+echo "Runs: $RUNS, workflows per run: $WORKFLOWS, phases: $PHASES, output: ~${OUTPUT_KB}KB"
+echo ""
+
+legacy_save_ms=0 blob_save_ms=0 legacy_check_ms=0 blob_check_ms=0
+legacy_hits=0 blob_hits=0 checks=0
+for ((run=0; run<RUNS; run++)); do
+    changed_phase=$(( run % PHASES ))
+    for ((wf=0; wf<WORKFLOWS; wf++)); do
+        workflow_id="run${run}-wf${wf}"
+        out_dir="$WORK_DIR/logs/$workflow_id"
+        mkdir -p "$out_dir"
+        for ((phase=0; phase<PHASES; phase++)); do
+            variant=0
+            [[ $phase -ne $changed_phase ]] || variant=$run
+            write_output "$out_dir/phase${phase}.md" "$phase" "$variant"
+        done
+
+        # First execution: save every phase
+        start=$EPOCHREALTIME
+        for ((phase=0; phase<PHASES; phase++)); do
+            deps=$(legacy_build_dependency_hashes "$workflow_id" $(seq 0 $((phase - 1))))
+            legacy_save_phase "$workflow_id" "$phase" "$out_dir/phase${phase}.md" "$deps"
+        done
+        elapsed_ms ms "$start"
+        legacy_save_ms=$((legacy_save_ms + ms))
+
+        start=$EPOCHREALTIME
+        for ((phase=0; phase<PHASES; phase++)); do
+            dep_indices=()
+            for ((dep=0; dep<phase; dep++)); do dep_indices+=("$dep"); done
+            incremental_dependency_hashes deps "$workflow_id" "${dep_indices[@]}"
+            save_phase_metadata "$workflow_id" "$phase" "claude" "role" "$out_dir/phase${phase}.md" "$deps"
+        done
+        elapsed_ms ms "$start"
+        blob_save_ms=$((blob_save_ms + ms))
+
+        # Re-run: validate every phase
+        start=$EPOCHREALTIME
+        for ((phase=0; phase<PHASES; phase++)); do
+            deps=$(legacy_build_dependency_hashes "$workflow_id" $(seq 0 $((phase - 1))))
+            legacy_check_phase_cache_valid "$workflow_id" "$phase" "$deps" && legacy_hits=$((legacy_hits + 1))
+        done
+        elapsed_ms ms "$start"
+        legacy_check_ms=$((legacy_check_ms + ms))
+
+        start=$EPOCHREALTIME
+        for ((phase=0; phase<PHASES; phase++)); do
+            dep_indices=()
+            for ((dep=0; dep<phase; dep++)); do dep_indices+=("$dep"); done
+            incremental_dependency_hashes deps "$workflow_id" "${dep_indices[@]}"
+            check_phase_cache_valid "$workflow_id" "$phase" "$deps" && blob_hits=$((blob_hits + 1))
+        done
+        elapsed_ms ms "$start"
+        blob_check_ms=$((blob_check_ms + ms))
+        checks=$((checks + PHASES))
+    done
+done
+
+legacy_kb=$(du -sk "$LEGACY_CACHE_DIR" | cut -f1)
+blob_kb=$(du -sk "$INCREMENTAL_CACHE_DIR" | cut -f1)
+blob_count=$(find "$INCREMENTAL_CACHE_DIR/blobs" -type f | wc -l)
+workflow_count=$((RUNS * WORKFLOWS))
+
+# Drop the older runs' manifests (as TTL expiry would) and collect their blobs
+for ((run=0; run<RUNS-1; run++)); do
+    rm -rf "$INCREMENTAL_CACHE_DIR"/run${run}-wf*
+done
+incremental_cache_gc 0
+gc_kb=$(du -sk "$INCREMENTAL_CACHE_DIR" | cut -f1)
+
+printf "  %-26s %10s %14s %14s %10s\n" "" "disk" "save/workflow" "check/phase" "hits"
+printf "  %-26s %8dKB %12dms %12dms %6d/%d\n" "per-workflow cache (legacy)" "$legacy_kb" \
+    $((legacy_save_ms / workflow_count)) $((legacy_check_ms / checks)) "$legacy_hits" "$checks"
+printf "  %-26s %8dKB %12dms %12dms %6d/%d\n" "content-addressed blobs" "$blob_kb" \
+    $((blob_save_ms / workflow_count)) $((blob_check_ms / checks)) "$blob_hits" "$checks"
+echo ""
+echo "  Blobs: $blob_count for $((workflow_count * PHASES)) phase outputs; after GC of $((RUNS - 1)) old runs:" \
+    "${gc_kb}KB ($INCREMENTAL_GC_REMOVED removed, $INCREMENTAL_GC_KEPT kept)"
+
+echo ""
+echo "  📊 Results:"
+echo "    - Disk usage: ${legacy_kb}KB → ${blob_kb}KB ($(( legacy_kb / (blob_kb > 0 ? blob_kb : 1) ))x smaller)"
+echo "    - Validation: ${legacy_check_ms}ms → ${blob_check_ms}ms for $checks phase checks" \
+    "($(( legacy_check_ms / (blob_check_ms > 0 ? blob_check_ms : 1) ))x faster)"
+echo ""
+echo "=== Benchmark Complete ==="
@@ -0,0 +1,230 @@
+#!/usr/bin/env bash
+# Worktree Metrics Rollup Benchmark
+# Purpose: Compare the per-line log scans previously done by worktree-metrics.sh
+#          with the incrementally maintained daily rollups of
+#          scripts/orchestrate/lib/worktree-metrics-store.sh on synthetic state logs
+#
+# Usage:
+#   bash scripts/benchmark-metrics-rollups.sh [DAYS] [WORKFLOWS_PER_DAY]
+#
+# Each synthetic day holds WORKFLOWS_PER_DAY workflows; every workflow moves
+# claude, gemini and qwen through creating → active → cleaning → none
+# (12 state events) and writes one execution_end history event.
+# A second tree with 10x the history checks that rollup queries do not grow
+# with history length. Results of both implementations are compared.
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+BENCH_ROOT="$PROJECT_ROOT"
+
+DAYS="${1:-90}"
+WORKFLOWS_PER_DAY="${2:-4}"
+
+WORK_DIR="$(mktemp -d)"
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+# generate_logs <root> <workflows_per_day>
+generate_logs() {
+    local root="$1"
+    local per_day="$2"
+    local d day
+
+    for ((d = DAYS; d >= 0; d--)); do
+        day=$(date -d "$d days ago" +%Y%m%d)
+        mkdir -p "$root/logs/worktree-states/$day" "$root/logs/worktree-history/$day"
+        awk -v day="$day" -v n="$per_day" -v seed="$d" \
+            -v states="$root/logs/worktree-states/$day/states.ndjson" \
+            -v history="$root/logs/worktree-history/$day/history.ndjson" '
+            function ts(sec) {
+                return sprintf("%s-%s-%sT%02d:%02d:%02dZ", substr(day, 1, 4), substr(day, 5, 2), substr(day, 7, 2),
+                    int(sec / 3600), int(sec % 3600 / 60), sec % 60)
+            }
+            BEGIN {
+                srand(seed + n)
+                split("claude gemini qwen", ais, " ")
+                for (w = 1; w <= n; w++) {
+                    start = int((w - 1) * 80000 / n)
+                    total = 0
+                    for (a = 1; a <= 3; a++) {
+                        dur = 30 + int(rand() * 600)
+                        if (dur > total) total = dur
+                        printf "{\"timestamp\":\"%s\",\"ai\":\"%s\",\"state\":\"creating\",\"branch\":\"ai/%s/%d\"}\n", ts(start), ais[a], ais[a], w > states
+                        printf "{\"timestamp\":\"%s\",\"ai\":\"%s\",\"state\":\"active\"}\n", ts(start + 2), ais[a] > states
+                        printf "{\"timestamp\":\"%s\",\"ai\":\"%s\",\"state\":\"cleaning\"}\n", ts(start + dur), ais[a] > states
+                        printf "{\"timestamp\":\"%s\",\"ai\":\"%s\",\"state\":\"none\"}\n", ts(start + dur + 1), ais[a] > states
+                    }
+                    printf "{\"timestamp\":\"%s\",\"event\":\"execution_end\",\"workflow_id\":\"multi-ai-full-orchestrate-%d\",\"status\":\"%s\",\"duration\":%d,\"metrics\":{}}\n",
+                        ts(start + total), day * 1000 + w, rand() < 0.9 ? "success" : "failure", total > history
+                }
+            }'
+    done
+}
+
+# Previous worktree-metrics.sh scans (kept here only as the baseline)
+legacy_get_workflow_avg_duration() {
+    local workflow="$1"
+    local days="${2:-7}"
+
+    local total_duration=0
+    local count=0
+
+    for d in $(seq 0 $days); do
+        local check_date
+        check_date=$(date -d "$d days ago" +%Y%m%d)
+        local history_file="$LEGACY_ROOT/logs/worktree-history/$check_date/history.ndjson"
+
+        if [[ -f "$history_file" ]]; then
+            while IFS= read -r line; do
+                if echo "$line" | grep -q "\"event\":\"execution_end\"" && \
+                   echo "$line" | grep -q "\"workflow_id\":\"$workflow"; then
+                    local duration
+                    duration=$(echo "$line" | grep -o '"duration":[0-9]*' | cut -d':' -f2)
+                    total_duration=$((total_duration + duration))
+                    count=$((count + 1))
+                fi
+            done < "$history_file"
+        fi
+    done
+
+    if [[ $count -gt 0 ]]; then
+        echo "$((total_duration / count))"
+    else
+        echo "0"
+    fi
+}
+
+legacy_get_ai_avg_duration() {
+    local ai="$1"
+    local days="${2:-7}"
+
+    local total_duration=0
+    local count=0
+
+    for d in $(seq 0 $days); do
+        local check_date
+        check_date=$(date -d "$d days ago" +%Y%m%d)
+        local state_file="$LEGACY_ROOT/logs/worktree-states/$check_date/states.ndjson"
+
+        if [[ -f "$state_file" ]]; then
+            local creating_time=""
+            while IFS= read -r line; do
+                if echo "$line" | grep -q "\"ai\":\"$ai\""; then
+                    local state
+                    state=$(echo "$line" | grep -o '"state":"[^"]*"' | cut -d'"' -f4)
+                    local timestamp
+                    timestamp=$(echo "$line" | grep -o '"timestamp":"[^"]*"' | cut -d'"' -f4)
+
+                    if [[ "$state" == "creating" ]]; then
+                        creating_time="$timestamp"
+                    elif [[ "$state" == "cleaning" ]] && [[ -n "$creating_time" ]]; then
+                        local start_sec
+                        start_sec=$(date -d "$creating_time" +%s 2>/dev/null || echo 0)
+                        local end_sec
+                        end_sec=$(date -d "$timestamp" +%s 2>/dev/null || echo 0)
+
+                        if [[ $start_sec -gt 0 ]] && [[ $end_sec -gt 0 ]]; then
+                            local duration=$((end_sec - start_sec))
+                            total_duration=$((total_duration + duration))
+                            count=$((count + 1))
+                        fi
+
+                        creating_time=""
+                    fi
+                fi
+            done < "$state_file"
+        fi
+    done
+
+    if [[ $count -gt 0 ]]; then
+        echo "$((total_duration / count))"
+    else
+        echo "0"
+    fi
+}
+
+# time_ms <result_var> <command...> (stdout of the command is kept in LAST_OUTPUT)
+time_ms() {
+    local -n _tm_result="$1"
+    shift
+    local start end
+    start=${EPOCHREALTIME/./}
+    LAST_OUTPUT=$("$@")
+    end=${EPOCHREALTIME/./}
+    _tm_result=$(( (end - start) / 1000 ))
+}
+
+echo ""
+echo "=== Worktree Metrics Rollup Benchmark ==="
+
+generate_logs "$WORK_DIR/small" "$WORKFLOWS_PER_DAY"
+generate_logs "$WORK_DIR/large" $((WORKFLOWS_PER_DAY * 10))
+small_lines=$(cat "$WORK_DIR"/small/logs/worktree-*/*/*.ndjson | wc -l)
+large_lines=$(cat "$WORK_DIR"/large/logs/worktree-*/*/*.ndjson | wc -l)
+echo "Days: $((DAYS + 1)), workflows/day: $WORKFLOWS_PER_DAY ($small_lines log lines; 10x tree: $large_lines lines)"
+echo ""
+
+# Baseline: every query re-reads the whole window
+LEGACY_ROOT="$WORK_DIR/small"
+time_ms legacy_ai_ms legacy_get_ai_avg_duration qwen "$DAYS"
+legacy_ai="$LAST_OUTPUT"
+time_ms legacy_wf_ms legacy_get_workflow_avg_duration multi-ai-full-orchestrate "$DAYS"
+legacy_wf="$LAST_OUTPUT"
+
+# run_rollups <root> <label>: times the rollup queries on one tree and prints its table row
+run_rollups() {
+    local root="$1"
+    local label="$2"
+    (
+        export PROJECT_ROOT="$root" VIBE_LOG_DIR="$WORK_DIR/vibe"
+        cd "$root"
+        # shellcheck source=orchestrate/lib/worktree-metrics.sh
+        source "$BENCH_ROOT/scripts/orchestrate/lib/worktree-metrics.sh"
+
+        local backfill_ms ai_ms wf_ms pct_ms summary_ms
+        time_ms backfill_ms get_ai_avg_duration qwen "$DAYS"
+        echo "$LAST_OUTPUT" > "$root/ai_avg"
+        time_ms ai_ms get_ai_avg_duration qwen "$DAYS"
+        time_ms wf_ms get_workflow_avg_duration multi-ai-full-orchestrate "$DAYS"
+        echo "$LAST_OUTPUT" > "$root/wf_avg"
+        time_ms pct_ms get_duration_percentiles ai "" "$DAYS"
+        echo "$LAST_OUTPUT" > "$root/ai_pct"
+        time_ms summary_ms generate_metrics_summary "$DAYS"
+
+        printf "  %-30s %10s %8s %8s %12s %9s\n" "$label" "${backfill_ms}ms" "${ai_ms}ms" "${wf_ms}ms" "${pct_ms}ms" "${summary_ms}ms"
+    )
+}
+
+printf "  %-30s %10s %8s %8s %12s %9s\n" "" "backfill" "AI avg" "wf avg" "percentiles" "summary"
+printf "  %-30s %10s %8s %8s %12s %9s\n" "legacy scan ($small_lines lines)" "-" "${legacy_ai_ms}ms" "${legacy_wf_ms}ms" "-" "-"
+run_rollups "$WORK_DIR/small" "rollups ($small_lines lines)"
+run_rollups "$WORK_DIR/large" "rollups ($large_lines lines)"
+
+# Incremental maintenance cost per event
+write_us=$(
+    export PROJECT_ROOT="$WORK_DIR/writes" VIBE_LOG_DIR="$WORK_DIR/vibe"
+    mkdir -p "$PROJECT_ROOT"
+    source "$BENCH_ROOT/scripts/orchestrate/lib/worktree-metrics-store.sh"
+    start=${EPOCHREALTIME/./}
+    for ((i = 1; i <= 100; i++)); do
+        metrics_rollup_state_event qwen creating
+        metrics_rollup_state_event qwen cleaning
+        metrics_hook_execution_completed "multi-ai-full-orchestrate-$i" 120 success
+    done
+    end=${EPOCHREALTIME/./}
+    echo $(( (end - start) / 300 ))
+)
+
+echo ""
+echo "  📊 Results:"
+echo "    - AI avg (qwen):        legacy $legacy_ai, rollups $(cat "$WORK_DIR/small/ai_avg")"
+echo "    - Workflow avg:         legacy $legacy_wf, rollups $(cat "$WORK_DIR/small/wf_avg")"
+echo "    - AI percentiles:       $(cat "$WORK_DIR/small/ai_pct")"
+echo "    - Rollup update cost:   $(( write_us / 1000 )).$(printf '%03d' $(( write_us % 1000 )))ms per event"
+if [[ "$legacy_ai" == "$(cat "$WORK_DIR/small/ai_avg")" && "$legacy_wf" == "$(cat "$WORK_DIR/small/wf_avg")" ]]; then
+    echo "    - ✅ Rollup results match the legacy scan"
+else
+    echo "    - ❌ Rollup results differ from the legacy scan"
+fi
+echo ""
+echo "=== Benchmark Complete ==="
@@ -0,0 +1,446 @@
+#!/usr/bin/env bash
+# Orchestrator Overhead Benchmark
+# Purpose: Run the real workflows of scripts/orchestrate/lib/workflows-*.sh end to
+#          end against deterministic stub AI CLIs and report what the
+#          orchestration itself costs, saved as a machine-readable baseline
+#
+# Usage:
+#   bash scripts/benchmark-orchestrator-overhead.sh [--compare BASELINE.json] [WORKFLOW...]
+#
+# Stub AI CLIs (claude, gemini, qwen, codex, cursor-agent, amp, droid) are put
+# first on PATH. They read the prompt, wait STUB_AI_LATENCY_MS, print
+# STUB_AI_OUTPUT_BYTES of text and fail STUB_AI_FAILURE_RATE percent of calls
+# (seeded by STUB_AI_SEED and the per-AI call number, so every run fails the same
+# calls). The stubs fork no processes, so every PID allocated during a run
+# belongs to the orchestrator (wrappers, timeout, subshells, jq, ...).
+#
+# Per workflow (median of ORCH_BENCH_RUNS runs, each with a cold result cache):
+#   wall_ms      - wall time of the workflow
+#   stub_ms      - time at least one stub AI was running (union of intervals)
+#   overhead_ms  - wall_ms - stub_ms: time spent with no AI working
+#   forks        - PIDs allocated during the run, also split per phase (log_phase markers)
+#   functions    - one extra run with xtrace enabled in every bash process through
+#                  BASH_ENV (PS4 timestamps written to BASH_XTRACEFD):
+#                  self time per library function, i.e. the time from each traced
+#                  command to the next one of the same process, cut when a new
+#                  process (subshell, pipeline, command substitution) appears, minus
+#                  the time a stub AI was running (so it breaks down overhead_ms);
+#                  wait/sleep and the last command of each process are not counted
+#
+# Environment:
+#   ORCH_BENCH_RUNS        Runs per workflow (default: 3)
+#   ORCH_BENCH_PROFILE     1 to add the xtrace run for the function profile (default: 1)
+#   ORCH_BENCH_TOP         Functions kept per workflow in the profile (default: 15)
+#   ORCH_BENCH_OUTPUT      Baseline file (default: logs/benchmarks/orchestrator-overhead-<timestamp>.json)
+#   ORCH_BENCH_TOLERANCE   --compare: allowed growth of overhead_ms / forks in % (default: 25)
+#   ORCH_BENCH_MIN_DELTA_MS --compare: overhead growth below this is noise (default: 50)
+#   STUB_AI_LATENCY_MS     Stub latency (default: 200), per AI: STUB_AI_LATENCY_MS_QWEN etc.
+#   STUB_AI_OUTPUT_BYTES   Stub output size (default: 2048)
+#   STUB_AI_FAILURE_RATE   Percent of stub calls that fail (default: 0)
+#   STUB_AI_SEED           Seed of the failure pattern (default: 1)
+#
+# Workflows driven by YAML profiles need yq v4 and are skipped without it.
+# Exit code: 1 if --compare finds a regression, otherwise 0 (workflow exit codes
+# are recorded in the baseline, not propagated).
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+BENCH_ROOT="$PROJECT_ROOT"
+
+DIRECT_WORKFLOWS=(
+    multi-ai-simple-fork-join
+    multi-ai-speed-prototype
+    multi-ai-code-review
+    multi-ai-full-review
+    multi-ai-coderabbit-review
+    multi-ai-dual-review
+    multi-ai-quad-review
+)
+YAML_WORKFLOWS=(
+    multi-ai-full-orchestrate
+    multi-ai-enterprise-quality
+    multi-ai-hybrid-development
+    multi-ai-consensus-review
+    multi-ai-chatdev-develop
+    multi-ai-collaborative-planning
+    multi-ai-collaborative-testing
+    multi-ai-discuss-before
+    multi-ai-review-after
+    multi-ai-coa-analyze
+)
+
+COMPARE_FILE=""
+WORKFLOWS=()
+while [[ $# -gt 0 ]]; do
+    case "$1" in
+        --compare)
+            COMPARE_FILE="$2"
+            shift 2
+            ;;
+        -h|--help)
+            sed -n '2,/^$/p' "${BASH_SOURCE[0]}" | sed 's/^# \{0,1\}//'
+            exit 0
+            ;;
+        *)
+            WORKFLOWS+=("$1")
+            shift
+            ;;
+    esac
+done
+
+RUNS="${ORCH_BENCH_RUNS:-3}"
+PROFILE="${ORCH_BENCH_PROFILE:-1}"
+TOP="${ORCH_BENCH_TOP:-15}"
+TOLERANCE="${ORCH_BENCH_TOLERANCE:-25}"
+MIN_DELTA_MS="${ORCH_BENCH_MIN_DELTA_MS:-50}"
+OUTPUT="${ORCH_BENCH_OUTPUT:-$PROJECT_ROOT/logs/benchmarks/orchestrator-overhead-$(date +%Y%m%d-%H%M%S).json}"
+
+export STUB_AI_LATENCY_MS="${STUB_AI_LATENCY_MS:-200}"
+export STUB_AI_OUTPUT_BYTES="${STUB_AI_OUTPUT_BYTES:-2048}"
+export STUB_AI_FAILURE_RATE="${STUB_AI_FAILURE_RATE:-0}"
+export STUB_AI_SEED="${STUB_AI_SEED:-1}"
+
+if [[ -n "$COMPARE_FILE" && ! -f "$COMPARE_FILE" ]]; then
+    echo "Baseline not found: $COMPARE_FILE" >&2
+    exit 1
+fi
+
+WORK_DIR="$(mktemp -d)"
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+PID_COUNTER=/proc/sys/kernel/ns_last_pid
+[[ -r "$PID_COUNTER" ]] || PID_COUNTER=""
+
+# ============================================================================
+# Stub AI CLIs
+# ============================================================================
+
+mkdir -p "$WORK_DIR/path" "$WORK_DIR/stub-state"
+mkfifo "$WORK_DIR/stub-state/idle.fifo"
+
+# Everything below uses builtins only: the wait is a read on an idle FIFO
+cat > "$WORK_DIR/path/stub-ai" <<'EOF'
+#!/usr/bin/env bash
+started=$EPOCHREALTIME
+ai=${0##*/}
+ai=${ai%-agent}
+[[ -t 0 ]] || mapfile -t _prompt
+
+echo >> "$STUB_AI_STATE/$ai.calls"
+mapfile -t _calls < "$STUB_AI_STATE/$ai.calls"
+n=${#_calls[@]}
+
+latency_var="STUB_AI_LATENCY_MS_${ai^^}"
+latency_ms=${!latency_var:-$STUB_AI_LATENCY_MS}
+if (( latency_ms > 0 )); then
+    printf -v secs '%d.%03d' $((latency_ms / 1000)) $((latency_ms % 1000))
+    read -rt "$secs" -u 9 9<>"$STUB_AI_STATE/idle.fifo" || true
+fi
+
+# Seeded hash of (seed, AI, call number) decides the failures
+h=$STUB_AI_SEED
+for ((i = 0; i < ${#ai}; i++)); do
+    printf -v c '%d' "'${ai:i:1}"
+    h=$(( (h * 31 + c) % 1000003 ))
+done
+h=$(( ((h * 7919 + n) * 1103515245 + 12345) & 0x7fffffff ))
+status=0
+(( h % 100 < STUB_AI_FAILURE_RATE )) && status=1
+
+if [[ $status -eq 0 ]]; then
+    line="stub $ai response, call $n"$'\n'
+    printf -v pad '%*s' $((STUB_AI_OUTPUT_BYTES / ${#line} + 1)) ''
+    out=${pad// /$line}
+    printf '%s' "${out:0:STUB_AI_OUTPUT_BYTES}"
+else
+    echo "Error: stub $ai failure (call $n)" >&2
+fi
+
+printf '%s %s %s %s %s\n' "$ai" "$n" "${started/./}" "${EPOCHREALTIME/./}" "$status" >> "$STUB_AI_LOG"
+exit $status
+EOF
+chmod +x "$WORK_DIR/path/stub-ai"
+for cli in claude gemini qwen codex cursor-agent amp droid; do
+    ln -s stub-ai "$WORK_DIR/path/$cli"
+done
+
+# Runner: loads the orchestrator like a user session and calls one workflow.
+# log_phase / log_phase_start are wrapped to mark phase boundaries.
+cat > "$WORK_DIR/runner.sh" <<'EOF'
+#!/usr/bin/env bash
+workflow=$1
+shift
+source "$BENCH_ROOT/scripts/orchestrate/orchestrate-multi-ai.sh"
+
+_orch_bench_mark() {
+    local last_pid=0
+    [[ -n "$ORCH_BENCH_PID_COUNTER" ]] && read -r last_pid < "$ORCH_BENCH_PID_COUNTER"
+    printf '%s %s %s\n' "${EPOCHREALTIME/./}" "$last_pid" "$1" >> "$ORCH_BENCH_PHASES"
+}
+for fn in log_phase log_phase_start; do
+    declare -f "$fn" >/dev/null || continue
+    eval "_orch_bench_$(declare -f "$fn")"
+    eval "$fn() { _orch_bench_mark \"\$1\"; _orch_bench_$fn \"\$@\"; }"
+done
+
+"$workflow" "$@"
+EOF
+
+# Traced run: every bash process (runner, wrappers, helper scripts, stubs) sources
+# this through BASH_ENV, so xtrace reaches scripts the workflows start
+cat > "$WORK_DIR/trace-env.sh" <<'EOF'
+exec 19>>"$ORCH_BENCH_TRACE"
+BASH_XTRACEFD=19
+PS4='+${EPOCHREALTIME/./} ${BASHPID} ${BASH_SOURCE[0]:-bash}:${FUNCNAME[0]:-main} '
+set -x
+EOF
+
+# Scratch git repository the review workflows look at
+mkdir -p "$WORK_DIR/repo"
+(
+    cd "$WORK_DIR/repo"
+    git init --quiet
+    git config user.email bench@example.com
+    git config user.name Bench
+    cp "$PROJECT_ROOT/examples/eva_tetris.py" . 2>/dev/null || echo "print('tetris')" > eva_tetris.py
+    git add -A && git commit --quiet -m base
+    echo "# pause menu" >> eva_tetris.py
+    git commit --quiet -am "Add pause menu"
+)
+
+# ============================================================================
+# Measurement
+# ============================================================================
+
+# read_last_pid <var>
+read_last_pid() {
+    local -n _rlp_result="$1"
+    _rlp_result=0
+    [[ -n "$PID_COUNTER" ]] && read -r _rlp_result < "$PID_COUNTER"
+    return 0
+}
+
+# run_once <workflow> <run_dir> [trace_file]: runs one workflow in a fresh project root
+# Writes run.json into run_dir
+run_once() {
+    local workflow="$1"
+    local run_dir="$2"
+    local trace="${3:-}"
+    local root="$run_dir/root"
+    local d
+
+    mkdir -p "$root/logs"
+    for d in bin config scripts examples src templates; do
+        ln -s "$PROJECT_ROOT/$d" "$root/$d"
+    done
+    rm -f "$WORK_DIR/stub-state/"*.calls
+    : > "$run_dir/stub.log"
+    : > "$run_dir/phases.log"
+
+    local start_us end_us start_pid end_pid exit_code=0
+    read_last_pid start_pid
+    start_us=${EPOCHREALTIME/./}
+    (
+        cd "$WORK_DIR/repo"
+        export PATH="$WORK_DIR/path:$PATH"
+        export PROJECT_ROOT="$root" BENCH_ROOT
+        export AI_CACHE_DIR="$root/.cache/ai-results"
+        export STUB_AI_LOG="$run_dir/stub.log" STUB_AI_STATE="$WORK_DIR/stub-state"
+        export ORCH_BENCH_PHASES="$run_dir/phases.log" ORCH_BENCH_PID_COUNTER="$PID_COUNTER"
+        if [[ -n "$trace" ]]; then
+            export ORCH_BENCH_TRACE="$trace" BASH_ENV="$WORK_DIR/trace-env.sh"
+        fi
+        export MULTI_AI_INIT=test SKIP_VERSION_CHECK=1 WRAPPER_NON_INTERACTIVE=1
+        exec bash "$WORK_DIR/runner.sh" "$workflow" "Add a pause menu to eva_tetris.py"
+    ) < /dev/null > "$run_dir/output.log" 2>&1 || exit_code=$?
+    end_us=${EPOCHREALTIME/./}
+    read_last_pid end_pid
+
+    # Stub intervals → union, then phases from the markers
+    local stub
+    stub=$(sort -n -k3 "$run_dir/stub.log" | awk '
+        { calls++; failures += $5
+          if (n == 0 || $3 > e) { total += e - s; s = $3; e = $4; n = 1 } else if ($4 > e) e = $4 }
+        END { if (n) total += e - s; printf "%d %d %d", total / 1000, calls, failures }')
+    local stub_ms stub_calls stub_failures
+    read -r stub_ms stub_calls stub_failures <<< "$stub"
+
+    local phases
+    phases=$(awk -v start_us="$start_us" -v end_us="$end_us" -v start_pid="$start_pid" -v end_pid="$end_pid" '
+        { t[NR] = $1; p[NR] = $2; $1 = $2 = ""; sub(/^ +/, ""); name[NR] = $0 }
+        END {
+            t[0] = start_us; p[0] = start_pid; name[0] = "setup"
+            t[NR + 1] = end_us; p[NR + 1] = end_pid
+            for (i = 0; i <= NR; i++) {
+                gsub(/["\\]/, "", name[i])
+                printf "%s{\"name\":\"%s\",\"ms\":%d,\"forks\":%d}", (i ? "," : "["), name[i],
+                    (t[i + 1] - t[i]) / 1000, p[i + 1] - p[i]
+            }
+            print "]"
+        }' "$run_dir/phases.log")
+
+    local wall_ms=$(( (end_us - start_us) / 1000 ))
+    jq -n --argjson exit_code "$exit_code" --argjson wall_ms "$wall_ms" --argjson stub_ms "$stub_ms" \
+        --argjson stub_calls "$stub_calls" --argjson stub_failures "$stub_failures" \
+        --argjson forks $(( end_pid - start_pid )) --argjson phases "$phases" \
+        '{exit_code: $exit_code, wall_ms: $wall_ms, stub_ms: $stub_ms, overhead_ms: ($wall_ms - $stub_ms),
+          stub_calls: $stub_calls, stub_failures: $stub_failures, forks: $forks, phases: $phases}' \
+        > "$run_dir/run.json"
+}
+
+# profile_trace <trace_file> <stub_log>: self time per library function as a JSON array
+profile_trace() {
+    sort -n -k3 "$2" | awk '
+        # Union of the stub intervals
+        NR == FNR {
+            if (n == 0 || $3 > e[n]) { n++; s[n] = $3; e[n] = $4 } else if ($4 > e[n]) e[n] = $4
+            next
+        }
+        function outside_stubs(from, to,   i, d) {
+            d = to - from
+            for (i = 1; i <= n; i++) {
+                if (s[i] >= to) break
+                if (e[i] > from) d -= (e[i] < to ? e[i] : to) - (s[i] > from ? s[i] : from)
+            }
+            return d
+        }
+        /^\++[0-9]+ [0-9]+ [^ ]+:/ {
+            sub(/^\++/, "")
+            t = $1; pid = $2; fn = $3; cmd = $4
+            sub(/.*\//, "", fn)
+            if (!(pid in seen)) {
+                # A new process: every running command now waits for (or just forked) it
+                seen[pid] = 1
+                for (p in open) if (!(p in cut)) cut[p] = t
+            }
+            if (pid in open && !blocking[pid]) {
+                self[open[pid]] += outside_stubs(start[pid], (pid in cut) ? cut[pid] : t)
+            }
+            open[pid] = fn; start[pid] = t; delete cut[pid]
+            blocking[pid] = (cmd == "wait" || cmd == "sleep")
+            commands[fn]++
+        }
+        END { for (fn in commands) printf "%d %d %s\n", self[fn] / 1000, commands[fn], fn }
+    ' - "$1" | sort -rn | head -n "$TOP" | \
+        jq -R -s 'split("\n") | map(select(length > 0) | split(" ") | {function: .[2], self_ms: (.[0] | tonumber), commands: (.[1] | tonumber)})'
+}
+
+# ============================================================================
+# Main
+# ============================================================================
+
+yq_v4=false
+if MULTI_AI_INIT=test PROJECT_ROOT="$PROJECT_ROOT" bash -c \
+    'source "$0/scripts/orchestrate/lib/multi-ai-core.sh"; source "$0/scripts/orchestrate/lib/multi-ai-config.sh"; check_yq_dependency' \
+    "$BENCH_ROOT" >/dev/null 2>&1 < /dev/null; then
+    yq_v4=true
+fi
+
+if [[ ${#WORKFLOWS[@]} -eq 0 ]]; then
+    WORKFLOWS=("${DIRECT_WORKFLOWS[@]}" "${YAML_WORKFLOWS[@]}")
+fi
+
+echo ""
+echo "=== Orchestrator Overhead Benchmark ==="
+echo "Runs: $RUNS per workflow, stub latency: ${STUB_AI_LATENCY_MS}ms, output: ${STUB_AI_OUTPUT_BYTES}B, failure rate: ${STUB_AI_FAILURE_RATE}%"
+[[ -n "$PID_COUNTER" ]] || echo "⚠️  $PID_COUNTER not readable, forks are reported as 0"
+echo ""
+
+printf "  %-34s %6s %9s %9s %10s %6s %7s\n" "" "exit" "wall" "stub" "overhead" "calls" "forks"
+
+mkdir -p "$WORK_DIR/results"
+for workflow in "${WORKFLOWS[@]}"; do
+    result="$WORK_DIR/results/$workflow.json"
+
+    if [[ " ${YAML_WORKFLOWS[*]} " == *" $workflow "* ]] && ! $yq_v4; then
+        jq -n '{status: "skipped", reason: "requires yq v4"}' > "$result"
+        printf "  %-34s %s\n" "$workflow" "skipped (requires yq v4)"
+        continue
+    fi
+
+    for ((run = 1; run <= RUNS; run++)); do
+        mkdir -p "$WORK_DIR/runs/$workflow/$run"
+        run_once "$workflow" "$WORK_DIR/runs/$workflow/$run"
+    done
+
+    functions='[]'
+    if [[ "$PROFILE" == "1" ]]; then
+        mkdir -p "$WORK_DIR/runs/$workflow/trace"
+        run_once "$workflow" "$WORK_DIR/runs/$workflow/trace" "$WORK_DIR/runs/$workflow/trace/xtrace.log"
+        functions=$(profile_trace "$WORK_DIR/runs/$workflow/trace/xtrace.log" "$WORK_DIR/runs/$workflow/trace/stub.log")
+    fi
+
+    # Median run by wall time; its phases are reported
+    jq -s --argjson functions "$functions" '
+        def median(f): map(f) | sort | .[length / 2 | floor];
+        (sort_by(.wall_ms) | .[length / 2 | floor]) as $mid
+        | {status: (if $mid.exit_code == 0 then "ok" else "failed" end),
+           exit_code: $mid.exit_code,
+           wall_ms: median(.wall_ms), stub_ms: median(.stub_ms), overhead_ms: median(.overhead_ms),
+           stub_calls: $mid.stub_calls, stub_failures: $mid.stub_failures, forks: median(.forks),
+           phases: $mid.phases, functions: $functions, runs: map(del(.phases))}' \
+        "$WORK_DIR/runs/$workflow"/[0-9]*/run.json > "$result"
+
+    jq -r --arg wf "$workflow" \
+        '"\($wf) \(.exit_code) \(.wall_ms) \(.stub_ms) \(.overhead_ms) \(.stub_calls) \(.forks)"' "$result" | \
+        while read -r name exit_code wall stub overhead calls forks; do
+            printf "  %-34s %6s %7sms %7sms %8sms %6s %7s\n" "$name" "$exit_code" "$wall" "$stub" "$overhead" "$calls" "$forks"
+        done
+done
+
+mkdir -p "$(dirname "$OUTPUT")"
+(
+    cd "$WORK_DIR/results"
+    for f in *.json; do
+        jq --arg wf "${f%.json}" '{($wf): .}' "$f"
+    done
+) | jq -s \
+    --arg timestamp "$(date -u +%Y-%m-%dT%H:%M:%SZ)" \
+    --arg commit "$(git -C "$PROJECT_ROOT" rev-parse --short HEAD 2>/dev/null || echo unknown)" \
+    --arg bash_version "$BASH_VERSION" --argjson cpus "$(nproc 2>/dev/null || echo 1)" \
+    --argjson runs "$RUNS" --argjson latency "$STUB_AI_LATENCY_MS" --argjson bytes "$STUB_AI_OUTPUT_BYTES" \
+    --argjson failure_rate "$STUB_AI_FAILURE_RATE" --argjson seed "$STUB_AI_SEED" \
+    '{benchmark: "orchestrator-overhead", timestamp: $timestamp, commit: $commit,
+      host: {cpus: $cpus, bash: $bash_version},
+      config: {runs: $runs, stub_latency_ms: $latency, stub_output_bytes: $bytes,
+               stub_failure_rate: $failure_rate, stub_seed: $seed},
+      workflows: add}' > "$OUTPUT"
+
+# Phase breakdown and hottest functions of the first measured workflow with phases
+echo ""
+echo "  📊 Results:"
+jq -r '.workflows | to_entries[] | select(.value.phases and (.value.phases | length) > 1) |
+    "    - \(.key) phases: " + ([.value.phases[] | "\(.name | .[0:32]) \(.ms)ms/\(.forks) forks"] | join(" | "))' "$OUTPUT" | head -n 3
+jq -r '[.workflows | to_entries[] | .value.functions // [] | .[]] | group_by(.function) |
+    map({function: .[0].function, self_ms: (map(.self_ms) | add)}) | sort_by(-.self_ms) | .[0:5][] |
+    "    - self time \(.function): \(.self_ms)ms"' "$OUTPUT"
+echo "    - Baseline saved: $OUTPUT"
+
+regressions=0
+if [[ -n "$COMPARE_FILE" ]]; then
+    echo ""
+    echo "  Comparison with $COMPARE_FILE (tolerance ${TOLERANCE}%, overhead noise < ${MIN_DELTA_MS}ms):"
+    while read -r name metric before after verdict; do
+        printf "    %-34s %-12s %8s → %-8s %s\n" "$name" "$metric" "$before" "$after" "$verdict"
+        [[ "$verdict" == "❌" ]] && regressions=$((regressions + 1))
+    done < <(jq -r -n --slurpfile old "$COMPARE_FILE" --slurpfile new "$OUTPUT" \
+        --argjson tol "$TOLERANCE" --argjson min_delta "$MIN_DELTA_MS" '
+        $old[0].workflows as $o | $new[0].workflows as $n
+        | $n | keys[] as $wf
+        | select($o[$wf].overhead_ms != null and $n[$wf].overhead_ms != null)
+        | ("overhead_ms", "forks") as $metric
+        | $o[$wf][$metric] as $before | $n[$wf][$metric] as $after
+        | (($after > $before * (1 + $tol / 100))
+           and ($metric != "overhead_ms" or $after - $before >= $min_delta)) as $worse
+        | "\($wf) \($metric) \($before) \($after) \(if $worse then "❌" else "✅" end)"')
+    if [[ $regressions -gt 0 ]]; then
+        echo "    - ❌ $regressions regression(s)"
+    else
+        echo "    - ✅ No regressions"
+    fi
+fi
+
+echo ""
+echo "=== Benchmark Complete ==="
+[[ $regressions -eq 0 ]]
@@ -0,0 +1,128 @@
+#!/usr/bin/env bash
+# Phase Streaming Benchmark
+# Purpose: Compare sequential phase hand-off with the pipelined phases of
+#          scripts/orchestrate/lib/phase-streaming.sh (ENABLE_PHASE_STREAMING)
+#
+# Usage:
+#   bash scripts/benchmark-phase-streaming.sh [PHASES] [STARTUP_S] [SECTIONS] [SECTION_S]
+#
+# Runs a PHASES-phase chain workflow (each phase consumes the previous phase's
+# output) against stub AI wrappers. Each stub takes STARTUP_S seconds to start
+# (CLI boot) before reading its prompt, then writes SECTIONS sections, one every
+# SECTION_S seconds. Reported: end-to-end time, and the time at which the last
+# phase received its complete input and started generating.
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+REPO_ROOT="$PROJECT_ROOT"
+
+PHASES="${1:-3}"
+STARTUP_S="${2:-1}"
+SECTIONS="${3:-3}"
+SECTION_S="${4:-1}"
+
+WORK_DIR="$(mktemp -d)"
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+AIS=(claude gemini qwen droid codex amp)
+if [ "$PHASES" -gt ${#AIS[@]} ]; then
+    echo "PHASES must be <= ${#AIS[@]}" >&2
+    exit 1
+fi
+
+STUB_ROOT="$WORK_DIR/root"
+EVENTS="$WORK_DIR/events.log"
+mkdir -p "$STUB_ROOT/bin" "$STUB_ROOT/config" "$WORK_DIR/path"
+
+# Chain workflow: phase N consumes phase N-1
+{
+    echo "profiles:"
+    echo "  stream-bench:"
+    echo "    workflows:"
+    echo "      chain:"
+    echo "        phases:"
+    for ((i = 0; i < PHASES; i++)); do
+        echo "          - name: \"Phase $((i + 1))\""
+        echo "            ai: ${AIS[$i]}"
+        echo "            role: stage$((i + 1))"
+        echo "            timeout: 120"
+        if [ $i -gt 0 ]; then
+            echo "            input_from: [\"${AIS[$((i - 1))]}\"]"
+        fi
+    done
+    echo "ai_fallbacks:"
+    echo "  claude: \"gemini\""
+    echo "ai_settings:"
+    echo "  enable_fallback: false"
+    echo "  fallback_timeout: 60"
+} > "$STUB_ROOT/config/multi-ai-profiles.yaml"
+
+for ((i = 0; i < PHASES; i++)); do
+    ai="${AIS[$i]}"
+    cat > "$STUB_ROOT/bin/${ai}-wrapper.sh" <<EOF
+#!/usr/bin/env bash
+sleep $STARTUP_S
+if [ "\${1:-}" = "--stdin" ]; then input=\$(cat); else input="\${2:-}"; fi
+echo "$i \$EPOCHREALTIME" >> "$EVENTS"
+for ((s = 1; s <= $SECTIONS; s++)); do
+    echo "## $ai section \$s (input: \${#input}B)"
+    sleep $SECTION_S
+done
+EOF
+    chmod +x "$STUB_ROOT/bin/${ai}-wrapper.sh"
+    ln -s "$STUB_ROOT/bin/${ai}-wrapper.sh" "$WORK_DIR/path/$ai"
+done
+
+# run_workflow <streaming> <total_var> <last_phase_var>
+run_workflow() {
+    local streaming="$1"
+    rm -f "$EVENTS"
+    rm -rf "$WORK_DIR/incremental" "$STUB_ROOT/logs"
+
+    local start=$EPOCHREALTIME
+    (
+        export PATH="$WORK_DIR/path:$PATH"
+        export PROJECT_ROOT="$STUB_ROOT" MULTI_AI_INIT=test
+        export AI_CACHE_ENABLED=0 ENABLE_AI_FALLBACK=false
+        export INCREMENTAL_CACHE_DIR="$WORK_DIR/incremental"
+        export ENABLE_PHASE_STREAMING="$streaming"
+        cd "$WORK_DIR"
+        # shellcheck source=orchestrate/orchestrate-multi-ai.sh
+        source "$REPO_ROOT/scripts/orchestrate/orchestrate-multi-ai.sh"
+        execute_yaml_workflow stream-bench chain "Benchmark task"
+    ) > "$WORK_DIR/run-$streaming.log" 2>&1 || {
+        echo "Workflow failed (streaming=$streaming):" >&2
+        tail -20 "$WORK_DIR/run-$streaming.log" >&2
+        exit 1
+    }
+    local end=$EPOCHREALTIME
+
+    local last_input
+    last_input=$(awk -v p=$((PHASES - 1)) '$1 == p { print $2 }' "$EVENTS")
+    printf -v "$2" '%d' $(( (${end/./} - ${start/./}) / 1000 ))
+    printf -v "$3" '%d' $(( (${last_input/./} - ${start/./}) / 1000 ))
+}
+
+echo ""
+echo "=== Phase Streaming Benchmark ==="
+echo "Phases: $PHASES, stub startup: ${STARTUP_S}s, output: $SECTIONS sections x ${SECTION_S}s"
+echo ""
+
+run_workflow false seq_total seq_last
+run_workflow true stream_total stream_last
+
+streamed=$(grep -c 'Streamed phase .* complete' "$WORK_DIR/run-true.log" || true)
+
+printf "  %-26s %12s %22s\n" "" "end-to-end" "last phase generating"
+printf "  %-26s %10dms %20dms\n" "sequential hand-off" "$seq_total" "$seq_last"
+printf "  %-26s %10dms %20dms\n" "streamed phases" "$stream_total" "$stream_last"
+echo ""
+echo "  Streamed phases: $streamed of $((PHASES - 1)) (others ran through execute_phase)"
+
+echo ""
+echo "  📊 Results:"
+echo "    - End-to-end: ${seq_total}ms → ${stream_total}ms ($((seq_total - stream_total))ms saved)"
+echo "    - Last phase starts generating: ${seq_last}ms → ${stream_last}ms"
+echo ""
+echo "=== Benchmark Complete ==="
@@ -0,0 +1,122 @@
+#!/usr/bin/env bash
+# PTY Output Stage Benchmark
+# Purpose: Measure the streaming ANSI/CR-redraw stripper + ring-buffer tail in
+#          bin/coderabbit-pty-wrapper.py on a synthetic spinner-heavy stream,
+#          and compare it against buffering everything and regex-cleaning at the end
+#
+# Usage:
+#   bash scripts/benchmark-pty-ansi-strip.sh [SIZE_MB]
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+PTY_WRAPPER="$PROJECT_ROOT/bin/coderabbit-pty-wrapper.py"
+
+SIZE_MB="${1:-100}"
+
+echo "=== PTY Output Stage Benchmark ==="
+echo "Stream: ${SIZE_MB}MB synthetic spinner-heavy CLI output"
+echo ""
+
+python3 - "$PTY_WRAPPER" "$SIZE_MB" <<'PY'
+import importlib.util
+import os
+import re
+import resource
+import sys
+import time
+import tracemalloc
+
+spec = importlib.util.spec_from_file_location("pty_wrapper", sys.argv[1])
+wrapper = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(wrapper)
+size = int(sys.argv[2]) * 1024 * 1024
+
+# One "frame" of a CLI that redraws a spinner many times before printing a finding
+spinner = b"".join(
+    b"\r\x1b[2K\x1b[36m%s\x1b[0m Analyzing changes... %d%%" % (c, i)
+    for i, c in enumerate([b"\xe2\xa0\x8b", b"\xe2\xa0\x99", b"\xe2\xa0\xb9", b"\xe2\xa0\xb8"] * 25)
+)
+finding = b"\r\x1b[2K\x1b[1m\x1b[33mMedium\x1b[0m src/app.py:42 - consider validating input\r\n"
+frame = spinner + finding
+chunk_size = 64 * 1024
+chunk = frame * (chunk_size // len(frame) + 1)
+
+
+def stream():
+    sent = 0
+    offset = 0
+    while sent < size:
+        # Misalign chunk boundaries so escape sequences get split across reads
+        piece = chunk[offset:offset + chunk_size - 17]
+        offset = (offset + 977) % len(frame)
+        sent += len(piece)
+        yield piece
+
+
+def run_streaming(out_path):
+    writer = wrapper.CoalescingWriter(
+        os.open(out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600),
+        threshold=wrapper.FILE_BLOCK, latency=None, owns_fd=True)
+    sink = wrapper.StreamSink([writer], strip_ansi=True, tail_kb=wrapper.TAIL_KB)
+    for piece in stream():
+        sink.write(piece)
+    sink.close()
+    return len(sink.tail.getvalue())
+
+
+def run_buffered(out_path):
+    # Naive approach: keep everything, clean once with full-output regexes
+    data = bytearray()
+    for piece in stream():
+        data += piece
+    text = re.sub(rb"\x1b\[[0-9;?]*[A-Za-z]", b"", bytes(data))
+    text = text.replace(b"\r\n", b"\n")
+    text = b"\n".join(line.rsplit(b"\r", 1)[-1] for line in text.split(b"\n"))
+    with open(out_path, "wb") as f:
+        f.write(text)
+    return len(text)
+
+
+def max_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+out_dir = os.environ.get("TMPDIR", "/tmp")
+results = {}
+# Streaming first: ru_maxrss only grows, so its reading is not polluted by the baseline
+for label, fn in (("streaming stripper", run_streaming), ("buffer + full regex", run_buffered)):
+    out_path = os.path.join(out_dir, f"ansi-bench-{os.getpid()}.out")
+    start = time.perf_counter()
+    fn(out_path)
+    elapsed = time.perf_counter() - start
+    rss = max_rss_mb()
+    out_size = os.path.getsize(out_path)
+    results[label] = (elapsed, rss, out_size)
+    os.unlink(out_path)
+    print(f"  {label:22s} {elapsed:7.2f}s  {size / elapsed / 1048576:7.1f} MB/s  "
+          f"max RSS {rss:8.1f} MB  clean output {out_size / 1048576:6.2f} MB")
+
+# Heap growth of the streaming stage alone (tracemalloc slows it down, so measured separately)
+size = min(size, 16 * 1024 * 1024)
+tracemalloc.start()
+run_streaming(os.path.join(out_dir, f"ansi-bench-{os.getpid()}.out"))
+_, stream_peak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+os.unlink(os.path.join(out_dir, f"ansi-bench-{os.getpid()}.out"))
+
+stream_time, stream_rss, stream_out = results["streaming stripper"]
+buffer_time, buffer_rss, buffer_out = results["buffer + full regex"]
+print("")
+print("  📊 Results:")
+print(f"    - Noise removed:     {int(sys.argv[2])}MB → {stream_out / 1048576:.2f}MB")
+print(f"    - Max RSS:           {buffer_rss:.1f}MB (buffered) vs {stream_rss:.1f}MB (streaming)")
+print(f"    - Streaming heap:    {stream_peak / 1048576:.2f}MB peak "
+      f"(tail ring buffer {wrapper.TAIL_KB}KB + {wrapper.FILE_BLOCK // 1048576}MB write block)")
+print(f"    - Wall time:         {buffer_time:.2f}s (buffered) vs {stream_time:.2f}s (streaming)")
+if stream_out != buffer_out:
+    print(f"    ⚠️  Output size differs from baseline ({stream_out} vs {buffer_out} bytes)")
+PY
+
+echo ""
+echo "=== Benchmark Complete ==="
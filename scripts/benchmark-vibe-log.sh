@@ -0,0 +1,201 @@
+#!/usr/bin/env bash
+# VibeLogger Write Benchmark
+# Purpose: Compare events/sec and forks per event of vibe_log before and after
+#          the compact JSONL sink (bin/vibe-log-sink.sh + vibe-log-collector.py)
+#
+# Usage:
+#   bash scripts/benchmark-vibe-log.sh [EVENTS]
+#
+# Cases:
+#   - legacy bin/vibe-logger-lib.sh vibe_log (3x date + multi-line heredoc)
+#   - legacy multi-ai-core.sh vibe_log (date, json_escape_string subshells, flock)
+#   - new vibe_log, direct append (VIBE_LOG_SINK=direct)
+#   - new vibe_log through the collector (includes starting it and the final flush;
+#     the start-up forks depend on how python3 is installed, e.g. pyenv shims)
+#
+# Forks are counted from /proc/sys/kernel/ns_last_pid (Linux), so run it on
+# an otherwise idle machine. Every case's output is checked as JSONL afterwards.
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+
+EVENTS="${1:-2000}"
+
+WORK_DIR="$(mktemp -d)"
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+export VIBE_LOG_DIR="$WORK_DIR/logs"
+export VIBE_LOG_SINK_DIR="$WORK_DIR/sink"
+# shellcheck source=../bin/vibe-logger-lib.sh
+source "$PROJECT_ROOT/bin/vibe-logger-lib.sh"
+
+# Previous bin/vibe-logger-lib.sh vibe_log (kept here only as the baseline)
+legacy_vibe_log() {
+    local event_type="$1"
+    local action="$2"
+    local metadata="$3"
+    local human_note="$4"
+    local ai_todo="${5:-}"
+    local tool_name="${6:-Generic}"
+
+    local timestamp
+    timestamp=$(date -u +%Y-%m-%dT%H:%M:%SZ)
+    local runid="${tool_name}_$(date +%s)_$$"
+
+    cat >> "$VIBE_LOG_DIR/${tool_name}_$(date +%H).jsonl" << EOF
+{
+  "timestamp": "$timestamp",
+  "runid": "$runid",
+  "event": "$event_type",
+  "action": "$action",
+  "metadata": $metadata,
+  "human_note": "$human_note",
+  "ai_context": {
+    "tool": "$tool_name",
+    "integration": "7AI",
+    "todo": "$ai_todo"
+  }
+}
+EOF
+}
+
+# Previous scripts/orchestrate/lib/multi-ai-core.sh vibe_log (baseline)
+legacy_json_escape_string() {
+    local input="${1-}"
+    input="${input//\\/\\\\}"
+    input="${input//\"/\\\"}"
+    input="${input//$'\n'/\\n}"
+    input="${input//$'\r'/\\r}"
+    input="${input//$'\t'/\\t}"
+    printf '"%s"' "$input"
+}
+legacy_core_vibe_log() {
+    local event_type="$1"
+    local action="$2"
+    local metadata="$3"
+    local human_note="$4"
+    local ai_todo="${5:-}"
+
+    local timestamp
+    timestamp=$(date -u +%Y-%m-%dT%H:%M:%SZ)
+    local runid="7ai_$(date +%s)_$$"
+    local log_file="$VIBE_LOG_DIR/7ai_orchestration_$(date +%H).jsonl"
+
+    local safe_event_type safe_action safe_human_note safe_ai_todo safe_runid safe_timestamp
+    safe_event_type=$(legacy_json_escape_string "$event_type")
+    safe_action=$(legacy_json_escape_string "$action")
+    safe_human_note=$(legacy_json_escape_string "$human_note")
+    safe_ai_todo=$(legacy_json_escape_string "$ai_todo")
+    safe_runid=$(legacy_json_escape_string "$runid")
+    safe_timestamp=$(legacy_json_escape_string "$timestamp")
+
+    local log_fd
+    exec {log_fd}>>"$log_file"
+    if command -v flock >/dev/null 2>&1; then
+        flock -w 5 "$log_fd"
+    fi
+    {
+        printf '{\n'
+        printf '  "timestamp": %s,\n' "$safe_timestamp"
+        printf '  "runid": %s,\n' "$safe_runid"
+        printf '  "event": %s,\n' "$safe_event_type"
+        printf '  "action": %s,\n' "$safe_action"
+        printf '  "metadata": %s,\n' "$metadata"
+        printf '  "human_note": %s,\n' "$safe_human_note"
+        printf '  "ai_context": {\n'
+        printf '    "tool": "Multi-AI Orchestration",\n'
+        printf '    "todo": %s\n' "$safe_ai_todo"
+        printf '  }\n'
+        printf '}\n'
+    } >&$log_fd
+    flock -u "$log_fd" 2>/dev/null || true
+    exec {log_fd}>&-
+}
+
+last_pid() {
+    local pid
+    read -r pid < /proc/sys/kernel/ns_last_pid
+    printf -v "$1" '%s' "$pid"
+}
+
+if [[ ! -r /proc/sys/kernel/ns_last_pid ]]; then
+    echo "❌ /proc/sys/kernel/ns_last_pid is not readable; fork counts need Linux" >&2
+    exit 1
+fi
+
+read -r PID_MAX < /proc/sys/kernel/pid_max
+
+METADATA='{"wrapper": "qwen", "status": "success", "execution_time_ms": 1234, "exit_code": 0}'
+declare -A CASE_RATE=()
+declare -A CASE_FORKS=()
+
+# run_case <label> <key> <log_dir> <function> [sink_mode]
+run_case() {
+    local label="$1" key="$2"
+    export VIBE_LOG_DIR="$WORK_DIR/$3"
+    local fn="$4"
+    VIBE_LOG_SINK="${5:-auto}"
+    mkdir -p "$VIBE_LOG_DIR"
+
+    local start end pid_start pid_end i
+    last_pid pid_start
+    start=$EPOCHREALTIME
+    for ((i=0; i<EVENTS; i++)); do
+        "$fn" "wrapper.done" "qwen_execution" "$METADATA" "qwen 実行完了: success (exit: 0)" \
+            "analyze_output,update_metrics" "qwen"
+    done
+    [[ "$fn" == "vibe_log" ]] && vibe_log_flush
+    end=$EPOCHREALTIME
+    last_pid pid_end
+
+    local elapsed_us=$(( ${end/./} - ${start/./} ))
+    local forks=$(( pid_end - pid_start ))
+    (( forks >= 0 )) || forks=$(( forks + PID_MAX ))
+    CASE_RATE[$key]=$(( EVENTS * 1000000 / (elapsed_us > 0 ? elapsed_us : 1) ))
+    CASE_FORKS[$key]=$(printf '%d.%02d' $((forks / EVENTS)) $((forks * 100 / EVENTS % 100)))
+    printf "  %-34s %7d events/sec  %6s forks/event  %6dms\n" "$label" "${CASE_RATE[$key]}" "${CASE_FORKS[$key]}" \
+        $((elapsed_us / 1000))
+}
+
+# jsonl_check <log_dir>: "<valid lines>/<lines>"
+jsonl_check() {
+    python3 - "$WORK_DIR/$1" <<'PY'
+import json, os, sys
+valid = total = 0
+for name in os.listdir(sys.argv[1]):
+    with open(os.path.join(sys.argv[1], name)) as f:
+        for line in f:
+            total += 1
+            try:
+                json.loads(line)
+                valid += 1
+            except ValueError:
+                pass
+print(f"{valid}/{total}")
+PY
+}
+
+echo ""
+echo "=== VibeLogger Write Benchmark ==="
+echo "Events: $EVENTS"
+echo ""
+
+run_case "legacy vibe-logger-lib vibe_log" legacy legacy legacy_vibe_log
+run_case "legacy multi-ai-core vibe_log" core legacy-core legacy_core_vibe_log
+run_case "vibe_log (direct append)" direct direct vibe_log direct
+run_case "vibe_log (collector)" collector collector vibe_log auto
+
+echo ""
+echo "  Valid JSONL lines: legacy $(jsonl_check legacy), legacy core $(jsonl_check legacy-core)," \
+    "direct $(jsonl_check direct), collector $(jsonl_check collector)"
+
+echo ""
+echo "  📊 Results:"
+echo "    - Forks/event:  ${CASE_FORKS[legacy]} (lib) / ${CASE_FORKS[core]} (core) → ${CASE_FORKS[direct]} (direct) / ${CASE_FORKS[collector]} (collector)"
+echo "    - Events/sec:   ${CASE_RATE[legacy]} (lib) / ${CASE_RATE[core]} (core) → ${CASE_RATE[direct]} (direct) / ${CASE_RATE[collector]} (collector)"
+if (( CASE_RATE[legacy] > 0 )); then
+    echo "    - Speedup:      $(( CASE_RATE[collector] / CASE_RATE[legacy] ))x (collector vs legacy lib)"
+fi
+echo ""
+echo "=== Benchmark Complete ==="
@@ -0,0 +1,145 @@
+#!/usr/bin/env bash
+# Worktree Cache LRU Benchmark
+# Purpose: Compare the jq-rewritten cache-index.json LRU with the append-only
+#          access log in scripts/orchestrate/lib/worktree-cache.sh
+#
+# Usage:
+#   bash scripts/benchmark-worktree-cache-lru.sh [TOUCHES] [KEYS] [CAPACITY]
+#
+# Performs TOUCHES cache accesses (update_lru_index) over KEYS cache keys of
+# 100 bytes each, with a size limit of CAPACITY entries, so that accesses to
+# keys outside the working set trigger LRU eviction. Both implementations see
+# the same access sequence; the surviving entries are compared at the end.
+
+set -euo pipefail
+
+PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
+export PROJECT_ROOT
+
+TOUCHES="${1:-200}"
+KEYS="${2:-14}"
+CAPACITY="${3:-7}"
+
+WORK_DIR="$(mktemp -d)"
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+export VIBE_LOG_DIR="$WORK_DIR/vibe"
+export WORKTREE_CACHE_DIR="$WORK_DIR/log-lru"
+export WORKTREE_CACHE_MAX_SIZE=$((CAPACITY * 100))
+# shellcheck source=orchestrate/lib/worktree-cache.sh
+source "$PROJECT_ROOT/scripts/orchestrate/lib/worktree-cache.sh" 2>/dev/null
+
+LEGACY_CACHE_DIR="$WORK_DIR/legacy"
+
+# Previous worktree-cache.sh LRU (kept here only as the baseline)
+legacy_update_lru_index() {
+    local ai_name="$1"
+    local size_bytes="$2"
+    local cache_index="$LEGACY_CACHE_DIR/cache-index.json"
+
+    jq --arg ai "$ai_name" 'del(.entries[] | select(.ai == $ai))' \
+        "$cache_index" > "$cache_index.tmp"
+    jq --arg ai "$ai_name" --arg size "$size_bytes" \
+        '.entries = [{ai: $ai, last_accessed: (now | todate), size_bytes: ($size | tonumber)}] + .entries' \
+        "$cache_index.tmp" > "$cache_index"
+    rm -f "$cache_index.tmp"
+    legacy_check_cache_size_limit
+}
+legacy_check_cache_size_limit() {
+    local cache_index="$LEGACY_CACHE_DIR/cache-index.json"
+    local max_size=$(jq -r '.max_size_bytes' "$cache_index")
+    local current_size=$(jq -r '[.entries[].size_bytes] | add // 0' "$cache_index")
+    if [[ $current_size -gt $max_size ]]; then
+        legacy_evict_lru_entries
+    fi
+}
+legacy_evict_lru_entries() {
+    local cache_index="$LEGACY_CACHE_DIR/cache-index.json"
+    local max_size=$(jq -r '.max_size_bytes' "$cache_index")
+    while true; do
+        local current_size=$(jq -r '[.entries[].size_bytes] | add // 0' "$cache_index")
+        if [[ $current_size -le $max_size ]]; then
+            break
+        fi
+        local oldest_ai=$(jq -r '.entries[-1].ai // ""' "$cache_index")
+        if [[ -z "$oldest_ai" ]]; then
+            break
+        fi
+        rm -rf "$LEGACY_CACHE_DIR/$oldest_ai/template" 2>/dev/null
+        rm -f "$LEGACY_CACHE_DIR/$oldest_ai/metadata.json" 2>/dev/null
+        legacy_evictions=$((legacy_evictions + 1))
+        jq --arg ai "$oldest_ai" 'del(.entries[] | select(.ai == $ai))' \
+            "$cache_index" > "$cache_index.tmp"
+        mv "$cache_index.tmp" "$cache_index"
+        vibe_log "worktree-lifecycle" "cache_evict" \
+            "{\"ai\":\"$oldest_ai\"}" \
+            "LRU cache eviction" "[]" "worktree-cache"
+    done
+}
+
+# elapsed_ms <var> <start>
+elapsed_ms() {
+    local end=$EPOCHREALTIME
+    printf -v "$1" '%d' $(( (${end/./} - ${2/./}) / 1000 ))
+}
+
+echo ""
+echo "=== Worktree Cache LRU Benchmark ==="
+echo "Touches: $TOUCHES, keys: $KEYS, capacity: $CAPACITY entries"
+echo ""
+
+# Access sequence: mostly a hot working set, every 4th access anywhere
+RANDOM=7919
+keys=()
+for ((i=0; i<TOUCHES; i++)); do
+    if (( i % 4 == 3 )); then
+        keys+=("ai$((RANDOM % KEYS))")
+    else
+        keys+=("ai$((RANDOM % (CAPACITY > 1 ? CAPACITY - 1 : 1)))")
+    fi
+done
+
+mkdir -p "$LEGACY_CACHE_DIR"
+printf '{"max_entries": 7, "current_size_bytes": 0, "max_size_bytes": %d, "entries": []}\n' \
+    "$WORKTREE_CACHE_MAX_SIZE" > "$LEGACY_CACHE_DIR/cache-index.json"
+init_worktree_cache 2>/dev/null
+
+legacy_evictions=0
+start=$EPOCHREALTIME
+for key in "${keys[@]}"; do
+    legacy_update_lru_index "$key" 100
+done
+elapsed_ms legacy_ms "$start"
+
+log_evictions=0
+start=$EPOCHREALTIME
+for key in "${keys[@]}"; do
+    WORKTREE_CACHE_EVICTED=()
+    update_lru_index "$key" 100
+    log_evictions=$((log_evictions + ${#WORKTREE_CACHE_EVICTED[@]}))
+done
+elapsed_ms log_ms "$start"
+
+legacy_entries=$(jq -r '[.entries[].ai] | sort | join(" ")' "$LEGACY_CACHE_DIR/cache-index.json")
+log_entries=$(printf '%s\n' "${!_WT_LRU_SIZE[@]}" | sort | paste -sd' ')
+if [[ "$legacy_entries" == "$log_entries" ]]; then
+    match="identical"
+else
+    match="DIFFERENT (legacy: $legacy_entries / log: $log_entries)"
+fi
+
+printf "  %-28s %10s %12s %10s\n" "" "total" "per touch" "evictions"
+printf "  %-28s %8dms %10dus %10d\n" "jq cache-index.json (legacy)" "$legacy_ms" \
+    $((legacy_ms * 1000 / TOUCHES)) "$legacy_evictions"
+printf "  %-28s %8dms %10dus %10d\n" "append-only access log" "$log_ms" \
+    $((log_ms * 1000 / TOUCHES)) "$log_evictions"
+echo ""
+echo "  Surviving entries: $match"
+echo "  Access log: $_WT_LRU_LINES lines after compaction (limit: $WORKTREE_CACHE_LRU_COMPACT_LINES + entries)"
+
+echo ""
+echo "  📊 Results:"
+echo "    - LRU touch: ${legacy_ms}ms → ${log_ms}ms for $TOUCHES accesses" \
+    "($(( legacy_ms / (log_ms > 0 ? log_ms : 1) ))x faster)"
+echo ""
+echo "=== Benchmark Complete ==="
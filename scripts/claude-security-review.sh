@@ -317,70 +317,6 @@ check_security_patterns() {
     echo "$total_vulnerabilities"
 }
 
-# Enrich JSON with security metadata (CWE, CVSS, OWASP)
-enrich_security_metadata() {
-    local md_file="$1"
-    local json_file="$2"
-
-    if [[ ! -f "$json_file" ]]; then
-        log_warning "JSON file not found for enrichment: $json_file"
-        return 1
-    fi
-
-    # Read markdown content for metadata extraction
-    local md_content
-    md_content=$(cat "$md_file")
-
-    # Process each finding and add security metadata
-    local findings_count
-    findings_count=$(jq -r '.findings | length' "$json_file")
-
-    for ((i=0; i<findings_count; i++)); do
-        local finding
-        finding=$(jq -r ".findings[$i]" "$json_file")
-        local title
-        title=$(echo "$finding" | jq -r '.title')
-        local body
-        body=$(echo "$finding" | jq -r '.body')
-
-        # Extract CWE
-        local cwe
-        cwe=$(extract_cwe "$title $body")
-
-        # Extract CVSS
-        local cvss
-        cvss=$(extract_cvss "$body")
-
-        # If no CVSS found, estimate from priority
-        if [[ -z "$cvss" ]] || [[ "$cvss" == "0.0" ]]; then
-            local priority
-            priority=$(echo "$finding" | jq -r '.priority')
-            case "$priority" in
-                0) cvss="9.5" ;;  # Critical
-                1) cvss="7.5" ;;  # High
-                2) cvss="5.5" ;;  # Medium
-                3) cvss="2.0" ;;  # Low
-                *) cvss="5.0" ;;
-            esac
-        fi
-
-        # Extract OWASP
-        local owasp
-        owasp=$(extract_owasp "$body")
-
-        # Update finding with security metadata
-        jq ".findings[$i] += {
-            \"security_metadata\": {
-                \"cwe_id\": $(if [[ -n "$cwe" ]]; then echo "\"CWE-$cwe\""; else echo "null"; fi),
-                \"cvss_score\": $(if [[ -n "$cvss" ]]; then echo "$cvss"; else echo "null"; fi),
-                \"owasp_category\": $(if [[ -n "$owasp" ]]; then echo "\"$owasp\""; else echo "null"; fi)
-            }
-        }" "$json_file" > "${json_file}.tmp" && mv "${json_file}.tmp" "$json_file"
-    done
-
-    return 0
-}
-
 # Generate SARIF format output from JSON
 generate_sarif_from_json() {
     local json_file="$1"
@@ -529,14 +465,10 @@ execute_claude_security_review() {
 
             # Convert Markdown to JSON using markdown-parser.sh
             if [[ "$MARKDOWN_PARSER_AVAILABLE" == "true" ]]; then
-                log_info "Converting Markdown security review to JSON..."
-                if parse_markdown_review "$md_file" "$json_file"; then
+                log_info "Converting Markdown security review to JSON (with CWE, CVSS, OWASP metadata)..."
+                if parse_markdown_review "$md_file" "$json_file" --security-metadata; then
                     log_success "Markdown → JSON conversion successful"
 
-                    # Extract security metadata (CWE, CVSS, OWASP) from findings
-                    log_info "Extracting security metadata (CWE, CVSS, OWASP)..."
-                    enrich_security_metadata "$md_file" "$json_file"
-
                     # Generate SARIF format for IDE integration
                     log_info "Generating SARIF format output..."
                     generate_sarif_from_json "$json_file" "$sarif_file" "$COMMIT_HASH"
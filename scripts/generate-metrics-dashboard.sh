@@ -170,6 +170,12 @@ cat > "$OUTPUT_FILE" << 'HTMLEOF'
                 <div class="metric-unit">sec</div>
             </div>
             
+            <div class="metric-card">
+                <div class="metric-title">⏱️ P95 Execution</div>
+                <div class="metric-value" id="p95-execution">-</div>
+                <div class="metric-unit">sec</div>
+            </div>
+            
             <div class="metric-card">
                 <div class="metric-title">✅ Success Rate</div>
                 <div class="metric-value" id="success-rate">-</div>
@@ -207,6 +213,10 @@ cat > "$OUTPUT_FILE" << 'HTMLEOF'
                 const avgExec = data.workflow_metrics.multi_ai_full_orchestrate_avg_sec;
                 document.getElementById('avg-execution').textContent = avgExec;
                 
+                // 実行時間の分位点（日別ロールアップのヒストグラムから算出）
+                const fullOrchestrate = data.workflow_duration_percentiles['multi-ai-full-orchestrate'];
+                document.getElementById('p95-execution').textContent = fullOrchestrate ? fullOrchestrate.p95_sec : '-';
+                
                 // 成功率
                 const latest = data.success_trend[data.success_trend.length - 1];
                 const rate = latest ? latest.success_rate : 0;
@@ -0,0 +1,504 @@
+#!/bin/bash
+set -euo pipefail
+
+#
+# adaptive-concurrency.sh
+#
+# Latency-driven Adaptive Concurrency Limiter for Spec-Driven Development
+# Keeps a per-AI concurrency limit that grows additively while round p90
+# latency stays near its baseline and shrinks multiplicatively on latency
+# inflation, timeouts and rate-limit errors (detected from the error output,
+# since exit codes stop at 255 and cannot carry an HTTP 429).
+#
+# The limiter state lives in the dispatching shell: acquire a slot before
+# starting a task and release it with the observed latency and exit code
+# when the task is reaped (see adaptive_run_queue, or mark_worker_active /
+# mark_worker_idle in worker-pool.sh).
+#
+
+# Configuration
+ADAPTIVE_MIN_CONCURRENCY="${ADAPTIVE_MIN_CONCURRENCY:-1}"
+ADAPTIVE_MAX_CONCURRENCY="${ADAPTIVE_MAX_CONCURRENCY:-${MAX_WORKERS:-32}}"
+ADAPTIVE_INITIAL_CONCURRENCY="${ADAPTIVE_INITIAL_CONCURRENCY:-2}"
+ADAPTIVE_MIN_ROUND_SAMPLES="${ADAPTIVE_MIN_ROUND_SAMPLES:-4}"      # Completions before a round is judged
+ADAPTIVE_LATENCY_TOLERANCE="${ADAPTIVE_LATENCY_TOLERANCE:-1.5}"    # p90 <= baseline * 1.5 is "steady"
+ADAPTIVE_LATENCY_BACKOFF="${ADAPTIVE_LATENCY_BACKOFF:-0.9}"        # Decrease factor on latency inflation
+ADAPTIVE_FAILURE_BACKOFF="${ADAPTIVE_FAILURE_BACKOFF:-0.5}"        # Decrease factor on timeout / 429
+PROJECT_ROOT="${PROJECT_ROOT:-$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)}"
+
+# Source VibeLogger if available
+if ! declare -F vibe_log &> /dev/null; then
+    if [[ -f "$PROJECT_ROOT/bin/vibe-logger-lib.sh" ]]; then
+        # shellcheck source=../../bin/vibe-logger-lib.sh
+        source "$PROJECT_ROOT/bin/vibe-logger-lib.sh"
+    else
+        # Fallback logging
+        vibe_log() { echo "[$(date +%FT%T)] $*" >&2; }
+    fi
+fi
+
+# Limiter state per AI (declared without reset so re-sourcing keeps it)
+declare -gA ADAPTIVE_LIMIT
+declare -gA ADAPTIVE_INFLIGHT
+declare -gA ADAPTIVE_PEAK_INFLIGHT
+declare -gA ADAPTIVE_ROUND_SAMPLES
+declare -gA ADAPTIVE_LAST_P90
+declare -gA ADAPTIVE_BASELINE_P90
+declare -gA ADAPTIVE_DRAIN
+declare -gA ADAPTIVE_COMPLETED
+declare -gA ADAPTIVE_TIMEOUTS
+declare -gA ADAPTIVE_RATE_LIMITED
+
+#
+# decimal_to_fixed4
+#
+# Converts a non-negative decimal string to an integer scaled by 10000,
+# without forking (replaces bc for threshold comparisons).
+#
+# Usage: decimal_to_fixed4 <decimal> <result_var>
+# Args:
+#   decimal - Decimal string such as "0.8" or "1.25"
+#   result_var - Name of the variable receiving the scaled integer
+# Returns: 0 on success
+#
+decimal_to_fixed4() {
+    local _fx_value="$1"
+    local _fx_int="${_fx_value%%.*}"
+    local _fx_frac=""
+
+    if [[ "$_fx_value" == *.* ]]; then
+        _fx_frac="${_fx_value#*.}"
+    fi
+    _fx_frac="${_fx_frac}0000"
+    _fx_frac="${_fx_frac:0:4}"
+
+    printf -v "$2" '%d' $(( 10#${_fx_int:-0} * 10000 + 10#$_fx_frac ))
+}
+
+#
+# adaptive_concurrency_init
+#
+# Initializes limiter state for an AI (no-op if already initialized).
+#
+# Usage: adaptive_concurrency_init <ai> [initial_limit]
+# Args:
+#   ai - AI name (e.g. claude, gemini)
+#   initial_limit - Starting limit (default: ADAPTIVE_INITIAL_CONCURRENCY)
+# Returns: 0 on success
+#
+adaptive_concurrency_init() {
+    local ai="$1"
+    local initial="${2:-$ADAPTIVE_INITIAL_CONCURRENCY}"
+
+    if [[ -n "${ADAPTIVE_LIMIT[$ai]:-}" ]]; then
+        return 0
+    fi
+
+    if (( initial < ADAPTIVE_MIN_CONCURRENCY )); then
+        initial=$ADAPTIVE_MIN_CONCURRENCY
+    elif (( initial > ADAPTIVE_MAX_CONCURRENCY )); then
+        initial=$ADAPTIVE_MAX_CONCURRENCY
+    fi
+
+    ADAPTIVE_LIMIT[$ai]=$initial
+    ADAPTIVE_INFLIGHT[$ai]=0
+    ADAPTIVE_PEAK_INFLIGHT[$ai]=0
+    ADAPTIVE_ROUND_SAMPLES[$ai]=""
+    ADAPTIVE_LAST_P90[$ai]=0
+    ADAPTIVE_BASELINE_P90[$ai]=0
+    ADAPTIVE_DRAIN[$ai]=0
+    ADAPTIVE_COMPLETED[$ai]=0
+    ADAPTIVE_TIMEOUTS[$ai]=0
+    ADAPTIVE_RATE_LIMITED[$ai]=0
+
+    return 0
+}
+
+#
+# adaptive_try_acquire
+#
+# Takes a concurrency slot for an AI if its current limit allows it.
+#
+# Usage: adaptive_try_acquire <ai>
+# Args:
+#   ai - AI name
+# Returns: 0 if a slot was taken, 1 if the AI is at its limit
+#
+adaptive_try_acquire() {
+    local ai="$1"
+    adaptive_concurrency_init "$ai"
+
+    if (( ADAPTIVE_INFLIGHT[$ai] >= ADAPTIVE_LIMIT[$ai] )); then
+        return 1
+    fi
+
+    ADAPTIVE_INFLIGHT[$ai]=$(( ADAPTIVE_INFLIGHT[$ai] + 1 ))
+    if (( ADAPTIVE_INFLIGHT[$ai] > ADAPTIVE_PEAK_INFLIGHT[$ai] )); then
+        ADAPTIVE_PEAK_INFLIGHT[$ai]=${ADAPTIVE_INFLIGHT[$ai]}
+    fi
+
+    return 0
+}
+
+#
+# adaptive_is_overload_failure
+#
+# Tells whether a failed completion signals overload: a timeout (exit 124/137)
+# or a rate-limit error. Rate limits are recognised only from the error output
+# (a 429 / rate limit / quota / too many requests message), so callers must
+# pass the task's stderr for them to count.
+#
+# Usage: adaptive_is_overload_failure <exit_code> [error_output]
+# Args:
+#   exit_code - Exit code of the task
+#   error_output - Captured stderr / error message (optional)
+# Returns: 0 for timeouts, 1 for other failures, 2 for rate limits
+#
+adaptive_is_overload_failure() {
+    local exit_code="$1"
+    local error_output="${2:-}"
+
+    case "$exit_code" in
+        124|137)
+            return 0
+            ;;
+    esac
+
+    shopt -s nocasematch
+    if [[ "$error_output" =~ rate.?limit|quota.?exceeded|too.?many.?requests|(^|[^0-9])429([^0-9]|$) ]]; then
+        shopt -u nocasematch
+        return 2
+    fi
+    shopt -u nocasematch
+
+    return 1
+}
+
+#
+# _adaptive_set_limit
+#
+# Applies a new limit (clamped to min/max) and logs the change.
+#
+# Usage: _adaptive_set_limit <ai> <new_limit> <reason>
+# Returns: 0 on success
+#
+_adaptive_set_limit() {
+    local ai="$1"
+    local new_limit="$2"
+    local reason="$3"
+    local old_limit="${ADAPTIVE_LIMIT[$ai]}"
+
+    if (( new_limit < ADAPTIVE_MIN_CONCURRENCY )); then
+        new_limit=$ADAPTIVE_MIN_CONCURRENCY
+    elif (( new_limit > ADAPTIVE_MAX_CONCURRENCY )); then
+        new_limit=$ADAPTIVE_MAX_CONCURRENCY
+    fi
+
+    if (( new_limit == old_limit )); then
+        return 0
+    fi
+
+    ADAPTIVE_LIMIT[$ai]=$new_limit
+
+    vibe_log "adaptive_concurrency.limit" "$reason" \
+        "{\"ai\": \"$ai\", \"old_limit\": $old_limit, \"new_limit\": $new_limit, \"p90_ms\": ${ADAPTIVE_LAST_P90[$ai]}, \"baseline_p90_ms\": ${ADAPTIVE_BASELINE_P90[$ai]}}" \
+        "Concurrency limit for $ai changed from $old_limit to $new_limit ($reason)"
+
+    return 0
+}
+
+#
+# _adaptive_decrease
+#
+# Shrinks the limit by a decimal factor (at least by one slot).
+#
+# Usage: _adaptive_decrease <ai> <factor> <reason>
+# Returns: 0 on success
+#
+_adaptive_decrease() {
+    local ai="$1"
+    local factor="$2"
+    local reason="$3"
+    local factor_fixed
+    decimal_to_fixed4 "$factor" factor_fixed
+
+    local limit="${ADAPTIVE_LIMIT[$ai]}"
+    local new_limit=$(( limit * factor_fixed / 10000 ))
+    if (( new_limit >= limit )); then
+        new_limit=$(( limit - 1 ))
+    fi
+
+    _adaptive_set_limit "$ai" "$new_limit" "$reason"
+}
+
+#
+# _adaptive_round_p90
+#
+# Computes the p90 latency of the current round's samples (in-process sort).
+#
+# Usage: _adaptive_round_p90 <ai> <result_var>
+# Returns: 0 on success
+#
+_adaptive_round_p90() {
+    local ai="$1"
+    local -a _ap_sorted=()
+    local _ap_sample _ap_i
+
+    # Insertion sort: rounds hold a few dozen samples at most
+    for _ap_sample in ${ADAPTIVE_ROUND_SAMPLES[$ai]}; do
+        _ap_i=${#_ap_sorted[@]}
+        while (( _ap_i > 0 && _ap_sorted[_ap_i - 1] > _ap_sample )); do
+            _ap_sorted[_ap_i]=${_ap_sorted[_ap_i - 1]}
+            _ap_i=$(( _ap_i - 1 ))
+        done
+        _ap_sorted[_ap_i]=$_ap_sample
+    done
+
+    # Nearest-rank p90: ceil(0.9 * n)
+    local _ap_rank=$(( (${#_ap_sorted[@]} * 9 + 9) / 10 ))
+    printf -v "$2" '%d' "${_ap_sorted[_ap_rank - 1]}"
+}
+
+#
+# _adaptive_end_round
+#
+# Judges a completed round: additive increase while p90 holds near the
+# baseline and the limit was actually used, gentle decrease on inflation.
+#
+# Usage: _adaptive_end_round <ai>
+# Returns: 0 on success
+#
+_adaptive_end_round() {
+    local ai="$1"
+    local p90 tolerance_fixed
+    _adaptive_round_p90 "$ai" p90
+    decimal_to_fixed4 "$ADAPTIVE_LATENCY_TOLERANCE" tolerance_fixed
+
+    local baseline="${ADAPTIVE_BASELINE_P90[$ai]}"
+    local peak="${ADAPTIVE_PEAK_INFLIGHT[$ai]}"
+    ADAPTIVE_LAST_P90[$ai]=$p90
+    ADAPTIVE_ROUND_SAMPLES[$ai]=""
+    ADAPTIVE_PEAK_INFLIGHT[$ai]=${ADAPTIVE_INFLIGHT[$ai]}
+
+    if (( baseline == 0 || p90 < baseline )); then
+        ADAPTIVE_BASELINE_P90[$ai]=$p90
+        baseline=$p90
+    fi
+
+    if (( p90 * 10000 <= baseline * tolerance_fixed )); then
+        # Steady: let the baseline follow slow drift (e.g. larger prompts)
+        ADAPTIVE_BASELINE_P90[$ai]=$(( baseline + (p90 - baseline) / 10 ))
+        if (( peak >= ADAPTIVE_LIMIT[$ai] )); then
+            _adaptive_set_limit "$ai" $(( ADAPTIVE_LIMIT[$ai] + 1 )) "increased"
+        fi
+    else
+        _adaptive_decrease "$ai" "$ADAPTIVE_LATENCY_BACKOFF" "latency_backoff"
+    fi
+
+    return 0
+}
+
+#
+# adaptive_release
+#
+# Returns a slot and feeds the completion into the limiter.
+#
+# Usage: adaptive_release <ai> <latency_ms> <exit_code> [error_output]
+# Args:
+#   ai - AI name
+#   latency_ms - Observed completion latency in milliseconds
+#   exit_code - Exit code of the task
+#   error_output - Captured stderr / error message (optional, needed for
+#                  rate-limit detection)
+# Returns: 0 on success
+#
+adaptive_release() {
+    local ai="$1"
+    local latency_ms="$2"
+    local exit_code="$3"
+    local error_output="${4:-}"
+    adaptive_concurrency_init "$ai"
+
+    if (( ADAPTIVE_INFLIGHT[$ai] > 0 )); then
+        ADAPTIVE_INFLIGHT[$ai]=$(( ADAPTIVE_INFLIGHT[$ai] - 1 ))
+    fi
+    ADAPTIVE_COMPLETED[$ai]=$(( ADAPTIVE_COMPLETED[$ai] + 1 ))
+
+    # Tasks started before the last backoff report the old load: skip them
+    local draining=0
+    if (( ADAPTIVE_DRAIN[$ai] > 0 )); then
+        ADAPTIVE_DRAIN[$ai]=$(( ADAPTIVE_DRAIN[$ai] - 1 ))
+        draining=1
+    fi
+
+    if (( exit_code != 0 )); then
+        local overload=0 reason
+        adaptive_is_overload_failure "$exit_code" "$error_output" || overload=$?
+        case "$overload" in
+            0)
+                ADAPTIVE_TIMEOUTS[$ai]=$(( ADAPTIVE_TIMEOUTS[$ai] + 1 ))
+                reason="timeout_backoff"
+                ;;
+            2)
+                ADAPTIVE_RATE_LIMITED[$ai]=$(( ADAPTIVE_RATE_LIMITED[$ai] + 1 ))
+                reason="rate_limit_backoff"
+                ;;
+            *)
+                # Ordinary task failure: says nothing about load
+                return 0
+                ;;
+        esac
+
+        # One multiplicative decrease per window of in-flight work
+        if (( draining == 0 )); then
+            _adaptive_decrease "$ai" "$ADAPTIVE_FAILURE_BACKOFF" "$reason"
+            ADAPTIVE_DRAIN[$ai]=${ADAPTIVE_INFLIGHT[$ai]}
+            ADAPTIVE_ROUND_SAMPLES[$ai]=""
+            ADAPTIVE_PEAK_INFLIGHT[$ai]=${ADAPTIVE_INFLIGHT[$ai]}
+        fi
+        return 0
+    fi
+
+    if (( draining == 1 )); then
+        return 0
+    fi
+
+    ADAPTIVE_ROUND_SAMPLES[$ai]+=" $latency_ms"
+
+    # A round is one limit's worth of completions (at least MIN_ROUND_SAMPLES)
+    local round_size="${ADAPTIVE_LIMIT[$ai]}"
+    if (( round_size < ADAPTIVE_MIN_ROUND_SAMPLES )); then
+        round_size=$ADAPTIVE_MIN_ROUND_SAMPLES
+    fi
+    local -a samples=(${ADAPTIVE_ROUND_SAMPLES[$ai]})
+    if (( ${#samples[@]} >= round_size )); then
+        _adaptive_end_round "$ai"
+    fi
+
+    return 0
+}
+
+#
+# adaptive_get_limit
+#
+# Returns the current concurrency limit for an AI.
+#
+# Usage: adaptive_get_limit <ai>
+# Returns: Limit (integer)
+#
+adaptive_get_limit() {
+    local ai="$1"
+    echo "${ADAPTIVE_LIMIT[$ai]:-$ADAPTIVE_INITIAL_CONCURRENCY}"
+}
+
+#
+# adaptive_is_saturated
+#
+# Tells whether an AI has as many tasks in flight as its limit allows.
+#
+# Usage: adaptive_is_saturated <ai>
+# Returns: 0 if saturated, 1 otherwise (also 1 for unknown AIs)
+#
+adaptive_is_saturated() {
+    local ai="$1"
+
+    if [[ -z "${ADAPTIVE_LIMIT[$ai]:-}" ]]; then
+        return 1
+    fi
+
+    (( ADAPTIVE_INFLIGHT[$ai] >= ADAPTIVE_LIMIT[$ai] ))
+}
+
+#
+# adaptive_concurrency_status
+#
+# Returns limiter state for every known AI as a JSON object keyed by AI.
+#
+# Usage: adaptive_concurrency_status
+# Returns: JSON string
+#
+adaptive_concurrency_status() {
+    local ai sep=""
+
+    printf '{'
+    for ai in "${!ADAPTIVE_LIMIT[@]}"; do
+        printf '%s"%s": {"limit": %d, "inflight": %d, "p90_ms": %d, "baseline_p90_ms": %d, "completed": %d, "timeouts": %d, "rate_limited": %d}' \
+            "$sep" "$ai" "${ADAPTIVE_LIMIT[$ai]}" "${ADAPTIVE_INFLIGHT[$ai]}" \
+            "${ADAPTIVE_LAST_P90[$ai]}" "${ADAPTIVE_BASELINE_P90[$ai]}" \
+            "${ADAPTIVE_COMPLETED[$ai]}" "${ADAPTIVE_TIMEOUTS[$ai]}" "${ADAPTIVE_RATE_LIMITED[$ai]}"
+        sep=", "
+    done
+    printf '}\n'
+}
+
+#
+# adaptive_run_queue
+#
+# Runs `<command> <task_id>` for every task in the background, never exceeding
+# the AI's adaptive limit, and feeds each completion back into the limiter.
+# The command's stderr is captured (and re-emitted) for 429 detection.
+#
+# Usage: adaptive_run_queue <ai> <command> <task_id>...
+# Args:
+#   ai - AI name the tasks are sent to
+#   command - Function or executable invoked as `<command> <task_id>`
+#   task_id - Task identifiers, dispatched in order
+# Returns: Number of failed tasks (0 if all succeeded, capped at 255)
+#
+adaptive_run_queue() {
+    local ai="$1"
+    local command="$2"
+    shift 2
+    local -a queue=("$@")
+    adaptive_concurrency_init "$ai"
+
+    local err_dir
+    err_dir=$(mktemp -d)
+    local -A started_us=() task_index=()
+    local next=0 failed=0 pid status now latency_ms error_file error_output
+
+    while (( next < ${#queue[@]} || ${#started_us[@]} > 0 )); do
+        while (( next < ${#queue[@]} )) && adaptive_try_acquire "$ai"; do
+            "$command" "${queue[$next]}" 2> "$err_dir/$next.err" &
+            started_us[$!]=${EPOCHREALTIME/./}
+            task_index[$!]=$next
+            next=$(( next + 1 ))
+        done
+
+        status=0
+        wait -n -p pid "${!started_us[@]}" || status=$?
+        [[ -n $pid ]] || continue
+        now=${EPOCHREALTIME/./}
+        latency_ms=$(( (now - started_us[$pid]) / 1000 ))
+        error_file="$err_dir/${task_index[$pid]}.err"
+        unset "started_us[$pid]" "task_index[$pid]"
+
+        error_output=""
+        if (( status != 0 )); then
+            error_output=$(< "$error_file")
+            failed=$(( failed + 1 ))
+        fi
+        cat "$error_file" >&2
+        rm -f "$error_file"
+
+        adaptive_release "$ai" "$latency_ms" "$status" "$error_output"
+    done
+
+    rm -rf "$err_dir"
+    return $(( failed > 255 ? 255 : failed ))
+}
+
+# Export functions for use in other scripts
+export -f decimal_to_fixed4
+export -f adaptive_concurrency_init
+export -f adaptive_try_acquire
+export -f adaptive_is_overload_failure
+export -f _adaptive_set_limit
+export -f _adaptive_decrease
+export -f _adaptive_round_p90
+export -f _adaptive_end_round
+export -f adaptive_release
+export -f adaptive_get_limit
+export -f adaptive_is_saturated
+export -f adaptive_concurrency_status
+export -f adaptive_run_queue
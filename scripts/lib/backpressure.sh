@@ -5,7 +5,9 @@ set -euo pipefail
 # backpressure.sh
 #
 # Backpressure Monitoring for Spec-Driven Development
-# Provides queue depth monitoring and throttling mechanisms.
+# Provides queue depth monitoring and throttling mechanisms. When an AI is
+# named, its adaptive concurrency limit (adaptive-concurrency.sh) and observed
+# latency drive backpressure and throttle duration.
 #
 
 # Configuration
@@ -23,6 +25,9 @@ else
     vibe_log() { echo "[$(date +%FT%T)] $*" >&2; }
 fi
 
+# shellcheck source=adaptive-concurrency.sh
+source "$(dirname "${BASH_SOURCE[0]}")/adaptive-concurrency.sh"
+
 #
 # get_queue_depth
 #
@@ -88,31 +93,26 @@ calculate_queue_utilization() {
         return 0
     fi
 
-    # Use bc for floating point division if available
-    if command -v bc &> /dev/null; then
-        local result
-        result=$(echo "scale=2; $depth / $capacity" | bc)
-        # Format to always show 2 decimal places (bc outputs "0" instead of "0.00")
-        printf "%.2f" "$result"
-    else
-        # Fallback: integer division with 2 decimal places
-        local scaled=$((depth * 100 / capacity))
-        printf "0.%02d" "$scaled"
-    fi
+    # Integer division with 2 decimal places (truncated, as bc scale=2)
+    local scaled=$((depth * 100 / capacity))
+    printf "%d.%02d" $((scaled / 100)) $((scaled % 100))
 }
 
 #
 # check_backpressure
 #
-# Checks if backpressure should be applied based on queue utilization.
+# Checks if backpressure should be applied based on queue utilization, or
+# because the given AI already runs as many tasks as its adaptive limit allows.
 #
-# Usage: check_backpressure [queue_name]
+# Usage: check_backpressure [queue_name] [ai]
 # Args:
 #   queue_name - Name of the queue (default: "default")
+#   ai - AI the queue feeds (optional)
 # Returns: 0 if backpressure detected, 1 otherwise
 #
 check_backpressure() {
     local queue_name="${1:-default}"
+    local ai="${2:-}"
 
     local depth capacity utilization
     depth=$(get_queue_depth "$queue_name")
@@ -123,17 +123,18 @@ check_backpressure() {
         "{\"queue\": \"$queue_name\", \"depth\": $depth, \"capacity\": $capacity, \"utilization\": $utilization}" \
         "Queue utilization: $utilization (threshold: $BACKPRESSURE_THRESHOLD)"
 
-    # Compare with threshold
-    if command -v bc &> /dev/null; then
-        if (( $(echo "$utilization >= $BACKPRESSURE_THRESHOLD" | bc -l) )); then
-            return 0
-        fi
-    else
-        # Fallback: integer comparison (threshold * 100)
-        local threshold_depth=$((capacity * 80 / 100))
-        if (( depth >= threshold_depth )); then
-            return 0
-        fi
+    # Compare with threshold in fixed point (no bc fork per check)
+    local threshold
+    decimal_to_fixed4 "$BACKPRESSURE_THRESHOLD" threshold
+    if (( capacity > 0 && depth * 100 / capacity * 100 >= threshold )); then
+        return 0
+    fi
+
+    if [[ -n "$ai" ]] && adaptive_is_saturated "$ai"; then
+        vibe_log "backpressure.check" "ai_saturated" \
+            "{\"queue\": \"$queue_name\", \"ai\": \"$ai\", \"limit\": ${ADAPTIVE_LIMIT[$ai]}}" \
+            "AI $ai is at its adaptive concurrency limit (${ADAPTIVE_LIMIT[$ai]})"
+        return 0
     fi
 
     return 1
@@ -142,18 +143,37 @@ check_backpressure() {
 #
 # apply_throttle
 #
-# Applies throttling by sleeping for a random duration.
+# Applies throttling by sleeping for a random duration. When an AI with
+# observed latency is given, sleeps for roughly the time until one of its
+# in-flight tasks completes (p90 / in-flight) instead.
 #
-# Usage: apply_throttle [jitter]
+# Usage: apply_throttle [jitter] [ai]
 # Args:
 #   jitter - Enable random jitter (default: true)
+#   ai - AI whose slot is awaited (optional)
 # Returns: 0 on success
 #
 apply_throttle() {
     local jitter="${1:-true}"
+    local ai="${2:-}"
     local sleep_duration=$THROTTLE_MIN_SLEEP
 
-    if [[ "$jitter" == "true" ]]; then
+    if [[ -n "$ai" ]] && (( ${ADAPTIVE_LAST_P90[$ai]:-0} > 0 )); then
+        local inflight="${ADAPTIVE_INFLIGHT[$ai]}"
+        (( inflight > 0 )) || inflight=1
+        local sleep_ms=$(( ADAPTIVE_LAST_P90[$ai] / inflight ))
+
+        if [[ "$jitter" == "true" ]]; then
+            # Random sleep between 50% and 150% of the expected wait
+            sleep_ms=$(( sleep_ms / 2 + RANDOM % (sleep_ms + 1) ))
+        fi
+        if (( sleep_ms < 100 )); then
+            sleep_ms=100
+        elif (( sleep_ms > THROTTLE_MAX_SLEEP * 1000 )); then
+            sleep_ms=$(( THROTTLE_MAX_SLEEP * 1000 ))
+        fi
+        printf -v sleep_duration '%d.%03d' $((sleep_ms / 1000)) $((sleep_ms % 1000))
+    elif [[ "$jitter" == "true" ]]; then
         # Random sleep between min and max
         local range=$((THROTTLE_MAX_SLEEP - THROTTLE_MIN_SLEEP))
         sleep_duration=$((THROTTLE_MIN_SLEEP + RANDOM % (range + 1)))
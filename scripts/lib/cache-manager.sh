@@ -7,11 +7,23 @@ set -euo pipefail
 # Cache Management System for Spec-Driven Development
 # Provides SHA-256 based caching with TTL management.
 #
+# Entries live in $CACHE_DIR/<key>.json. An append-only index file
+# ($CACHE_DIR/.index, one "key<TAB>path<TAB>size<TAB>mtime<TAB>expiry"
+# line per write, "-" size for deletions) is kept in memory, so TTL
+# checks, hits and stats never fork date/stat/find. Appends from other
+# processes are picked up incrementally through a long-lived read fd.
+# Files written before the index existed are still honoured through the
+# stat-based fallback. Once the index holds more than
+# CACHE_INDEX_COMPACT_RATIO lines per live entry it is rewritten with one
+# line per live entry.
+#
 
 # Configuration
 CACHE_DIR="${CACHE_DIR:-/tmp/spec-driven-cache}"
 CACHE_TTL="${CACHE_TTL:-86400}"  # Default: 24 hours in seconds
 PROJECT_ROOT="${PROJECT_ROOT:-$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd)}"
+CACHE_INDEX_COMPACT_RATIO="${CACHE_INDEX_COMPACT_RATIO:-4}"  # index lines per live entry
+CACHE_INDEX_COMPACT_MIN="${CACHE_INDEX_COMPACT_MIN:-256}"    # never compact below this many lines
 
 # Source VibeLogger if available
 if [[ -f "$PROJECT_ROOT/bin/vibe-logger-lib.sh" ]]; then
@@ -26,6 +38,224 @@ fi
 declare -g CACHE_HITS=0
 declare -g CACHE_MISSES=0
 
+# In-memory index (see header). Not exported: child shells load their own.
+declare -gA CACHE_INDEX_PATH=()
+declare -gA CACHE_INDEX_SIZE=()
+declare -gA CACHE_INDEX_MTIME=()
+declare -gA CACHE_INDEX_EXPIRY=()
+declare -g CACHE_INDEX_DIR=""
+declare -g CACHE_INDEX_FD=""
+declare -g CACHE_INDEX_OWNER=""
+declare -gi CACHE_INDEX_LINES=0
+
+# Keys that missed in the last cache_get_many / get_cached_specs call
+declare -ga CACHE_BATCH_MISSES=()
+
+#
+# _cache_now
+#
+# Current epoch seconds without forking date.
+#
+_cache_now() {
+    if [[ -n "${EPOCHSECONDS:-}" ]]; then
+        printf -v "$1" '%s' "$EPOCHSECONDS"
+    else
+        printf -v "$1" '%(%s)T' -1
+    fi
+}
+
+#
+# _cache_index_file
+#
+# Path of the index file for the current CACHE_DIR.
+#
+_cache_index_file() {
+    printf -v "$1" '%s' "$CACHE_DIR/.index"
+}
+
+#
+# _cache_index_reset
+#
+# Drops the in-memory index and closes the read fd.
+#
+_cache_index_reset() {
+    if [[ -n "$CACHE_INDEX_FD" && "$CACHE_INDEX_OWNER" == "$BASHPID" ]]; then
+        exec {CACHE_INDEX_FD}<&- 2>/dev/null || true
+    fi
+    CACHE_INDEX_PATH=()
+    CACHE_INDEX_SIZE=()
+    CACHE_INDEX_MTIME=()
+    CACHE_INDEX_EXPIRY=()
+    CACHE_INDEX_DIR=""
+    CACHE_INDEX_FD=""
+    CACHE_INDEX_OWNER=""
+    CACHE_INDEX_LINES=0
+}
+
+#
+# _cache_index_sync
+#
+# Loads the index on first use and applies lines appended since the last
+# call (by this or other processes). Reopens it if CACHE_DIR changed or
+# the file was replaced by cache_clear.
+#
+# Command substitutions share the parent's read fd offset, so a subshell
+# never reads from it; it keeps using the snapshot it inherited and
+# relies on the -f check plus the stat fallback for anything newer.
+#
+_cache_index_sync() {
+    local index_file
+    _cache_index_file index_file
+
+    if [[ -n "$CACHE_INDEX_OWNER" && "$CACHE_INDEX_OWNER" != "$BASHPID" ]]; then
+        [[ "$CACHE_INDEX_DIR" == "$CACHE_DIR" ]] && return 0
+        CACHE_INDEX_OWNER=""
+        CACHE_INDEX_FD=""
+    fi
+
+    if [[ "$CACHE_INDEX_DIR" != "$CACHE_DIR" ]] ||
+       [[ -z "$CACHE_INDEX_FD" ]] ||
+       ! [[ "$index_file" -ef "/dev/fd/$CACHE_INDEX_FD" ]]; then
+        _cache_index_reset
+        [[ -f "$index_file" ]] || return 0
+        exec {CACHE_INDEX_FD}<"$index_file" || { CACHE_INDEX_FD=""; return 0; }
+        CACHE_INDEX_DIR="$CACHE_DIR"
+        CACHE_INDEX_OWNER="$BASHPID"
+    fi
+
+    local key path size mtime expiry
+    while IFS=$'\t' read -r -u "$CACHE_INDEX_FD" key path size mtime expiry; do
+        CACHE_INDEX_LINES+=1
+        [[ -n "$key" ]] || continue
+        if [[ "$size" == "-" ]]; then
+            unset 'CACHE_INDEX_PATH[$key]' 'CACHE_INDEX_SIZE[$key]' \
+                  'CACHE_INDEX_MTIME[$key]' 'CACHE_INDEX_EXPIRY[$key]'
+        else
+            CACHE_INDEX_PATH[$key]="$path"
+            CACHE_INDEX_SIZE[$key]="$size"
+            CACHE_INDEX_MTIME[$key]="$mtime"
+            CACHE_INDEX_EXPIRY[$key]="$expiry"
+        fi
+    done
+    return 0
+}
+
+#
+# _cache_index_append
+#
+# Appends pre-formatted index lines (one O_APPEND write) and applies them
+# to the in-memory index by syncing.
+#
+_cache_index_append() {
+    local lines="$1"
+    local index_file
+    _cache_index_file index_file
+    printf '%s' "$lines" >> "$index_file" || return 1
+    _cache_index_sync
+    _cache_index_maybe_compact
+}
+
+#
+# _cache_index_maybe_compact
+#
+# Compacts the index once it holds more than CACHE_INDEX_COMPACT_RATIO
+# lines per live entry (and at least CACHE_INDEX_COMPACT_MIN lines).
+#
+_cache_index_maybe_compact() {
+    [[ "$CACHE_INDEX_OWNER" == "$BASHPID" ]] || return 0
+    (( CACHE_INDEX_LINES > CACHE_INDEX_COMPACT_MIN &&
+       CACHE_INDEX_LINES > ${#CACHE_INDEX_PATH[@]} * CACHE_INDEX_COMPACT_RATIO )) || return 0
+    _cache_index_compact
+}
+
+#
+# _cache_index_compact
+#
+# Rewrites the index with one line per live entry and renames it into
+# place. The new inode makes other processes reload it on their next sync.
+# Compactions are serialised by a lock on $CACHE_DIR/.index.lock; a process
+# that finds it held skips compacting. Lines appended to the old file after
+# the final sync are copied from the still-open read fd into the new one.
+# An append that lands in the old file after that copy loses only its
+# index line; the entry file is still honoured through the stat fallback.
+#
+_cache_index_compact() {
+    local index_file lock_fd
+    _cache_index_file index_file
+
+    exec {lock_fd}>>"$CACHE_DIR/.index.lock" || return 0
+    if ! flock -n "$lock_fd"; then
+        exec {lock_fd}>&-
+        return 0
+    fi
+
+    # Another process may have compacted already: reload before deciding
+    _cache_index_sync
+    if (( CACHE_INDEX_LINES > CACHE_INDEX_COMPACT_MIN &&
+          CACHE_INDEX_LINES > ${#CACHE_INDEX_PATH[@]} * CACHE_INDEX_COMPACT_RATIO )); then
+        local tmp_file="$index_file.$BASHPID.tmp"
+        local key lines="" rest="" line
+        for key in "${!CACHE_INDEX_PATH[@]}"; do
+            lines+="$key"$'\t'"${CACHE_INDEX_PATH[$key]}"$'\t'"${CACHE_INDEX_SIZE[$key]}"$'\t'
+            lines+="${CACHE_INDEX_MTIME[$key]}"$'\t'"${CACHE_INDEX_EXPIRY[$key]}"$'\n'
+        done
+        if printf '%s' "$lines" > "$tmp_file" && mv -f "$tmp_file" "$index_file"; then
+            while IFS= read -r -u "$CACHE_INDEX_FD" line; do
+                rest+="$line"$'\n'
+            done
+            [[ -z "$rest" ]] || printf '%s' "$rest" >> "$index_file" || true
+            _cache_index_reset
+            _cache_index_sync
+        else
+            rm -f "$tmp_file"
+        fi
+    fi
+
+    exec {lock_fd}>&-
+    return 0
+}
+
+#
+# _cache_entry_valid
+#
+# TTL check for a key using the index; falls back to the legacy stat-based
+# check for entries written without an index line.
+#
+# Usage: _cache_entry_valid <cache_key> <now>
+# Returns: 0 if valid, 1 if expired or missing
+#
+_cache_entry_valid() {
+    local cache_key="$1"
+    local now="$2"
+    local cache_path="$CACHE_DIR/${cache_key}.json"
+
+    [[ -f "$cache_path" ]] || return 1
+
+    local mtime="${CACHE_INDEX_MTIME[$cache_key]:-}"
+    if [[ -z "$mtime" ]]; then
+        _cache_legacy_valid "$cache_path"
+        return
+    fi
+
+    local age=$((now - mtime))
+    if (( age > CACHE_TTL )); then
+        vibe_log "cache.validity" "expired" \
+            "{\"cache_path\": \"$cache_path\", \"age\": $age, \"ttl\": $CACHE_TTL}" \
+            "Cache expired (age: ${age}s, TTL: ${CACHE_TTL}s)"
+        return 1
+    fi
+    return 0
+}
+
+#
+# _cache_read_entry
+#
+# Reads a cache file into the named variable without forking cat.
+#
+_cache_read_entry() {
+    IFS= read -r -d '' "$2" < "$1" || true
+}
+
 #
 # init_cache
 #
@@ -66,13 +296,16 @@ generate_cache_key() {
     local input="$1"
     local is_string="${2:-}"
 
+    local digest
     if [[ "$is_string" == "--string" ]]; then
         # Hash string directly
-        echo -n "$input" | sha256sum | awk '{print $1}'
+        read -r digest _ < <(printf '%s' "$input" | sha256sum)
+        echo "$digest"
     else
         # Hash file content
         if [[ -f "$input" ]]; then
-            sha256sum "$input" | awk '{print $1}'
+            read -r digest _ < <(sha256sum "$input")
+            echo "${digest#\\}"
         else
             vibe_log "cache.key" "file_not_found" \
                 "{\"file\": \"$input\"}" \
@@ -82,6 +315,48 @@ generate_cache_key() {
     fi
 }
 
+#
+# generate_cache_keys
+#
+# Hashes many files with a single sha256sum call.
+#
+# Usage: generate_cache_keys <result_assoc_name> <file>...
+# Args:
+#   result_assoc_name - Associative array to fill with file -> SHA-256 key
+#   file... - Files to hash (missing files are logged and skipped)
+# Returns: 0 if every file was hashed, 1 otherwise
+#
+generate_cache_keys() {
+    local -n _gck_result="$1"
+    shift
+
+    local -a files=()
+    local file status=0
+    for file in "$@"; do
+        if [[ -f "$file" ]]; then
+            files+=("$file")
+        else
+            vibe_log "cache.key" "file_not_found" \
+                "{\"file\": \"$file\"}" \
+                "File not found for cache key generation"
+            status=1
+        fi
+    done
+    (( ${#files[@]} > 0 )) || return "$status"
+
+    # sha256sum prints one line per file in argument order; names with
+    # special characters get a leading backslash, which we strip
+    local line i=0
+    while IFS= read -r line; do
+        line="${line#\\}"
+        _gck_result["${files[i]}"]="${line:0:64}"
+        i=$((i + 1))
+    done < <(sha256sum -- "${files[@]}")
+
+    (( i == ${#files[@]} )) || status=1
+    return "$status"
+}
+
 #
 # get_cache_path
 #
@@ -114,6 +389,26 @@ is_cache_valid() {
         return 1
     fi
 
+    local cache_key="${cache_path##*/}"
+    cache_key="${cache_key%.json}"
+    if [[ "$cache_path" == "$CACHE_DIR/${cache_key}.json" ]]; then
+        local now
+        _cache_index_sync
+        _cache_now now
+        _cache_entry_valid "$cache_key" "$now"
+        return
+    fi
+
+    _cache_legacy_valid "$cache_path"
+}
+
+#
+# _cache_legacy_valid
+#
+# stat-based TTL check for files without an index entry.
+#
+_cache_legacy_valid() {
+    local cache_path="$1"
     local current_time file_mtime age
     current_time=$(date +%s)
     file_mtime=$(stat -c %Y "$cache_path" 2>/dev/null || stat -f %m "$cache_path" 2>/dev/null || echo 0)
@@ -141,11 +436,15 @@ is_cache_valid() {
 #
 cache_get() {
     local cache_key="$1"
-    local cache_path
-    cache_path=$(get_cache_path "$cache_key")
+    local cache_path="$CACHE_DIR/${cache_key}.json"
+    local now content
 
-    if is_cache_valid "$cache_path"; then
-        cat "$cache_path"
+    _cache_index_sync
+    _cache_now now
+
+    if _cache_entry_valid "$cache_key" "$now"; then
+        _cache_read_entry "$cache_path" content
+        printf '%s' "$content"
 
         CACHE_HITS=$((CACHE_HITS + 1))
 
@@ -179,11 +478,34 @@ cache_get() {
 cache_set() {
     local cache_key="$1"
     local json_content="$2"
-    local cache_path
-    cache_path=$(get_cache_path "$cache_key")
+    local cache_path="$CACHE_DIR/${cache_key}.json"
 
     # Ensure cache directory exists
-    init_cache || return 1
+    [[ -d "$CACHE_DIR" ]] || init_cache || return 1
+
+    local line
+    _cache_write_entry "$cache_key" "$json_content" line || return 1
+    _cache_index_append "$line" || return 1
+
+    vibe_log "cache.set" "stored" \
+        "{\"cache_key\": \"$cache_key\", \"size\": ${CACHE_INDEX_SIZE[$cache_key]:-0}}" \
+        "Cached data for key $cache_key"
+
+    return 0
+}
+
+#
+# _cache_write_entry
+#
+# Writes one entry file and formats its index line into the named variable.
+#
+# Usage: _cache_write_entry <cache_key> <json_content> <line_var>
+# Returns: 0 on success, 1 on failure
+#
+_cache_write_entry() {
+    local cache_key="$1"
+    local json_content="$2"
+    local cache_path="$CACHE_DIR/${cache_key}.json"
 
     # Write content to cache file
     echo "$json_content" > "$cache_path" || {
@@ -193,11 +515,86 @@ cache_set() {
         return 1
     }
 
-    vibe_log "cache.set" "stored" \
-        "{\"cache_key\": \"$cache_key\", \"size\": $(wc -c < "$cache_path")}" \
-        "Cached data for key $cache_key"
+    # Byte length (+1 for echo's newline); LC_ALL=C makes ${#} count bytes
+    local now size LC_ALL=C
+    _cache_now now
+    size=$(( ${#json_content} + 1 ))
+    printf -v "$3" '%s\t%s\t%s\t%s\t%s\n' \
+        "$cache_key" "$cache_path" "$size" "$now" "$((now + CACHE_TTL))"
+}
 
-    return 0
+#
+# cache_get_many
+#
+# Retrieves many keys in one call (one index sync, no forks).
+#
+# Usage: cache_get_many <result_assoc_name> <cache_key>...
+# Args:
+#   result_assoc_name - Associative array to fill with key -> cached content
+#   cache_key... - Keys to look up
+# Sets: CACHE_BATCH_MISSES - keys that were missing or expired
+# Returns: 0 if every key hit, 1 otherwise
+#
+cache_get_many() {
+    local -n _cgm_result="$1"
+    shift
+
+    local now key content hits=0
+    CACHE_BATCH_MISSES=()
+    _cache_index_sync
+    _cache_now now
+
+    for key in "$@"; do
+        if _cache_entry_valid "$key" "$now"; then
+            _cache_read_entry "$CACHE_DIR/${key}.json" content
+            _cgm_result["$key"]="$content"
+            hits=$((hits + 1))
+        else
+            CACHE_BATCH_MISSES+=("$key")
+        fi
+    done
+
+    CACHE_HITS=$((CACHE_HITS + hits))
+    CACHE_MISSES=$((CACHE_MISSES + ${#CACHE_BATCH_MISSES[@]}))
+
+    vibe_log "cache.get_many" "done" \
+        "{\"requested\": $#, \"hits\": $hits, \"misses\": ${#CACHE_BATCH_MISSES[@]}}" \
+        "Batch cache lookup: $hits/$# hits"
+
+    (( ${#CACHE_BATCH_MISSES[@]} == 0 ))
+}
+
+#
+# cache_set_many
+#
+# Stores many entries and appends their index lines in a single write.
+#
+# Usage: cache_set_many <entries_assoc_name>
+# Args:
+#   entries_assoc_name - Associative array of key -> JSON content
+# Returns: 0 on success, 1 if any entry failed
+#
+cache_set_many() {
+    local -n _csm_entries="$1"
+
+    [[ -d "$CACHE_DIR" ]] || init_cache || return 1
+
+    local key line lines="" status=0 stored=0
+    for key in "${!_csm_entries[@]}"; do
+        if _cache_write_entry "$key" "${_csm_entries[$key]}" line; then
+            lines+="$line"
+            stored=$((stored + 1))
+        else
+            status=1
+        fi
+    done
+    [[ -z "$lines" ]] || _cache_index_append "$lines" || return 1
+
+    vibe_log "cache.set_many" "stored" \
+        "{\"stored\": $stored}" \
+        "Cached $stored entries"
+
+    return "$status"
 }
 
 #
@@ -222,6 +619,7 @@ cache_delete() {
                 "Failed to delete cache file"
             return 1
         }
+        _cache_index_append "$cache_key"$'\t'"$cache_path"$'\t-\t-\t-\n' || true
 
         vibe_log "cache.delete" "deleted" \
             "{\"cache_key\": \"$cache_key\"}" \
@@ -249,19 +647,35 @@ cache_clear() {
 
     if [[ "$expired_only" == "--expired-only" ]]; then
         # Delete only expired entries
-        while IFS= read -r -d '' cache_file; do
-            if ! is_cache_valid "$cache_file"; then
-                rm -f "$cache_file"
-                deleted_count=$((deleted_count + 1))
+        local now cache_file cache_key tombstones=""
+        local -a expired=()
+        _cache_index_sync
+        _cache_now now
+        for cache_file in "$CACHE_DIR"/*.json; do
+            [[ -f "$cache_file" ]] || continue
+            cache_key="${cache_file##*/}"
+            cache_key="${cache_key%.json}"
+            if ! _cache_entry_valid "$cache_key" "$now"; then
+                expired+=("$cache_file")
+                tombstones+="$cache_key"$'\t'"$cache_file"$'\t-\t-\t-\n'
             fi
-        done < <(find "$CACHE_DIR" -name "*.json" -print0 2>/dev/null)
+        done
+        if (( ${#expired[@]} > 0 )); then
+            rm -f -- "${expired[@]}"
+            _cache_index_append "$tombstones" || true
+        fi
+        deleted_count=${#expired[@]}
 
         vibe_log "cache.clear" "expired_cleared" \
             "{\"deleted_count\": $deleted_count}" \
             "Cleared $deleted_count expired cache entries"
     else
-        # Delete all entries
-        rm -f "$CACHE_DIR"/*.json 2>/dev/null || true
+        # Delete all entries; removing the index gives it a new inode, so
+        # other processes notice and reload instead of reading a stale offset
+        local index_file
+        _cache_index_file index_file
+        rm -f "$CACHE_DIR"/*.json "$index_file" 2>/dev/null || true
+        _cache_index_reset
         deleted_count=$(find "$CACHE_DIR" -name "*.json" 2>/dev/null | wc -l)
 
         vibe_log "cache.clear" "all_cleared" \
@@ -286,13 +700,19 @@ cache_stats() {
     local hit_rate="0.00"
 
     if [[ -d "$CACHE_DIR" ]]; then
-        total_entries=$(find "$CACHE_DIR" -name "*.json" 2>/dev/null | wc -l)
-        total_size=$(du -sb "$CACHE_DIR" 2>/dev/null | awk '{print $1}' || echo 0)
+        local key
+        _cache_index_sync
+        for key in "${!CACHE_INDEX_SIZE[@]}"; do
+            [[ -f "$CACHE_DIR/${key}.json" ]] || continue
+            total_entries=$((total_entries + 1))
+            total_size=$((total_size + CACHE_INDEX_SIZE[$key]))
+        done
     fi
 
     local total_requests=$((CACHE_HITS + CACHE_MISSES))
-    if (( total_requests > 0 )) && command -v bc &> /dev/null; then
-        hit_rate=$(echo "scale=2; $CACHE_HITS / $total_requests" | bc)
+    if (( total_requests > 0 )); then
+        local hundredths=$((CACHE_HITS * 100 / total_requests))
+        printf -v hit_rate '%d.%02d' $((hundredths / 100)) $((hundredths % 100))
     fi
 
     cat <<EOF
@@ -323,8 +743,9 @@ cache_spec_file() {
     local spec_file="$1"
     local tasks_json="$2"
 
-    local cache_key
-    cache_key=$(generate_cache_key "$spec_file") || return 1
+    local -A _keys=()
+    generate_cache_keys _keys "$spec_file" || return 1
+    local cache_key="${_keys[$spec_file]}"
 
     cache_set "$cache_key" "$tasks_json"
 }
@@ -342,12 +763,75 @@ cache_spec_file() {
 get_cached_spec() {
     local spec_file="$1"
 
-    local cache_key
-    cache_key=$(generate_cache_key "$spec_file") || return 1
+    local -A _keys=()
+    generate_cache_keys _keys "$spec_file" || return 1
+    local cache_key="${_keys[$spec_file]}"
 
     cache_get "$cache_key"
 }
 
+#
+# cache_spec_files
+#
+# Caches task extraction results for many specification files at once
+# (one sha256sum call, one index write).
+#
+# Usage: cache_spec_files <spec_tasks_assoc_name>
+# Args:
+#   spec_tasks_assoc_name - Associative array of spec file -> tasks JSON
+# Returns: 0 on success, 1 if any file could not be hashed or stored
+#
+cache_spec_files() {
+    local -n _csf_specs="$1"
+    local -A _csf_keys=() _csf_entries=()
+    local spec status=0
+
+    generate_cache_keys _csf_keys "${!_csf_specs[@]}" || status=1
+    for spec in "${!_csf_keys[@]}"; do
+        _csf_entries["${_csf_keys[$spec]}"]="${_csf_specs[$spec]}"
+    done
+    cache_set_many _csf_entries || status=1
+    return "$status"
+}
+
+#
+# get_cached_specs
+#
+# Retrieves cached task extraction results for many specification files.
+#
+# Usage: get_cached_specs <result_assoc_name> <spec_file>...
+# Args:
+#   result_assoc_name - Associative array to fill with spec file -> tasks JSON
+#   spec_file... - Specification files
+# Sets: CACHE_BATCH_MISSES - spec files with no valid cache entry
+# Returns: 0 if every spec hit, 1 otherwise
+#
+get_cached_specs() {
+    local -n _gcs_result="$1"
+    shift
+    local -A _gcs_keys=() _gcs_found=()
+    local spec
+    local -a missing=()
+
+    generate_cache_keys _gcs_keys "$@" || true
+    local -a keys=()
+    for spec in "$@"; do
+        [[ -n "${_gcs_keys[$spec]:-}" ]] && keys+=("${_gcs_keys[$spec]}")
+    done
+    (( ${#keys[@]} == 0 )) || cache_get_many _gcs_found "${keys[@]}" || true
+
+    for spec in "$@"; do
+        local key="${_gcs_keys[$spec]:-}"
+        if [[ -n "$key" && -n "${_gcs_found[$key]+set}" ]]; then
+            _gcs_result["$spec"]="${_gcs_found[$key]}"
+        else
+            missing+=("$spec")
+        fi
+    done
+    CACHE_BATCH_MISSES=("${missing[@]}")
+    (( ${#missing[@]} == 0 ))
+}
+
 #
 # invalidate_spec_cache
 #
@@ -361,22 +845,39 @@ get_cached_spec() {
 invalidate_spec_cache() {
     local spec_file="$1"
 
-    local cache_key
-    cache_key=$(generate_cache_key "$spec_file") || return 1
+    local -A _keys=()
+    generate_cache_keys _keys "$spec_file" || return 1
+    local cache_key="${_keys[$spec_file]}"
 
     cache_delete "$cache_key"
 }
 
 # Export functions for use in other scripts
 export -f init_cache
+export -f _cache_now
+export -f _cache_index_file
+export -f _cache_index_reset
+export -f _cache_index_sync
+export -f _cache_index_append
+export -f _cache_index_maybe_compact
+export -f _cache_index_compact
+export -f _cache_entry_valid
+export -f _cache_read_entry
+export -f _cache_legacy_valid
+export -f _cache_write_entry
 export -f generate_cache_key
+export -f generate_cache_keys
 export -f get_cache_path
 export -f is_cache_valid
 export -f cache_get
 export -f cache_set
+export -f cache_get_many
+export -f cache_set_many
 export -f cache_delete
 export -f cache_clear
 export -f cache_stats
 export -f cache_spec_file
 export -f get_cached_spec
+export -f cache_spec_files
+export -f get_cached_specs
 export -f invalidate_spec_cache
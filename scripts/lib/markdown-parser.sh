@@ -20,10 +20,15 @@
 #
 # Usage:
 #   source scripts/lib/markdown-parser.sh
-#   parse_markdown_review "input.md" "output.json"
+#   parse_markdown_review "input.md" "output.json" [--security-metadata]
+#   parse_markdown_review_dir "reviews/" "json/" [--security-metadata]
+#
+# Each review is read once: a line-level awk state machine extracts every
+# field in a single pass, and one jq run writes the JSON for the whole batch.
 #
 # Dependencies:
 #   - jq (JSON processor)
+#   - awk (single-pass scanner)
 #   - bin/vibe-logger-lib.sh (structured logging)
 #
 # Created: 2025-10-28
@@ -488,15 +493,419 @@ extract_overall_explanation() {
     echo "$explanation"
 }
 
+# ============================================================================
+# SINGLE-PASS CONVERSION
+# ============================================================================
+
+# Scan Markdown reviews once, line by line, and emit one JSON record per file
+# Usage: _markdown_review_scan <security_metadata> <truncate_bytes> <paths_file> <sizes> <file>...
+# Output: JSONL records on stdout; relative code locations are appended to <paths_file>
+#
+# A line-level state machine reproduces the extract_* helpers in one pass:
+# headers open findings (the final line only counts when newline-terminated, as
+# with `read`/`wc -l`), sed-style ranges track the Summary/Conclusion sections,
+# and the priority/confidence/location/CWE/CVSS/OWASP patterns run on the
+# in-memory section text. Numbers are kept as the literal text the helpers
+# would have passed to `jq --argjson`.
+_markdown_review_scan() {
+    local security_metadata="$1"
+    local truncate_bytes="$2"
+    local paths_file="$3"
+    local sizes="$4"
+    shift 4
+
+    LC_ALL=C awk -v security="$security_metadata" -v truncate_bytes="$truncate_bytes" \
+        -v pathfile="$paths_file" -v sizes="$sizes" '
+function start_doc() {
+    consumed = 0; nlines = 0; content = ""; pend = ""; has_pend = 0
+    nsec = 0; split("", sec_title); split("", sec_body); split("", sec_n)
+    split("", in_range); split("", found); split("", printed); split("", kept)
+    fallback = ""; fallback_set = 0
+}
+
+function replace_all(s, from, to,    parts, n, i, out) {
+    n = split(s, parts, from)
+    out = parts[1]
+    for (i = 2; i <= n; i++) out = out to parts[i]
+    return out
+}
+
+function json_str(s,    c) {
+    if (index(s, "\\")) s = replace_all(s, "\\", "\\\\")
+    if (index(s, "\"")) s = replace_all(s, "\"", "\\\"")
+    if (s ~ /[\001-\037]/) {
+        for (c in ctrl) if (index(s, c)) s = replace_all(s, c, ctrl[c])
+    }
+    return "\"" s "\""
+}
+
+# extract_headers / extract_findings: ##, ### and #### open a finding
+function section_line(line,    h, rest, ws, title) {
+    h = 0
+    if (line ~ /^##[[:space:]]/) h = 2
+    else if (line ~ /^###[[:space:]]/) h = 3
+    else if (line ~ /^####[[:space:]]/) h = 4
+    if (h) {
+        rest = substr(line, h + 1)
+        match(rest, /^[[:space:]]+/)
+        ws = RLENGTH
+        title = substr(rest, ws + 1)
+        if (title == "" && ws >= 2) title = substr(rest, ws, 1)
+        if (title != "") {
+            nsec++
+            sec_title[nsec] = title
+            sec_body[nsec] = ""
+            sec_n[nsec] = 0
+            return
+        }
+    }
+    if (nsec == 0) return
+    sec_body[nsec] = (sec_n[nsec]++ == 0) ? line : sec_body[nsec] "\n" line
+}
+
+# extract_overall_explanation: sed -n "/^## Summary/,/^##/p" (k=1) and Conclusion (k=2)
+function range_line(k, line) {
+    if (in_range[k]) {
+        range_print(k, line)
+        if (line ~ /^##/) in_range[k] = 0
+        return
+    }
+    if ((k == 1 && line ~ /^## Summary/) || (k == 2 && line ~ /^## Conclusion/)) {
+        found[k] = 1
+        in_range[k] = 1
+        range_print(k, line)
+    }
+}
+
+function range_print(k, line) {
+    printed[k]++
+    if (printed[k] <= 5) kept[k, printed[k]] = line
+}
+
+# | sed "1d;$d" | head -n 3 | tr "\n" " "
+function range_text(k,    i, s) {
+    s = ""
+    for (i = 2; i <= 4 && i <= printed[k] - 1; i++) s = s kept[k, i] " "
+    return s
+}
+
+function priority_of(text,    m) {
+    if (match(text, /\[P[0-3]\]/)) return substr(text, RSTART + 2, 1)
+    if (match(text, /\*\*P[0-3]\*\*/)) return substr(text, RSTART + 3, 1)
+    if (match(text, /Priority:[[:space:]]*(Critical|High|Medium|Low)/)) {
+        m = substr(text, RSTART, RLENGTH)
+        if (m ~ /Critical$/) return 0
+        if (m ~ /High$/) return 1
+        if (m ~ /Medium$/) return 2
+        return 3
+    }
+    if (match(text, /P[0-3]:/)) return substr(text, RSTART + 1, 1)
+    return 2
+}
+
+# bc "scale=2; percent / 100" as printed by bc (".95", "1.00", "0")
+function percent_of(p,    n) {
+    sub(/^0+/, "", p)
+    if (p == "") return "0"
+    if (length(p) > 3) return "1.0"
+    n = p + 0
+    if (n > 100) return "1.0"
+    if (n == 100) return "1.00"
+    return sprintf(".%02d", n)
+}
+
+# Clamp to 1.0 with an exact decimal comparison (bc "> 1.0")
+function clamp_unit(v,    i, int_part, frac) {
+    i = index(v, ".")
+    int_part = i ? substr(v, 1, i - 1) : v
+    frac = i ? substr(v, i + 1) : ""
+    sub(/^0+/, "", int_part)
+    if (length(int_part) > 1 || (int_part != "" && int_part != "1") || (int_part == "1" && frac ~ /[1-9]/)) return "1.0"
+    return v
+}
+
+function confidence_of(text,    m) {
+    if (match(text, /Confidence:[[:space:]]*[0-9]+%/)) {
+        m = substr(text, RSTART, RLENGTH - 1)
+        sub(/^Confidence:[[:space:]]*/, "", m)
+        return percent_of(m)
+    }
+    if (match(text, /confidence_score:[[:space:]]*[0-9]+\.?[0-9]*/)) {
+        m = substr(text, RSTART, RLENGTH)
+        sub(/^confidence_score:[[:space:]]*/, "", m)
+        return clamp_unit(m)
+    }
+    if (match(text, /(High|Medium|Low)[[:space:]]+confidence/)) {
+        m = substr(text, RSTART, RLENGTH)
+        if (m ~ /^High/) return "0.9"
+        if (m ~ /^Medium/) return "0.7"
+        return "0.5"
+    }
+    return "0.8"
+}
+
+function location_of(text,    m, i, file, first, last) {
+    if (match(text, "N/A|n/a|unknown|UNKNOWN|[?]-[?]")) return "null"
+    if (match(text, "[a-zA-Z0-9_/.-]+:[0-9]+$")) {
+        m = substr(text, RSTART, RLENGTH)
+        i = index(m, ":")
+        file = substr(m, 1, i - 1)
+        first = last = substr(m, i + 1)
+    } else if (match(text, "[a-zA-Z0-9_/.-]+:[0-9]+-[0-9]+")) {
+        m = substr(text, RSTART, RLENGTH)
+        i = index(m, ":")
+        file = substr(m, 1, i - 1)
+        m = substr(m, i + 1)
+        i = index(m, "-")
+        first = substr(m, 1, i - 1)
+        last = substr(m, i + 1)
+    } else if (match(text, "Line[[:space:]]+[0-9]+[[:space:]]+in[[:space:]]+[a-zA-Z0-9_/.-]+")) {
+        m = substr(text, RSTART, RLENGTH)
+        sub(/^Line[[:space:]]+/, "", m)
+        match(m, /^[0-9]+/)
+        first = last = substr(m, 1, RLENGTH)
+        m = substr(m, RLENGTH + 1)
+        sub(/^[[:space:]]+in[[:space:]]+/, "", m)
+        file = m
+    } else if (match(text, "at[[:space:]]+[a-zA-Z0-9_/.-]+:[0-9]+")) {
+        m = substr(text, RSTART, RLENGTH)
+        sub(/^at[[:space:]]+/, "", m)
+        i = index(m, ":")
+        file = substr(m, 1, i - 1)
+        first = last = substr(m, i + 1)
+    } else {
+        return "null"
+    }
+    if (substr(file, 1, 1) != "/" && !(file in seen_path)) {
+        seen_path[file] = 1
+        print file >> pathfile
+    }
+    return "{\"file\":" json_str(file) ",\"start\":\"" first "\",\"end\":\"" last "\"}"
+}
+
+# security_metadata: CWE/OWASP from the section text, CVSS estimated from priority when absent
+function security_of(title, body, priority,    cwe, cvss, owasp, m) {
+    cwe = ""; cvss = ""; owasp = ""
+    if (match(title " " body, /CWE-[0-9]+/)) cwe = substr(title " " body, RSTART + 4, RLENGTH - 4)
+    if (match(body, /CVSS[[:space:]]*Score:[[:space:]]*[0-9]+\.[0-9]+/)) {
+        m = substr(body, RSTART, RLENGTH)
+        sub(/^CVSS[[:space:]]*Score:[[:space:]]*/, "", m)
+        cvss = m
+    }
+    if (cvss == "" || cvss == "0.0") {
+        cvss = (priority == 0) ? "9.5" : (priority == 1) ? "7.5" : (priority == 2) ? "5.5" : "2.0"
+    }
+    if (match(body, /A[0-9][0-9]:20[0-9][0-9]/)) owasp = substr(body, RSTART, RLENGTH)
+    return ",\"cwe\":\"" cwe "\",\"cvss\":\"" cvss "\",\"owasp\":\"" owasp "\""
+}
+
+function finish_doc(    i, body, priority, findings, p0, m, correctness, explanation) {
+    # The last line counts for headers/bodies only when newline-terminated
+    if (has_pend && consumed <= size_of[doc] + 0) section_line(pend)
+    sub(/\n+$/, "", content)
+
+    findings = ""
+    p0 = 0
+    for (i = 1; i <= nsec; i++) {
+        body = sec_body[i]
+        sub(/\n+$/, "", body)
+        priority = priority_of(sec_title[i] " " body)
+        if (priority == 0) p0++
+        findings = findings (i > 1 ? "," : "") "{\"title\":" json_str(sec_title[i]) \
+            ",\"body\":" json_str(body) ",\"priority\":\"" priority "\"" \
+            ",\"confidence\":\"" confidence_of(body) "\",\"location\":" location_of(body) \
+            (security ? security_of(sec_title[i], body, priority) : "") "}"
+    }
+
+    if (match(content, /Overall:[[:space:]]*(Correct|Incorrect)/)) {
+        m = substr(content, RSTART, RLENGTH)
+        correctness = (m ~ /Incorrect$/) ? "patch is incorrect" : "patch is correct"
+    } else if (match(content, /Summary:[[:space:]]*(Pass|Fail)/)) {
+        m = substr(content, RSTART, RLENGTH)
+        correctness = (m ~ /Fail$/) ? "patch is incorrect" : "patch is correct"
+    } else {
+        correctness = (p0 > 0) ? "patch is incorrect" : "patch is correct"
+    }
+
+    explanation = found[1] ? range_text(1) : found[2] ? range_text(2) : fallback
+    if (truncate_bytes && length(explanation) > 200) explanation = substr(explanation, 1, 197) "..."
+
+    print "{\"findings\":[" findings "],\"correctness\":\"" correctness "\"" \
+        ",\"explanation\":" json_str(explanation) ",\"confidence\":\"" confidence_of(content) "\"}"
+}
+
+BEGIN {
+    split(sizes, size_of, " ")
+    for (i = 1; i < 32; i++) ctrl[sprintf("%c", i)] = sprintf("\\u%04x", i)
+    doc = 0
+}
+
+FNR == 1 {
+    if (doc > 0) finish_doc()
+    doc++
+    start_doc()
+}
+
+{
+    consumed += length($0) + 1
+    content = (nlines++ == 0) ? $0 : content "\n" $0
+
+    range_line(1, $0)
+    range_line(2, $0)
+    if (!fallback_set && nlines <= 10 && $0 !~ /^#/ && $0 != "") {
+        fallback = $0
+        fallback_set = 1
+    }
+
+    # Section handling lags one line behind to know whether the last line is terminated
+    if (has_pend) section_line(pend)
+    pend = $0
+    has_pend = 1
+}
+
+END {
+    if (doc > 0) finish_doc()
+}' "$@"
+}
+
+# Convert Markdown reviews to JSON in a single pass over each input
+# Usage: _markdown_review_convert <security_metadata> <input.md> <output.json> [<input.md> <output.json>...]
+# Returns: 0 if every file was converted, 1 otherwise
+_markdown_review_convert() {
+    local security_metadata="$1"
+    shift
+
+    local -a inputs=() outputs=()
+    local failed=0
+    while (( $# >= 2 )); do
+        if validate_input_file "$1" && validate_output_file "$2"; then
+            # "./" keeps awk from reading names like a=b.md as assignments
+            if [[ "$1" == /* ]]; then inputs+=("$1"); else inputs+=("./$1"); fi
+            outputs+=("$2")
+        else
+            failed=$((failed + 1))
+        fi
+        shift 2
+    done
+
+    if (( ${#inputs[@]} == 0 )); then
+        return 1
+    fi
+
+    # extract_overall_explanation truncates in characters when the locale is
+    # multibyte and in bytes otherwise, like ${#explanation} does
+    local probe=$'\xc3\xa9'
+    local truncate_bytes=1
+    (( ${#probe} == 1 )) && truncate_bytes=0
+
+    # File sizes tell whether each file ends with a newline
+    local sizes="" size _name
+    while read -r size _name; do
+        sizes+="$size "
+    done < <(wc -c -- "${inputs[@]}" | head -n "${#inputs[@]}")
+
+    local work_dir
+    work_dir="$(mktemp -d)"
+    : > "$work_dir/paths"
+    : > "$work_dir/paths.map"
+    printf '%s\n' "${outputs[@]}" > "$work_dir/outputs"
+
+    if ! _markdown_review_scan "$security_metadata" "$truncate_bytes" "$work_dir/paths" "$sizes" \
+        "${inputs[@]}" > "$work_dir/records"; then
+        rm -rf "$work_dir"
+        markdown_parser_error "SCAN_FAILED" "Failed to scan Markdown input" "${inputs[*]}"
+        return 1
+    fi
+
+    # Resolve relative code locations once per distinct path (same as extract_code_location)
+    local -a rel_paths=() abs_paths=()
+    mapfile -t rel_paths < "$work_dir/paths"
+    if (( ${#rel_paths[@]} > 0 )); then
+        mapfile -t abs_paths < <(cd "$PROJECT_ROOT" 2>/dev/null && realpath "${rel_paths[@]}" 2>/dev/null)
+        if (( ${#abs_paths[@]} != ${#rel_paths[@]} )); then
+            abs_paths=()
+            local rel
+            for rel in "${rel_paths[@]}"; do
+                abs_paths+=("$(cd "$PROJECT_ROOT" 2>/dev/null && realpath "$rel" 2>/dev/null || echo "$PROJECT_ROOT/$rel")")
+            done
+        fi
+        local i
+        for ((i = 0; i < ${#rel_paths[@]}; i++)); do
+            printf '%s\n%s\n' "${rel_paths[$i]}" "${abs_paths[$i]}" >> "$work_dir/paths.map"
+        done
+    fi
+
+    # One jq run shapes every document; the \u0001 line before each one routes
+    # it to its output file
+    if ! jq -r --arg truncate_chars "$((1 - truncate_bytes))" --rawfile paths "$work_dir/paths.map" '
+        def sanitize:
+            split("\\`") | join("`") | split("\\$") | join("$")
+            | split("\\{") | join("{") | split("\\}") | join("}")
+            | split("\\(") | join("(") | split("\\)") | join(")")
+            # sanitize_text_for_json ends with echo, which swallows -n/-e/-E
+            | if test("^-[neE]+$") then "" else . end;
+        ($paths | split("\n")) as $p
+        | (reduce range(0; ($p | length) / 2 | floor) as $i ({}; .[$p[2 * $i]] = $p[2 * $i + 1])) as $abs
+        | "\u0001",
+          {
+            findings: [.findings[] | {
+                title: (.title | sanitize),
+                body: (.body | sanitize),
+                priority: (.priority | fromjson),
+                confidence_score: (.confidence | fromjson),
+                code_location: (.location | if . == null then null else {
+                    absolute_file_path: (if .file | startswith("/") then .file else $abs[.file] end),
+                    line_range: {"start": (.start | fromjson), "end": (.end | fromjson)}
+                } end)
+            } + (if has("cwe") then {security_metadata: {
+                cwe_id: (if .cwe == "" then null else "CWE-" + .cwe end),
+                cvss_score: (.cvss | fromjson),
+                owasp_category: (if .owasp == "" then null else .owasp end)
+            }} else {} end)],
+            overall_correctness: .correctness,
+            overall_explanation: (.explanation
+                | if $truncate_chars == "1" and length > 200 then .[0:197] + "..." else . end
+                | sanitize),
+            overall_confidence_score: (.confidence | fromjson)
+          }
+    ' "$work_dir/records" | LC_ALL=C awk '
+        NR == FNR { out[NR] = $0; next }
+        $0 == "\001" { if (file != "") close(file); file = out[++n]; next }
+        { print > file }
+    ' "$work_dir/outputs" -; then
+        rm -rf "$work_dir"
+        markdown_parser_error "JSON_WRITE_FAILED" "Failed to write JSON output" "${outputs[*]}"
+        return 1
+    fi
+
+    local findings_count correctness record
+    for ((i = 0; i < ${#outputs[@]}; i++)); do
+        read -r record
+        findings_count="${record%%$'\t'*}"
+        correctness="${record#*$'\t'}"
+        vibe_log "done" "parse-markdown-review-done" \
+            "{\"output\":\"${outputs[$i]}\",\"findings_count\":$findings_count,\"correctness\":\"$correctness\"}" \
+            "Markdown → JSON conversion completed successfully" \
+            "[]" \
+            "markdown-parser"
+    done < <(jq -r '"\(.findings | length)\t\(.correctness)"' "$work_dir/records")
+
+    rm -rf "$work_dir"
+    (( failed == 0 ))
+}
+
 # ============================================================================
 # MAIN CONVERSION FUNCTION
 # ============================================================================
 
 # Parse Markdown review and generate JSON output
-# Usage: parse_markdown_review "input.md" "output.json"
+# Usage: parse_markdown_review "input.md" "output.json" [--security-metadata]
+#   --security-metadata  Add security_metadata (CWE, CVSS, OWASP) to each finding
 parse_markdown_review() {
     local markdown_file="$1"
     local output_json="$2"
+    local security_metadata=0
+    [[ "${3:-}" == "--security-metadata" ]] && security_metadata=1
 
     vibe_log "step" "parse-markdown-review-start" \
         "{\"input\":\"$markdown_file\",\"output\":\"$output_json\"}" \
@@ -504,57 +913,44 @@ parse_markdown_review() {
         "[\"extract-findings\",\"generate-json\"]" \
         "markdown-parser"
 
-    # Validate inputs
-    validate_input_file "$markdown_file" || return 1
-    validate_output_file "$output_json" || return 1
-
-    # Extract findings
-    local findings_json
-    findings_json="$(extract_findings "$markdown_file")"
-
-    # Extract overall assessment
-    local correctness
-    correctness="$(extract_overall_correctness "$markdown_file")"
-    local explanation
-    explanation="$(extract_overall_explanation "$markdown_file")"
-    local overall_confidence="0.8"  # Default
+    _markdown_review_convert "$security_metadata" "$markdown_file" "$output_json"
+}
 
-    # Try to extract overall confidence from content
-    local content
-    content="$(cat "$markdown_file")"
-    local extracted_confidence
-    extracted_confidence="$(extract_confidence "$content")"
-    if [[ "$extracted_confidence" != "0.8" ]]; then
-        overall_confidence="$extracted_confidence"
+# Convert every *.md review in a directory in one invocation
+# Usage: parse_markdown_review_dir "input_dir" "output_dir" [--security-metadata]
+# Output: output_dir/<name>.json for each input_dir/<name>.md
+# Returns: 0 if every review was converted, 1 otherwise
+parse_markdown_review_dir() {
+    local input_dir="$1"
+    local output_dir="$2"
+    local security_metadata=0
+    [[ "${3:-}" == "--security-metadata" ]] && security_metadata=1
+
+    if [[ ! -d "$input_dir" ]]; then
+        markdown_parser_error "INPUT_NOT_FOUND" "Input directory not found: $input_dir"
+        return 1
     fi
 
-    # Generate complete JSON
-    local complete_json
-    complete_json=$(jq -n \
-        --argjson findings "$findings_json" \
-        --arg correctness "$correctness" \
-        --arg explanation "$explanation" \
-        --argjson confidence "$overall_confidence" \
-        '{
-            findings: $findings,
-            overall_correctness: $correctness,
-            overall_explanation: $explanation,
-            overall_confidence_score: $confidence
-        }')
-
-    # Write JSON output
-    echo "$complete_json" | jq '.' > "$output_json" || {
-        markdown_parser_error "JSON_WRITE_FAILED" "Failed to write JSON output: $output_json"
-        return 1
-    }
+    local -a pairs=()
+    local md
+    for md in "$input_dir"/*.md; do
+        [[ -f "$md" ]] || continue
+        local name="${md##*/}"
+        pairs+=("$md" "$output_dir/${name%.md}.json")
+    done
 
-    vibe_log "done" "parse-markdown-review-done" \
-        "{\"findings_count\":$(echo "$findings_json" | jq 'length'),\"correctness\":\"$correctness\"}" \
-        "Markdown → JSON conversion completed successfully" \
-        "[]" \
+    vibe_log "step" "parse-markdown-review-dir-start" \
+        "{\"input_dir\":\"$input_dir\",\"output_dir\":\"$output_dir\",\"files\":$(( ${#pairs[@]} / 2 ))}" \
+        "Starting batch Markdown → JSON conversion" \
+        "[\"extract-findings\",\"generate-json\"]" \
         "markdown-parser"
 
-    return 0
+    if (( ${#pairs[@]} == 0 )); then
+        markdown_parser_error "INPUT_EMPTY" "No Markdown reviews found in: $input_dir"
+        return 1
+    fi
+
+    _markdown_review_convert "$security_metadata" "${pairs[@]}"
 }
 
 # ============================================================================
@@ -638,7 +1034,10 @@ export -f extract_code_location
 export -f extract_findings
 export -f extract_overall_correctness
 export -f extract_overall_explanation
+export -f _markdown_review_scan
+export -f _markdown_review_convert
 export -f parse_markdown_review
+export -f parse_markdown_review_dir
 export -f extract_cwe
 export -f extract_cvss
 export -f extract_owasp
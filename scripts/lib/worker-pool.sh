@@ -5,7 +5,8 @@ set -euo pipefail
 # worker-pool.sh
 #
 # Dynamic Worker Pool Management for Spec-Driven Development
-# Provides CPU-aware worker scaling with queue monitoring.
+# Provides CPU-aware worker scaling with queue monitoring, bounded by the
+# per-AI adaptive concurrency limits of adaptive-concurrency.sh.
 #
 
 # Configuration
@@ -22,9 +23,14 @@ else
     vibe_log() { echo "[$(date +%FT%T)] $*" >&2; }
 fi
 
+# shellcheck source=adaptive-concurrency.sh
+source "$(dirname "${BASH_SOURCE[0]}")/adaptive-concurrency.sh"
+
 # Worker pool state (associative arrays)
 declare -gA WORKER_POOL_ACTIVE=()
 declare -gA WORKER_POOL_IDLE=()
+declare -gA WORKER_POOL_AI=()          # worker_id -> AI holding an adaptive slot
+declare -gA WORKER_POOL_STARTED_US=()  # worker_id -> start time (microseconds)
 declare -g WORKER_POOL_SIZE=0
 
 #
@@ -121,19 +127,28 @@ get_idle_worker() {
 #
 # mark_worker_active
 #
-# Moves a worker from idle to active state.
+# Moves a worker from idle to active state. When an AI is given, the task
+# takes one of that AI's adaptive concurrency slots.
 #
-# Usage: mark_worker_active <worker_id> <task_id>
+# Usage: mark_worker_active <worker_id> <task_id> [ai]
 # Args:
 #   worker_id - ID of the worker
 #   task_id - ID of the task being executed
-# Returns: 0 on success, 1 if worker not found
+#   ai - AI the task is sent to (optional)
+# Returns: 0 on success, 1 if worker not found or the AI is at its limit
 #
 mark_worker_active() {
     local worker_id="$1"
     local task_id="$2"
+    local ai="${3:-}"
 
     if [[ -n "${WORKER_POOL_IDLE[$worker_id]:-}" ]]; then
+        if [[ -n "$ai" ]]; then
+            adaptive_try_acquire "$ai" || return 1
+            WORKER_POOL_AI[$worker_id]="$ai"
+            WORKER_POOL_STARTED_US[$worker_id]=${EPOCHREALTIME/./}
+        fi
+
         unset "WORKER_POOL_IDLE[$worker_id]"
         WORKER_POOL_ACTIVE[$worker_id]="$task_id"
 
@@ -150,21 +165,36 @@ mark_worker_active() {
 #
 # mark_worker_idle
 #
-# Moves a worker from active to idle state.
+# Moves a worker from active to idle state. If the task holds an adaptive
+# slot, it is released with the task's latency, exit code and error output.
+# Rate limits are recognised only from error_output (see
+# adaptive_is_overload_failure), so pass the task's stderr on failure.
 #
-# Usage: mark_worker_idle <worker_id>
+# Usage: mark_worker_idle <worker_id> [exit_code] [error_output]
 # Args:
 #   worker_id - ID of the worker
+#   exit_code - Exit code of the task (default: 0)
+#   error_output - Captured stderr / error message (optional, needed for
+#                  rate-limit detection)
 # Returns: 0 on success, 1 if worker not found
 #
 mark_worker_idle() {
     local worker_id="$1"
+    local exit_code="${2:-0}"
+    local error_output="${3:-}"
 
     if [[ -n "${WORKER_POOL_ACTIVE[$worker_id]:-}" ]]; then
         local task_id="${WORKER_POOL_ACTIVE[$worker_id]}"
         unset "WORKER_POOL_ACTIVE[$worker_id]"
         WORKER_POOL_IDLE[$worker_id]="idle"
 
+        if [[ -n "${WORKER_POOL_AI[$worker_id]:-}" ]]; then
+            local now=${EPOCHREALTIME/./}
+            adaptive_release "${WORKER_POOL_AI[$worker_id]}" \
+                $(( (now - WORKER_POOL_STARTED_US[$worker_id]) / 1000 )) "$exit_code" "$error_output"
+            unset "WORKER_POOL_AI[$worker_id]" "WORKER_POOL_STARTED_US[$worker_id]"
+        fi
+
         vibe_log "worker_pool.worker_idle" "released" \
             "{\"worker_id\": $worker_id, \"task_id\": \"$task_id\"}" \
             "Worker $worker_id released from task $task_id"
@@ -213,56 +243,51 @@ get_worker_utilization() {
         return 0
     fi
 
-    local active_count
-    active_count=$(get_active_worker_count)
-
-    # Use bc for floating point division if available
-    if command -v bc &> /dev/null; then
-        echo "scale=2; $active_count / $WORKER_POOL_SIZE" | bc
-    else
-        # Fallback: integer division with 2 decimal places
-        local scaled=$((active_count * 100 / WORKER_POOL_SIZE))
-        echo "0.$scaled"
-    fi
+    # Integer division with 2 decimal places (truncated, as bc scale=2)
+    local scaled=$(( ${#WORKER_POOL_ACTIVE[@]} * 100 / WORKER_POOL_SIZE ))
+    printf "%d.%02d\n" $((scaled / 100)) $((scaled % 100))
 }
 
 #
 # should_scale_up
 #
-# Determines if worker pool should be scaled up based on queue depth.
+# Determines if worker pool should be scaled up based on queue depth and,
+# when an AI is given, on that AI's adaptive concurrency limit: more workers
+# than the AI currently sustains would only queue behind it. The limit is only
+# applied once the limiter has seen completions for that AI (see
+# mark_worker_idle); before that it is just the initial guess.
 #
-# Usage: should_scale_up <queue_depth> <queue_capacity>
+# Usage: should_scale_up <queue_depth> <queue_capacity> [ai]
 # Args:
 #   queue_depth - Current queue depth
 #   queue_capacity - Maximum queue capacity
+#   ai - AI the queued tasks are sent to (optional)
 # Returns: 0 if should scale up, 1 otherwise
 #
 should_scale_up() {
     local queue_depth="$1"
     local queue_capacity="$2"
+    local ai="${3:-}"
 
     if (( queue_capacity == 0 )); then
         return 1
     fi
 
-    # Calculate queue utilization
-    local utilization
-    if command -v bc &> /dev/null; then
-        utilization=$(echo "scale=2; $queue_depth / $queue_capacity" | bc)
+    # Queue utilization truncated to 2 decimals, compared in fixed point
+    local threshold utilization
+    decimal_to_fixed4 "$SCALE_THRESHOLD" threshold
+    utilization=$(( queue_depth * 100 / queue_capacity * 100 ))
 
-        # Compare with threshold
-        if (( $(echo "$utilization >= $SCALE_THRESHOLD" | bc -l) )); then
-            return 0
-        fi
-    else
-        # Fallback: integer comparison
-        local threshold_depth=$((queue_capacity * 80 / 100))
-        if (( queue_depth >= threshold_depth )); then
-            return 0
-        fi
+    if (( utilization < threshold )); then
+        return 1
     fi
 
-    return 1
+    if [[ -n "$ai" ]] && (( ${ADAPTIVE_COMPLETED[$ai]:-0} > 0 )) &&
+        (( WORKER_POOL_SIZE >= $(adaptive_get_limit "$ai") )); then
+        return 1
+    fi
+
+    return 0
 }
 
 #
@@ -309,16 +334,18 @@ scale_up_workers() {
 #
 # get_worker_pool_status
 #
-# Returns current worker pool status as JSON.
+# Returns current worker pool status as JSON, including the per-AI adaptive
+# concurrency limits ("adaptive_limits", keyed by AI).
 #
 # Usage: get_worker_pool_status
 # Returns: JSON string with pool status
 #
 get_worker_pool_status() {
-    local active_count idle_count utilization
+    local active_count idle_count utilization adaptive_limits
     active_count=$(get_active_worker_count)
     idle_count=$(get_idle_worker_count)
     utilization=$(get_worker_utilization)
+    adaptive_limits=$(adaptive_concurrency_status)
 
     cat <<EOF
 {
@@ -326,7 +353,8 @@ get_worker_pool_status() {
   "active_workers": $active_count,
   "idle_workers": $idle_count,
   "utilization": $utilization,
-  "max_workers": $MAX_WORKERS
+  "max_workers": $MAX_WORKERS,
+  "adaptive_limits": $adaptive_limits
 }
 EOF
 }
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+AI Slot Daemon - resource-limiter.sh のイベント駆動スロット管理
+
+AI_SLOTS_DIR ごとに1プロセスだけ常駐し、AI実行スロットを到着順（FIFO）に割り当てる。
+待機側は自分専用の応答FIFOを read しているだけなので、解放と同時にカーネルが起こす
+（sleep によるポーリングなし）。
+
+- 全体の上限 --max と、AIごとの上限 --limits "claude=1,gemini=2"
+  （上限に達したAIの待機者は飛ばし、他の待機者には到着順で割り当てる）
+- 保持者・待機者の所有プロセスを pidfd で監視し、終了したら即座にスロットを回収
+  （pidfd が使えない環境では1秒ごとの kill(pid, 0) で回収）
+- 起動時に残っているスロットファイルは、所有プロセスが生きていれば引き継ぐ
+- 所有プロセスがすべて終了し、保持者も待機者もいなくなったら終了する
+
+制御FIFO ($AI_SLOTS_DIR/.slotd/ctl) のメッセージ（1行 < PIPE_BUF なので書き込みは不可分）:
+    acquire <req_id> <ai> <owner_pid> <reply_fifo>
+    release <slot_file>
+    cancel <req_id>
+    shutdown [pid]   pid を付けた場合は --owner のプロセスからのみ受け付ける
+応答FIFOへの返信:
+    ok <slot_file>   スロット取得
+    retry            デーモン終了中（呼び出し側は再起動して取り直す）
+
+Usage:
+    ai-slot-daemon.py --dir DIR --max N [--limits SPEC] [--owner PID] [--foreground]
+"""
+import argparse
+import errno
+import fcntl
+import os
+import selectors
+import signal
+import sys
+import time
+from collections import deque
+
+STATE_DIR = ".slotd"
+# 所有プロセスがいなくなってから終了するまでの猶予（秒）
+LINGER_SECONDS = 2.0
+# pidfd が使えない場合の生存確認間隔（秒）
+SWEEP_INTERVAL = 1.0
+
+
+def parse_limits(spec: str) -> dict:
+    """'claude=1,gemini=2' → {'claude': 1, 'gemini': 2}"""
+    limits = {}
+    for item in spec.split(","):
+        name, sep, value = item.strip().partition("=")
+        if sep and name and value.strip().isdigit():
+            limits[name] = int(value)
+    return limits
+
+
+def pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Waiter:
+    __slots__ = ("req", "ai", "owner", "reply")
+
+    def __init__(self, req: str, ai: str, owner: int, reply: str):
+        self.req = req
+        self.ai = ai
+        self.owner = owner
+        self.reply = reply
+
+
+class Holder:
+    __slots__ = ("req", "ai", "owner")
+
+    def __init__(self, req: str, ai: str, owner: int):
+        self.req = req
+        self.ai = ai
+        self.owner = owner
+
+
+class SlotDaemon:
+    def __init__(self, slots_dir: str, max_slots: int, limits: dict, ctl_fd: int, owner: int = 0):
+        self.slots_dir = slots_dir
+        self.owner = owner            # 起動したプロセス（shutdown を送れるのはこのプロセスだけ）
+        self.state_dir = os.path.join(slots_dir, STATE_DIR)
+        self.ctl_path = os.path.join(self.state_dir, "ctl")
+        self.pid_path = os.path.join(self.state_dir, "daemon.pid")
+        self.max_slots = max_slots
+        self.limits = limits
+        self.ctl_fd = ctl_fd
+        self.buffer = b""
+
+        self.queue = deque()          # Waiter（到着順）
+        self.holders = {}             # slot_file -> Holder
+        self.slot_by_req = {}         # req_id -> slot_file
+        self.per_ai = {}              # ai -> 保持数
+        self.owners = {}              # pid -> pidfd（pidfd なしなら None）
+        self.idle_since = None
+        self.running = True
+
+        self.sel = selectors.DefaultSelector()
+        self.sel.register(ctl_fd, selectors.EVENT_READ, None)
+
+    # ------------------------------------------------------------------
+    # 所有プロセスの監視
+    # ------------------------------------------------------------------
+
+    def watch(self, pid: int) -> bool:
+        """pid の終了監視を始める。すでに終了していれば False"""
+        if pid in self.owners:
+            return True
+        pidfd = None
+        try:
+            pidfd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return False
+        except (AttributeError, OSError):
+            if not pid_alive(pid):
+                return False
+        self.owners[pid] = pidfd
+        if pidfd is not None:
+            self.sel.register(pidfd, selectors.EVENT_READ, pid)
+        return True
+
+    def reap(self, pid: int):
+        """終了したプロセスの待機をやめ、保持していたスロットを回収する"""
+        pidfd = self.owners.pop(pid, None)
+        if pidfd is not None:
+            self.sel.unregister(pidfd)
+            os.close(pidfd)
+        kept = deque()
+        for waiter in self.queue:
+            if waiter.owner == pid:
+                self._unlink(waiter.reply)
+            else:
+                kept.append(waiter)
+        self.queue = kept
+        for slot_file, holder in list(self.holders.items()):
+            if holder.owner == pid:
+                self.release(slot_file)
+
+    def sweep(self):
+        for pid, pidfd in list(self.owners.items()):
+            if pidfd is None and not pid_alive(pid):
+                self.reap(pid)
+
+    # ------------------------------------------------------------------
+    # スロットの割り当て
+    # ------------------------------------------------------------------
+
+    def adopt_existing(self):
+        """起動前から残っているスロットファイルを引き継ぐ（所有者が死んでいれば削除）"""
+        for name in os.listdir(self.slots_dir):
+            path = os.path.join(self.slots_dir, name)
+            if name.startswith(".") or not os.path.isfile(path):
+                continue
+            parts = name.split("-")
+            owner = int(parts[1]) if len(parts) >= 3 and parts[1].isdigit() else 0
+            if owner and self.watch(owner):
+                self._hold(path, Holder(parts[2], parts[0], owner))
+            else:
+                self._unlink(path)
+
+    def _hold(self, slot_file: str, holder: Holder):
+        self.holders[slot_file] = holder
+        self.slot_by_req[holder.req] = slot_file
+        self.per_ai[holder.ai] = self.per_ai.get(holder.ai, 0) + 1
+
+    def release(self, slot_file: str):
+        holder = self.holders.pop(slot_file, None)
+        if holder is None:
+            return
+        self.slot_by_req.pop(holder.req, None)
+        self.per_ai[holder.ai] -= 1
+        self._unlink(slot_file)
+
+    def _grant(self, waiter: Waiter) -> bool:
+        """待機者にスロットを渡す。待機者がもういなければ False"""
+        try:
+            fd = os.open(waiter.reply, os.O_WRONLY | os.O_NONBLOCK)
+        except OSError:
+            # ENXIO: 読み手がいない（タイムアウト済み） / ENOENT: 応答FIFOが消えた
+            self._unlink(waiter.reply)
+            return False
+        slot_file = os.path.join(self.slots_dir, f"{waiter.ai}-{waiter.owner}-{waiter.req}")
+        try:
+            with open(slot_file, "w") as f:
+                f.write(f"{waiter.owner}\n")
+            os.write(fd, f"ok {slot_file}\n".encode())
+        except OSError:
+            self._unlink(slot_file)
+            return False
+        finally:
+            os.close(fd)
+            self._unlink(waiter.reply)
+        self._hold(slot_file, Holder(waiter.req, waiter.ai, waiter.owner))
+        return True
+
+    def dispatch(self):
+        """空きがある限り、AIごとの上限内で最も早く来た待機者から割り当てる"""
+        if len(self.holders) >= self.max_slots or not self.queue:
+            return
+        kept = deque()
+        while self.queue:
+            waiter = self.queue.popleft()
+            if len(self.holders) >= self.max_slots:
+                kept.append(waiter)
+                kept.extend(self.queue)
+                break
+            limit = self.limits.get(waiter.ai)
+            if limit is not None and self.per_ai.get(waiter.ai, 0) >= limit:
+                kept.append(waiter)
+                continue
+            self._grant(waiter)
+        self.queue = kept
+
+    # ------------------------------------------------------------------
+    # 制御メッセージ
+    # ------------------------------------------------------------------
+
+    def handle(self, line: str):
+        parts = line.split()
+        if not parts:
+            return
+        command = parts[0]
+        if command == "acquire" and len(parts) == 5 and parts[3].isdigit():
+            _, req, ai, owner, reply = parts
+            if self.watch(int(owner)):
+                self.queue.append(Waiter(req, ai, int(owner), reply))
+            else:
+                self._unlink(reply)
+        elif command == "release" and len(parts) == 2:
+            self.release(parts[1])
+        elif command == "cancel" and len(parts) == 2:
+            req = parts[1]
+            slot_file = self.slot_by_req.get(req)
+            if slot_file is not None:
+                # タイムアウトと割り当てがすれ違った
+                self.release(slot_file)
+            kept = deque()
+            for waiter in self.queue:
+                if waiter.req == req:
+                    self._unlink(waiter.reply)
+                else:
+                    kept.append(waiter)
+            self.queue = kept
+        elif command == "shutdown":
+            # 他のプロセスの終了処理で、共有しているデーモンを止めない
+            if len(parts) == 1 or not self.owner or parts[1] == str(self.owner):
+                self.running = False
+
+    def read_ctl(self) -> list:
+        lines = []
+        while True:
+            try:
+                chunk = os.read(self.ctl_fd, 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            self.buffer += chunk
+        if b"\n" in self.buffer:
+            *complete, self.buffer = self.buffer.split(b"\n")
+            lines = [line.decode(errors="replace") for line in complete]
+        return lines
+
+    # ------------------------------------------------------------------
+    # イベントループ
+    # ------------------------------------------------------------------
+
+    def _idle(self) -> bool:
+        return not self.owners and not self.holders and not self.queue
+
+    def run(self):
+        while self.running:
+            timeout = None
+            if any(pidfd is None for pidfd in self.owners.values()):
+                timeout = SWEEP_INTERVAL
+            if self._idle():
+                now = time.monotonic()
+                if self.idle_since is None:
+                    self.idle_since = now
+                elif now - self.idle_since >= LINGER_SECONDS:
+                    break
+                timeout = max(0.0, LINGER_SECONDS - (now - self.idle_since))
+            else:
+                self.idle_since = None
+
+            for key, _ in self.sel.select(timeout):
+                if key.data is None:
+                    for line in self.read_ctl():
+                        self.handle(line)
+                else:
+                    self.reap(key.data)
+            self.sweep()
+            self.dispatch()
+        self.shutdown()
+
+    def shutdown(self):
+        """制御FIFOを外してから残りのメッセージを処理する
+
+        待機中の取得要求と未読の取得要求には retry を返す（呼び出し側は再起動して取り直す）
+        """
+        self._unlink(self.pid_path)
+        self._unlink(self.ctl_path)
+        time.sleep(0.05)
+        for line in self.read_ctl():
+            parts = line.split()
+            if parts and parts[0] == "acquire" and len(parts) == 5:
+                self._send_retry(parts[4])
+            elif parts and parts[0] == "release" and len(parts) == 2:
+                self.release(parts[1])
+        while self.queue:
+            self._send_retry(self.queue.popleft().reply)
+
+    def _send_retry(self, reply: str):
+        try:
+            fd = os.open(reply, os.O_WRONLY | os.O_NONBLOCK)
+            os.write(fd, b"retry\n")
+            os.close(fd)
+        except OSError:
+            pass
+        self._unlink(reply)
+
+    @staticmethod
+    def _unlink(path: str):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def _open_ctl(ctl_path: str) -> int:
+    try:
+        os.unlink(ctl_path)
+    except FileNotFoundError:
+        pass
+    os.mkfifo(ctl_path, 0o600)
+    # 読み書き両用で開いておけば、書き手がいなくなっても EOF にならない
+    return os.open(ctl_path, os.O_RDWR | os.O_NONBLOCK)
+
+
+def _detach(keep: set):
+    """setsid し、標準入出力と keep 以外の継承FDを閉じる"""
+    os.setsid()
+    os.chdir("/")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.close(devnull)
+    fd = 3
+    for keep_fd in sorted(keep) + [1024]:
+        if keep_fd > fd:
+            os.closerange(fd, keep_fd)
+        fd = max(fd, keep_fd + 1)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Event-driven AI slot daemon")
+    parser.add_argument("--dir", required=True, help="AI_SLOTS_DIR")
+    parser.add_argument("--max", type=int, required=True, help="全体の同時実行数")
+    parser.add_argument("--limits", default="", help="AIごとの上限 (ai=N,...)")
+    parser.add_argument("--owner", type=int, default=0, help="起動したプロセスのPID")
+    parser.add_argument("--foreground", action="store_true")
+    args = parser.parse_args()
+
+    state_dir = os.path.join(args.dir, STATE_DIR)
+    os.makedirs(state_dir, exist_ok=True)
+
+    # 起動は1つずつ。すでに動いているデーモンがあれば何もしない
+    start_fd = os.open(os.path.join(state_dir, "start.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+    fcntl.flock(start_fd, fcntl.LOCK_EX)
+    lock_fd = os.open(os.path.join(state_dir, "daemon.lock"), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError as e:
+        if e.errno in (errno.EAGAIN, errno.EACCES):
+            return 0
+        raise
+
+    ctl_fd = _open_ctl(os.path.join(state_dir, "ctl"))
+    ready_r = ready_w = -1
+    if not args.foreground:
+        ready_r, ready_w = os.pipe()
+        if os.fork() > 0:
+            # 子が準備完了を知らせるまで待つ（呼び出し側はすぐに acquire できる）
+            os.close(ready_w)
+            os.read(ready_r, 1)
+            return 0
+        os.close(ready_r)
+        os.close(start_fd)
+        _detach({lock_fd, ctl_fd, ready_w})
+
+    daemon = SlotDaemon(args.dir, max(1, args.max), parse_limits(args.limits), ctl_fd, args.owner)
+    # select() を起こすため、シグナルは制御FIFOへの shutdown として扱う
+    signal.signal(signal.SIGTERM, lambda *_: os.write(ctl_fd, b"shutdown\n"))
+    if args.owner:
+        daemon.watch(args.owner)
+    daemon.adopt_existing()
+    with open(daemon.pid_path, "w") as f:
+        f.write(f"{os.getpid()}\n")
+    if ready_w >= 0:
+        os.write(ready_w, b"1")
+        os.close(ready_w)
+    else:
+        os.close(start_fd)
+
+    daemon.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
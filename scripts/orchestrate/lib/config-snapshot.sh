@@ -0,0 +1,323 @@
+#!/usr/bin/env bash
+# Multi-AI Configuration Snapshot Library
+# Purpose: Compile config/multi-ai-profiles.yaml once into a flat, sourceable snapshot
+# Responsibilities:
+#   - Schema validation at compile time (config_snapshot_validate)
+#   - Snapshot compilation keyed by the YAML content hash (config_snapshot_compile)
+#   - Freshness check and loading (config_snapshot_load)
+#   - Constant-time lookups without forks (config_snapshot_get, config_snapshot_has)
+#
+# A snapshot is a bash file declaring MULTI_AI_CONFIG as an associative array:
+#   profiles/<profile>/workflows/<workflow>/phases/0/ai    -> scalar as yq prints it
+#   profiles/<profile>/workflows/<workflow>/phases/#       -> length of a list/map
+#   .../phases/2/input_from                                -> JSON text of a scalar list
+# Snapshots live in $CONFIG_SNAPSHOT_DIR as <name>.<sha256[0:16]>.sh, and
+# <name>.current holds the hash of the snapshot compiled last. Each process
+# sources the snapshot once. After that it only compares the YAML's mtime with
+# the snapshot's ([[ -nt ]], no fork); the YAML is hashed again only after it
+# was touched, and yq/jq run only when its content actually changed.
+#
+# Settings:
+#   CONFIG_SNAPSHOT_ENABLED  true (default) | false = always query yq
+#   CONFIG_SNAPSHOT_DIR      snapshot directory (default: $PROJECT_ROOT/.cache/config-snapshots)
+#   CONFIG_SNAPSHOT_STRICT   true = refuse to compile a YAML that fails schema validation
+#                            (default false: violations are logged as warnings)
+#
+# Dependencies:
+#   - lib/multi-ai-core.sh (logging functions)
+#   - yq v4 (YAML -> JSON), jq, sha256sum or shasum (compile time only)
+
+set -euo pipefail
+
+PROJECT_ROOT="${PROJECT_ROOT:-$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)}"
+
+CONFIG_SNAPSHOT_ENABLED="${CONFIG_SNAPSHOT_ENABLED:-true}"
+CONFIG_SNAPSHOT_DIR="${CONFIG_SNAPSHOT_DIR:-$PROJECT_ROOT/.cache/config-snapshots}"
+CONFIG_SNAPSHOT_STRICT="${CONFIG_SNAPSHOT_STRICT:-false}"
+
+# Loaded snapshot (per process; re-sourced only when the YAML changes)
+declare -gA MULTI_AI_CONFIG=()
+MULTI_AI_CONFIG_SNAPSHOT_HASH=""
+_CONFIG_SNAPSHOT_YAML=""
+_CONFIG_SNAPSHOT_FILE=""
+# YAML whose compile failed in this process (not retried until invalidated)
+_CONFIG_SNAPSHOT_FAILED=""
+# Schema violations found when the loaded snapshot was compiled (-1: not validated)
+CONFIG_SNAPSHOT_VIOLATIONS=-1
+
+# ============================================================================
+# jq Programs
+# ============================================================================
+
+# Flatten a JSON document into `[key]=value` lines of a bash associative array.
+# Scalars keep yq's output format (strings raw, null as "null"); lists and maps
+# get a "<path>/#" length entry, and lists of scalars are also stored as JSON.
+_CONFIG_SNAPSHOT_FLATTEN_JQ='
+def scalar_text: if type == "string" then . elif type == "null" then "null" else tojson end;
+paths as $p
+| getpath($p) as $v
+| ($p | map(tostring) | join("/")) as $k
+| if ($v | type) == "array" then
+      [$k + "/#", ($v | length | tostring)],
+      (if all($v[]; type != "array" and type != "object") then [$k, ($v | tojson)] else empty end)
+  elif ($v | type) == "object" then
+      [$k + "/#", ($v | length | tostring)]
+  else
+      [$k, ($v | scalar_text)]
+  end
+| "[\(.[0] | @sh)]=\(.[1] | @sh)"
+'
+
+# Validate a JSON document against the draft-07 subset used by
+# config/schema/multi-ai-profiles.schema.json (type, enum, required, properties,
+# patternProperties, items, minItems, minimum, maximum, minLength, pattern, oneOf).
+# Prints one line per violation.
+_CONFIG_SNAPSHOT_VALIDATE_JQ='
+def type_names: if type == "number" and . == floor then ["number", "integer"] else [type] end;
+def violations($s; $p):
+  . as $v
+  | ( if ($s | has("type")) and ([$s.type] | flatten) as $t
+           | ([$v | type_names[] | select(. as $n | $t | index($n))] | length) == 0
+      then "\($p): expected \($s.type | tojson), got \($v | type)" else empty end ),
+    ( if ($s | has("enum")) and ([$s.enum[] | select(. == $v)] | length) == 0
+      then "\($p): \($v | tojson) is not one of \($s.enum | tojson)" else empty end ),
+    ( if ($v | type) == "number" then
+        ( if ($s | has("minimum")) and $v < $s.minimum then "\($p): \($v) < minimum \($s.minimum)" else empty end ),
+        ( if ($s | has("maximum")) and $v > $s.maximum then "\($p): \($v) > maximum \($s.maximum)" else empty end )
+      else empty end ),
+    ( if ($v | type) == "string" then
+        ( if ($s | has("minLength")) and ($v | length) < $s.minLength then "\($p): shorter than \($s.minLength)" else empty end ),
+        ( if ($s | has("pattern")) and ($v | test($s.pattern) | not) then "\($p): does not match \($s.pattern)" else empty end )
+      else empty end ),
+    ( if ($v | type) == "object" then
+        ( ($s.required // [])[] | select(. as $k | $v | has($k) | not) | "\($p): missing required key \"\(.)\"" ),
+        ( $v | to_entries[] | .key as $k | .value as $c
+          | ( ($s.properties // {})[$k] // empty | . as $cs | $c | violations($cs; "\($p).\($k)") ),
+            ( ($s.patternProperties // {}) | to_entries[] | select(.key as $re | $k | test($re)) | .value as $cs
+              | $c | violations($cs; "\($p).\($k)") ) )
+      else empty end ),
+    ( if ($v | type) == "array" then
+        ( if ($s | has("minItems")) and ($v | length) < $s.minItems then "\($p): fewer than \($s.minItems) items" else empty end ),
+        ( if ($s | has("items")) then
+            $v | to_entries[] | .key as $i | .value | violations($s.items; "\($p)[\($i)]")
+          else empty end )
+      else empty end ),
+    ( if ($s | has("oneOf")) then
+        ([$s.oneOf[] as $alt | select(([$v | violations($alt; $p)] | length) == 0)] | length) as $n
+        | if $n != 1 then "\($p): matches \($n) of \($s.oneOf | length) oneOf alternatives" else empty end
+      else empty end );
+violations($schema[0]; "")
+'
+
+# ============================================================================
+# Compile Functions
+# ============================================================================
+
+# Hash a file's content (first 16 hex chars of SHA-256) into a variable
+# Usage: _config_snapshot_hash <var_name> <file>
+_config_snapshot_hash() {
+    local -n _hash_ref=$1
+    local digest
+    if command -v sha256sum &>/dev/null; then
+        digest=$(sha256sum "$2") || return 1
+    else
+        digest=$(shasum -a 256 "$2") || return 1
+    fi
+    _hash_ref="${digest:0:16}"
+}
+
+# Default schema for a YAML file: config/schema/<name>.schema.json
+_config_snapshot_schema_for() {
+    local yaml_file="$1"
+    local name="${yaml_file##*/}"
+    echo "${yaml_file%/*}/schema/${name%.yaml}.schema.json"
+}
+
+# Validate a JSON document against a JSON schema
+# Usage: config_snapshot_validate <json_file> <schema_file>
+# Output: one line per violation
+# Returns: 0 if valid, 1 if there are violations, 2 if validation could not run
+config_snapshot_validate() {
+    local json_file="$1"
+    local schema_file="$2"
+    local violations
+
+    violations=$(jq -r --slurpfile schema "$schema_file" "$_CONFIG_SNAPSHOT_VALIDATE_JQ" "$json_file") || return 2
+    [[ -n "$violations" ]] || return 0
+
+    echo "$violations"
+    return 1
+}
+
+# Compile a YAML file into a snapshot (no-op if a snapshot for its content exists)
+# Usage: config_snapshot_compile [yaml_file] [schema_file]
+# Output: snapshot file path
+# Returns: 0 on success, 1 on failure (callers then fall back to yq)
+config_snapshot_compile() {
+    local yaml_file="${1:-$PROJECT_ROOT/config/multi-ai-profiles.yaml}"
+    local schema_file="${2:-$(_config_snapshot_schema_for "$yaml_file")}"
+    local name="${yaml_file##*/}"
+    name="${name%.yaml}"
+
+    [[ -f "$yaml_file" ]] || { log_error "Configuration file not found: $yaml_file"; return 1; }
+    if ! command -v yq &>/dev/null || ! command -v jq &>/dev/null; then
+        log_debug "Config snapshot: yq/jq not available, using direct yq queries"
+        return 1
+    fi
+    mkdir -p "$CONFIG_SNAPSHOT_DIR" 2>/dev/null || {
+        log_warning "Failed to create config snapshot directory: $CONFIG_SNAPSHOT_DIR"
+        return 1
+    }
+
+    local hash
+    _config_snapshot_hash hash "$yaml_file" || return 1
+    local snapshot_file="$CONFIG_SNAPSHOT_DIR/${name}.${hash}.sh"
+
+    if [[ ! -f "$snapshot_file" ]]; then
+        local tmp_json="$snapshot_file.$$.json"
+        local tmp_file="$snapshot_file.$$.tmp"
+
+        if ! yq eval -o=json '.' "$yaml_file" > "$tmp_json" 2>/dev/null; then
+            rm -f "$tmp_json"
+            log_warning "Config snapshot: yq could not convert $yaml_file to JSON"
+            return 1
+        fi
+
+        local violations="" violation_count=-1 validate_status=2
+        if [[ -f "$schema_file" ]]; then
+            violations=$(config_snapshot_validate "$tmp_json" "$schema_file") && validate_status=0 || validate_status=$?
+            if [[ $validate_status -eq 0 ]]; then
+                violation_count=0
+            elif [[ $validate_status -eq 1 ]]; then
+                violation_count=$(grep -c '' <<< "$violations")
+                log_warning "Config snapshot: $name.yaml has $violation_count schema violation(s):"
+                while IFS= read -r line; do
+                    log_warning "  $line"
+                done <<< "$violations"
+            else
+                log_warning "Config snapshot: schema validation could not run ($schema_file)"
+            fi
+            if [[ $validate_status -ne 0 ]]; then
+                if [[ "$CONFIG_SNAPSHOT_STRICT" == "true" ]]; then
+                    rm -f "$tmp_json"
+                    log_error "Config snapshot not compiled (CONFIG_SNAPSHOT_STRICT=true)"
+                    return 1
+                fi
+            fi
+        fi
+
+        {
+            echo "# Compiled from $yaml_file - do not edit"
+            echo "MULTI_AI_CONFIG_SNAPSHOT_HASH='$hash'"
+            echo "CONFIG_SNAPSHOT_VIOLATIONS=$violation_count"
+            echo "MULTI_AI_CONFIG=("
+            jq -r "$_CONFIG_SNAPSHOT_FLATTEN_JQ" "$tmp_json"
+            echo ")"
+        } > "$tmp_file" 2>/dev/null || {
+            rm -f "$tmp_json" "$tmp_file"
+            log_warning "Config snapshot: failed to flatten $yaml_file"
+            return 1
+        }
+        rm -f "$tmp_json"
+        # Atomic publish: concurrent compilers write the same content
+        mv -f "$tmp_file" "$snapshot_file"
+    else
+        # Same content as before (e.g. touched or reverted): mark the snapshot current
+        touch "$snapshot_file"
+    fi
+
+    # Pointer for the freshness check (its mtime is compared with the YAML's)
+    local pointer_tmp="$CONFIG_SNAPSHOT_DIR/${name}.current.$$"
+    echo "$hash" > "$pointer_tmp" && mv -f "$pointer_tmp" "$CONFIG_SNAPSHOT_DIR/${name}.current"
+
+    echo "$snapshot_file"
+}
+
+# ============================================================================
+# Lookup Functions
+# ============================================================================
+
+# Make sure the snapshot of a YAML file is loaded and up to date
+# Usage: config_snapshot_load [yaml_file]
+# Returns: 0 if MULTI_AI_CONFIG holds the current snapshot, 1 otherwise
+config_snapshot_load() {
+    [[ "$CONFIG_SNAPSHOT_ENABLED" == "true" ]] || return 1
+
+    local yaml_file="${1:-$PROJECT_ROOT/config/multi-ai-profiles.yaml}"
+    local name="${yaml_file##*/}"
+    local pointer="$CONFIG_SNAPSHOT_DIR/${name%.yaml}.current"
+
+    # Fast path: already loaded and the YAML has not been touched since
+    if [[ "$_CONFIG_SNAPSHOT_YAML" == "$yaml_file" && ! "$yaml_file" -nt "$_CONFIG_SNAPSHOT_FILE" ]]; then
+        return 0
+    fi
+
+    [[ "$_CONFIG_SNAPSHOT_FAILED" != "$yaml_file" ]] || return 1
+
+    local snapshot_file="" hash=""
+    if [[ -f "$pointer" && ! "$yaml_file" -nt "$pointer" ]]; then
+        read -r hash < "$pointer" || hash=""
+        snapshot_file="$CONFIG_SNAPSHOT_DIR/${name%.yaml}.${hash}.sh"
+    fi
+    if [[ -z "$hash" || ! -f "$snapshot_file" || "$yaml_file" -nt "$snapshot_file" ]]; then
+        snapshot_file=$(config_snapshot_compile "$yaml_file") || {
+            _CONFIG_SNAPSHOT_FAILED="$yaml_file"
+            return 1
+        }
+    fi
+
+    MULTI_AI_CONFIG=()
+    # shellcheck source=/dev/null
+    source "$snapshot_file" || { MULTI_AI_CONFIG=(); _CONFIG_SNAPSHOT_YAML=""; return 1; }
+    _CONFIG_SNAPSHOT_YAML="$yaml_file"
+    _CONFIG_SNAPSHOT_FILE="$snapshot_file"
+    return 0
+}
+
+# Look up a snapshot key into a variable (no subshell needed)
+# Usage: config_snapshot_get <var_name> <key> [default]
+#   key: "/"-separated path, e.g. profiles/balanced-multi-ai/workflows/x/phases/0/ai
+#   default: value for missing keys (default: "null", like yq)
+# Returns: 0 if the snapshot answered, 1 if it is unavailable (use yq instead)
+config_snapshot_get() {
+    config_snapshot_load || return 1
+    local -n _snapshot_ref=$1
+    _snapshot_ref="${MULTI_AI_CONFIG[$2]-${3-null}}"
+}
+
+# Check whether a key (a scalar, or a list/map via its "/#" entry) exists
+# Usage: config_snapshot_has <key>
+# Returns: 0 if present, 1 if absent, 2 if the snapshot is unavailable
+config_snapshot_has() {
+    config_snapshot_load || return 2
+    [[ -v "MULTI_AI_CONFIG[$1]" || -v "MULTI_AI_CONFIG[$1/#]" ]]
+}
+
+# Drop the loaded snapshot (the next lookup re-checks and re-sources it)
+invalidate_config_snapshot() {
+    MULTI_AI_CONFIG=()
+    _CONFIG_SNAPSHOT_YAML=""
+    _CONFIG_SNAPSHOT_FILE=""
+    _CONFIG_SNAPSHOT_FAILED=""
+}
+
+export -f _config_snapshot_hash
+export -f _config_snapshot_schema_for
+export -f config_snapshot_validate
+export -f config_snapshot_compile
+export -f config_snapshot_load
+export -f config_snapshot_get
+export -f config_snapshot_has
+export -f invalidate_config_snapshot
+
+# Standalone: compile (and report on) a configuration file
+# Usage: bash config-snapshot.sh [yaml_file]
+if [[ "${BASH_SOURCE[0]}" == "${0}" ]]; then
+    # shellcheck source=multi-ai-core.sh
+    source "$(dirname "${BASH_SOURCE[0]}")/multi-ai-core.sh"
+
+    yaml="${1:-$PROJECT_ROOT/config/multi-ai-profiles.yaml}"
+    snapshot=$(config_snapshot_compile "$yaml") || exit 1
+    config_snapshot_load "$yaml" || exit 1
+    log_success "Config snapshot: $snapshot (${#MULTI_AI_CONFIG[@]} keys, hash $MULTI_AI_CONFIG_SNAPSHOT_HASH)"
+fi
@@ -8,6 +8,7 @@
 # - Critical-Path抽出
 # - Slack Time算出
 # - レイテンシ予測
+# - 増分再計算（所要時間・ステータス変更時は影響を受ける部分グラフのみ更新）
 
 set -euo pipefail
 
@@ -37,6 +38,17 @@ declare -ga CPM_CRITICAL_PATH
 # Total Project Duration（プロジェクト全体の所要時間）
 declare -g CPM_TOTAL_DURATION=0
 
+# 直近の増分更新で再計算したノード数（全体再計算時はノード総数）
+declare -g CPM_LAST_RECOMPUTED=0
+
+# ENDまでの最長パス長（増分計算用、LFT = 全体所要時間 - この値）
+# キー: ノードID
+# 値: 秒数（数値）
+declare -gA _CPM_TAIL
+
+# ENDノードID（増分計算用）
+declare -g _CPM_END_NODE=""
+
 # ==============================================================================
 # EST計算（前方パス）
 # ==============================================================================
@@ -53,36 +65,41 @@ cpm_calculate_est() {
 
     # ESTを初期化
     CPM_EST=()
-    for node_id in $(dag_get_all_nodes); do
+    local node_id est
+    for node_id in "${!DAG_NODES[@]}"; do
         CPM_EST["$node_id"]=0
     done
 
     # トポロジカル順序で計算
     for node_id in "${DAG_TOPO_ORDER[@]}"; do
-        local max_est=0
-
-        # すべての前方ノード（predecessors）から最大ESTを計算
-        local predecessors=$(dag_get_predecessors "$node_id")
-        if [[ -n "$predecessors" ]]; then
-            for pred in $predecessors; do
-                # predecessor のEST + edge weight（タスク実行時間）
-                local pred_est=${CPM_EST[$pred]}
-                local edge_weight=$(dag_get_edge_weight "$pred" "$node_id")
-
-                local pred_finish_time=$((pred_est + edge_weight))
-
-                if [[ $pred_finish_time -gt $max_est ]]; then
-                    max_est=$pred_finish_time
-                fi
-            done
-        fi
-
-        CPM_EST["$node_id"]=$max_est
+        _cpm_node_est est "$node_id"
+        CPM_EST["$node_id"]=$est
     done
 
     return 0
 }
 
+# 1ノードのESTを前方ノードから計算（内部関数、サブシェル無し）
+# 引数:
+#   $1: 結果を格納する変数名
+#   $2: ノードID
+_cpm_node_est() {
+    local -n _cpm_est_result=$1
+    local node_id="$2"
+    local max_est=0 pred pred_finish_time adjacent
+
+    # predecessor のEST + edge weight（タスク実行時間）の最大値
+    adjacent="${DAG_REVERSE_EDGES[$node_id]:-}"
+    for pred in ${adjacent//,/ }; do
+        pred_finish_time=$(( ${CPM_EST[$pred]:-0} + ${DAG_EDGE_WEIGHTS["${pred}->${node_id}"]:-0} ))
+        if [[ $pred_finish_time -gt $max_est ]]; then
+            max_est=$pred_finish_time
+        fi
+    done
+
+    _cpm_est_result=$max_est
+}
+
 # ==============================================================================
 # LFT計算（後方パス）
 # ==============================================================================
@@ -99,12 +116,12 @@ cpm_calculate_lft() {
 
     # LFTを初期化（ENDノードのLFTをプロジェクト完了時刻に設定）
     CPM_LFT=()
+    _CPM_TAIL=()
 
     # ENDノードのESTをプロジェクト完了時刻とする
-    local end_node=""
+    local end_node="" node_id i tail
     for node_id in "${DAG_TOPO_ORDER[@]}"; do
-        local node_type=$(dag_get_node_type "$node_id")
-        if [[ "$node_type" == "END" ]]; then
+        if [[ "${DAG_NODE_TYPES[$node_id]:-}" == "END" ]]; then
             end_node="$node_id"
             break
         fi
@@ -115,46 +132,43 @@ cpm_calculate_lft() {
         return 1
     fi
 
+    _CPM_END_NODE="$end_node"
     CPM_TOTAL_DURATION=${CPM_EST[$end_node]}
-    CPM_LFT["$end_node"]=$CPM_TOTAL_DURATION
 
-    # 逆トポロジカル順序で計算（ENDから遡る）
-    local reverse_order=()
+    # 逆トポロジカル順序でENDまでの最長パス長を計算（ENDから遡る）
+    # LFT(u) = min(LFT(v) - duration(u->v)) = 全体所要時間 - tail(u)
+    # 後続ノードがない場合は tail = 0、つまり LFT = プロジェクト完了時刻
     for ((i=${#DAG_TOPO_ORDER[@]}-1; i>=0; i--)); do
-        reverse_order+=("${DAG_TOPO_ORDER[$i]}")
+        node_id="${DAG_TOPO_ORDER[$i]}"
+        _cpm_node_tail tail "$node_id"
+        _CPM_TAIL["$node_id"]=$tail
+        CPM_LFT["$node_id"]=$((CPM_TOTAL_DURATION - tail))
     done
 
-    for node_id in "${reverse_order[@]}"; do
-        # ENDノードはスキップ（既に設定済み）
-        if [[ "$node_id" == "$end_node" ]]; then
-            continue
-        fi
-
-        # 後続ノード（successors）がない場合、LFT = プロジェクト完了時刻
-        local successors=$(dag_get_successors "$node_id")
-        if [[ -z "$successors" ]]; then
-            CPM_LFT["$node_id"]=$CPM_TOTAL_DURATION
-            continue
-        fi
-
-        # すべての後続ノードから最小LFTを計算
-        local min_lft=$CPM_TOTAL_DURATION
-        for succ in $successors; do
-            # successor のLFT - edge weight
-            local succ_lft=${CPM_LFT[$succ]}
-            local edge_weight=$(dag_get_edge_weight "$node_id" "$succ")
-
-            local required_finish_time=$((succ_lft - edge_weight))
+    return 0
+}
 
-            if [[ $required_finish_time -lt $min_lft ]]; then
-                min_lft=$required_finish_time
+# 1ノードのENDまでの最長パス長を後続ノードから計算（内部関数、サブシェル無し）
+# 引数:
+#   $1: 結果を格納する変数名
+#   $2: ノードID
+_cpm_node_tail() {
+    local -n _cpm_tail_result=$1
+    local node_id="$2"
+    local max_tail=0 succ path_length adjacent
+
+    # ENDノードはプロジェクト完了時刻で固定
+    if [[ "$node_id" != "$_CPM_END_NODE" ]]; then
+        adjacent="${DAG_FORWARD_EDGES[$node_id]:-}"
+        for succ in ${adjacent//,/ }; do
+            path_length=$(( ${_CPM_TAIL[$succ]:-0} + ${DAG_EDGE_WEIGHTS["${node_id}->${succ}"]:-0} ))
+            if [[ $path_length -gt $max_tail ]]; then
+                max_tail=$path_length
             fi
         done
+    fi
 
-        CPM_LFT["$node_id"]=$min_lft
-    done
-
-    return 0
+    _cpm_tail_result=$max_tail
 }
 
 # ==============================================================================
@@ -173,14 +187,10 @@ cpm_calculate_slack() {
 
     CPM_SLACK=()
 
-    for node_id in $(dag_get_all_nodes); do
-        local est=${CPM_EST[$node_id]}
-        local lft=${CPM_LFT[$node_id]}
-
+    local node_id
+    for node_id in "${!DAG_NODES[@]}"; do
         # Slack = LFT - EST
-        local slack=$((lft - est))
-
-        CPM_SLACK["$node_id"]=$slack
+        CPM_SLACK["$node_id"]=$(( ${CPM_LFT[$node_id]} - ${CPM_EST[$node_id]} ))
     done
 
     return 0
@@ -202,10 +212,9 @@ cpm_extract_critical_path() {
     CPM_CRITICAL_PATH=()
 
     # STARTノードを見つける
-    local start_node=""
-    for node_id in $(dag_get_all_nodes); do
-        local node_type=$(dag_get_node_type "$node_id")
-        if [[ "$node_type" == "START" ]]; then
+    local start_node="" node_id
+    for node_id in "${!DAG_NODES[@]}"; do
+        if [[ "${DAG_NODE_TYPES[$node_id]:-}" == "START" ]]; then
             start_node="$node_id"
             break
         fi
@@ -222,43 +231,40 @@ cpm_extract_critical_path() {
     return 0
 }
 
-# Critical-PathのDFS探索（内部関数）
+# Critical-PathのDFS探索（内部関数、再帰せずループで辿る）
 _cpm_dfs_critical_path() {
     local node_id="$1"
+    local succ slack min_slack next_node adjacent
 
-    # Critical-Pathに追加
-    CPM_CRITICAL_PATH+=("$node_id")
-
-    # ENDノードに到達したら終了
-    local node_type=$(dag_get_node_type "$node_id")
-    if [[ "$node_type" == "END" ]]; then
-        return 0
-    fi
+    while [[ -n "$node_id" ]]; do
+        # Critical-Pathに追加
+        CPM_CRITICAL_PATH+=("$node_id")
 
-    # Slack = 0 の後続ノードを探す
-    local successors=$(dag_get_successors "$node_id")
-    for succ in $successors; do
-        local slack=${CPM_SLACK[$succ]}
-        if [[ $slack -eq 0 ]]; then
-            _cpm_dfs_critical_path "$succ"
+        # ENDノードに到達したら終了
+        if [[ "${DAG_NODE_TYPES[$node_id]:-}" == "END" ]]; then
             return 0
         fi
-    done
 
-    # Slack = 0 の後続ノードがない場合、最もSlackの小さいノードを選ぶ
-    local min_slack=999999
-    local next_node=""
-    for succ in $successors; do
-        local slack=${CPM_SLACK[$succ]}
-        if [[ $slack -lt $min_slack ]]; then
-            min_slack=$slack
-            next_node="$succ"
-        fi
-    done
+        # Slack = 0 かつ余裕のないエッジ（EST + 重み = 後続のEST）で繋がる後続ノードを優先し、
+        # なければ最もSlackの小さいノードを選ぶ
+        min_slack=999999
+        next_node=""
+        adjacent="${DAG_FORWARD_EDGES[$node_id]:-}"
+        for succ in ${adjacent//,/ }; do
+            slack=${CPM_SLACK[$succ]}
+            if [[ $slack -eq 0 ]] &&
+                [[ $(( ${CPM_EST[$node_id]} + ${DAG_EDGE_WEIGHTS["${node_id}->${succ}"]:-0} )) -eq ${CPM_EST[$succ]} ]]; then
+                next_node="$succ"
+                break
+            fi
+            if [[ $slack -lt $min_slack ]]; then
+                min_slack=$slack
+                next_node="$succ"
+            fi
+        done
 
-    if [[ -n "$next_node" ]]; then
-        _cpm_dfs_critical_path "$next_node"
-    fi
+        node_id="$next_node"
+    done
 
     return 0
 }
@@ -309,6 +315,8 @@ cpm_calculate_all() {
         return 1
     }
 
+    CPM_LAST_RECOMPUTED=${#DAG_NODES[@]}
+
     echo "=== Calculation Complete ===" >&2
     echo "Total Project Duration: $CPM_TOTAL_DURATION seconds" >&2
     echo "Critical-Path Length: ${#CPM_CRITICAL_PATH[@]} nodes" >&2
@@ -316,6 +324,159 @@ cpm_calculate_all() {
     return 0
 }
 
+# ==============================================================================
+# 増分再計算（実行中の再計画）
+# ==============================================================================
+
+# エッジの重みを変更し、影響を受けるノードだけCPMを更新
+# 引数:
+#   $1: from ノードID
+#   $2: to ノードID
+#   $3: 新しい重み（秒数）
+cpm_update_edge_weight() {
+    local from="$1"
+    local to="$2"
+    local weight="$3"
+
+    dag_set_edge_weight "$from" "$to" "$weight" || return 1
+    _cpm_incremental_update "$to" -- "$from"
+}
+
+# ノードの所要時間を変更し、影響を受けるノードだけCPMを更新
+# dag_build_from_yaml ではタスクの所要時間がノードへの入力エッジの重みになるため、
+# すべての入力エッジを同じ重みに設定する
+# 引数:
+#   $1: ノードID
+#   $2: 新しい所要時間（秒数）
+cpm_update_node_duration() {
+    local node_id="$1"
+    local duration="$2"
+
+    if [[ ! -v "DAG_NODES[$node_id]" ]]; then
+        echo "ERROR: Node '$node_id' not found" >&2
+        return 1
+    fi
+
+    local pred adjacent="${DAG_REVERSE_EDGES[$node_id]:-}"
+    local -a predecessors=(${adjacent//,/ })
+    for pred in "${predecessors[@]}"; do
+        dag_set_edge_weight "$pred" "$node_id" "$duration" || return 1
+    done
+
+    _cpm_incremental_update "$node_id" -- "${predecessors[@]}"
+}
+
+# ノードのステータス変更を反映し、影響を受けるノードだけCPMを更新
+# 引数:
+#   $1: ノードID
+#   $2: ステータス（completed | skipped | cancelled | running | pending ...）
+#   $3: 実際の所要時間（秒数、completed時のみ。省略時は所要時間を変更しない）
+cpm_update_node_status() {
+    local node_id="$1"
+    local status="$2"
+    local elapsed="${3:-}"
+
+    dag_set_node_attr "$node_id" "status" "$status" || return 1
+
+    case "$status" in
+        completed)
+            if [[ -n "$elapsed" ]]; then
+                cpm_update_node_duration "$node_id" "$elapsed"
+            fi
+            ;;
+        skipped|cancelled)
+            # 実行されないタスクは所要時間0として扱う
+            cpm_update_node_duration "$node_id" 0
+            ;;
+    esac
+}
+
+# 増分更新の本体（内部関数）
+# 引数: ESTを再計算するノード... -- ENDまでの最長パスを再計算するノード...
+_cpm_incremental_update() {
+    local -a est_seeds=() tail_seeds=()
+    while [[ $# -gt 0 && "$1" != "--" ]]; do
+        est_seeds+=("$1")
+        shift
+    done
+    [[ $# -gt 0 ]] && shift
+    tail_seeds=("$@")
+
+    # 前回の計算結果がない、またはグラフ構造が変わった場合は全体を再計算
+    if [[ ${#DAG_TOPO_ORDER[@]} -eq 0 ]] || [[ ${#_CPM_TAIL[@]} -ne ${#DAG_NODES[@]} ]] ||
+        [[ ${#CPM_EST[@]} -ne ${#DAG_NODES[@]} ]] || [[ -z "$_CPM_END_NODE" ]]; then
+        cpm_calculate_all 2>/dev/null || {
+            echo "ERROR: CPM calculation failed" >&2
+            return 1
+        }
+        return 0
+    fi
+
+    local -A changed=()
+    local -a dirty=()
+    local node_id idx value next adjacent last_index=$(( ${#DAG_TOPO_ORDER[@]} - 1 ))
+
+    # 前方パス: 変更されたノードから後続へ、ESTが変わった間だけ伝播
+    # dirty はトポロジカル順序の位置をキーにした疎配列で、常に最小位置から処理する
+    for node_id in "${est_seeds[@]}"; do
+        dirty[${DAG_TOPO_INDEX[$node_id]}]="$node_id"
+    done
+    while [[ ${#dirty[@]} -gt 0 ]]; do
+        for idx in "${!dirty[@]}"; do break; done
+        node_id="${dirty[$idx]}"
+        unset 'dirty[idx]'
+
+        _cpm_node_est value "$node_id"
+        if [[ $value -eq ${CPM_EST[$node_id]} ]]; then
+            continue
+        fi
+        CPM_EST["$node_id"]=$value
+        changed["$node_id"]=1
+        adjacent="${DAG_FORWARD_EDGES[$node_id]:-}"
+        for next in ${adjacent//,/ }; do
+            dirty[${DAG_TOPO_INDEX[$next]}]="$next"
+        done
+    done
+
+    # 後方パス: 逆トポロジカル順序で、ENDまでの最長パスが変わった間だけ伝播
+    for node_id in "${tail_seeds[@]}"; do
+        dirty[$(( last_index - ${DAG_TOPO_INDEX[$node_id]} ))]="$node_id"
+    done
+    while [[ ${#dirty[@]} -gt 0 ]]; do
+        for idx in "${!dirty[@]}"; do break; done
+        node_id="${dirty[$idx]}"
+        unset 'dirty[idx]'
+
+        _cpm_node_tail value "$node_id"
+        if [[ $value -eq ${_CPM_TAIL[$node_id]} ]]; then
+            continue
+        fi
+        _CPM_TAIL["$node_id"]=$value
+        changed["$node_id"]=1
+        adjacent="${DAG_REVERSE_EDGES[$node_id]:-}"
+        for next in ${adjacent//,/ }; do
+            dirty[$(( last_index - ${DAG_TOPO_INDEX[$next]} ))]="$next"
+        done
+    done
+
+    # LFT/Slack: 全体所要時間が変わった場合のみ全ノード、それ以外は変更ノードのみ
+    local total=${CPM_EST[$_CPM_END_NODE]}
+    local -a refresh=("${!changed[@]}")
+    if [[ $total -ne $CPM_TOTAL_DURATION ]]; then
+        CPM_TOTAL_DURATION=$total
+        refresh=("${DAG_TOPO_ORDER[@]}")
+    fi
+    for node_id in "${refresh[@]}"; do
+        CPM_LFT["$node_id"]=$(( total - ${_CPM_TAIL[$node_id]} ))
+        CPM_SLACK["$node_id"]=$(( ${CPM_LFT[$node_id]} - ${CPM_EST[$node_id]} ))
+    done
+
+    CPM_LAST_RECOMPUTED=${#changed[@]}
+
+    # Critical-Pathはパス長分の走査で済むので毎回抽出し直す
+    cpm_extract_critical_path
+}
+
 # ==============================================================================
 # レポート出力
 # ==============================================================================
@@ -543,6 +704,19 @@ cpm_cache_load() {
         CPM_CRITICAL_PATH+=("$node")
     done < <(jq -r '.critical_path[]' "$cache_file")
 
+    # 増分更新に必要なトポロジカル順序とENDまでの最長パス長を復元
+    if [[ ${#DAG_TOPO_ORDER[@]} -eq 0 ]]; then
+        dag_topological_sort || return 1
+    fi
+    _CPM_TAIL=()
+    _CPM_END_NODE=""
+    for node in "${!CPM_LFT[@]}"; do
+        _CPM_TAIL["$node"]=$((CPM_TOTAL_DURATION - ${CPM_LFT[$node]}))
+        if [[ "${DAG_NODE_TYPES[$node]:-}" == "END" ]]; then
+            _CPM_END_NODE="$node"
+        fi
+    done
+
     return 0
 }
 
@@ -602,6 +776,9 @@ cpm_reset() {
     CPM_SLACK=()
     CPM_CRITICAL_PATH=()
     CPM_TOTAL_DURATION=0
+    CPM_LAST_RECOMPUTED=0
+    _CPM_TAIL=()
+    _CPM_END_NODE=""
 }
 
 # ==============================================================================
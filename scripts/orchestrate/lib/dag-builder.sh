@@ -7,7 +7,7 @@
 # - ノード（タスク）とエッジ（依存関係）の抽象化
 # - トポロジカルソート実装
 # - 循環依存検出
-# - Critical-Path計算の基盤
+# - Critical-Path計算の基盤（隣接インデックスでフォーク無しに走査）
 # - Graphviz DOT形式エクスポート
 
 set -euo pipefail
@@ -31,9 +31,29 @@ declare -gA DAG_EDGES
 # 値: カンマ区切りの依存元ノードID（例: "fork-1,fork-2"）
 declare -gA DAG_REVERSE_EDGES
 
+# 順エッジ（依存先を高速検索するため）
+# キー: ノードID
+# 値: カンマ区切りの依存先ノードID（例: "join-1,join-2"）
+declare -gA DAG_FORWARD_EDGES
+
+# エッジ重み（数値のみ、grep無しで参照するため）
+# キー: "from->to"
+# 値: 重み（秒数）
+declare -gA DAG_EDGE_WEIGHTS
+
+# ノードタイプ（属性文字列を解析せずに参照するため）
+# キー: ノードID
+# 値: FORK | JOIN | START | END
+declare -gA DAG_NODE_TYPES
+
 # トポロジカルソート結果
 declare -ga DAG_TOPO_ORDER
 
+# トポロジカル順序での位置（増分CPM計算の処理順に使用）
+# キー: ノードID
+# 値: DAG_TOPO_ORDER内のインデックス
+declare -gA DAG_TOPO_INDEX
+
 # グラフメタデータ
 declare -g DAG_ORGANIZER=""
 declare -g DAG_AGENT_POOL_CAPACITY=0
@@ -59,6 +79,42 @@ dag_add_node() {
     done
 
     DAG_NODES["$node_id"]="$attributes"
+    DAG_NODE_TYPES["$node_id"]="$node_type"
+}
+
+# ノード属性を設定（既存の属性は置き換え、なければ追加）
+# 引数:
+#   $1: ノードID
+#   $2: 属性名
+#   $3: 値
+dag_set_node_attr() {
+    local node_id="$1"
+    local attr_name="$2"
+    local value="$3"
+
+    if [[ ! -v "DAG_NODES[$node_id]" ]]; then
+        echo "ERROR: Node '$node_id' not found" >&2
+        return 1
+    fi
+
+    local -a attrs
+    local attributes="" attr found=false
+    IFS='|' read -ra attrs <<< "${DAG_NODES[$node_id]}"
+    for attr in "${attrs[@]}"; do
+        if [[ "${attr%%:*}" == "$attr_name" ]]; then
+            attr="${attr_name}:${value}"
+            found=true
+        fi
+        attributes="${attributes:+${attributes}|}${attr}"
+    done
+    if [[ "$found" == "false" ]]; then
+        attributes="${attributes}|${attr_name}:${value}"
+    fi
+
+    DAG_NODES["$node_id"]="$attributes"
+    if [[ "$attr_name" == "type" ]]; then
+        DAG_NODE_TYPES["$node_id"]="$value"
+    fi
 }
 
 # ノード属性を取得
@@ -74,8 +130,16 @@ dag_get_node_attr() {
         return 1
     fi
 
-    local node_data="${DAG_NODES[$node_id]}"
-    echo "$node_data" | grep -oP "${attr_name}:\K[^|]+"
+    local -a attrs
+    local attr
+    IFS='|' read -ra attrs <<< "${DAG_NODES[$node_id]}"
+    for attr in "${attrs[@]}"; do
+        if [[ "${attr%%:*}" == "$attr_name" && -n "${attr#*:}" ]]; then
+            echo "${attr#*:}"
+            return 0
+        fi
+    done
+    return 1
 }
 
 # ノードのタイプを取得
@@ -114,8 +178,17 @@ dag_add_edge() {
     local to="$2"
     local weight="${3:-0}"
 
+    local edge_key="${from}->${to}"
+
+    # 同じエッジの再追加は重みの更新のみ
+    if [[ -v "DAG_EDGES[$edge_key]" ]]; then
+        dag_set_edge_weight "$from" "$to" "$weight"
+        return 0
+    fi
+
     # エッジ追加
-    DAG_EDGES["${from}->${to}"]="weight:${weight}"
+    DAG_EDGES["$edge_key"]="weight:${weight}"
+    DAG_EDGE_WEIGHTS["$edge_key"]="$weight"
 
     # 逆エッジ更新（toノードの依存元リストにfromを追加）
     if [[ -v "DAG_REVERSE_EDGES[$to]" ]]; then
@@ -123,20 +196,45 @@ dag_add_edge() {
     else
         DAG_REVERSE_EDGES["$to"]="$from"
     fi
+
+    # 順エッジ更新（fromノードの依存先リストにtoを追加）
+    if [[ -v "DAG_FORWARD_EDGES[$from]" ]]; then
+        DAG_FORWARD_EDGES["$from"]="${DAG_FORWARD_EDGES[$from]},${to}"
+    else
+        DAG_FORWARD_EDGES["$from"]="$to"
+    fi
+
+    # グラフ構造が変わったのでトポロジカル順序を無効化
+    DAG_TOPO_ORDER=()
+    DAG_TOPO_INDEX=()
 }
 
-# エッジの重み（タスク実行時間）を取得
-dag_get_edge_weight() {
+# エッジの重みを変更（構造は変わらないのでトポロジカル順序は維持）
+# 引数:
+#   $1: from ノードID
+#   $2: to ノードID
+#   $3: weight
+dag_set_edge_weight() {
     local from="$1"
     local to="$2"
+    local weight="$3"
 
     local edge_key="${from}->${to}"
     if [[ ! -v "DAG_EDGES[$edge_key]" ]]; then
-        echo "0"
-        return
+        echo "ERROR: Edge '$edge_key' not found" >&2
+        return 1
     fi
 
-    echo "${DAG_EDGES[$edge_key]}" | grep -oP 'weight:\K\d+'
+    DAG_EDGES["$edge_key"]="weight:${weight}"
+    DAG_EDGE_WEIGHTS["$edge_key"]="$weight"
+}
+
+# エッジの重み（タスク実行時間）を取得
+dag_get_edge_weight() {
+    local from="$1"
+    local to="$2"
+
+    echo "${DAG_EDGE_WEIGHTS["${from}->${to}"]:-0}"
 }
 
 # ノードの依存元（predecessors）を取得
@@ -147,21 +245,18 @@ dag_get_predecessors() {
         return 0
     fi
 
-    echo "${DAG_REVERSE_EDGES[$node_id]}" | tr ',' '\n'
+    printf '%s\n' ${DAG_REVERSE_EDGES[$node_id]//,/ }
 }
 
 # ノードの依存先（successors）を取得
 dag_get_successors() {
     local node_id="$1"
 
-    for edge_key in "${!DAG_EDGES[@]}"; do
-        local from="${edge_key%%->*}"
-        local to="${edge_key##*->}"
+    if [[ ! -v "DAG_FORWARD_EDGES[$node_id]" ]]; then
+        return 0
+    fi
 
-        if [[ "$from" == "$node_id" ]]; then
-            echo "$to"
-        fi
-    done
+    printf '%s\n' ${DAG_FORWARD_EDGES[$node_id]//,/ }
 }
 
 # ==============================================================================
@@ -285,16 +380,18 @@ _parse_join_node() {
 # 返り値: 0=成功、1=循環依存検出
 dag_topological_sort() {
     DAG_TOPO_ORDER=()
+    DAG_TOPO_INDEX=()
 
     # 入次数を計算
-    declare -A in_degree
-    for node_id in $(dag_get_all_nodes); do
+    local -A in_degree=()
+    local node_id edge_key to
+    for node_id in "${!DAG_NODES[@]}"; do
         in_degree["$node_id"]=0
     done
 
     for edge_key in "${!DAG_EDGES[@]}"; do
-        local to="${edge_key##*->}"
-        in_degree["$to"]=$((in_degree["$to"] + 1))
+        to="${edge_key##*->}"
+        in_degree["$to"]=$(( ${in_degree["$to"]:-0} + 1 ))
     done
 
     # 入次数0のノードをキューに追加
@@ -305,18 +402,21 @@ dag_topological_sort() {
         fi
     done
 
-    # Kahn's Algorithm実行
+    # Kahn's Algorithm実行（キューは先頭インデックスで進め、配列の詰め直しをしない）
     local visited_count=0
-    while [[ ${#queue[@]} -gt 0 ]]; do
-        local current="${queue[0]}"
-        queue=("${queue[@]:1}")
+    local head=0 current successor adjacent
+    while [[ $head -lt ${#queue[@]} ]]; do
+        current="${queue[$head]}"
+        head=$((head + 1))
 
+        DAG_TOPO_INDEX["$current"]=$visited_count
         DAG_TOPO_ORDER+=("$current")
         visited_count=$((visited_count + 1))
 
         # 後続ノードの入次数を減らす
-        for successor in $(dag_get_successors "$current"); do
-            in_degree["$successor"]=$((in_degree["$successor"] - 1))
+        adjacent="${DAG_FORWARD_EDGES[$current]:-}"
+        for successor in ${adjacent//,/ }; do
+            in_degree["$successor"]=$(( ${in_degree["$successor"]} - 1 ))
 
             if [[ ${in_degree["$successor"]} -eq 0 ]]; then
                 queue+=("$successor")
@@ -356,12 +456,13 @@ dag_detect_cycle() {
     _DAG_VISITED=()
     _DAG_REC_STACK=()
 
-    for node_id in $(dag_get_all_nodes); do
+    local node_id
+    for node_id in "${!DAG_NODES[@]}"; do
         _DAG_VISITED["$node_id"]=0
         _DAG_REC_STACK["$node_id"]=0
     done
 
-    for node_id in $(dag_get_all_nodes); do
+    for node_id in "${!DAG_NODES[@]}"; do
         if [[ ${_DAG_VISITED["$node_id"]} -eq 0 ]]; then
             # 返り値: 0=循環なし、1=循環あり
             # → 循環ありの場合（return 1）に早期リターン
@@ -381,14 +482,16 @@ _dag_dfs_cycle() {
     _DAG_VISITED["$node"]=1
     _DAG_REC_STACK["$node"]=1
 
-    for successor in $(dag_get_successors "$node"); do
-        if [[ ${_DAG_VISITED["$successor"]} -eq 0 ]]; then
+    local successor adjacent
+    adjacent="${DAG_FORWARD_EDGES[$node]:-}"
+    for successor in ${adjacent//,/ }; do
+        if [[ ${_DAG_VISITED["$successor"]:-0} -eq 0 ]]; then
             # 返り値: 0=循環なし、1=循環あり
             # → 循環ありの場合（return 1）に伝播させる
             if ! _dag_dfs_cycle "$successor"; then
                 return 1
             fi
-        elif [[ ${_DAG_REC_STACK["$successor"]} -eq 1 ]]; then
+        elif [[ ${_DAG_REC_STACK["$successor"]:-0} -eq 1 ]]; then
             echo "ERROR: Cycle detected: $node -> $successor" >&2
             return 1
         fi
@@ -583,7 +686,11 @@ dag_reset() {
     DAG_NODES=()
     DAG_EDGES=()
     DAG_REVERSE_EDGES=()
+    DAG_FORWARD_EDGES=()
+    DAG_EDGE_WEIGHTS=()
+    DAG_NODE_TYPES=()
     DAG_TOPO_ORDER=()
+    DAG_TOPO_INDEX=()
 
     DAG_ORGANIZER=""
     DAG_AGENT_POOL_CAPACITY=0
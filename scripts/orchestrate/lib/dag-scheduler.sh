@@ -0,0 +1,429 @@
+#!/usr/bin/env bash
+# DAG Scheduler - Critical-Path Priority Ready-Queue Dispatcher
+# AsyncThink v4.0 Phase 2 (Fork-Join実行エンジン)
+#
+# 機能:
+# - dag_build_from_yaml で構築したDAGを依存関係どおりに実行
+# - 前方ノードがすべて完了したノードを即座に起動（固定順の待機をしない）
+# - 実行可能ノードはCritical-PathのSlackが小さい順に起動
+# - エージェントプール容量（DAG_AGENT_POOL_CAPACITY）を超えて同時実行しない
+# - 完了ごとに実績時間でCPMを増分更新し、残りの優先度を再計画
+# - Makespan と CPM下限値の比較レポート
+#
+# ノードの扱い:
+# - FORKノード: タスク。ランナー関数をバックグラウンドで実行する
+# - START/JOIN/ENDノード: 同期点。前方ノードがすべて完了した時点で完了する
+# - 失敗したノードの後続はスキップ（所要時間0として再計画）
+#
+# 依存: dag-builder.sh, critical-path.sh
+
+set -euo pipefail
+
+# ==============================================================================
+# データ構造
+# ==============================================================================
+
+# DAGの重み1単位あたりのミリ秒（YAMLのtimeoutは秒なので1000）
+DAG_SCHED_TIME_UNIT_MS="${DAG_SCHED_TIME_UNIT_MS:-1000}"
+
+# ノードの実行状態
+# キー: ノードID
+# 値: pending | running | completed | failed | skipped
+declare -gA DAG_SCHED_STATUS
+
+# ノードの開始・終了時刻（実行開始からの経過ミリ秒）
+declare -gA DAG_SCHED_START_MS
+declare -gA DAG_SCHED_END_MS
+
+# ノードの終了コード
+declare -gA DAG_SCHED_EXIT
+
+# 起動順（ノードIDのリスト）
+declare -ga DAG_SCHED_DISPATCH_ORDER
+
+# 実行結果メトリクス（ミリ秒）
+declare -g DAG_SCHED_MAKESPAN_MS=0
+declare -g DAG_SCHED_PLANNED_MS=0
+declare -g DAG_SCHED_CRITICAL_PATH_MS=0
+declare -g DAG_SCHED_WORK_BOUND_MS=0
+declare -g DAG_SCHED_LOWER_BOUND_MS=0
+declare -g DAG_SCHED_CAPACITY=0
+
+# ==============================================================================
+# 実行
+# ==============================================================================
+
+# DAGを実行
+# 引数:
+#   $1: ランナー関数名（"$runner" <node_id> <worker> <timeout> で呼ばれ、終了コードで成否を返す）
+#   $2: 同時実行数（省略時: DAG_AGENT_POOL_CAPACITY、0以下なら無制限）
+# 返り値: 0=全FORKノード成功、1=失敗またはスキップあり
+dag_schedule_run() {
+    local runner="$1"
+    local capacity="${2:-${DAG_AGENT_POOL_CAPACITY:-0}}"
+
+    if ! declare -F "$runner" > /dev/null; then
+        echo "ERROR: Runner function '$runner' not found" >&2
+        return 1
+    fi
+
+    # CPM計算（優先度とプラン値に使用）
+    if [[ ${#DAG_TOPO_ORDER[@]} -eq 0 ]] || [[ ${#CPM_SLACK[@]} -ne ${#DAG_NODES[@]} ]]; then
+        cpm_calculate_all 2>/dev/null || {
+            echo "ERROR: CPM calculation failed" >&2
+            return 1
+        }
+    fi
+
+    local task_count=0 node_id
+    for node_id in "${!DAG_NODES[@]}"; do
+        if [[ "${DAG_NODE_TYPES[$node_id]:-}" == "FORK" ]]; then
+            task_count=$((task_count + 1))
+        fi
+    done
+    if [[ ! "$capacity" =~ ^[0-9]+$ ]] || [[ $capacity -le 0 ]]; then
+        capacity=$((task_count > 0 ? task_count : 1))
+    fi
+
+    DAG_SCHED_STATUS=()
+    DAG_SCHED_START_MS=()
+    DAG_SCHED_END_MS=()
+    DAG_SCHED_EXIT=()
+    DAG_SCHED_DISPATCH_ORDER=()
+    DAG_SCHED_CAPACITY=$capacity
+    DAG_SCHED_PLANNED_MS=$((CPM_TOTAL_DURATION * DAG_SCHED_TIME_UNIT_MS))
+
+    # 未完了の前方ノード数
+    local -A _dag_sched_waiting=()
+    local -A _dag_sched_ready=()
+    local -A running_pids=()
+    local adjacent pred
+    for node_id in "${!DAG_NODES[@]}"; do
+        DAG_SCHED_STATUS["$node_id"]=pending
+        adjacent="${DAG_REVERSE_EDGES[$node_id]:-}"
+        _dag_sched_waiting["$node_id"]=0
+        for pred in ${adjacent//,/ }; do
+            _dag_sched_waiting["$node_id"]=$(( ${_dag_sched_waiting[$node_id]} + 1 ))
+        done
+        if [[ ${_dag_sched_waiting[$node_id]} -eq 0 ]]; then
+            _dag_sched_ready["$node_id"]=1
+        fi
+    done
+
+    echo "=== DAG Schedule: ${task_count} tasks, capacity ${capacity} ===" >&2
+
+    local _dag_sched_epoch=$EPOCHREALTIME
+    local finished=0 total=${#DAG_NODES[@]} failed=0
+    local next pid exit_code now_ms
+
+    while [[ $finished -lt $total ]]; do
+        # 同期点はプール容量を使わずに即座に完了させ、タスクはSlack順に起動
+        while true; do
+            _dag_sched_pick_ready next || break
+            unset '_dag_sched_ready[$next]'
+            _dag_sched_now_ms now_ms
+
+            if [[ "${DAG_SCHED_STATUS[$next]}" == "skipped" ]]; then
+                _dag_sched_finish "$next" skipped "$now_ms"
+                finished=$((finished + 1))
+                continue
+            fi
+
+            if [[ "${DAG_NODE_TYPES[$next]:-}" != "FORK" ]]; then
+                DAG_SCHED_START_MS["$next"]=$now_ms
+                _dag_sched_finish "$next" completed "$now_ms"
+                finished=$((finished + 1))
+                continue
+            fi
+
+            if [[ ${#running_pids[@]} -ge $capacity ]]; then
+                _dag_sched_ready["$next"]=1
+                break
+            fi
+
+            DAG_SCHED_START_MS["$next"]=$now_ms
+            DAG_SCHED_STATUS["$next"]=running
+            DAG_SCHED_DISPATCH_ORDER+=("$next")
+            "$runner" "$next" \
+                "$(dag_get_node_attr "$next" worker 2>/dev/null || true)" \
+                "$(dag_get_node_attr "$next" timeout 2>/dev/null || true)" &
+            running_pids[$!]="$next"
+            echo "▶ ${next} started (slack: ${CPM_SLACK[$next]:-0}, running: ${#running_pids[@]}/${capacity})" >&2
+        done
+
+        if [[ $finished -ge $total ]]; then
+            break
+        fi
+        if [[ ${#running_pids[@]} -eq 0 ]]; then
+            echo "ERROR: No runnable nodes left (is the DAG acyclic?)" >&2
+            return 1
+        fi
+
+        # いずれかのタスク完了を待つ（完了した順に処理）
+        _dag_sched_wait_any pid exit_code "${!running_pids[@]}"
+        node_id="${running_pids[$pid]}"
+        unset 'running_pids[$pid]'
+        _dag_sched_now_ms now_ms
+        DAG_SCHED_EXIT["$node_id"]=$exit_code
+        finished=$((finished + 1))
+
+        if [[ $exit_code -eq 0 ]]; then
+            _dag_sched_finish "$node_id" completed "$now_ms"
+            echo "✓ ${node_id} completed in $(_dag_sched_format_ms $((now_ms - DAG_SCHED_START_MS[$node_id])))" >&2
+        else
+            failed=$((failed + 1))
+            _dag_sched_finish "$node_id" failed "$now_ms"
+            echo "✗ ${node_id} failed (exit code: $exit_code)" >&2
+        fi
+    done
+
+    _dag_sched_now_ms DAG_SCHED_MAKESPAN_MS
+    _dag_sched_compute_lower_bound
+
+    echo "=== DAG Schedule Complete: makespan $(_dag_sched_format_ms "$DAG_SCHED_MAKESPAN_MS")," \
+        "lower bound $(_dag_sched_format_ms "$DAG_SCHED_LOWER_BOUND_MS") ===" >&2
+
+    for node_id in "${!DAG_SCHED_STATUS[@]}"; do
+        if [[ "${DAG_NODE_TYPES[$node_id]:-}" == "FORK" ]] && [[ "${DAG_SCHED_STATUS[$node_id]}" != "completed" ]]; then
+            return 1
+        fi
+    done
+    return 0
+}
+
+# 実行可能ノードから次に起動するものを選ぶ（内部関数）
+# 同期点・スキップを最優先し、タスクはSlack → トポロジカル順序の小さい順
+# 引数:
+#   $1: 結果を格納する変数名
+# 返り値: 0=選択あり、1=実行可能ノードなし
+_dag_sched_pick_ready() {
+    local -n _dag_sched_pick=$1
+    local node_id best="" best_slack=0 best_index=0 slack index
+
+    for node_id in "${!_dag_sched_ready[@]}"; do
+        if [[ "${DAG_NODE_TYPES[$node_id]:-}" != "FORK" ]] || [[ "${DAG_SCHED_STATUS[$node_id]}" == "skipped" ]]; then
+            _dag_sched_pick="$node_id"
+            return 0
+        fi
+        slack=${CPM_SLACK[$node_id]:-0}
+        index=${DAG_TOPO_INDEX[$node_id]:-0}
+        if [[ -z "$best" ]] || [[ $slack -lt $best_slack ]] ||
+            [[ $slack -eq $best_slack && $index -lt $best_index ]]; then
+            best="$node_id"
+            best_slack=$slack
+            best_index=$index
+        fi
+    done
+
+    [[ -n "$best" ]] || return 1
+    _dag_sched_pick="$best"
+}
+
+# ノード完了処理（内部関数）
+# 後続ノードの待ち数を減らし、0になったものを実行可能にする。
+# 失敗・スキップの後続はスキップし、実績時間でCPMを増分更新する
+# 引数:
+#   $1: ノードID
+#   $2: completed | failed | skipped
+#   $3: 完了時刻（経過ミリ秒）
+_dag_sched_finish() {
+    local node_id="$1"
+    local status="$2"
+    local now_ms="$3"
+
+    DAG_SCHED_STATUS["$node_id"]=$status
+    DAG_SCHED_END_MS["$node_id"]=$now_ms
+
+    # 残りの優先度を実績ベースで再計画
+    if [[ "${DAG_NODE_TYPES[$node_id]:-}" == "FORK" ]]; then
+        case "$status" in
+            completed)
+                local elapsed_ms=$((now_ms - DAG_SCHED_START_MS[$node_id]))
+                cpm_update_node_status "$node_id" completed \
+                    $(( (elapsed_ms + DAG_SCHED_TIME_UNIT_MS / 2) / DAG_SCHED_TIME_UNIT_MS ))
+                ;;
+            skipped)
+                cpm_update_node_status "$node_id" skipped
+                ;;
+            *)
+                dag_set_node_attr "$node_id" status "$status"
+                ;;
+        esac
+    fi
+
+    local adjacent="${DAG_FORWARD_EDGES[$node_id]:-}" succ
+    for succ in ${adjacent//,/ }; do
+        if [[ "$status" != "completed" ]]; then
+            DAG_SCHED_STATUS["$succ"]=skipped
+        fi
+        _dag_sched_waiting["$succ"]=$(( ${_dag_sched_waiting[$succ]} - 1 ))
+        if [[ ${_dag_sched_waiting[$succ]} -eq 0 ]]; then
+            _dag_sched_ready["$succ"]=1
+        fi
+    done
+}
+
+# いずれかのプロセスの終了を待つ（内部関数）
+# Bash 5.1以降は wait -n -p、それ以前は kill -0 のポーリング
+# 引数:
+#   $1: 終了したPIDを格納する変数名
+#   $2: 終了コードを格納する変数名
+#   $3+: 待機対象のPID
+_dag_sched_wait_any() {
+    local -n _dag_sched_done_pid=$1
+    local -n _dag_sched_done_exit=$2
+    shift 2
+
+    local finished_pid=""
+    if (( BASH_VERSINFO[0] > 5 || (BASH_VERSINFO[0] == 5 && BASH_VERSINFO[1] >= 1) )); then
+        if wait -n -p finished_pid "$@"; then
+            _dag_sched_done_exit=0
+        else
+            _dag_sched_done_exit=$?
+        fi
+        _dag_sched_done_pid=$finished_pid
+        return 0
+    fi
+
+    local pid
+    while true; do
+        for pid in "$@"; do
+            if ! kill -0 "$pid" 2>/dev/null; then
+                if wait "$pid"; then
+                    _dag_sched_done_exit=0
+                else
+                    _dag_sched_done_exit=$?
+                fi
+                _dag_sched_done_pid=$pid
+                return 0
+            fi
+        done
+        sleep 0.05
+    done
+}
+
+# ==============================================================================
+# メトリクス
+# ==============================================================================
+
+# 実績時間に基づくMakespan下限値を計算（内部関数）
+# 下限値 = max(実績時間でのCritical-Path長, 総作業時間 / 同時実行数)
+_dag_sched_compute_lower_bound() {
+    local -A finish_ms=()
+    local node_id pred adjacent start duration total_work=0 longest=0
+
+    for node_id in "${DAG_TOPO_ORDER[@]}"; do
+        start=0
+        adjacent="${DAG_REVERSE_EDGES[$node_id]:-}"
+        for pred in ${adjacent//,/ }; do
+            if [[ ${finish_ms[$pred]:-0} -gt $start ]]; then
+                start=${finish_ms[$pred]}
+            fi
+        done
+
+        duration=0
+        if [[ "${DAG_NODE_TYPES[$node_id]:-}" == "FORK" ]] && [[ -v "DAG_SCHED_START_MS[$node_id]" ]]; then
+            duration=$(( DAG_SCHED_END_MS[$node_id] - DAG_SCHED_START_MS[$node_id] ))
+        fi
+        total_work=$((total_work + duration))
+        finish_ms["$node_id"]=$((start + duration))
+        if [[ ${finish_ms[$node_id]} -gt $longest ]]; then
+            longest=${finish_ms[$node_id]}
+        fi
+    done
+
+    DAG_SCHED_CRITICAL_PATH_MS=$longest
+    DAG_SCHED_WORK_BOUND_MS=$(( (total_work + DAG_SCHED_CAPACITY - 1) / DAG_SCHED_CAPACITY ))
+    DAG_SCHED_LOWER_BOUND_MS=$(( longest > DAG_SCHED_WORK_BOUND_MS ? longest : DAG_SCHED_WORK_BOUND_MS ))
+}
+
+# 実行開始からの経過ミリ秒（内部関数）
+_dag_sched_now_ms() {
+    local now=$EPOCHREALTIME
+    printf -v "$1" '%d' $(( (${now/./} - ${_dag_sched_epoch/./}) / 1000 ))
+}
+
+# ミリ秒を "1.234s" 形式で出力（内部関数）
+_dag_sched_format_ms() {
+    printf '%d.%03ds' $(($1 / 1000)) $(($1 % 1000))
+}
+
+# ==============================================================================
+# レポート出力
+# ==============================================================================
+
+# スケジュール実行結果を表示
+dag_schedule_print_report() {
+    if [[ ${#DAG_SCHED_STATUS[@]} -eq 0 ]]; then
+        echo "ERROR: DAG schedule has not been run" >&2
+        return 1
+    fi
+
+    local efficiency=0
+    if [[ $DAG_SCHED_MAKESPAN_MS -gt 0 ]]; then
+        efficiency=$((DAG_SCHED_LOWER_BOUND_MS * 100 / DAG_SCHED_MAKESPAN_MS))
+    fi
+
+    echo "DAG Schedule Report"
+    echo "==================="
+    echo ""
+    echo "Makespan:        $(_dag_sched_format_ms "$DAG_SCHED_MAKESPAN_MS")"
+    echo "CPM lower bound: $(_dag_sched_format_ms "$DAG_SCHED_LOWER_BOUND_MS")" \
+        "(critical path $(_dag_sched_format_ms "$DAG_SCHED_CRITICAL_PATH_MS")," \
+        "work/capacity $(_dag_sched_format_ms "$DAG_SCHED_WORK_BOUND_MS"))"
+    echo "Efficiency:      ${efficiency}% of lower bound"
+    echo "Planned (CPM):   $(_dag_sched_format_ms "$DAG_SCHED_PLANNED_MS") with estimated durations"
+    echo "Capacity:        $DAG_SCHED_CAPACITY"
+    echo ""
+    printf "%-15s %-10s %-10s %-10s %-10s\n" "Node ID" "Status" "Start" "End" "Duration"
+    printf "%-15s %-10s %-10s %-10s %-10s\n" "---------------" "----------" "----------" "----------" "----------"
+
+    local node_id start end
+    for node_id in "${DAG_TOPO_ORDER[@]}"; do
+        [[ "${DAG_NODE_TYPES[$node_id]:-}" == "FORK" ]] || continue
+        start=${DAG_SCHED_START_MS[$node_id]:-}
+        end=${DAG_SCHED_END_MS[$node_id]:-}
+        if [[ -n "$start" ]]; then
+            printf "%-15s %-10s %-10s %-10s %-10s\n" "$node_id" "${DAG_SCHED_STATUS[$node_id]}" \
+                "$(_dag_sched_format_ms "$start")" "$(_dag_sched_format_ms "$end")" \
+                "$(_dag_sched_format_ms $((end - start)))"
+        else
+            printf "%-15s %-10s %-10s %-10s %-10s\n" "$node_id" "${DAG_SCHED_STATUS[$node_id]}" "-" "-" "-"
+        fi
+    done
+}
+
+# ==============================================================================
+# メイン処理（スタンドアロン実行時）
+# ==============================================================================
+
+if [[ "${BASH_SOURCE[0]}" == "${0}" ]]; then
+    # スタンドアロン実行: 各FORKを timeout / SPEEDUP 秒の sleep で模擬実行
+
+    if [[ $# -lt 2 ]]; then
+        echo "Usage: $0 <yaml_file> <profile> [speedup]" >&2
+        echo "" >&2
+        echo "Simulates the profile's DAG, sleeping timeout/speedup seconds per FORK (default speedup: 100)" >&2
+        exit 1
+    fi
+
+    yaml_file="$1"
+    profile="$2"
+    speedup="${3:-100}"
+
+    script_dir="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+    source "$script_dir/dag-builder.sh"
+    source "$script_dir/critical-path.sh"
+
+    dag_build_from_yaml "$yaml_file" "$profile" || exit 1
+
+    DAG_SCHED_TIME_UNIT_MS=$((1000 / speedup > 0 ? 1000 / speedup : 1))
+    _dag_sched_simulate() {
+        sleep "$(printf '%d.%03d' $(( ${3:-0} * DAG_SCHED_TIME_UNIT_MS / 1000 )) $(( ${3:-0} * DAG_SCHED_TIME_UNIT_MS % 1000 )))"
+    }
+
+    schedule_exit=0
+    dag_schedule_run _dag_sched_simulate || schedule_exit=$?
+    dag_schedule_print_report
+    exit $schedule_exit
+fi
@@ -8,10 +8,21 @@
 #
 # Architecture:
 #   - Content hashing (SHA256) for change detection
-#   - Phase metadata with dependency hashes
-#   - TTL-based cache invalidation
+#   - Content-addressed blob store: each distinct output is stored once,
+#     compressed, under blobs/<hash[0:2]>/<hash>[.gz], shared by all workflows
+#   - Per-workflow phase manifests referencing blobs (one tab-separated line,
+#     read without forking) plus the JSON .meta for tooling
+#   - Memoized dependency-hash chains: an unchanged upstream is validated from
+#     manifests without re-reading or re-hashing outputs
+#   - TTL-based cache invalidation, mark-and-sweep GC of unreferenced blobs
 #   - Graceful fallback on cache miss
 #
+# Layout ($INCREMENTAL_CACHE_DIR):
+#   blobs/ab/abcdef....gz            phase output, gzip-compressed
+#   <workflow_id>/phase_<N>.manifest output_hash, blob, timestamp, ttl, dependency_hashes, output_file, ai
+#   <workflow_id>/phase_<N>.meta     same information as JSON
+#   .gc-stamp                        time of the last automatic GC
+#
 
 set -euo pipefail
 
@@ -19,8 +30,21 @@ set -euo pipefail
 
 INCREMENTAL_CACHE_DIR="${INCREMENTAL_CACHE_DIR:-${AI_CACHE_DIR:-$PROJECT_ROOT/.cache/workflows}}"
 INCREMENTAL_CACHE_TTL="${INCREMENTAL_CACHE_TTL:-3600}"  # 1 hour
+INCREMENTAL_CACHE_COMPRESS="${INCREMENTAL_CACHE_COMPRESS:-true}"  # gzip blobs when gzip is available
+INCREMENTAL_CACHE_GC_GRACE_MIN="${INCREMENTAL_CACHE_GC_GRACE_MIN:-10}"  # never sweep blobs younger than this
+INCREMENTAL_CACHE_GC_INTERVAL="${INCREMENTAL_CACHE_GC_INTERVAL:-3600}"  # seconds between automatic GCs (0 = never)
 CACHE_VERBOSE="${CACHE_VERBOSE:-false}"
 
+# Per-process memo: "<workflow_id>/<phase_idx>" -> output hash from its manifest
+declare -gA _INCREMENTAL_OUTPUT_HASH=()
+# Per-process memo: "<workflow_id>/<idx>,<idx>,..." -> dependency JSON body for that chain
+declare -gA _INCREMENTAL_DEP_CHAIN=()
+
+# Last GC result
+INCREMENTAL_GC_REMOVED=0
+INCREMENTAL_GC_KEPT=0
+INCREMENTAL_GC_EXPIRED=0
+
 # ===== Logging =====
 
 log_cache_event() {
@@ -59,14 +83,15 @@ calculate_content_hash() {
 
     # Try Linux sha256sum
     if command -v sha256sum >/dev/null 2>&1; then
-        hash=$(sha256sum "$file_path" 2>/dev/null | cut -d' ' -f1)
+        hash=$(sha256sum < "$file_path" 2>/dev/null)
     # Try macOS shasum
     elif command -v shasum >/dev/null 2>&1; then
-        hash=$(shasum -a 256 "$file_path" 2>/dev/null | cut -d' ' -f1)
+        hash=$(shasum -a 256 < "$file_path" 2>/dev/null)
     else
         log_cache_event "HASH_ERROR" "No SHA256 utility available (sha256sum or shasum)"
         return 1
     fi
+    hash="${hash%% *}"
 
     if [[ -z "$hash" ]]; then
         log_cache_event "HASH_ERROR" "Failed to calculate hash for $file_path"
@@ -79,9 +104,100 @@ calculate_content_hash() {
     return 0
 }
 
+#
+# Store a file in the content-addressed blob store (no-op if already stored)
+#
+# Arguments:
+#   $1 - var_name: Variable receiving the blob path relative to INCREMENTAL_CACHE_DIR
+#   $2 - file_path: File to store
+#   $3 - content_hash: SHA256 of the file content
+#
+# Returns:
+#   Exit code 0 on success, 1 on failure
+#
+store_phase_blob() {
+    local -n _blob_ref=$1
+    local file_path="$2"
+    local content_hash="$3"
+
+    local blob_dir="$INCREMENTAL_CACHE_DIR/blobs/${content_hash:0:2}"
+    local blob_rel="blobs/${content_hash:0:2}/${content_hash}"
+    local compress=false
+    if [[ "$INCREMENTAL_CACHE_COMPRESS" == "true" ]] && command -v gzip >/dev/null 2>&1; then
+        compress=true
+        blob_rel+=".gz"
+    fi
+
+    # Deduplicated: the same content is already stored (compressed or not).
+    # Refresh its mtime so a GC that marked before our manifest lands keeps it
+    # within the grace period instead of sweeping a re-referenced blob.
+    local existing
+    for existing in "$blob_rel" "${blob_rel%.gz}"; do
+        if [[ -f "$INCREMENTAL_CACHE_DIR/$existing" ]]; then
+            touch -c "$INCREMENTAL_CACHE_DIR/$existing" 2>/dev/null || true
+            _blob_ref="$existing"
+            log_cache_event "BLOB_DEDUP" "hash=${content_hash:0:16}..."
+            return 0
+        fi
+    done
+
+    mkdir -p "$blob_dir" 2>/dev/null || {
+        log_cache_event "BLOB_ERROR" "Failed to create directory: $blob_dir"
+        return 1
+    }
+
+    # Write to a temporary name and rename, so readers never see a partial blob
+    local tmp_blob="$INCREMENTAL_CACHE_DIR/$blob_rel.tmp.$$"
+    if [[ "$compress" == "true" ]]; then
+        gzip -c -n "$file_path" > "$tmp_blob" 2>/dev/null || { rm -f "$tmp_blob"; return 1; }
+    else
+        cp "$file_path" "$tmp_blob" 2>/dev/null || { rm -f "$tmp_blob"; return 1; }
+    fi
+    mv -f "$tmp_blob" "$INCREMENTAL_CACHE_DIR/$blob_rel" || { rm -f "$tmp_blob"; return 1; }
+
+    _blob_ref="$blob_rel"
+    log_cache_event "BLOB_STORE" "hash=${content_hash:0:16}... | blob=$blob_rel"
+    return 0
+}
+
+#
+# Read a phase manifest without forking
+#
+# Arguments:
+#   $1 - var_prefix: Prefix of the variables to set (<prefix>_hash, _blob,
+#        _timestamp, _ttl, _deps, _output_file, _ai); declare them local first
+#   $2 - workflow_id: Unique workflow identifier
+#   $3 - phase_idx: Phase index (0-based)
+#
+# Returns:
+#   Exit code 0 if the manifest exists and was read, 1 otherwise
+#
+read_phase_manifest() {
+    local prefix="$1"
+    local manifest="$INCREMENTAL_CACHE_DIR/${2}/phase_${3}.manifest"
+
+    [[ -f "$manifest" ]] || return 1
+
+    local hash="" blob="" timestamp="" ttl="" deps="" output_file="" ai=""
+    IFS=$'\t' read -r hash blob timestamp ttl deps output_file ai < "$manifest" || true
+    [[ -n "$hash" ]] || return 1
+
+    printf -v "${prefix}_hash" '%s' "$hash"
+    printf -v "${prefix}_blob" '%s' "$blob"
+    printf -v "${prefix}_timestamp" '%s' "$timestamp"
+    printf -v "${prefix}_ttl" '%s' "$ttl"
+    printf -v "${prefix}_deps" '%s' "$deps"
+    printf -v "${prefix}_output_file" '%s' "$output_file"
+    printf -v "${prefix}_ai" '%s' "$ai"
+    return 0
+}
+
 #
 # Save phase metadata with content hash and dependencies
 #
+# The output is stored once in the blob store; the workflow's manifest and
+# .meta only reference it.
+#
 # Arguments:
 #   $1 - workflow_id: Unique workflow identifier
 #   $2 - phase_idx: Phase index (0-based)
@@ -103,7 +219,8 @@ save_phase_metadata() {
     local ai_name="$3"
     local role="$4"
     local output_file="$5"
-    local dependency_hashes="${6:-{}}"
+    local dependency_hashes="${6-}"
+    [[ -n "$dependency_hashes" ]] || dependency_hashes="{}"
 
     # Validate inputs
     if [[ -z "$workflow_id" ]] || [[ -z "$phase_idx" ]] || [[ -z "$ai_name" ]]; then
@@ -130,16 +247,22 @@ save_phase_metadata() {
         return 1
     }
 
+    # Store the output once, by content
+    local blob
+    store_phase_blob blob "$output_file" "$output_hash" || {
+        log_cache_event "SAVE_ERROR" "Failed to store blob for $output_file"
+        return 1
+    }
+
     # Prepare metadata
     local meta_file="$meta_dir/phase_${phase_idx}.meta"
-    local timestamp=$(date +%s)
+    local timestamp
+    printf -v timestamp '%(%s)T' -1
 
-    # Validate dependency_hashes is valid JSON
-    # Note: Currently defaulting to empty object for complex JSON to avoid parsing issues
-    # TODO: Fix dependency hash preservation in Phase 4 Tier 2 Task 4 completion
-    if echo "$dependency_hashes" | jq empty 2>/dev/null; then
-        : # Valid JSON, continue
-    else
+    # Validate dependency_hashes is valid JSON (build_dependency_hashes output needs no jq)
+    local compact_deps_re='^\{("phase_[0-9]+":"[0-9a-f]+",?)*\}$'
+    if [[ ! "$dependency_hashes" =~ $compact_deps_re ]] && \
+       ! echo "$dependency_hashes" | jq empty 2>/dev/null; then
         log_cache_event "SAVE_WARN" "Invalid dependency_hashes JSON, using empty object"
         dependency_hashes="{}"
     fi
@@ -152,6 +275,7 @@ save_phase_metadata() {
             --arg role "$role" \
             --arg output_hash "$output_hash" \
             --arg output_file "$output_file" \
+            --arg blob "$blob" \
             --argjson dependency_hashes "$dependency_hashes" \
             --arg timestamp "$timestamp" \
             --arg ttl "$INCREMENTAL_CACHE_TTL" \
@@ -161,6 +285,7 @@ save_phase_metadata() {
                 role: $role,
                 output_hash: $output_hash,
                 output_file: $output_file,
+                blob: $blob,
                 dependency_hashes: $dependency_hashes,
                 timestamp: ($timestamp | tonumber),
                 ttl: ($ttl | tonumber)
@@ -177,6 +302,7 @@ save_phase_metadata() {
   "role": "$role",
   "output_hash": "$output_hash",
   "output_file": "$output_file",
+  "blob": "$blob",
   "dependency_hashes": $dependency_hashes,
   "timestamp": $timestamp,
   "ttl": $INCREMENTAL_CACHE_TTL
@@ -184,7 +310,24 @@ save_phase_metadata() {
 EOF
     fi
 
-    log_cache_event "SAVE_OK" "phase=$phase_idx | ai=$ai_name | hash=${output_hash:0:16}..."
+    # Manifest last (one tab-separated line): validation and GC only read this
+    local manifest="$meta_dir/phase_${phase_idx}.manifest"
+    if ! printf '%s\t%s\t%s\t%s\t%s\t%s\t%s\n' "$output_hash" "$blob" "$timestamp" "$INCREMENTAL_CACHE_TTL" \
+            "${dependency_hashes//[$'\t\n']/ }" "${output_file//$'\t'/ }" "$ai_name" > "$manifest.tmp.$$" ||
+       ! mv -f "$manifest.tmp.$$" "$manifest"; then
+        rm -f "$manifest.tmp.$$"
+        log_cache_event "SAVE_ERROR" "Failed to write manifest: $manifest"
+        return 1
+    fi
+
+    # Chains through this phase now resolve to the new hash
+    _INCREMENTAL_OUTPUT_HASH["$workflow_id/$phase_idx"]="$output_hash"
+    local chain_key
+    for chain_key in "${!_INCREMENTAL_DEP_CHAIN[@]}"; do
+        [[ "$chain_key" != "$workflow_id/"* ]] || unset '_INCREMENTAL_DEP_CHAIN[$chain_key]'
+    done
+
+    log_cache_event "SAVE_OK" "phase=$phase_idx | ai=$ai_name | hash=${output_hash:0:16}... | blob=$blob"
 
     return 0
 }
@@ -192,6 +335,8 @@ EOF
 #
 # Check if phase can use cached result
 #
+# Only the phase manifest is read: no jq, no hashing and no forks on a hit.
+#
 # Arguments:
 #   $1 - workflow_id: Unique workflow identifier
 #   $2 - phase_idx: Phase index (0-based)
@@ -210,44 +355,28 @@ EOF
 check_phase_cache_valid() {
     local workflow_id="$1"
     local phase_idx="$2"
-    local current_dependency_hashes="${3:-{}}"
-
-    local meta_file="$INCREMENTAL_CACHE_DIR/${workflow_id}/phase_${phase_idx}.meta"
+    local current_dependency_hashes="${3-}"
+    [[ -n "$current_dependency_hashes" ]] || current_dependency_hashes="{}"
 
-    # No metadata → cache miss
-    if [[ ! -f "$meta_file" ]]; then
+    # No manifest → cache miss
+    local m_hash m_blob m_timestamp m_ttl m_deps m_output_file m_ai
+    if ! read_phase_manifest m "$workflow_id" "$phase_idx"; then
         log_cache_event "CACHE_MISS" "phase=$phase_idx | reason=no_metadata"
         return 1
     fi
 
-    # Check if jq is available
-    if ! command -v jq >/dev/null 2>&1; then
-        log_cache_event "CACHE_MISS" "phase=$phase_idx | reason=no_jq"
-        return 1
-    fi
-
-    # Validate metadata JSON
-    if ! jq empty "$meta_file" 2>/dev/null; then
-        log_cache_event "CACHE_MISS" "phase=$phase_idx | reason=invalid_json"
-        return 1
-    fi
-
     # Check TTL
-    local cached_timestamp
-    cached_timestamp=$(jq -r '.timestamp' "$meta_file" 2>/dev/null)
-
-    if [[ -z "$cached_timestamp" ]] || [[ "$cached_timestamp" == "null" ]]; then
+    if [[ ! "$m_timestamp" =~ ^[0-9]+$ ]]; then
         log_cache_event "CACHE_MISS" "phase=$phase_idx | reason=no_timestamp"
         return 1
     fi
 
-    local current_timestamp=$(date +%s)
-    local age=$((current_timestamp - cached_timestamp))
-
-    local cached_ttl
-    cached_ttl=$(jq -r '.ttl' "$meta_file" 2>/dev/null)
+    local current_timestamp
+    printf -v current_timestamp '%(%s)T' -1
+    local age=$((current_timestamp - m_timestamp))
 
-    if [[ -z "$cached_ttl" ]] || [[ "$cached_ttl" == "null" ]]; then
+    local cached_ttl="$m_ttl"
+    if [[ ! "$cached_ttl" =~ ^[0-9]+$ ]]; then
         cached_ttl="$INCREMENTAL_CACHE_TTL"
     fi
 
@@ -257,38 +386,29 @@ check_phase_cache_valid() {
         return 1
     fi
 
-    # Check output file exists
-    local output_file
-    output_file=$(jq -r '.output_file' "$meta_file" 2>/dev/null)
-
-    if [[ -z "$output_file" ]] || [[ ! -f "$output_file" ]]; then
+    # Check stored output exists
+    if [[ -z "$m_blob" ]] || [[ ! -f "$INCREMENTAL_CACHE_DIR/$m_blob" ]]; then
         log_cache_event "CACHE_MISS" "phase=$phase_idx | reason=output_missing"
         return 1
     fi
 
-    # Check dependency hashes
-    local cached_dependency_hashes
-    cached_dependency_hashes=$(jq -c '.dependency_hashes' "$meta_file" 2>/dev/null)
-
-    if [[ -z "$cached_dependency_hashes" ]]; then
-        cached_dependency_hashes="{}"
-    fi
-
-    # Normalize JSON for comparison (sort keys)
-    local cached_deps_normalized
-    local current_deps_normalized
-
-    cached_deps_normalized=$(echo "$cached_dependency_hashes" | jq -S '.' 2>/dev/null) || cached_deps_normalized="{}"
-    current_deps_normalized=$(echo "$current_dependency_hashes" | jq -S '.' 2>/dev/null) || current_deps_normalized="{}"
-
-    # Compare dependency hashes
-    if [[ "$cached_deps_normalized" != "$current_deps_normalized" ]]; then
-        log_cache_event "CACHE_MISS" "phase=$phase_idx | reason=dependency_changed"
-        log_cache_event "CACHE_MISS_DETAIL" "cached=$cached_deps_normalized | current=$current_deps_normalized"
-        return 1
+    # Compare dependency hashes: identical text first, normalized JSON only if it differs
+    if [[ "$m_deps" != "$current_dependency_hashes" ]]; then
+        local cached_deps_normalized=""
+        local current_deps_normalized=""
+        if command -v jq >/dev/null 2>&1; then
+            cached_deps_normalized=$(echo "$m_deps" | jq -S -c '.' 2>/dev/null) || cached_deps_normalized=""
+            current_deps_normalized=$(echo "$current_dependency_hashes" | jq -S -c '.' 2>/dev/null) || current_deps_normalized="{}"
+        fi
+        if [[ -z "$cached_deps_normalized" ]] || [[ "$cached_deps_normalized" != "$current_deps_normalized" ]]; then
+            log_cache_event "CACHE_MISS" "phase=$phase_idx | reason=dependency_changed"
+            log_cache_event "CACHE_MISS_DETAIL" "cached=$m_deps | current=$current_dependency_hashes"
+            return 1
+        fi
     fi
 
     # Cache valid
+    _INCREMENTAL_OUTPUT_HASH["$workflow_id/$phase_idx"]="$m_hash"
     log_cache_event "CACHE_HIT" "phase=$phase_idx | age=${age}s/${cached_ttl}s"
 
     return 0
@@ -315,30 +435,15 @@ load_phase_from_cache() {
     local phase_idx="$2"
     local output_destination="$3"
 
-    local meta_file="$INCREMENTAL_CACHE_DIR/${workflow_id}/phase_${phase_idx}.meta"
-
-    if [[ ! -f "$meta_file" ]]; then
+    local m_hash m_blob m_timestamp m_ttl m_deps m_output_file m_ai
+    if ! read_phase_manifest m "$workflow_id" "$phase_idx"; then
         log_cache_event "LOAD_ERROR" "phase=$phase_idx | reason=no_metadata"
         return 1
     fi
 
-    # Check if jq is available
-    if ! command -v jq >/dev/null 2>&1; then
-        log_cache_event "LOAD_ERROR" "phase=$phase_idx | reason=no_jq"
-        return 1
-    fi
-
-    # Get cached output file path
-    local cached_output_file
-    cached_output_file=$(jq -r '.output_file' "$meta_file" 2>/dev/null)
-
-    if [[ -z "$cached_output_file" ]] || [[ "$cached_output_file" == "null" ]]; then
-        log_cache_event "LOAD_ERROR" "phase=$phase_idx | reason=no_output_path"
-        return 1
-    fi
-
-    if [[ ! -f "$cached_output_file" ]]; then
-        log_cache_event "LOAD_ERROR" "phase=$phase_idx | reason=output_missing | path=$cached_output_file"
+    local blob_path="$INCREMENTAL_CACHE_DIR/$m_blob"
+    if [[ -z "$m_blob" ]] || [[ ! -f "$blob_path" ]]; then
+        log_cache_event "LOAD_ERROR" "phase=$phase_idx | reason=output_missing | blob=$m_blob"
         return 1
     fi
 
@@ -350,13 +455,20 @@ load_phase_from_cache() {
         return 1
     }
 
-    # Copy cached output to destination
-    if ! cp "$cached_output_file" "$output_destination" 2>/dev/null; then
+    # Materialize the blob at the destination
+    local load_status=0
+    if [[ "$blob_path" == *.gz ]]; then
+        gzip -dc "$blob_path" > "$output_destination" 2>/dev/null || load_status=$?
+    else
+        cp "$blob_path" "$output_destination" 2>/dev/null || load_status=$?
+    fi
+    if [[ $load_status -ne 0 ]]; then
+        rm -f "$output_destination"
         log_cache_event "LOAD_ERROR" "phase=$phase_idx | reason=copy_failed"
         return 1
     fi
 
-    log_cache_event "LOAD_OK" "phase=$phase_idx | from=${cached_output_file##*/} | to=${output_destination##*/}"
+    log_cache_event "LOAD_OK" "phase=$phase_idx | from=${m_blob##*/} | to=${output_destination##*/}"
 
     return 0
 }
@@ -379,25 +491,64 @@ get_phase_output_hash() {
     local workflow_id="$1"
     local phase_idx="$2"
 
-    local meta_file="$INCREMENTAL_CACHE_DIR/${workflow_id}/phase_${phase_idx}.meta"
-
-    if [[ ! -f "$meta_file" ]]; then
+    local m_hash m_blob m_timestamp m_ttl m_deps m_output_file m_ai
+    if ! read_phase_manifest m "$workflow_id" "$phase_idx"; then
         return 1
     fi
 
-    if ! command -v jq >/dev/null 2>&1; then
-        return 1
-    fi
+    echo "$m_hash"
+    return 0
+}
 
-    local output_hash
-    output_hash=$(jq -r '.output_hash' "$meta_file" 2>/dev/null)
+#
+# Build dependency hashes JSON into a variable (memoized, no subshell)
+#
+# Every prefix of the index list is memoized per workflow, so the dependencies
+# of phase N after those of phase N-1 cost one more manifest read. Saving a
+# phase drops that workflow's memoized chains.
+#
+# Arguments:
+#   $1 - var_name: Variable receiving the JSON string
+#   $2 - workflow_id: Unique workflow identifier
+#   $3... - phase_indices: Dependency phase indices
+#
+# Example:
+#   incremental_dependency_hashes deps "workflow-123" 0 1
+#   # deps={"phase_0":"abc123...","phase_1":"def456..."}
+#
+incremental_dependency_hashes() {
+    local -n _deps_ref=$1
+    local workflow_id="$2"
+    shift 2
+
+    local chain_key="$workflow_id/"
+    local body=""
+    local dep_idx
+    for dep_idx in "$@"; do
+        chain_key+="$dep_idx,"
+        if [[ -v "_INCREMENTAL_DEP_CHAIN[$chain_key]" ]]; then
+            body="${_INCREMENTAL_DEP_CHAIN[$chain_key]}"
+            continue
+        fi
 
-    if [[ -z "$output_hash" ]] || [[ "$output_hash" == "null" ]]; then
-        return 1
-    fi
+        local dep_hash=""
+        if [[ -v "_INCREMENTAL_OUTPUT_HASH[$workflow_id/$dep_idx]" ]]; then
+            dep_hash="${_INCREMENTAL_OUTPUT_HASH[$workflow_id/$dep_idx]}"
+        else
+            local m_hash="" m_blob m_timestamp m_ttl m_deps m_output_file m_ai
+            read_phase_manifest m "$workflow_id" "$dep_idx" || m_hash=""
+            dep_hash="$m_hash"
+        fi
 
-    echo "$output_hash"
-    return 0
+        # Only complete chains are memoized; a missing upstream is re-read until saved
+        if [[ -n "$dep_hash" ]]; then
+            _INCREMENTAL_OUTPUT_HASH["$workflow_id/$dep_idx"]="$dep_hash"
+            body+="${body:+,}\"phase_${dep_idx}\":\"${dep_hash}\""
+            _INCREMENTAL_DEP_CHAIN["$chain_key"]="$body"
+        fi
+    done
+
+    _deps_ref="{${body}}"
 }
 
 #
@@ -413,38 +564,127 @@ get_phase_output_hash() {
 #
 # Example:
 #   deps=$(build_dependency_hashes "workflow-123" "0" "1")
-#   # Returns: {"phase_0": "abc123...", "phase_1": "def456..."}
+#   # Returns: {"phase_0":"abc123...","phase_1":"def456..."}
 #
 build_dependency_hashes() {
-    local workflow_id="$1"
-    shift
-    local dependency_indices=("$@")
-
-    local dependency_hashes="{}"
-
-    for dep_idx in "${dependency_indices[@]}"; do
-        local dep_hash
-        dep_hash=$(get_phase_output_hash "$workflow_id" "$dep_idx")
+    local dependency_hashes
+    incremental_dependency_hashes dependency_hashes "$@"
+    echo "$dependency_hashes"
+    return 0
+}
 
-        if [[ -n "$dep_hash" ]]; then
-            if command -v jq >/dev/null 2>&1; then
-                dependency_hashes=$(echo "$dependency_hashes" | \
-                    jq --arg idx "$dep_idx" --arg hash "$dep_hash" \
-                    '. + {("phase_" + $idx): $hash}' 2>/dev/null)
-            fi
+#
+# Mark-and-sweep garbage collection of the blob store
+#
+# Mark: every blob referenced by an unexpired phase manifest. Expired manifests
+# (and their .meta) are removed first, since they can never be cache hits.
+# Sweep: unreferenced blobs older than the grace period, so a blob stored by a
+# concurrent save_phase_metadata just before its manifest is never removed.
+#
+# Arguments:
+#   $1 - grace_minutes: Minimum age of swept blobs (default: INCREMENTAL_CACHE_GC_GRACE_MIN)
+#
+# Returns:
+#   Exit code 0; counts in INCREMENTAL_GC_REMOVED, INCREMENTAL_GC_KEPT, INCREMENTAL_GC_EXPIRED
+#
+# Example:
+#   incremental_cache_gc 0
+#
+incremental_cache_gc() {
+    local grace_minutes="${1:-$INCREMENTAL_CACHE_GC_GRACE_MIN}"
+    local -A live_blobs=()
+    local now manifest
+    printf -v now '%(%s)T' -1
+
+    INCREMENTAL_GC_REMOVED=0
+    INCREMENTAL_GC_KEPT=0
+    INCREMENTAL_GC_EXPIRED=0
+
+    # Mark
+    for manifest in "$INCREMENTAL_CACHE_DIR"/*/phase_*.manifest; do
+        [[ -f "$manifest" ]] || continue
+        local hash="" blob="" timestamp="" ttl=""
+        IFS=$'\t' read -r hash blob timestamp ttl _ < "$manifest" || true
+        [[ "$ttl" =~ ^[0-9]+$ ]] || ttl="$INCREMENTAL_CACHE_TTL"
+        if [[ ! "$timestamp" =~ ^[0-9]+$ ]] || (( now - timestamp > ttl )); then
+            rm -f "$manifest" "${manifest%.manifest}.meta"
+            INCREMENTAL_GC_EXPIRED=$((INCREMENTAL_GC_EXPIRED + 1))
+            continue
         fi
+        [[ -z "$blob" ]] || live_blobs["$blob"]=1
     done
 
-    echo "$dependency_hashes"
+    # Memos may point at removed manifests
+    _INCREMENTAL_OUTPUT_HASH=()
+    _INCREMENTAL_DEP_CHAIN=()
+
+    # Sweep
+    local blob_root="$INCREMENTAL_CACHE_DIR/blobs"
+    if [[ -d "$blob_root" ]]; then
+        local -a age_filter=()
+        [[ "$grace_minutes" -le 0 ]] || age_filter=(-mmin "+$grace_minutes")
+        local blob_path
+        while IFS= read -r -d '' blob_path; do
+            if [[ -v "live_blobs[${blob_path#"$INCREMENTAL_CACHE_DIR/"}]" ]]; then
+                INCREMENTAL_GC_KEPT=$((INCREMENTAL_GC_KEPT + 1))
+            else
+                rm -f "$blob_path"
+                INCREMENTAL_GC_REMOVED=$((INCREMENTAL_GC_REMOVED + 1))
+            fi
+        done < <(find "$blob_root" -type f ! -name '*.tmp.*' "${age_filter[@]}" -print0 2>/dev/null)
+    fi
+
+    log_cache_event "GC" "removed=$INCREMENTAL_GC_REMOVED | kept=$INCREMENTAL_GC_KEPT | expired_manifests=$INCREMENTAL_GC_EXPIRED"
+    return 0
+}
+
+#
+# Run incremental_cache_gc at most once per INCREMENTAL_CACHE_GC_INTERVAL
+#
+# The time of the last run is kept in $INCREMENTAL_CACHE_DIR/.gc-stamp. One
+# process claims each run under a non-blocking lock; others skip it.
+#
+# Returns:
+#   Exit code 0 (GC failures never fail the caller)
+#
+# Example:
+#   incremental_cache_maybe_gc   # after a workflow completes
+#
+incremental_cache_maybe_gc() {
+    [[ "$INCREMENTAL_CACHE_GC_INTERVAL" =~ ^[0-9]+$ ]] && (( INCREMENTAL_CACHE_GC_INTERVAL > 0 )) || return 0
+    [[ -d "$INCREMENTAL_CACHE_DIR/blobs" ]] || return 0
+
+    local stamp="$INCREMENTAL_CACHE_DIR/.gc-stamp"
+    local now last="" lock_fd
+    printf -v now '%(%s)T' -1
+    [[ -f "$stamp" ]] && read -r last < "$stamp" 2>/dev/null || true
+    [[ "$last" =~ ^[0-9]+$ ]] && (( now - last < INCREMENTAL_CACHE_GC_INTERVAL )) && return 0
+
+    exec {lock_fd}>>"$stamp.lock" || return 0
+    if flock -n "$lock_fd"; then
+        # Re-check under the lock: another process may have just run it
+        last=""
+        [[ -f "$stamp" ]] && read -r last < "$stamp" 2>/dev/null || true
+        if [[ ! "$last" =~ ^[0-9]+$ ]] || (( now - last >= INCREMENTAL_CACHE_GC_INTERVAL )); then
+            echo "$now" > "$stamp" 2>/dev/null || true
+            incremental_cache_gc || true
+        fi
+    fi
+    exec {lock_fd}>&-
     return 0
 }
 
 # ===== Export Functions =====
 
 export -f calculate_content_hash
+export -f store_phase_blob
+export -f read_phase_manifest
 export -f save_phase_metadata
 export -f check_phase_cache_valid
 export -f load_phase_from_cache
 export -f get_phase_output_hash
+export -f incremental_dependency_hashes
 export -f build_dependency_hashes
+export -f incremental_cache_gc
+export -f incremental_cache_maybe_gc
 export -f log_cache_event
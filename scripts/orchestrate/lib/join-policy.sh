@@ -5,13 +5,16 @@
 #   - Eager Policy: ブロッキング待機（現行互換）
 #   - Lazy Policy: 最初完了優先
 #   - Hybrid Policy: Qwen優先 + Droidタイムアウト付き（推奨）
+#   - DAG Policy: YAMLのDAGを依存関係どおりに実行（Critical-Path優先の実行可能キュー）
 #
 # Dependencies:
 #   - lib/multi-ai-core.sh (logging)
+#   - lib/dag-builder.sh, lib/critical-path.sh, lib/dag-scheduler.sh (DAG Policyのみ)
 #
 # Usage:
 #   source scripts/orchestrate/lib/join-policy.sh
 #   join_policy_hybrid $qwen_pid $droid_pid "$temp_file_qwen" "$temp_file_droid" 300
+#   join_policy_dag config/multi-ai-profiles.yaml simple-fork-join run_fork_node
 
 set -euo pipefail
 
@@ -287,6 +290,53 @@ join_policy_hybrid() {
     fi
 }
 
+# DAG Policy: Critical-Path優先の実行可能キュー
+# 固定順のJOIN待機を行わず、前方ノードがすべて完了したノードを即座に起動する。
+# 実行可能なFORKはSlackの小さい順に、エージェントプール容量の範囲で起動する
+#
+# Args:
+#   $1 - yaml_file: プロファイルYAMLファイルパス
+#   $2 - profile: プロファイル名
+#   $3 - runner: FORK実行関数（"$runner" <node_id> <worker> <timeout>）
+#   $4 - capacity: 同時実行数（省略時: agent_pool.capacity）
+#
+# Returns:
+#   0: 全FORK成功
+#   1: 失敗したFORKあり（後続はスキップ）
+join_policy_dag() {
+    local yaml_file=$1
+    local profile=$2
+    local runner=$3
+    local capacity=${4:-}
+
+    log_info "🔗 JOIN Policy: DAG (critical-path priority ready queue)"
+
+    local lib_dir
+    lib_dir="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+    if ! declare -F dag_schedule_run > /dev/null; then
+        source "$lib_dir/dag-builder.sh"
+        source "$lib_dir/critical-path.sh"
+        source "$lib_dir/dag-scheduler.sh"
+    fi
+
+    dag_reset
+    cpm_reset
+    dag_build_from_yaml "$yaml_file" "$profile" || {
+        log_error "Failed to build DAG for profile: $profile"
+        return 1
+    }
+
+    local schedule_exit=0
+    dag_schedule_run "$runner" "$capacity" || schedule_exit=$?
+
+    log_info "📊 DAG Policy Metrics:"
+    while IFS= read -r line; do
+        log_info "  $line"
+    done < <(dag_schedule_print_report)
+
+    return $schedule_exit
+}
+
 # ============================================================================
 # ヘルパー関数（Phase 3で実装予定）
 # ============================================================================
@@ -316,7 +366,8 @@ merge_results() {
 export -f join_policy_eager
 export -f join_policy_lazy
 export -f join_policy_hybrid
+export -f join_policy_dag
 export -f start_next_phase
 export -f merge_results
 
-log_info "✓ JOIN Policy library loaded (eager | lazy | hybrid)"
+log_info "✓ JOIN Policy library loaded (eager | lazy | hybrid | dag)"
@@ -5,7 +5,9 @@
 #   - AI availability checking with installation hints (check_ai_with_details, check_ai_available)
 #   - Unified AI call wrapper with timeout and sanitization (call_ai)
 #   - Fallback mechanism for AI failures (call_ai_with_fallback)
+#   - Hedged fallback past the primary's p95 latency (call_ai_hedged)
 #   - Multi-AI tools availability check (check-multi-ai-tools)
+#   - Result caching with single-flight deduplication (handle_cache, ai_cache_single_flight)
 #
 # Security Notice: When fallback mechanism is enabled, sensitive context data
 # may be sent to alternative AI providers. Ensure all configured fallback AIs
@@ -39,7 +41,7 @@ load_fallback_map_from_config() {
                          sed '/^ai_settings:/,$d' | \
                          grep -E "^[[:space:]]*[a-z]+:" | \
                          grep -v "ai_fallbacks:" | \
-                         sed 's/^[[:space:]]*\([^:]*\): "\([^\"]*\)".*/\1 \2/')
+                         sed 's/^[[:space:]]*\([^:]*\): "\([^\"]*\)".*/\1 \2/') || true
 
         # Create temporary file to store bash associative array declaration
         local temp_file
@@ -119,7 +121,7 @@ load_config_settings() {
                          grep -E "^[[:space:]]*enable_fallback:" | \
                          sed 's/^[[:space:]]*enable_fallback:[[:space:]]*\([^#]*\).*/\1/' | \
                          tr -d "\"'" | \
-                         sed 's/[[:space:]]*$//')
+                         sed 's/[[:space:]]*$//') || true
 
         if [[ -n "$fallback_setting" ]]; then
             ENABLE_AI_FALLBACK="$fallback_setting"
@@ -307,20 +309,12 @@ check-multi-ai-tools() {
 # AI Invocation Functions (2 functions)
 # ============================================================================
 
-# Unified AI call wrapper (backward compatibility layer)
-# Phase 1.3 Update: Now uses call_ai_with_context() internally
-# Phase 4 Update: Added API rate limiting with exponential backoff
-# This function maintains backward compatibility with existing code
-call_ai() {
-    local ai=$1
-    local prompt=$2
-    local timeout=${3:-300}
-    local output_file=${4:-}
-
-    # Availability check
-    check_ai_with_details "$ai" || return 1
-
-    # Phase 4: API rate limit check with exponential backoff
+# Wait until the API rate limit has room for another call
+# Backs off 5min, 10min, 15min while check_api_rate_limit reports the limit
+# Returns:
+#   0 - OK to call
+#   1 - Still limited after the maximum number of retries
+wait_for_api_rate_limit() {
     local retry_count=0
     local max_retries=3
     while ! check_api_rate_limit; do
@@ -336,6 +330,23 @@ call_ai() {
         log_info "API rate limit approaching. Waiting ${wait_time}s for cooldown (retry $retry_count/$max_retries)"
         sleep "$wait_time"
     done
+}
+
+# Unified AI call wrapper (backward compatibility layer)
+# Phase 1.3 Update: Now uses call_ai_with_context() internally
+# Phase 4 Update: Added API rate limiting with exponential backoff
+# This function maintains backward compatibility with existing code
+call_ai() {
+    local ai=$1
+    local prompt=$2
+    local timeout=${3:-300}
+    local output_file=${4:-}
+
+    # Availability check
+    check_ai_with_details "$ai" || return 1
+
+    # Phase 4: API rate limit check with exponential backoff
+    wait_for_api_rate_limit || return 1
 
     # Log API call
     log_api_call "$ai" "call_ai"
@@ -351,12 +362,26 @@ call_ai() {
 }
 
 # AI failure fallback mechanism
+# With AI_HEDGE_ENABLED=true and enough latency history, the fallback is
+# started once the primary runs past its p95 latency (see call_ai_hedged)
 call_ai_with_fallback() {
     local primary_ai=$1
-    local fallback_ai=$2
+    local fallback_ai=${2:-$(get_fallback_ai "$primary_ai")}
     local prompt=$3
-    local timeout=$4
-    local output_file=$5
+    local timeout=${4:-300}
+    local output_file=${5:-}
+
+    if [ -z "$fallback_ai" ]; then
+        call_ai "$primary_ai" "$prompt" "$timeout" "$output_file"
+        return
+    fi
+
+    local hedge_delay_ms
+    if [ "$AI_HEDGE_ENABLED" = "true" ] && [ -n "$output_file" ] && [[ "$timeout" =~ ^[0-9]+$ ]] && \
+        hedge_delay_ms=$(get_ai_latency_p95 "$primary_ai") && [ "$hedge_delay_ms" -lt $((timeout * 1000)) ]; then
+        call_ai_hedged "$primary_ai" "$fallback_ai" "$prompt" "$timeout" "$output_file" "$hedge_delay_ms"
+        return
+    fi
 
     if call_ai "$primary_ai" "$prompt" "$timeout" "$output_file"; then
         return 0
@@ -366,6 +391,270 @@ call_ai_with_fallback() {
     call_ai "$fallback_ai" "$prompt" "$timeout" "$output_file"
 }
 
+# ============================================================================
+# Hedged Fallback (speculative execution)
+# Purpose: Cut tail latency of call_ai_with_fallback and of the ENABLE_AI_FALLBACK
+#          chain in call_ai_with_context by starting the first fallback
+#          once the primary runs past its historical p95 latency
+# ============================================================================
+
+# Hedging is opt-in: a hedge sends the prompt to the fallback provider while
+# the primary is still running (see the Security Notice at the top of this file)
+AI_HEDGE_ENABLED="${AI_HEDGE_ENABLED:-false}"
+AI_HEDGE_BUDGET="${AI_HEDGE_BUDGET:-20}"            # Extra calls hedging may spend per hour
+AI_HEDGE_MIN_SAMPLES="${AI_HEDGE_MIN_SAMPLES:-5}"   # Latency samples required before hedging
+AI_LATENCY_SAMPLES="${AI_LATENCY_SAMPLES:-100}"     # Recent samples used for the p95
+AI_LATENCY_LOG_DIR="${AI_LATENCY_LOG_DIR:-${API_CALL_LOG_DIR}/ai-latency}"
+export AI_HEDGE_ENABLED AI_HEDGE_BUDGET AI_HEDGE_MIN_SAMPLES AI_LATENCY_SAMPLES AI_LATENCY_LOG_DIR
+
+# Record the latency of an AI execution (one millisecond value per line)
+# Arguments:
+#   $1 - AI name
+#   $2 - Start time ($EPOCHREALTIME taken before the call)
+record_ai_latency() {
+    local ai="$1"
+    local started="$2"
+    local now=$EPOCHREALTIME
+
+    mkdir -p "$AI_LATENCY_LOG_DIR" 2>/dev/null || return 0
+    echo $(( (${now/./} - ${started/./}) / 1000 )) >> "$AI_LATENCY_LOG_DIR/${ai}.log" 2>/dev/null || true
+}
+
+# Get the p95 latency of an AI over its recent executions
+# Arguments:
+#   $1 - AI name
+# Output: p95 in milliseconds (nearest rank)
+# Returns: 1 if fewer than AI_HEDGE_MIN_SAMPLES samples are recorded
+get_ai_latency_p95() {
+    local ai="$1"
+    local log_file="$AI_LATENCY_LOG_DIR/${ai}.log"
+
+    [ -f "$log_file" ] || return 1
+
+    # Keep the history bounded; losing a concurrent append here only drops one sample
+    if [ "$(wc -c < "$log_file")" -gt 65536 ]; then
+        tail -n "$AI_LATENCY_SAMPLES" "$log_file" > "$log_file.tmp" 2>/dev/null && \
+            mv -f "$log_file.tmp" "$log_file"
+    fi
+
+    tail -n "$AI_LATENCY_SAMPLES" "$log_file" | sort -n | awk -v min="$AI_HEDGE_MIN_SAMPLES" '
+        { v[NR] = $1 }
+        END {
+            if (NR < min) exit 1
+            rank = int(NR * 0.95)
+            if (rank < NR * 0.95) rank++
+            print v[rank]
+        }'
+}
+
+# Check the rate limit and the hedge budget, then log the hedge as an API call
+# (called under the hedge lock so concurrent callers cannot overspend)
+_ai_hedge_claim_locked() {
+    local ai="$1"
+
+    check_api_rate_limit || return 1
+
+    local current_hour hedges
+    current_hour=$(date +%Y%m%d-%H)
+    hedges=$(grep -c "^${current_hour}.* hedge$" "$API_CALL_LOG" 2>/dev/null) || hedges=0
+    if [ "$hedges" -ge "$AI_HEDGE_BUDGET" ]; then
+        log_info "[$ai] Hedge budget exhausted ($hedges/$AI_HEDGE_BUDGET this hour)"
+        return 1
+    fi
+
+    log_api_call "$ai" "hedge"
+}
+
+# Spend one call of the hourly hedge budget
+# Arguments:
+#   $1 - AI the hedge is sent to
+# Returns:
+#   0 - Hedge allowed (already counted in API_CALL_LOG)
+#   1 - Rate limit reached or budget exhausted
+ai_hedge_claim_budget() {
+    local ai="$1"
+
+    init_api_call_log || return 1
+
+    if ! command -v flock &>/dev/null; then
+        _ai_hedge_claim_locked "$ai"
+        return
+    fi
+
+    {
+        flock 9 && _ai_hedge_claim_locked "$ai"
+    } 9>>"$API_CALL_LOG_DIR/.hedge.lock"
+}
+
+# Terminate a call and every process it started
+# Processes are stopped parent-first while the tree is collected so none can
+# fork new children, then terminated and resumed to deliver SIGTERM.
+_ai_hedge_kill_tree() {
+    local root_pid="$1"
+    local -a tree=("$root_pid")
+    local i=0 pid child
+
+    while [ "$i" -lt "${#tree[@]}" ]; do
+        pid=${tree[$i]}
+        kill -STOP "$pid" 2>/dev/null || true
+        for child in $(pgrep -P "$pid" 2>/dev/null); do
+            tree+=("$child")
+        done
+        i=$((i + 1))
+    done
+
+    kill -TERM "${tree[@]}" 2>/dev/null || true
+    kill -CONT "${tree[@]}" 2>/dev/null || true
+    wait "$root_pid" 2>/dev/null || true
+}
+
+# Wait until one of the given background jobs finishes
+# Arguments:
+#   $1 - Variable receiving the PID of the finished job
+#   $2 - Variable receiving its exit code
+#   $3+ - PIDs to wait for
+_ai_hedge_wait_any() {
+    local -n _ai_hedge_done_pid=$1
+    local -n _ai_hedge_done_exit=$2
+    shift 2
+
+    local finished_pid=""
+    if (( BASH_VERSINFO[0] > 5 || (BASH_VERSINFO[0] == 5 && BASH_VERSINFO[1] >= 1) )); then
+        if wait -n -p finished_pid "$@"; then
+            _ai_hedge_done_exit=0
+        else
+            _ai_hedge_done_exit=$?
+        fi
+        _ai_hedge_done_pid=$finished_pid
+        return 0
+    fi
+
+    local pid
+    while true; do
+        for pid in "$@"; do
+            if ! kill -0 "$pid" 2>/dev/null; then
+                if wait "$pid"; then
+                    _ai_hedge_done_exit=0
+                else
+                    _ai_hedge_done_exit=$?
+                fi
+                _ai_hedge_done_pid=$pid
+                return 0
+            fi
+        done
+        sleep 0.1
+    done
+}
+
+# Race the primary AI against a delayed hedge to the fallback AI
+#
+# The primary starts immediately. If it is still running after hedge_delay_ms
+# (its p95 latency) and the hedge budget allows, the fallback starts as well.
+# The first successful result is written to output_file and the other call is
+# terminated. A primary that fails before the hedge starts falls back as usual.
+#
+# Arguments:
+#   $1 - Primary AI
+#   $2 - Fallback AI
+#   $3 - Prompt
+#   $4 - Timeout in seconds
+#   $5 - Output file
+#   $6 - Hedge delay in milliseconds
+#   $7 - "context" when called from call_ai_with_context (optional): the primary
+#        has already passed call_ai's checks, and a failed primary falls back
+#        through call_ai_with_context with the primary in the fallback chain
+#
+# Returns:
+#   0 if either call succeeded, otherwise the exit code of the last call
+#
+call_ai_hedged() {
+    local primary_ai=$1
+    local fallback_ai=$2
+    local prompt=$3
+    local timeout=$4
+    local output_file=$5
+    local hedge_delay_ms=$6
+    local caller=${7:-}
+
+    local primary_call=call_ai
+    [ "$caller" = "context" ] && primary_call=call_ai_with_context
+
+    local work_dir
+    work_dir=$(mktemp -d "${TMPDIR:-/tmp}/ai-hedge-XXXXXX") || {
+        ENABLE_AI_FALLBACK=false "$primary_call" "$primary_ai" "$prompt" "$timeout" "$output_file"
+        return
+    }
+
+    # Both racers run without the auto-fallback chain; the hedge is the fallback
+    local primary_started=$EPOCHREALTIME
+    ENABLE_AI_FALLBACK=false "$primary_call" "$primary_ai" "$prompt" "$timeout" "$work_dir/primary.out" &
+    local primary_pid=$!
+
+    sleep "$((hedge_delay_ms / 1000)).$(printf '%03d' $((hedge_delay_ms % 1000)))" &
+    local timer_pid=$!
+
+    local done_pid done_exit exit_code=1
+    local hedge_pid="" winner=""
+    _ai_hedge_wait_any done_pid done_exit "$primary_pid" "$timer_pid"
+
+    if [ "$done_pid" = "$primary_pid" ]; then
+        kill "$timer_pid" 2>/dev/null || true
+        wait "$timer_pid" 2>/dev/null || true
+        exit_code=$done_exit
+        if [ "$exit_code" -eq 0 ]; then
+            winner=primary
+        else
+            log_warning "[$primary_ai] failed, falling back to [$fallback_ai]"
+            if [ "$caller" = "context" ]; then
+                call_ai_with_context "$fallback_ai" "$prompt" "$timeout" "$work_dir/hedge.out" " $primary_ai" && exit_code=0 || exit_code=$?
+            else
+                call_ai "$fallback_ai" "$prompt" "$timeout" "$work_dir/hedge.out" && exit_code=0 || exit_code=$?
+            fi
+            winner=hedge
+        fi
+    elif ! ai_hedge_claim_budget "$fallback_ai"; then
+        log_info "[$primary_ai] Slower than p95 (${hedge_delay_ms}ms), hedge to [$fallback_ai] skipped"
+        wait "$primary_pid" && exit_code=0 || exit_code=$?
+        winner=primary
+    else
+        log_info "[$primary_ai] Slower than p95 (${hedge_delay_ms}ms), hedging with [$fallback_ai]"
+        (
+            check_ai_with_details "$fallback_ai" || exit 1
+            ENABLE_AI_FALLBACK=false call_ai_with_context "$fallback_ai" "$prompt" "$timeout" "$work_dir/hedge.out"
+        ) &
+        hedge_pid=$!
+
+        _ai_hedge_wait_any done_pid done_exit "$primary_pid" "$hedge_pid"
+        local loser_pid=$hedge_pid
+        winner=primary
+        if [ "$done_pid" = "$hedge_pid" ]; then
+            loser_pid=$primary_pid
+            winner=hedge
+        fi
+        exit_code=$done_exit
+
+        if [ "$exit_code" -ne 0 ]; then
+            # The first call to finish failed; the other one decides the result
+            [ "$winner" = "hedge" ] && winner=primary || winner=hedge
+            wait "$loser_pid" && exit_code=0 || exit_code=$?
+        elif [ "$winner" = "hedge" ]; then
+            # The primary ran at least this long; keep the sample so p95 does not drift down
+            record_ai_latency "$primary_ai" "$primary_started"
+            log_info "[$fallback_ai] Hedge for [$primary_ai] won, terminating [$primary_ai]"
+            _ai_hedge_kill_tree "$loser_pid"
+        else
+            log_info "[$primary_ai] Won against hedge, terminating [$fallback_ai]"
+            _ai_hedge_kill_tree "$loser_pid"
+        fi
+    fi
+
+    if [ -f "$work_dir/$winner.out" ]; then
+        mv -f "$work_dir/$winner.out" "$output_file"
+    fi
+    rm -rf "$work_dir"
+    return "$exit_code"
+}
+
 # ============================================================================
 # File-Based Prompt System (Phase 1.1 - Core Functions)
 # Purpose: Handle large prompts (>1KB) via secure temporary files
@@ -453,6 +742,23 @@ create_secure_prompt_file() {
     return 0
 }
 
+# Write a prompt to stdout for an AI CLI reading stdin
+#
+# Arguments:
+#   $1 - Prompt content
+#
+# Returns:
+#   0 (a reader that exits early does not fail the pipeline with SIGPIPE)
+#
+# Usage:
+#   pipe_prompt "$large_prompt" | "$wrapper_script" --stdin
+#
+pipe_prompt() {
+    local content="$1"
+
+    ( trap '' PIPE; printf '%s\n' "$content" 2>/dev/null ) || true
+}
+
 # Clean up temporary prompt file
 #
 # Arguments:
@@ -497,6 +803,7 @@ handle_cache() {
             # Cache hit - load from cache
             if load_from_cache "$cache_key" "$output_file"; then
                 log_info "[$ai_name] Using cached result (key: ${cache_key:0:16}...)"
+                ai_cache_record hit
                 return 0
             fi
         fi
@@ -506,6 +813,63 @@ handle_cache() {
     return 1
 }
 
+# Single-flight execution of an AI call that missed the cache
+#
+# The first caller for a cache key owns the in-flight lock and runs the call;
+# concurrent callers with the same key block on the lock and then load the
+# owner's result from the cache instead of calling the AI again. If the owner
+# failed (nothing was cached), the next waiter runs the call itself.
+#
+# Arguments:
+#   $1 - Cache key (empty: run without caching)
+#   $2 - Output file
+#   $3 - Maximum seconds to wait for an in-flight call
+#   $4... - Command that performs the call and saves the result to the cache
+#
+# Returns:
+#   0 on a coalesced/cached result, otherwise the exit code of the command
+#
+ai_cache_single_flight() {
+    local cache_key="$1"
+    local output_file="$2"
+    local wait_seconds="$3"
+    shift 3
+
+    if [ -z "$cache_key" ] || [ -z "$output_file" ] || ! command -v flock &>/dev/null || \
+        ! mkdir -p "$AI_CACHE_DIR/inflight" 2>/dev/null; then
+        "$@"
+        return
+    fi
+
+    local waited=false
+    {
+        if ! flock -n 9; then
+            waited=true
+            log_info "Waiting for in-flight call (key: ${cache_key:0:16}...)"
+            if ! flock -w "$wait_seconds" 9; then
+                log_warning "In-flight call did not finish within ${wait_seconds}s (key: ${cache_key:0:16}...), calling AI directly"
+                ai_cache_record miss
+                "$@" 9>&-
+                return
+            fi
+        fi
+
+        # The call may have completed while we were waiting for the lock
+        if check_cache "$cache_key" && load_from_cache "$cache_key" "$output_file"; then
+            if $waited; then
+                log_info "Coalesced with in-flight call (key: ${cache_key:0:16}...)"
+                ai_cache_record coalesced
+            else
+                ai_cache_record hit
+            fi
+            return 0
+        fi
+
+        ai_cache_record miss
+        "$@" 9>&-
+    } 9>>"$AI_CACHE_DIR/inflight/${cache_key}.lock"
+}
+
 # Helper function to process large prompts
 process_large_prompt() {
     local ai_name="$1"
@@ -516,37 +880,42 @@ process_large_prompt() {
 
     local size_threshold=1024
     local context_size=${#context}
+    local started=$EPOCHREALTIME
 
-    log_info "[$ai_name] Large prompt detected (${context_size}B > ${size_threshold}B), using file-based input"
-
-    # Create secure temporary file
-    local prompt_file
-    if ! prompt_file=$(create_secure_prompt_file "$ai_name" "$context"); then
-        log_structured_error \
-            "[$ai_name] Failed to create temporary file for large prompt" \
-            "Disk space, permissions, or /tmp not writable" \
-            "Check: df -h /tmp && ls -ld /tmp. Falling back to truncated (${size_threshold}B) prompt"
-        # Fallback: Truncate and use command-line
-        local truncated="${context:0:$size_threshold}"
-        call_ai "$ai_name" "$truncated" "$timeout_seconds" "$output_file"
-        return $?
-    fi
-
-    # Set up automatic cleanup
-    # shellcheck disable=SC2064
-    trap "cleanup_prompt_file '$prompt_file'" EXIT INT TERM
+    log_info "[$ai_name] Large prompt detected (${context_size}B > ${size_threshold}B), using stdin input"
 
     # Determine input method based on AI support
     local wrapper_script="$PROJECT_ROOT/bin/${ai_name}-wrapper.sh"
     local exit_code=0
 
+    # --prompt-file needs a file on disk; otherwise the prompt is streamed through
+    # a pipe (no temp file, the pipe blocks the writer until the AI reads it)
+    local prompt_file=""
+    if [ -f "$wrapper_script" ] && supports_file_input "$ai_name"; then
+        # Create secure temporary file
+        if ! prompt_file=$(create_secure_prompt_file "$ai_name" "$context"); then
+            log_structured_error \
+                "[$ai_name] Failed to create temporary file for large prompt" \
+                "Disk space, permissions, or /tmp not writable" \
+                "Check: df -h /tmp && ls -ld /tmp. Falling back to truncated (${size_threshold}B) prompt"
+            # Fallback: Truncate and use command-line
+            local truncated="${context:0:$size_threshold}"
+            call_ai "$ai_name" "$truncated" "$timeout_seconds" "$output_file"
+            return $?
+        fi
+
+        # Set up automatic cleanup
+        # shellcheck disable=SC2064
+        trap "cleanup_prompt_file '$prompt_file'" EXIT INT TERM
+    fi
+
     if [ -f "$wrapper_script" ]; then
-        log_info "[$ai_name] Using wrapper with file input"
+        log_info "[$ai_name] Using wrapper with stdin input"
 
         ( # Start a subshell to scope the environment variable
             export WRAPPER_NON_INTERACTIVE="${WRAPPER_NON_INTERACTIVE:-1}"
 
-            if supports_file_input "$ai_name"; then
+            if [ -n "$prompt_file" ]; then
                 # Use --prompt-file if supported
                 if [ -n "$output_file" ]; then
                     timeout "$timeout_seconds" "$wrapper_script" --prompt-file "$prompt_file" > "$output_file" 2>&1
@@ -554,12 +923,14 @@ process_large_prompt() {
                     timeout "$timeout_seconds" "$wrapper_script" --prompt-file "$prompt_file" 2>&1
                 fi
             else
-                # Fallback to stdin redirect with --stdin flag for explicit handling
+                # Fallback to stdin pipe with --stdin flag for explicit handling
                 # Set WRAPPER_SKIP_TIMEOUT=1 to let outer timeout manage execution
                 if [ -n "$output_file" ]; then
-                    WRAPPER_SKIP_TIMEOUT=1 timeout "$timeout_seconds" "$wrapper_script" --stdin < "$prompt_file" > "$output_file" 2>&1
+                    pipe_prompt "$context" | \
+                        WRAPPER_SKIP_TIMEOUT=1 timeout "$timeout_seconds" "$wrapper_script" --stdin > "$output_file" 2>&1
                 else
-                    WRAPPER_SKIP_TIMEOUT=1 timeout "$timeout_seconds" "$wrapper_script" --stdin < "$prompt_file" 2>&1
+                    pipe_prompt "$context" | \
+                        WRAPPER_SKIP_TIMEOUT=1 timeout "$timeout_seconds" "$wrapper_script" --stdin 2>&1
                 fi
             fi
         )
@@ -567,17 +938,19 @@ process_large_prompt() {
     else
         log_warning "[$ai_name] Wrapper not found, using direct CLI with stdin"
         if [ -n "$output_file" ]; then
-            timeout "$timeout_seconds" "$ai_name" < "$prompt_file" > "$output_file" 2>&1
+            pipe_prompt "$context" | timeout "$timeout_seconds" "$ai_name" > "$output_file" 2>&1
             exit_code=$?
         else
-            timeout "$timeout_seconds" "$ai_name" < "$prompt_file" 2>&1
+            pipe_prompt "$context" | timeout "$timeout_seconds" "$ai_name" 2>&1
             exit_code=$?
         fi
     fi
 
     # Clean up temporary file
-    cleanup_prompt_file "$prompt_file"
-    trap - EXIT INT TERM
+    if [ -n "$prompt_file" ]; then
+        cleanup_prompt_file "$prompt_file"
+        trap - EXIT INT TERM
+    fi
 
     # Log routing decision for metrics
     if [ -n "${VIBE_LOGGER_ENABLED:-}" ]; then
@@ -585,6 +958,9 @@ process_large_prompt() {
             log_info "[$ai_name] File-based routing: size=${context_size}B, exit_code=$exit_code"
     fi
 
+    # Latency history for hedging (only successful executions, cache hits never get here)
+    [ $exit_code -eq 0 ] && record_ai_latency "$ai_name" "$started"
+
     # Phase 3: Save to cache on success
     if [ $exit_code -eq 0 ] && [ -n "$output_file" ] && [ -n "$cache_key" ] && [ "${AI_CACHE_ENABLED:-1}" = "1" ]; then
         save_to_cache "$cache_key" "$output_file" 2>/dev/null || log_warning "[$ai_name] Failed to save cache"
@@ -602,6 +978,7 @@ process_small_prompt() {
     local cache_key="$5"
 
     local context_size=${#context}
+    local started=$EPOCHREALTIME
 
     # Small prompt: Use command-line arguments (direct wrapper call)
     log_info "[$ai_name] Small prompt (${context_size}B), using command-line arguments"
@@ -644,6 +1021,9 @@ process_small_prompt() {
         exit_code=$?
     fi
 
+    # Latency history for hedging (only successful executions, cache hits never get here)
+    [ $exit_code -eq 0 ] && record_ai_latency "$ai_name" "$started"
+
     # Phase 3: Save to cache on success
     if [ $exit_code -eq 0 ] && [ -n "$output_file" ] && [ -n "$cache_key" ] && [ "${AI_CACHE_ENABLED:-1}" = "1" ]; then
         save_to_cache "$cache_key" "$output_file" 2>/dev/null || log_warning "[$ai_name] Failed to save cache"
@@ -697,10 +1077,8 @@ call_ai_with_context_internal() {
 
     # Handle caching
     local cache_key
-    if handle_cache "$ai_name" "$context" "$output_file"; then
+    if cache_key=$(handle_cache "$ai_name" "$context" "$output_file"); then
         return 0
-    else
-        cache_key=$(handle_cache "$ai_name" "$context" "$output_file" 2>&1)
     fi
 
     # Size threshold: 1KB (1024 bytes)
@@ -708,10 +1086,13 @@ call_ai_with_context_internal() {
     local context_size=${#context}
 
     # Decision: Use file-based input for large prompts
+    # Identical concurrent calls share one execution (single-flight per cache key)
     if [ "$context_size" -gt "$size_threshold" ]; then
-        process_large_prompt "$ai_name" "$context" "$timeout_seconds" "$output_file" "$cache_key"
+        ai_cache_single_flight "$cache_key" "$output_file" "$timeout_seconds" \
+            process_large_prompt "$ai_name" "$context" "$timeout_seconds" "$output_file" "$cache_key"
     else
-        process_small_prompt "$ai_name" "$context" "$timeout_seconds" "$output_file" "$cache_key"
+        ai_cache_single_flight "$cache_key" "$output_file" "$timeout_seconds" \
+            process_small_prompt "$ai_name" "$context" "$timeout_seconds" "$output_file" "$cache_key"
     fi
 }
 
@@ -728,10 +1109,8 @@ call_ai_with_context_original() {
 
     # Handle caching
     local cache_key
-    if handle_cache "$ai_name" "$context" "$output_file"; then
+    if cache_key=$(handle_cache "$ai_name" "$context" "$output_file"); then
         return 0
-    else
-        cache_key=$(handle_cache "$ai_name" "$context" "$output_file" 2>&1)
     fi
 
     # Size threshold: 1KB (1024 bytes)
@@ -739,10 +1118,13 @@ call_ai_with_context_original() {
     local context_size=${#context}
 
     # Decision: Use file-based input for large prompts
+    # Identical concurrent calls share one execution (single-flight per cache key)
     if [ "$context_size" -gt "$size_threshold" ]; then
-        process_large_prompt "$ai_name" "$context" "$timeout_seconds" "$output_file" "$cache_key"
+        ai_cache_single_flight "$cache_key" "$output_file" "$timeout_seconds" \
+            process_large_prompt "$ai_name" "$context" "$timeout_seconds" "$output_file" "$cache_key"
     else
-        process_small_prompt "$ai_name" "$context" "$timeout_seconds" "$output_file" "$cache_key"
+        ai_cache_single_flight "$cache_key" "$output_file" "$timeout_seconds" \
+            process_small_prompt "$ai_name" "$context" "$timeout_seconds" "$output_file" "$cache_key"
     fi
 }
 
@@ -764,7 +1146,7 @@ call_ai_with_context_original() {
 #
 # Features:
 #   - Automatic size detection (1KB threshold)
-#   - Secure temporary file handling
+#   - Prompts streamed over stdin (temporary file only for --prompt-file)
 #   - Automatic cleanup via trap
 #   - Fallback to command-line on file creation failure
 #   - VibeLogger integration for routing decisions
@@ -782,8 +1164,24 @@ call_ai_with_context() {
     local fallback_chain="${5:-}"  # Track the chain of fallbacks to prevent circular loops
     local exit_code=0
 
+    # Hedged fallback: with AI_HEDGE_ENABLED=true and a known p95 latency, the
+    # first fallback AI is raced against the primary (see call_ai_hedged)
+    # instead of being started only after the primary has failed
+    local hedge_ai="" hedge_delay_ms=""
+    if [[ -z "$fallback_chain" ]] && [[ "${ENABLE_AI_FALLBACK:-true}" == "true" ]] && \
+        [[ "$AI_HEDGE_ENABLED" == "true" ]] && [[ -n "$output_file" ]] && [[ "$timeout" =~ ^[0-9]+$ ]]; then
+        hedge_ai=$(get_fallback_ai "$ai_name")
+        if [[ -z "$hedge_ai" ]] || [[ "$hedge_ai" == "$ai_name" ]] || \
+            ! hedge_delay_ms=$(get_ai_latency_p95 "$ai_name") || [[ "$hedge_delay_ms" -ge $((timeout * 1000)) ]]; then
+            hedge_ai=""
+        fi
+    fi
+
+    if [[ -n "$hedge_ai" ]]; then
+        call_ai_hedged "$ai_name" "$hedge_ai" "$context" "$timeout" "$output_file" "$hedge_delay_ms" context
+        exit_code=$?
     # Feature Flag check for failure retry
-    if [[ "${ENABLE_FAILURE_RETRY:-false}" == "true" ]]; then
+    elif [[ "${ENABLE_FAILURE_RETRY:-false}" == "true" ]]; then
         # Use retry policy
         execute_with_retry_policy "$ai_name" call_ai_with_context_internal "$ai_name" "$context" "$timeout" "$output_file"
         exit_code=$?
@@ -821,6 +1219,11 @@ call_ai_with_context() {
                     continue
                 fi
 
+                # Already raced against the primary by call_ai_hedged
+                if [[ "$fallback_ai" == "$hedge_ai" ]]; then
+                    continue
+                fi
+
                 # Defensive check: prevent AI from falling back to a previous AI in the chain
                 if [[ " $fallback_chain " =~ " $fallback_ai " ]]; then
                     log_debug "[$ai_name] Skipping fallback to [$fallback_ai] (already in chain: $fallback_chain), continuing to next fallback option"
@@ -857,11 +1260,22 @@ call_ai_with_context() {
 export -f call_ai_with_context
 export -f call_ai_with_context_original
 export -f call_ai_with_context_internal
+export -f wait_for_api_rate_limit
 export -f call_ai
+export -f call_ai_with_fallback
+export -f call_ai_hedged
+export -f record_ai_latency
+export -f get_ai_latency_p95
+export -f ai_hedge_claim_budget
+export -f _ai_hedge_claim_locked
+export -f _ai_hedge_kill_tree
+export -f _ai_hedge_wait_any
 export -f create_secure_prompt_file
 export -f cleanup_prompt_file
+export -f pipe_prompt
 export -f supports_file_input
 export -f validate_timeout
 export -f handle_cache
+export -f ai_cache_single_flight
 export -f process_large_prompt
 export -f process_small_prompt
@@ -6,12 +6,16 @@
 #   - Workflow configuration access (get_workflow_config)
 #   - Phase metadata retrieval (get_phases, get_phase_info, get_phase_*)
 #   - Parallel phase metadata retrieval (get_parallel_*)
+#   - Compiled config snapshot lookups (lib/config-snapshot.sh), yq as fallback
+#   - Size-bounded AI result store with hit/miss/coalesced counters (save_to_cache, ai_cache_stats)
 #   - Phase execution (execute_phase, execute_sequential_phase, execute_parallel_phase)
-#   - YAML workflow execution (execute_yaml_workflow)
+#   - YAML workflow execution (execute_yaml_workflow), optionally pipelined (lib/phase-streaming.sh)
 #
 # Dependencies:
 #   - lib/7ai-core.sh (logging functions)
 #   - lib/7ai-ai-interface.sh (call_ai function)
+#   - lib/config-snapshot.sh (compiled config snapshot)
+#   - lib/phase-streaming.sh (ENABLE_PHASE_STREAMING=true)
 #   - yq (YAML processor)
 
 set -euo pipefail
@@ -41,6 +45,27 @@ else
     echo "WARNING: incremental-cache.sh not found at $INCREMENTAL_CACHE_LIB" >&2
 fi
 
+# Source config snapshot library: profile/workflow lookups without yq forks
+CONFIG_SNAPSHOT_LIB="$(dirname "${BASH_SOURCE[0]}")/config-snapshot.sh"
+if [[ -f "$CONFIG_SNAPSHOT_LIB" ]]; then
+    source "$CONFIG_SNAPSHOT_LIB" || {
+        echo "WARNING: Failed to source config-snapshot.sh" >&2
+    }
+else
+    echo "WARNING: config-snapshot.sh not found at $CONFIG_SNAPSHOT_LIB" >&2
+fi
+# Source phase streaming library: overlapped execution of consecutive phases
+PHASE_STREAMING_LIB="$(dirname "${BASH_SOURCE[0]}")/phase-streaming.sh"
+if [[ -f "$PHASE_STREAMING_LIB" ]]; then
+    source "$PHASE_STREAMING_LIB" || {
+        echo "WARNING: Failed to source phase-streaming.sh" >&2
+    }
+fi
+if ! declare -F config_snapshot_get >/dev/null; then
+    config_snapshot_get() { return 1; }
+    config_snapshot_has() { return 2; }
+fi
+
 # Shadow mode for optimizer decision logging without applying changes (Phase 3)
 if [[ "${OPTIMIZER_SHADOW_MODE:-false}" == "true" ]]; then
     log_info "Optimizer shadow mode enabled - decisions will be logged but not applied"
@@ -204,8 +229,9 @@ get_dynamic_parallel_jobs() {
 # ============================================================================
 
 # Cache directory for AI execution results
-AI_CACHE_DIR="${PROJECT_ROOT:-.}/.cache/ai-results"
+AI_CACHE_DIR="${AI_CACHE_DIR:-${PROJECT_ROOT:-.}/.cache/ai-results}"
 AI_CACHE_TTL="${AI_CACHE_TTL:-86400}"  # Default: 24 hours (86400 seconds)
+AI_CACHE_MAX_SIZE="${AI_CACHE_MAX_SIZE:-104857600}"  # Default: 100MB, least recently used results evicted first
 
 # Initialize AI cache directory
 init_ai_cache() {
@@ -287,8 +313,10 @@ save_to_cache() {
     local cache_file="$AI_CACHE_DIR/${cache_key}.cache"
     local meta_file="$AI_CACHE_DIR/${cache_key}.meta"
 
-    # Copy output to cache
-    cp "$output_file" "$cache_file" 2>/dev/null || {
+    # Copy output to cache (rename into place so concurrent readers never see a partial result)
+    cp "$output_file" "$cache_file.tmp.$BASHPID" 2>/dev/null && \
+        mv -f "$cache_file.tmp.$BASHPID" "$cache_file" 2>/dev/null || {
+        rm -f "$cache_file.tmp.$BASHPID" 2>/dev/null
         log_warning "Failed to save cache: $cache_file"
         return 1
     }
@@ -305,6 +333,9 @@ save_to_cache() {
         log_info "CACHE_SAVE: key=${cache_key:0:16}... | size=${file_size}B | TTL=${AI_CACHE_TTL}s | expires_at=$expiry_date"
     fi
 
+    # Keep the store within AI_CACHE_MAX_SIZE
+    ai_cache_locked -x ai_cache_enforce_size_locked || true
+
     return 0
 }
 
@@ -326,6 +357,9 @@ load_from_cache() {
         return 1
     }
 
+    # Mark as recently used for size-based eviction (mtime only, content untouched)
+    touch -c "$cache_file" 2>/dev/null || true
+
     # Cache verbose: Show load details
     if [ "${CACHE_VERBOSE:-false}" = "true" ]; then
         local file_size=$(wc -c < "$cache_file" 2>/dev/null || echo "0")
@@ -341,6 +375,113 @@ load_from_cache() {
     return 0
 }
 
+# Run a command under the AI cache store lock ($1: -s=shared / -x=exclusive)
+# Runs without locking if flock is not available
+ai_cache_locked() {
+    local mode="$1"
+    shift
+
+    init_ai_cache || return 1
+
+    if ! command -v flock &>/dev/null; then
+        "$@"
+        return
+    fi
+
+    {
+        flock "$mode" 9 && "$@"
+    } 9>>"$AI_CACHE_DIR/.lock"
+}
+
+# Append one line to the counter log (called under the shared store lock)
+_ai_cache_append_stat_locked() {
+    printf '%s 1\n' "$1" >> "$AI_CACHE_DIR/stats.log"
+}
+
+# Count a cache lookup result
+# Arguments:
+#   $1 - hit | miss | coalesced
+ai_cache_record() {
+    [ "${AI_CACHE_ENABLED:-1}" = "1" ] || return 0
+    ai_cache_locked -s _ai_cache_append_stat_locked "$1" 2>/dev/null || true
+}
+
+# Remove an evicted key's single-flight lock file, but only while no leader holds it
+# (unlinking a held lock would let the next caller become a second leader)
+_ai_cache_remove_idle_inflight_lock() {
+    local lock_file="$AI_CACHE_DIR/inflight/${1}.lock"
+
+    [ -e "$lock_file" ] && command -v flock &>/dev/null || return 0
+    {
+        flock -n -x 9 && rm -f "$lock_file"
+    } 9>>"$lock_file" 2>/dev/null || true
+}
+
+# Print "<mtime> <size> <path>" for every stored result, one stat call for all
+# (GNU stat, BSD/macOS stat fallback; a result removed concurrently is skipped)
+_ai_cache_list_entries() {
+    local -a files=("$AI_CACHE_DIR"/*.cache)
+    [ ${#files[@]} -gt 0 ] && [ -e "${files[0]}" ] || return 0
+
+    if stat -c %Y "$AI_CACHE_DIR" >/dev/null 2>&1; then
+        stat -c '%Y %s %n' -- "${files[@]}" 2>/dev/null
+    else
+        stat -f '%m %z %N' -- "${files[@]}" 2>/dev/null
+    fi
+    return 0
+}
+
+# Evict least recently used results until the store fits in AI_CACHE_MAX_SIZE
+# and fold the counter log into one line per counter (called under the exclusive store lock)
+ai_cache_enforce_size_locked() {
+    local stats_file="$AI_CACHE_DIR/stats.log"
+    local total=0 size name key
+    local -a entries=()
+
+    local path
+    while read -r _ size path; do
+        entries+=("$size ${path##*/}")
+        total=$((total + size))
+    done < <(_ai_cache_list_entries | sort -n)
+
+    local entry
+    for entry in "${entries[@]}"; do
+        [ "$total" -gt "$AI_CACHE_MAX_SIZE" ] || break
+        read -r size name <<< "$entry"
+        key="${name%.cache}"
+        rm -f "$AI_CACHE_DIR/$name" "$AI_CACHE_DIR/${key}.meta" 2>/dev/null
+        _ai_cache_remove_idle_inflight_lock "$key"
+        total=$((total - size))
+        if [ "${CACHE_VERBOSE:-false}" = "true" ]; then
+            log_info "CACHE_EVICT: key=${key:0:16}... | size=${size}B | store=${total}B/${AI_CACHE_MAX_SIZE}B"
+        fi
+    done
+
+    if [ -f "$stats_file" ] && [ "$(wc -c < "$stats_file")" -gt 65536 ]; then
+        awk '{ n[$1] += $2 } END { for (c in n) print c, n[c] }' "$stats_file" > "$stats_file.tmp" && \
+            mv -f "$stats_file.tmp" "$stats_file"
+    fi
+    return 0
+}
+
+# Print AI cache statistics as JSON
+# Output: {"hits":N,"misses":N,"coalesced":N,"entries":N,"size_bytes":N,"max_size_bytes":N}
+ai_cache_stats() {
+    local hits=0 misses=0 coalesced=0 entries=0 size_bytes=0
+
+    if [ -f "$AI_CACHE_DIR/stats.log" ]; then
+        read -r hits misses coalesced < <(awk '{ n[$1] += $2 }
+            END { print n["hit"] + 0, n["miss"] + 0, n["coalesced"] + 0 }' "$AI_CACHE_DIR/stats.log")
+    fi
+    if [ -d "$AI_CACHE_DIR" ]; then
+        read -r entries size_bytes < <(_ai_cache_list_entries | \
+            awk '{ n++; s += $2 } END { print n + 0, s + 0 }')
+    fi
+
+    printf '{"hits":%d,"misses":%d,"coalesced":%d,"entries":%d,"size_bytes":%d,"max_size_bytes":%d}\n' \
+        "$hits" "$misses" "$coalesced" "$entries" "$size_bytes" "$AI_CACHE_MAX_SIZE"
+}
+
 # ============================================================================
 # YAML Caching Mechanism (P1.2.1)
 # ============================================================================
@@ -400,6 +541,14 @@ invalidate_yaml_cache() {
     yaml_cache=()
 }
 
+# Load the compiled snapshot in this shell, so getters running in $(...)
+# subshells inherit it instead of each sourcing it again. Getters check the
+# snapshot first; yaml_cache + yq only serve when it is unavailable.
+if [[ -n "${PROJECT_ROOT:-}" && -f "$PROJECT_ROOT/config/multi-ai-profiles.yaml" ]] &&
+        declare -F config_snapshot_load >/dev/null; then
+    config_snapshot_load "$PROJECT_ROOT/config/multi-ai-profiles.yaml" || true
+fi
+
 # ============================================================================
 # Dependency Check Functions (P0.1.2)
 # ============================================================================
@@ -463,9 +612,14 @@ load_multi_ai_profile() {
         return 1
     fi
 
-    # Validate profile exists
-    local profile_check
-    profile_check=$(yq eval ".profiles.\"$profile\"" "$config_file" 2>/dev/null)
+    # Validate profile exists (compiled snapshot first, yq if unavailable)
+    local profile_check="" snapshot_status=0
+    config_snapshot_has "profiles/$profile" || snapshot_status=$?
+    if [ "$snapshot_status" -eq 0 ]; then
+        profile_check="found"
+    elif [ "$snapshot_status" -eq 2 ]; then
+        profile_check=$(yq eval ".profiles.\"$profile\"" "$config_file" 2>/dev/null)
+    fi
     if [ "$profile_check" = "null" ] || [ -z "$profile_check" ]; then
         log_error "Profile '$profile' not found in configuration"
         log_info "Available profiles:"
@@ -483,7 +637,14 @@ get_workflow_config() {
     local workflow="$2"
     local config_file="$PROJECT_ROOT/config/multi-ai-profiles.yaml"
 
-    if ! yq eval ".profiles.\"$profile\".workflows.\"$workflow\"" "$config_file" >/dev/null 2>&1; then
+    local snapshot_status=0
+    config_snapshot_has "profiles/$profile/workflows/$workflow" || snapshot_status=$?
+    if [ "$snapshot_status" -eq 1 ]; then
+        log_error "Workflow '$workflow' not found in profile '$profile'"
+        return 1
+    fi
+
+    if [ "$snapshot_status" -eq 2 ] && ! yq eval ".profiles.\"$profile\".workflows.\"$workflow\"" "$config_file" >/dev/null 2>&1; then
         log_error "Workflow '$workflow' not found in profile '$profile'"
         return 1
     fi
@@ -496,6 +657,20 @@ get_workflow_config() {
 # Phase Metadata Functions (6 functions)
 # ============================================================================
 
+# Print a value from the compiled config snapshot (no yq fork)
+# Usage: _config_snapshot_lookup <key> [default]
+#   default: printed instead of a missing, null or empty value
+#            (without it, missing keys print "null" like yq)
+# Returns: 0 if the snapshot answered, 1 if it is unavailable (use yq instead)
+_config_snapshot_lookup() {
+    local value
+    config_snapshot_get value "$1" || return 1
+    if [[ $# -ge 2 ]] && { [[ "$value" == "null" ]] || [[ -z "$value" ]]; }; then
+        value="$2"
+    fi
+    echo "$value"
+}
+
 # Get phases from workflow
 get_phases() {
     local profile="${1:-$DEFAULT_PROFILE}"
@@ -503,6 +678,8 @@ get_phases() {
     local config_file="$PROJECT_ROOT/config/multi-ai-profiles.yaml"
     local yaml_path=".profiles.\"$profile\".workflows.\"$workflow\".phases | length"
 
+    _config_snapshot_lookup "profiles/$profile/workflows/$workflow/phases/#" 0 && return 0
+
     # Try cache first
     local cached_result
     if cached_result=$(get_cached_yaml "$yaml_path" "$config_file" 2>/dev/null); then
@@ -524,6 +701,18 @@ get_phase_info() {
     local phase_idx="$3"
     local config_file="$PROJECT_ROOT/config/multi-ai-profiles.yaml"
 
+    # Compiled snapshot first (no yq fork)
+    local snapshot_key="profiles/$profile/workflows/$workflow/phases/$phase_idx"
+    local snapshot_name
+    if config_snapshot_get snapshot_name "$snapshot_key/name"; then
+        if [[ -v "MULTI_AI_CONFIG[$snapshot_key/parallel]" || -v "MULTI_AI_CONFIG[$snapshot_key/parallel/#]" ]]; then
+            echo "$snapshot_name|true"
+        else
+            echo "$snapshot_name|false"
+        fi
+        return 0
+    fi
+
     # Get phase name (with caching)
     local name_path=".profiles.\"$profile\".workflows.\"$workflow\".phases[$phase_idx].name"
     local name
@@ -557,6 +746,8 @@ get_phase_ai() {
     local config_file="$PROJECT_ROOT/config/multi-ai-profiles.yaml"
     local yaml_path=".profiles.\"$profile\".workflows.\"$workflow\".phases[$phase_idx].ai"
 
+    _config_snapshot_lookup "profiles/$profile/workflows/$workflow/phases/$phase_idx/ai" && return 0
+
     # Try cache first
     local cached_result
     if cached_result=$(get_cached_yaml "$yaml_path" "$config_file" 2>/dev/null); then
@@ -579,6 +770,8 @@ get_phase_role() {
     local config_file="$PROJECT_ROOT/config/multi-ai-profiles.yaml"
     local yaml_path=".profiles.\"$profile\".workflows.\"$workflow\".phases[$phase_idx].role"
 
+    _config_snapshot_lookup "profiles/$profile/workflows/$workflow/phases/$phase_idx/role" && return 0
+
     # Try cache first
     local cached_result
     if cached_result=$(get_cached_yaml "$yaml_path" "$config_file" 2>/dev/null); then
@@ -601,6 +794,8 @@ get_phase_timeout() {
     local config_file="$PROJECT_ROOT/config/multi-ai-profiles.yaml"
     local yaml_path=".profiles.\"$profile\".workflows.\"$workflow\".phases[$phase_idx].timeout"
 
+    _config_snapshot_lookup "profiles/$profile/workflows/$workflow/phases/$phase_idx/timeout" "120" && return 0
+
     # Try cache first
     local cached_result
     if cached_result=$(get_cached_yaml "$yaml_path" "$config_file" 2>/dev/null); then
@@ -633,6 +828,8 @@ get_phase_input_from() {
     local config_file="$PROJECT_ROOT/config/multi-ai-profiles.yaml"
     local yaml_path=".profiles.\"$profile\".workflows.\"$workflow\".phases[$phase_idx].input_from"
 
+    _config_snapshot_lookup "profiles/$profile/workflows/$workflow/phases/$phase_idx/input_from" "" && return 0
+
     # Try cache first
     local cached_result
     if cached_result=$(get_cached_yaml "$yaml_path" "$config_file" 2>/dev/null); then
@@ -668,6 +865,8 @@ get_parallel_count() {
     local config_file="$PROJECT_ROOT/config/multi-ai-profiles.yaml"
     local yaml_path=".profiles.\"$profile\".workflows.\"$workflow\".phases[$phase_idx].parallel | length"
 
+    _config_snapshot_lookup "profiles/$profile/workflows/$workflow/phases/$phase_idx/parallel/#" 0 && return 0
+
     # Try cache first
     local cached_result
     if cached_result=$(get_cached_yaml "$yaml_path" "$config_file" 2>/dev/null); then
@@ -691,6 +890,8 @@ get_parallel_ai() {
     local config_file="$PROJECT_ROOT/config/multi-ai-profiles.yaml"
     local yaml_path=".profiles.\"$profile\".workflows.\"$workflow\".phases[$phase_idx].parallel[$parallel_idx].ai"
 
+    _config_snapshot_lookup "profiles/$profile/workflows/$workflow/phases/$phase_idx/parallel/$parallel_idx/ai" && return 0
+
     # Try cache first
     local cached_result
     if cached_result=$(get_cached_yaml "$yaml_path" "$config_file" 2>/dev/null); then
@@ -714,6 +915,8 @@ get_parallel_role() {
     local config_file="$PROJECT_ROOT/config/multi-ai-profiles.yaml"
     local yaml_path=".profiles.\"$profile\".workflows.\"$workflow\".phases[$phase_idx].parallel[$parallel_idx].role"
 
+    _config_snapshot_lookup "profiles/$profile/workflows/$workflow/phases/$phase_idx/parallel/$parallel_idx/role" && return 0
+
     # Try cache first
     local cached_result
     if cached_result=$(get_cached_yaml "$yaml_path" "$config_file" 2>/dev/null); then
@@ -737,6 +940,8 @@ get_parallel_timeout() {
     local config_file="$PROJECT_ROOT/config/multi-ai-profiles.yaml"
     local yaml_path=".profiles.\"$profile\".workflows.\"$workflow\".phases[$phase_idx].parallel[$parallel_idx].timeout"
 
+    _config_snapshot_lookup "profiles/$profile/workflows/$workflow/phases/$phase_idx/parallel/$parallel_idx/timeout" "120" && return 0
+
     # Try cache first
     local cached_result
     if cached_result=$(get_cached_yaml "$yaml_path" "$config_file" 2>/dev/null); then
@@ -770,6 +975,8 @@ get_parallel_name() {
     local config_file="$PROJECT_ROOT/config/multi-ai-profiles.yaml"
     local yaml_path=".profiles.\"$profile\".workflows.\"$workflow\".phases[$phase_idx].parallel[$parallel_idx].name"
 
+    _config_snapshot_lookup "profiles/$profile/workflows/$workflow/phases/$phase_idx/parallel/$parallel_idx/name" && return 0
+
     # Try cache first
     local cached_result
     if cached_result=$(get_cached_yaml "$yaml_path" "$config_file" 2>/dev/null); then
@@ -793,6 +1000,8 @@ get_parallel_blocking() {
     local config_file="$PROJECT_ROOT/config/multi-ai-profiles.yaml"
     local yaml_path=".profiles.\"$profile\".workflows.\"$workflow\".phases[$phase_idx].parallel[$parallel_idx].blocking"
 
+    _config_snapshot_lookup "profiles/$profile/workflows/$workflow/phases/$phase_idx/parallel/$parallel_idx/blocking" "true" && return 0
+
     # Try cache first
     local cached_result
     if cached_result=$(get_cached_yaml "$yaml_path" "$config_file" 2>/dev/null); then
@@ -846,8 +1055,10 @@ execute_phase() {
             dep_indices+=("$dep_idx")
         done
 
-        # Use incremental-cache library to build dependency hashes
-        if command -v build_dependency_hashes >/dev/null 2>&1; then
+        # Use incremental-cache library to build dependency hashes (memoized chain, no subshell)
+        if command -v incremental_dependency_hashes >/dev/null 2>&1; then
+            incremental_dependency_hashes dependency_hashes "$workflow_id" "${dep_indices[@]}" 2>/dev/null || dependency_hashes="{}"
+        elif command -v build_dependency_hashes >/dev/null 2>&1; then
             dependency_hashes=$(build_dependency_hashes "$workflow_id" "${dep_indices[@]}" 2>/dev/null) || dependency_hashes="{}"
         fi
     fi
@@ -890,19 +1101,10 @@ execute_phase() {
         local output_file="$work_dir/${ai}_phase${phase_idx}.md"
 
         if [ -f "$output_file" ]; then
-            # Save metadata
+            # Save metadata (incremental-cache stores the output itself in its blob store)
             save_phase_metadata "$workflow_id" "$phase_idx" "$ai" "$role" "$output_file" "$dependency_hashes" 2>/dev/null || {
                 log_warning "Failed to save phase metadata (non-critical)"
             }
-
-            # Save output to cache
-            local cached_file="$AI_CACHE_DIR/${workflow_id}/phase_${phase_idx}.cache"
-            local cache_dir
-            cache_dir=$(dirname "$cached_file")
-            mkdir -p "$cache_dir" 2>/dev/null
-            cp "$output_file" "$cached_file" 2>/dev/null || {
-                log_warning "Failed to cache phase output (non-critical)"
-            }
         fi
     fi
 
@@ -1235,7 +1437,12 @@ execute_parallel_phase() {
 
     # P0.3.2.1: Get max_parallel_jobs from YAML or use default (4)
     local max_parallel_jobs=4
-    if command -v yq &>/dev/null; then
+    local snapshot_max
+    if config_snapshot_get snapshot_max "execution/max_parallel_jobs" 4; then
+        if [[ "$snapshot_max" =~ ^[0-9]+$ ]] && [ "$snapshot_max" -gt 0 ]; then
+            max_parallel_jobs=$snapshot_max
+        fi
+    elif command -v yq &>/dev/null; then
         local yaml_max
         local config_file="$PROJECT_ROOT/config/multi-ai-profiles.yaml"
         yaml_max=$(yq eval ".execution.max_parallel_jobs // 4" "$config_file" 2>/dev/null || echo "4")
@@ -1395,12 +1602,23 @@ execute_yaml_workflow() {
     WORKFLOW_ID="${WORKFLOW_ID:0:16}"  # Use first 16 chars for brevity
 
     # Execute all phases sequentially
-    for ((phase_idx = 0; phase_idx < phase_count; phase_idx++)); do
-        execute_phase "$profile" "$workflow" "$phase_idx" "$task" "$WORK_DIR" "$WORKFLOW_ID" || {
-            log_error "Phase $((phase_idx + 1)) failed"
-            return 1
-        }
-    done
+    # Streaming mode: phases consuming the previous phase's output start while it is still running
+    if [ "${ENABLE_PHASE_STREAMING:-false}" = "true" ] && declare -F phase_stream_workflow >/dev/null; then
+        log_info "Phase streaming enabled: consecutive phases are pipelined"
+        phase_stream_workflow "$profile" "$workflow" "$task" "$WORK_DIR" "$WORKFLOW_ID" "$phase_count" || return 1
+    else
+        for ((phase_idx = 0; phase_idx < phase_count; phase_idx++)); do
+            execute_phase "$profile" "$workflow" "$phase_idx" "$task" "$WORK_DIR" "$WORKFLOW_ID" || {
+                log_error "Phase $((phase_idx + 1)) failed"
+                return 1
+            }
+        done
+    fi
+
+    # Drop expired manifests and unreferenced blobs (throttled by INCREMENTAL_CACHE_GC_INTERVAL)
+    if declare -F incremental_cache_maybe_gc >/dev/null; then
+        incremental_cache_maybe_gc
+    fi
 
     # Display results
     echo ""
@@ -1675,71 +1893,74 @@ mark_ai_failed() {
 # Phase 4 Tier 2: Incremental Composition (Task 4) (2025-11-09)
 # ============================================================================
 
-# Calculate content hash of a file using SHA256
-# Arguments:
-#   $1 - file_path
-# Returns:
-#   SHA256 hash (stdout), empty string on failure
-calculate_content_hash() {
-    local file_path="$1"
-
-    if [ ! -f "$file_path" ]; then
-        log_warning "File not found for hashing: $file_path"
-        echo ""
-        return 1
-    fi
-
-    # Use sha256sum (Linux) or shasum -a 256 (macOS)
-    if command -v sha256sum >/dev/null 2>&1; then
-        sha256sum "$file_path" | cut -d' ' -f1
-    elif command -v shasum >/dev/null 2>&1; then
-        shasum -a 256 "$file_path" | cut -d' ' -f1
-    else
-        log_error "No SHA256 utility available (sha256sum or shasum required)"
-        echo ""
-        return 1
-    fi
-}
+# Legacy fallbacks, only defined when incremental-cache.sh is not loaded: its
+# save_phase_metadata (content-addressed blob store) must not be overridden
+if ! declare -F save_phase_metadata >/dev/null 2>&1; then
+    # Calculate content hash of a file using SHA256
+    # Arguments:
+    #   $1 - file_path
+    # Returns:
+    #   SHA256 hash (stdout), empty string on failure
+    calculate_content_hash() {
+        local file_path="$1"
+
+        if [ ! -f "$file_path" ]; then
+            log_warning "File not found for hashing: $file_path"
+            echo ""
+            return 1
+        fi
 
-# Save phase metadata with content hash and dependencies
-# Arguments:
-#   $1 - workflow_id
-#   $2 - phase_idx
-#   $3 - ai_name
-#   $4 - role
-#   $5 - output_file
-#   $6 - dependency_hashes (JSON string, e.g., '{"phase_0": "abc123"}')
-# Returns:
-#   0 on success, 1 on failure
-save_phase_metadata() {
-    local workflow_id="$1"
-    local phase_idx="$2"
-    local ai_name="$3"
-    local role="$4"
-    local output_file="$5"
-    local dependency_hashes="${6:-{}}"
-
-    # Create metadata directory
-    local meta_dir="$AI_CACHE_DIR/${workflow_id}"
-    mkdir -p "$meta_dir" || {
-        log_error "Failed to create metadata directory: $meta_dir"
-        return 1
+        # Use sha256sum (Linux) or shasum -a 256 (macOS)
+        if command -v sha256sum >/dev/null 2>&1; then
+            sha256sum "$file_path" | cut -d' ' -f1
+        elif command -v shasum >/dev/null 2>&1; then
+            shasum -a 256 "$file_path" | cut -d' ' -f1
+        else
+            log_error "No SHA256 utility available (sha256sum or shasum required)"
+            echo ""
+            return 1
+        fi
     }
 
-    local meta_file="$meta_dir/phase_${phase_idx}.meta"
+    # Save phase metadata with content hash and dependencies
+    # Arguments:
+    #   $1 - workflow_id
+    #   $2 - phase_idx
+    #   $3 - ai_name
+    #   $4 - role
+    #   $5 - output_file
+    #   $6 - dependency_hashes (JSON string, e.g., '{"phase_0": "abc123"}')
+    # Returns:
+    #   0 on success, 1 on failure
+    save_phase_metadata() {
+        local workflow_id="$1"
+        local phase_idx="$2"
+        local ai_name="$3"
+        local role="$4"
+        local output_file="$5"
+        local dependency_hashes="${6:-{}}"
+
+        # Create metadata directory
+        local meta_dir="$AI_CACHE_DIR/${workflow_id}"
+        mkdir -p "$meta_dir" || {
+            log_error "Failed to create metadata directory: $meta_dir"
+            return 1
+        }
 
-    # Calculate output hash
-    local output_hash
-    output_hash=$(calculate_content_hash "$output_file")
-    if [ -z "$output_hash" ]; then
-        log_warning "Failed to calculate hash for: $output_file"
-        output_hash="error"
-    fi
+        local meta_file="$meta_dir/phase_${phase_idx}.meta"
 
-    local timestamp=$(date +%s)
+        # Calculate output hash
+        local output_hash
+        output_hash=$(calculate_content_hash "$output_file")
+        if [ -z "$output_hash" ]; then
+            log_warning "Failed to calculate hash for: $output_file"
+            output_hash="error"
+        fi
+
+        local timestamp=$(date +%s)
 
-    # Generate JSON metadata
-    cat > "$meta_file" <<EOF
+        # Generate JSON metadata
+        cat > "$meta_file" <<EOF
 {
   "phase_idx": $phase_idx,
   "ai": "$ai_name",
@@ -1751,14 +1972,15 @@ save_phase_metadata() {
 }
 EOF
 
-    # Cache verbose logging
-    if [ "${CACHE_VERBOSE:-false}" = "true" ]; then
-        local hash_short="${output_hash:0:16}"
-        log_info "PHASE_META_SAVE: workflow=$workflow_id | phase=$phase_idx | ai=$ai_name | hash=${hash_short}..."
-    fi
+        # Cache verbose logging
+        if [ "${CACHE_VERBOSE:-false}" = "true" ]; then
+            local hash_short="${output_hash:0:16}"
+            log_info "PHASE_META_SAVE: workflow=$workflow_id | phase=$phase_idx | ai=$ai_name | hash=${hash_short}..."
+        fi
 
-    return 0
-}
+        return 0
+    }
+fi
 
 # Check if phase output has changed since last execution
 # Arguments:
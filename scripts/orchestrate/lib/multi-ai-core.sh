@@ -202,10 +202,14 @@ get_timestamp_ms() {
 # VibeLogger Integration Functions (6 functions)
 # ============================================================================
 
+# Compact JSONL writer shared with bin/vibe-logger-lib.sh
+# shellcheck source=../../../bin/vibe-log-sink.sh
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")/../../../bin" && pwd)/vibe-log-sink.sh"
+
 vibe_log() {
     local event_type="$1"
     local action="$2"
-    local metadata="${3:-{}}"
+    local metadata="${3:-}"
     local human_note="$4"
     local ai_todo="${5:-}"
 
@@ -214,65 +218,30 @@ vibe_log() {
         return 1
     fi
 
+    # One compact line per event (JSONL); raw newlines cannot appear inside JSON strings
+    metadata="${metadata//$'\n'/}"
     if [[ -z "$metadata" ]]; then
         metadata="{}"
     fi
 
-    local timestamp
-    timestamp=$(date -u +%Y-%m-%dT%H:%M:%SZ)
-    local runid="7ai_$(date +%s)_$$"
-    local log_file="$VIBE_LOG_DIR/7ai_orchestration_$(date +%H).jsonl"
-
-    local safe_event_type safe_action safe_human_note safe_ai_todo safe_runid safe_timestamp
-    safe_event_type=$(json_escape_string "$event_type")
-    safe_action=$(json_escape_string "$action")
-    safe_human_note=$(json_escape_string "$human_note")
-    safe_ai_todo=$(json_escape_string "$ai_todo")
-    safe_runid=$(json_escape_string "$runid")
-    safe_timestamp=$(json_escape_string "$timestamp")
+    local timestamp hour
+    vibe_timestamp timestamp
+    printf -v hour '%(%H)T' -1
+    local log_file="$VIBE_LOG_DIR/7ai_orchestration_${hour}.jsonl"
 
-    local log_fd
-    if ! exec {log_fd}>>"$log_file"; then
-        log_warning "vibe_log: unable to open log file for append: $log_file"
-        return 1
-    fi
+    local safe_event_type safe_action safe_human_note safe_ai_todo
+    vibe_json_string safe_event_type "$event_type"
+    vibe_json_string safe_action "$action"
+    vibe_json_string safe_human_note "$human_note"
+    vibe_json_string safe_ai_todo "$ai_todo"
 
-    local have_flock=0
-    if command -v flock >/dev/null 2>&1; then
-        have_flock=1
-        if ! flock -w 5 "$log_fd"; then
-            log_warning "vibe_log: unable to acquire file lock for $log_file"
-            exec {log_fd}>&-
-            return 1
-        fi
-    fi
+    local line
+    printf -v line '{"timestamp":"%s","runid":"7ai_%s_%s","event":%s,"action":%s,"metadata":%s,"human_note":%s,"ai_context":{"tool":"Multi-AI Orchestration","integration":"Multi-AI","ai_team":["Claude","Gemini","Amp","Qwen","Droid","Codex","Cursor"],"todo":%s}}' \
+        "$timestamp" "$EPOCHSECONDS" "$$" \
+        "$safe_event_type" "$safe_action" "$metadata" "$safe_human_note" "$safe_ai_todo"
 
     local write_status=0
-    {
-        printf '{\n'
-        printf '  "timestamp": %s,\n' "$safe_timestamp"
-        printf '  "runid": %s,\n' "$safe_runid"
-        printf '  "event": %s,\n' "$safe_event_type"
-        printf '  "action": %s,\n' "$safe_action"
-        printf '  "metadata": '
-        printf '%s' "$metadata"
-        printf ',\n'
-        printf '  "human_note": %s,\n' "$safe_human_note"
-        printf '  "ai_context": {\n'
-        printf '    "tool": "Multi-AI Orchestration",\n'
-        printf '    "integration": "Multi-AI",\n'
-        printf '    "ai_team": ["Claude", "Gemini", "Amp", "Qwen", "Droid", "Codex", "Cursor"],\n'
-        printf '    "todo": %s\n' "$safe_ai_todo"
-        printf '  }\n'
-        printf '}\n'
-    } >&$log_fd || write_status=$?
-
-    if [[ $have_flock -eq 1 ]]; then
-        flock -u "$log_fd" 2>/dev/null || true
-    fi
-
-    exec {log_fd}>&-
-
+    vibe_sink_write "$log_file" "$line" || write_status=$?
     if [[ $write_status -ne 0 ]]; then
         log_warning "vibe_log: failed to write log entry to $log_file (status: $write_status)"
         return $write_status
@@ -288,9 +257,9 @@ vibe_pipeline_start() {
 
     local safe_workflow safe_description metadata timestamp total_phases_value
 
-    safe_workflow=$(json_escape_string "${workflow:-}")
-    safe_description=$(json_escape_string "${description:-}")
-    timestamp=$(date +%s)
+    vibe_json_string safe_workflow "${workflow:-}"
+    vibe_json_string safe_description "${description:-}"
+    timestamp=$EPOCHSECONDS
 
     if [[ "$total_phases" =~ ^[0-9]+$ ]]; then
         total_phases_value=$total_phases
@@ -299,7 +268,7 @@ vibe_pipeline_start() {
         total_phases_value=0
     fi
 
-    printf -v metadata '{\n  "workflow": %s,\n  "description": %s,\n  "total_phases": %d,\n  "timestamp": %s\n}\n' \
+    printf -v metadata '{"workflow":%s,"description":%s,"total_phases":%d,"timestamp":%s}' \
         "$safe_workflow" \
         "$safe_description" \
         "$total_phases_value" \
@@ -318,8 +287,8 @@ vibe_pipeline_done() {
 
     local safe_workflow safe_status metadata total_time_value ai_participants_value
 
-    safe_workflow=$(json_escape_string "${workflow:-}")
-    safe_status=$(json_escape_string "${status:-}")
+    vibe_json_string safe_workflow "${workflow:-}"
+    vibe_json_string safe_status "${status:-}"
 
     if [[ "$total_time" =~ ^[0-9]+$ ]]; then
         total_time_value=$total_time
@@ -335,7 +304,7 @@ vibe_pipeline_done() {
         ai_participants_value=0
     fi
 
-    printf -v metadata '{\n  "workflow": %s,\n  "status": %s,\n  "total_execution_time_ms": %d,\n  "ai_participants": %d\n}\n' \
+    printf -v metadata '{"workflow":%s,"status":%s,"total_execution_time_ms":%d,"ai_participants":%d}' \
         "$safe_workflow" \
         "$safe_status" \
         "$total_time_value" \
@@ -353,8 +322,8 @@ vibe_phase_start() {
 
     local safe_phase_name metadata timestamp phase_number_value ai_count_value
 
-    safe_phase_name=$(json_escape_string "${phase_name:-}")
-    timestamp=$(date +%s)
+    vibe_json_string safe_phase_name "${phase_name:-}"
+    timestamp=$EPOCHSECONDS
 
     if [[ "$phase_number" =~ ^[0-9]+$ ]]; then
         phase_number_value=$phase_number
@@ -370,7 +339,7 @@ vibe_phase_start() {
         ai_count_value=0
     fi
 
-    printf -v metadata '{\n  "phase_name": %s,\n  "phase_number": %d,\n  "ai_count": %d,\n  "timestamp": %s\n}\n' \
+    printf -v metadata '{"phase_name":%s,"phase_number":%d,"ai_count":%d,"timestamp":%s}' \
         "$safe_phase_name" \
         "$phase_number_value" \
         "$ai_count_value" \
@@ -389,8 +358,8 @@ vibe_phase_done() {
 
     local safe_phase_name safe_status metadata phase_number_value execution_time_value
 
-    safe_phase_name=$(json_escape_string "${phase_name:-}")
-    safe_status=$(json_escape_string "${status:-}")
+    vibe_json_string safe_phase_name "${phase_name:-}"
+    vibe_json_string safe_status "${status:-}"
 
     if [[ "$phase_number" =~ ^[0-9]+$ ]]; then
         phase_number_value=$phase_number
@@ -406,7 +375,7 @@ vibe_phase_done() {
         execution_time_value=0
     fi
 
-    printf -v metadata '{\n  "phase_name": %s,\n  "phase_number": %d,\n  "status": %s,\n  "execution_time_ms": %d\n}\n' \
+    printf -v metadata '{"phase_name":%s,"phase_number":%d,"status":%s,"execution_time_ms":%d}' \
         "$safe_phase_name" \
         "$phase_number_value" \
         "$safe_status" \
@@ -424,7 +393,7 @@ vibe_summary_done() {
 
     local safe_priority metadata summary_length output_payload trimmed_output
 
-    safe_priority=$(json_escape_string "${priority:-}")
+    vibe_json_string safe_priority "${priority:-}"
     summary_length=${#summary_text}
 
     trimmed_output="${output_files}"
@@ -440,7 +409,7 @@ vibe_summary_done() {
         output_payload="[]"
     fi
 
-    printf -v metadata '{\n  "priority": %s,\n  "output_files": %s,\n  "summary_length": %d\n}\n' \
+    printf -v metadata '{"priority":%s,"output_files":%s,"summary_length":%d}' \
         "$safe_priority" \
         "$output_payload" \
         "$summary_length"
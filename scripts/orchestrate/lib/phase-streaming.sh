@@ -0,0 +1,375 @@
+#!/usr/bin/env bash
+# Multi-AI Phase Streaming Library
+# Purpose: Overlap consecutive workflow phases instead of handing off complete output files
+# Responsibilities:
+#   - Streaming eligibility of a phase (phase_stream_eligible)
+#   - Pipelined execution of all phases of a YAML workflow (phase_stream_workflow)
+#
+# A sequential phase with input_from is started while the previous phase is
+# still running. Its AI wrapper is launched right away with --stdin on a FIFO;
+# a feeder writes the prompt header, then follows the upstream output file
+# (tail -F --pid) and forwards each chunk as the upstream AI writes it. The
+# upstream output file is the spill buffer: when the downstream consumer falls
+# behind, the data waits on disk (in the page cache) instead of blocking the
+# upstream AI. Parallel upstream phases are forwarded once the phase is done
+# (their tasks finish in any order), which still overlaps the wrapper startup.
+#
+# The AI CLIs only start generating once stdin is closed, so the feeder decides
+# before closing it: if the upstream phase failed, rewrote its output (retry or
+# fallback AI, detected by checksum), or the downstream phase turns out to be
+# valid in the incremental cache, the consumer is killed and the phase runs
+# through the normal execute_phase path instead. Streamed calls bypass the
+# call_ai result cache, as their prompt is not known up front.
+#
+# Settings:
+#   ENABLE_PHASE_STREAMING   false (default) | true
+#   PHASE_STREAM_POLL        upstream output/process poll interval in seconds (default: 0.2)
+#
+# Dependencies:
+#   - lib/multi-ai-core.sh (logging functions)
+#   - lib/multi-ai-ai-interface.sh (check_ai_with_details, wait_for_api_rate_limit, log_api_call)
+#   - lib/multi-ai-config.sh (phase metadata getters, execute_phase)
+#   - lib/incremental-cache.sh (optional: dependency hashes, phase metadata)
+#   - lib/resource-limiter.sh (optional: the consumer holds an AI slot while it runs)
+#   - GNU tail (--pid), mkfifo, cksum
+
+set -euo pipefail
+
+ENABLE_PHASE_STREAMING="${ENABLE_PHASE_STREAMING:-false}"
+PHASE_STREAM_POLL="${PHASE_STREAM_POLL:-0.2}"
+
+# PID of the last phase started by _phase_stream_spawn
+PHASE_STREAM_PID=""
+
+# Check if a phase can stream its input from the (still running) previous phase
+# Arguments:
+#   $1 - Profile, $2 - Workflow, $3 - Phase index
+# Returns:
+#   0 if eligible, 1 otherwise
+phase_stream_eligible() {
+    local profile="$1"
+    local workflow="$2"
+    local phase_idx="$3"
+
+    [ "$ENABLE_PHASE_STREAMING" = "true" ] || return 1
+    [ "$phase_idx" -gt 0 ] || return 1
+
+    # tail --pid is GNU only
+    if [ -z "${_PHASE_STREAM_TOOLS_OK:-}" ]; then
+        _PHASE_STREAM_TOOLS_OK=false
+        if command -v mkfifo >/dev/null 2>&1 && command -v cksum >/dev/null 2>&1 && \
+           tail --pid="$$" -n 0 /dev/null >/dev/null 2>&1; then
+            _PHASE_STREAM_TOOLS_OK=true
+        else
+            log_warning "Phase streaming requires GNU tail (--pid) and mkfifo, running phases sequentially"
+        fi
+    fi
+    [ "$_PHASE_STREAM_TOOLS_OK" = "true" ] || return 1
+
+    local phase_info
+    phase_info=$(get_phase_info "$profile" "$workflow" "$phase_idx")
+    [ "${phase_info#*|}" != "true" ] || return 1
+
+    local ai input_from
+    ai=$(get_phase_ai "$profile" "$workflow" "$phase_idx")
+    [ -n "$ai" ] && [ "$ai" != "null" ] || return 1
+    input_from=$(get_phase_input_from "$profile" "$workflow" "$phase_idx")
+    [ -n "$input_from" ] && [ "$input_from" != "null" ] || return 1
+
+    return 0
+}
+
+# Run a phase command in the background and record its exit code
+# Arguments:
+#   $1 - Stream directory, $2 - Phase index, $3... - Command
+# Sets:
+#   PHASE_STREAM_PID
+_phase_stream_spawn() {
+    local stream_dir="$1"
+    local phase_idx="$2"
+    shift 2
+
+    rm -f "$stream_dir/phase${phase_idx}.status"
+    (
+        rc=0
+        "$@" || rc=$?
+        echo "$rc" > "$stream_dir/phase${phase_idx}.status"
+        exit "$rc"
+    ) &
+    PHASE_STREAM_PID=$!
+}
+
+# Dependency hashes of a phase (outputs of phases 0..phase_idx-1)
+# Arguments:
+#   $1 - Variable name to set, $2 - Workflow ID, $3 - Phase index
+_phase_stream_dependency_hashes() {
+    local -n _stream_deps_ref=$1
+    local workflow_id="$2"
+    local phase_idx="$3"
+    local dep_indices=() dep_idx
+
+    _stream_deps_ref="{}"
+    for ((dep_idx = 0; dep_idx < phase_idx; dep_idx++)); do
+        dep_indices+=("$dep_idx")
+    done
+    if command -v incremental_dependency_hashes >/dev/null 2>&1; then
+        incremental_dependency_hashes _stream_deps_ref "$workflow_id" "${dep_indices[@]}" 2>/dev/null || _stream_deps_ref="{}"
+    fi
+}
+
+# Write the prompt of a streamed phase to the consumer's FIFO
+# Kills the consumer (before closing the FIFO) when the streamed input must not be used
+# Arguments:
+#   $1 - Profile, $2 - Workflow, $3 - Phase index, $4 - Task, $5 - Work directory,
+#   $6 - Workflow ID, $7 - Upstream PID, $8 - Stream directory, $9 - Consumer PID
+# Returns:
+#   0 if the prompt was delivered, 1 if the consumer was aborted
+_phase_stream_feed() {
+    local profile="$1"
+    local workflow="$2"
+    local phase_idx="$3"
+    local task="$4"
+    local work_dir="$5"
+    local workflow_id="$6"
+    local upstream_pid="$7"
+    local stream_dir="$8"
+    local consumer_pid="$9"
+
+    local prev_idx=$((phase_idx - 1))
+    local fifo="$stream_dir/phase${phase_idx}.fifo"
+    local sum_file="$stream_dir/phase${phase_idx}.cksum"
+    local abort_reason=""
+
+    local ai role
+    ai=$(get_phase_ai "$profile" "$workflow" "$phase_idx")
+    role=$(get_phase_role "$profile" "$workflow" "$phase_idx")
+
+    local prev_phase_info
+    prev_phase_info=$(get_phase_info "$profile" "$workflow" "$prev_idx")
+
+    # Opening the FIFO lets the consumer start its AI wrapper now
+    exec 3>"$fifo"
+    printf '%s\n\nRole: %s\nAI: %s\n\nInput from previous phase:\n' "$task" "$role" "$ai" >&3 2>/dev/null || true
+
+    if [ "${prev_phase_info#*|}" = "true" ]; then
+        # Parallel upstream: task outputs are complete only when the whole phase is
+        tail --pid="$upstream_pid" -s "$PHASE_STREAM_POLL" -f /dev/null 2>/dev/null || true
+
+        local input_from parallel_count i prev_ai prev_output_file first=true
+        input_from=$(get_phase_input_from "$profile" "$workflow" "$phase_idx")
+        parallel_count=$(get_parallel_count "$profile" "$workflow" "$prev_idx")
+        for ((i = 0; i < parallel_count; i++)); do
+            prev_ai=$(get_parallel_ai "$profile" "$workflow" "$prev_idx" "$i")
+            prev_output_file="$work_dir/${prev_ai}_task${i}.md"
+            if [ -f "$prev_output_file" ] && [[ "$input_from" == *"$prev_ai"* ]]; then
+                $first || printf '\n\n' >&3 2>/dev/null || true
+                first=false
+                { printf -- '--- %s output ---\n' "$prev_ai"; cat "$prev_output_file"; } >&3 2>/dev/null || true
+            fi
+        done
+        if $first; then
+            abort_reason="no upstream output"
+        fi
+    else
+        # Sequential upstream: forward its output while it is being written
+        local prev_ai prev_output_file
+        prev_ai=$(get_phase_ai "$profile" "$workflow" "$prev_idx")
+        prev_output_file="$work_dir/${prev_ai}_phase${prev_idx}.md"
+
+        printf -- '--- Previous phase output ---\n' >&3 2>/dev/null || true
+        rm -f "$sum_file"
+        tail -c +1 -F --pid="$upstream_pid" -s "$PHASE_STREAM_POLL" "$prev_output_file" 2>/dev/null | \
+            tee >(cksum > "$sum_file.tmp" && mv -f "$sum_file.tmp" "$sum_file") >&3 2>/dev/null || true
+
+        # The checksum is computed by tee's output substitution; wait for it
+        local tries=0
+        while [ ! -f "$sum_file" ] && [ $tries -lt 100 ]; do
+            sleep 0.05
+            tries=$((tries + 1))
+        done
+
+        if [ ! -f "$prev_output_file" ]; then
+            abort_reason="no upstream output"
+        elif [ "$(cksum < "$prev_output_file")" != "$(cat "$sum_file" 2>/dev/null)" ]; then
+            abort_reason="upstream output was rewritten while streaming"
+        fi
+    fi
+
+    local upstream_status=""
+    read -r upstream_status < "$stream_dir/phase${prev_idx}.status" 2>/dev/null || true
+    if [ "$upstream_status" != "0" ]; then
+        abort_reason="upstream phase failed"
+    fi
+
+    # Dependencies are known now: a valid cached result beats a new AI call
+    if [ -z "$abort_reason" ] && command -v check_phase_cache_valid >/dev/null 2>&1; then
+        local dependency_hashes
+        _phase_stream_dependency_hashes dependency_hashes "$workflow_id" "$phase_idx"
+        if check_phase_cache_valid "$workflow_id" "$phase_idx" "$dependency_hashes" 2>/dev/null; then
+            abort_reason="phase is cached"
+        fi
+    fi
+
+    if [ -n "$abort_reason" ]; then
+        echo "$abort_reason" > "$stream_dir/phase${phase_idx}.abort"
+        kill -TERM "$consumer_pid" 2>/dev/null || true
+        exec 3>&-
+        return 1
+    fi
+
+    printf '\n\nPlease synthesize the above inputs according to your role.\n' >&3 2>/dev/null || true
+    exec 3>&-
+    return 0
+}
+
+# Execute a phase as a streaming consumer of the running previous phase
+# Falls back to execute_phase when the streamed run is aborted or fails
+# Arguments:
+#   $1 - Profile, $2 - Workflow, $3 - Phase index, $4 - Task, $5 - Work directory,
+#   $6 - Workflow ID, $7 - Upstream PID, $8 - Stream directory
+# Returns:
+#   Exit code of the phase
+_phase_stream_run_consumer() {
+    local profile="$1"
+    local workflow="$2"
+    local phase_idx="$3"
+    local task="$4"
+    local work_dir="$5"
+    local workflow_id="$6"
+    local upstream_pid="$7"
+    local stream_dir="$8"
+
+    local prev_idx=$((phase_idx - 1))
+    local fifo="$stream_dir/phase${phase_idx}.fifo"
+
+    local ai role timeout upstream_timeout=0 prev_phase_info task_timeout i
+    ai=$(get_phase_ai "$profile" "$workflow" "$phase_idx")
+    role=$(get_phase_role "$profile" "$workflow" "$phase_idx")
+    timeout=$(validate_timeout "$(get_phase_timeout "$profile" "$workflow" "$phase_idx")" "$ai" 300)
+    prev_phase_info=$(get_phase_info "$profile" "$workflow" "$prev_idx")
+    if [ "${prev_phase_info#*|}" = "true" ]; then
+        for ((i = 0; i < $(get_parallel_count "$profile" "$workflow" "$prev_idx"); i++)); do
+            task_timeout=$(validate_timeout "$(get_parallel_timeout "$profile" "$workflow" "$prev_idx" "$i")" "$ai" 300)
+            [ "$task_timeout" -le "$upstream_timeout" ] || upstream_timeout=$task_timeout
+        done
+    else
+        upstream_timeout=$(validate_timeout "$(get_phase_timeout "$profile" "$workflow" "$prev_idx")" "$ai" 300)
+    fi
+
+    local output_file="$work_dir/${ai}_phase${phase_idx}.md"
+    local wrapper_script="$PROJECT_ROOT/bin/${ai}-wrapper.sh"
+    local consumer_rc=0 streamed=false slot_file="" owner_pid=$BASHPID
+
+    rm -f "$fifo" "$stream_dir/phase${phase_idx}.abort"
+    # Rate limit backoff as in call_ai, then an AI slot (as in call_ai_with_slot) if the limiter is loaded
+    if check_ai_with_details "$ai" >/dev/null 2>&1 && wait_for_api_rate_limit && \
+        { ! declare -F acquire_ai_slot >/dev/null || slot_file=$(acquire_ai_slot "$ai" 60 "$owner_pid"); } && \
+        mkfifo -m 600 "$fifo" 2>/dev/null; then
+        log_info "[$ai] Streaming input from phase $((prev_idx + 1)) (role: $role, timeout: ${timeout}s after upstream)"
+        log_api_call "$ai" "call_ai_stream"
+
+        # The consumer waits for its input, so its timeout includes the upstream's
+        if [ -f "$wrapper_script" ]; then
+            WRAPPER_NON_INTERACTIVE="${WRAPPER_NON_INTERACTIVE:-1}" WRAPPER_SKIP_TIMEOUT=1 \
+                timeout "$((timeout + upstream_timeout))" "$wrapper_script" --stdin < "$fifo" > "$output_file" 2>&1 &
+        else
+            timeout "$((timeout + upstream_timeout))" "$ai" < "$fifo" > "$output_file" 2>&1 &
+        fi
+        local consumer_pid=$!
+
+        # A consumer that exits early must not take the feeder down with SIGPIPE
+        ( trap '' PIPE
+          _phase_stream_feed "$profile" "$workflow" "$phase_idx" "$task" "$work_dir" "$workflow_id" \
+              "$upstream_pid" "$stream_dir" "$consumer_pid" ) && streamed=true
+        wait "$consumer_pid" || consumer_rc=$?
+        rm -f "$fifo"
+        [ -z "$slot_file" ] || release_ai_slot "$slot_file" || true
+    else
+        [ -z "$slot_file" ] || release_ai_slot "$slot_file" || true
+        # Not streamable after all: wait for the upstream phase like the sequential path
+        tail --pid="$upstream_pid" -s "$PHASE_STREAM_POLL" -f /dev/null 2>/dev/null || true
+    fi
+
+    local upstream_status=""
+    read -r upstream_status < "$stream_dir/phase${prev_idx}.status" 2>/dev/null || true
+    if [ "$upstream_status" != "0" ]; then
+        return 1
+    fi
+
+    if $streamed && [ $consumer_rc -eq 0 ]; then
+        log_success "[$ai] Streamed phase $((phase_idx + 1)) complete"
+        if command -v save_phase_metadata >/dev/null 2>&1; then
+            local dependency_hashes
+            _phase_stream_dependency_hashes dependency_hashes "$workflow_id" "$phase_idx"
+            save_phase_metadata "$workflow_id" "$phase_idx" "$ai" "$role" "$output_file" "$dependency_hashes" 2>/dev/null || {
+                log_warning "Failed to save phase metadata (non-critical)"
+            }
+        fi
+        return 0
+    fi
+
+    if [ -f "$stream_dir/phase${phase_idx}.abort" ]; then
+        log_info "[$ai] Streamed run of phase $((phase_idx + 1)) aborted ($(cat "$stream_dir/phase${phase_idx}.abort")), running it normally"
+    elif $streamed; then
+        log_warning "[$ai] Streamed run of phase $((phase_idx + 1)) failed (exit_code=$consumer_rc), running it normally"
+    fi
+    execute_phase "$profile" "$workflow" "$phase_idx" "$task" "$work_dir" "$workflow_id"
+}
+
+# Execute all phases of a workflow, overlapping each streamable phase with its predecessor
+# Arguments:
+#   $1 - Profile, $2 - Workflow, $3 - Task, $4 - Work directory, $5 - Workflow ID, $6 - Phase count
+# Returns:
+#   0 if all phases succeeded, 1 on the first failed phase
+phase_stream_workflow() {
+    local profile="$1"
+    local workflow="$2"
+    local task="$3"
+    local work_dir="$4"
+    local workflow_id="$5"
+    local phase_count="$6"
+
+    local stream_dir="$work_dir/.stream"
+    local running_pid="" running_idx=-1 rc=0 phase_idx
+
+    mkdir -p "$stream_dir" || return 1
+
+    for ((phase_idx = 0; phase_idx < phase_count; phase_idx++)); do
+        if [ -n "$running_pid" ] && phase_stream_eligible "$profile" "$workflow" "$phase_idx"; then
+            _phase_stream_spawn "$stream_dir" "$phase_idx" _phase_stream_run_consumer \
+                "$profile" "$workflow" "$phase_idx" "$task" "$work_dir" "$workflow_id" "$running_pid" "$stream_dir"
+
+            rc=0
+            wait "$running_pid" || rc=$?
+            if [ $rc -ne 0 ]; then
+                # The streamed consumer notices the failure and exits without calling its AI
+                wait "$PHASE_STREAM_PID" 2>/dev/null || true
+                running_pid=""
+                break
+            fi
+        else
+            if [ -n "$running_pid" ]; then
+                rc=0
+                wait "$running_pid" || rc=$?
+                running_pid=""
+                [ $rc -eq 0 ] || break
+            fi
+            _phase_stream_spawn "$stream_dir" "$phase_idx" execute_phase \
+                "$profile" "$workflow" "$phase_idx" "$task" "$work_dir" "$workflow_id"
+        fi
+        running_pid="$PHASE_STREAM_PID"
+        running_idx=$phase_idx
+    done
+
+    if [ -n "$running_pid" ]; then
+        rc=0
+        wait "$running_pid" || rc=$?
+    fi
+
+    rm -rf "$stream_dir"
+    if [ $rc -ne 0 ]; then
+        log_error "Phase $((running_idx + 1)) failed"
+        return 1
+    fi
+    return 0
+}
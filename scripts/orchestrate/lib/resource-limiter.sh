@@ -2,18 +2,19 @@
 # リソース衝突回避（API rate limit）
 # Purpose: AsyncThink Phase 2, Week 15-16
 # Responsibilities:
-#   - API同時実行数制限
-#   - グローバルカウンタベースのシンプルな実装
-#   - セマフォライクな動作
+#   - API同時実行数制限（全体 + AIごとの上限）
+#   - イベント駆動のスロット割り当て（ai-slot-daemon.py、到着順FIFO）
+#   - 終了したプロセスが保持していたスロットの自動回収
 #
 # Dependencies:
 #   - lib/multi-ai-core.sh (logging)
+#   - lib/ai-slot-daemon.py (python3がなければポーリング実装にフォールバック)
 #
 # Usage:
 #   source scripts/orchestrate/lib/resource-limiter.sh
-#   acquire_ai_slot "qwen"
+#   slot_file=$(acquire_ai_slot "qwen")
 #   # AI実行...
-#   release_ai_slot "qwen"
+#   release_ai_slot "$slot_file"
 
 set -euo pipefail
 
@@ -27,10 +28,16 @@ CURRENT_CONCURRENT_AI="${CURRENT_CONCURRENT_AI:-0}"
 # 最大同時実行AI数（デフォルト: 2）
 MAX_CONCURRENT_AI="${MAX_CONCURRENT_AI:-2}"
 
-# AI実行状態ファイル（ロックファイルベース実装）
+# AIごとの同時実行数上限（例: "claude=1,gemini=1"、未指定のAIは全体上限のみ）
+AI_SLOT_LIMITS="${AI_SLOT_LIMITS:-}"
+
+# AI実行状態ファイル（スロットごとに1ファイル、デーモンの状態は .slotd/ 以下）
 AI_SLOTS_DIR="${AI_SLOTS_DIR:-/tmp/multi-ai-slots}"
 mkdir -p "$AI_SLOTS_DIR" 2>/dev/null || true
 
+# スロット管理デーモン（AI_SLOTS_DIRごとに1つ、最初の acquire で起動）
+AI_SLOT_DAEMON="${AI_SLOT_DAEMON:-$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/ai-slot-daemon.py}"
+
 # クリーンアップトラップ
 trap 'cleanup_ai_slots' EXIT INT TERM
 
@@ -38,47 +45,175 @@ trap 'cleanup_ai_slots' EXIT INT TERM
 # コア関数
 # ============================================================================
 
+# AIごとの上限を取得（AI_SLOT_LIMITS に指定がなければ空）
+# Args:
+#   $1 - ai_name: AI名
+_ai_slot_limit() {
+    local ai_name=$1 item
+    local -a items
+    IFS=',' read -r -a items <<< "$AI_SLOT_LIMITS"
+    for item in "${items[@]}"; do
+        if [[ "${item%%=*}" == "$ai_name" ]]; then
+            echo "${item#*=}"
+            return 0
+        fi
+    done
+}
+
+# 使用中のスロット数を数える（fork なし）
+# Args:
+#   $1 - 結果を格納する変数名
+_ai_slot_count() {
+    local -n _count_ref=$1
+    local slot
+    _count_ref=0
+    for slot in "$AI_SLOTS_DIR"/*; do
+        [[ -f "$slot" ]] && ((++_count_ref))
+    done
+    return 0
+}
+
+# スロット管理デーモンが制御FIFOを開いて動いているか（fork なし）
+# Returns:
+#   0: 動作中
+#   1: 停止中（制御FIFOか daemon.pid がない、またはプロセスが終了している）
+_ai_slotd_alive() {
+    local state_dir="$AI_SLOTS_DIR/.slotd" pid=""
+    [[ -p "$state_dir/ctl" && -r "$state_dir/daemon.pid" ]] &&
+        read -r pid < "$state_dir/daemon.pid" && kill -0 "$pid" 2>/dev/null
+}
+
+# スロット管理デーモンが動いていることを確認し、なければ起動する
+# Returns:
+#   0: デーモン利用可能
+#   1: 利用不可（python3 なし等 → ポーリング実装を使う）
+_ai_slotd_ensure() {
+    local state_dir="$AI_SLOTS_DIR/.slotd"
+
+    _ai_slotd_alive && return 0
+
+    [[ -f "$AI_SLOT_DAEMON" ]] && command -v python3 >/dev/null 2>&1 || return 1
+
+    # 準備ができてから戻る（既に別プロセスが起動していれば何もしない）
+    python3 "$AI_SLOT_DAEMON" --dir "$AI_SLOTS_DIR" --max "$MAX_CONCURRENT_AI" \
+        --limits "$AI_SLOT_LIMITS" --owner "$$" </dev/null >/dev/null 2>&1 || return 1
+    [[ -p "$state_dir/ctl" ]]
+}
+
 # AI実行スロット取得
+# 空きがなければ応答FIFOの read でブロックし、解放されると即座に起こされる。
+# 割り当ては到着順（AIごとの上限に達したAIの待機者だけは後回し）。
 # Args:
 #   $1 - ai_name: AI名（qwen, droid, claude等）
+#   $2 - max_wait_seconds: タイムアウト秒（デフォルト: 60）
+#   $3 - owner_pid: スロットを保持するプロセス（デフォルト: $$、終了すると自動解放）
 # Returns:
-#   0: スロット取得成功
+#   0: スロット取得成功（スロットファイルパスを標準出力に返す）
 #   1: スロット取得失敗（タイムアウト）
 acquire_ai_slot() {
     local ai_name=${1:-"unknown"}
-    local max_wait_seconds=${2:-60}  # デフォルト60秒タイムアウト
-    local waited=0
-
-    # ロックファイル作成
-    local slot_file="$AI_SLOTS_DIR/${ai_name}-$$-$(date +%s%N)"
+    local max_wait_seconds=${2:-60}
+    local owner_pid=${3:-$$}
 
     log_info "🔒 [$ai_name] Acquiring AI slot (max: $MAX_CONCURRENT_AI)..."
 
+    local attempt
+    for attempt in 1 2; do
+        if ! _ai_slotd_ensure; then
+            _acquire_ai_slot_polling "$ai_name" "$max_wait_seconds" "$owner_pid"
+            return
+        fi
+
+        local state_dir="$AI_SLOTS_DIR/.slotd"
+        local request_id="${BASHPID}x${RANDOM}${RANDOM}"
+        local reply="$state_dir/reply-$request_id"
+        local reply_fd status="" slot_file=""
+
+        mkfifo -m 600 "$reply" 2>/dev/null || {
+            log_error "[$ai_name] Failed to create reply FIFO: $reply"
+            return 1
+        }
+        # 読み書き両用で開く（デーモンが書くまで open でブロックしないように）
+        exec {reply_fd}<>"$reply"
+        printf 'acquire %s %s %s %s\n' "$request_id" "$ai_name" "$owner_pid" "$reply" 3<>"$state_dir/ctl" >&3
+
+        read -r -t "$max_wait_seconds" -u "$reply_fd" status slot_file || true
+        exec {reply_fd}<&-
+
+        if [[ "$status" == "ok" ]]; then
+            _ai_slot_count CURRENT_CONCURRENT_AI
+            log_info "✅ [$ai_name] AI slot acquired ($CURRENT_CONCURRENT_AI/$MAX_CONCURRENT_AI)"
+            echo "$slot_file"  # スロットファイルパスを返す
+            return 0
+        fi
+
+        rm -f "$reply" 2>/dev/null || true
+        # retry: デーモンが終了するところだった → 起動し直して取り直す
+        [[ "$status" == "retry" ]] && continue
+
+        printf 'cancel %s\n' "$request_id" 3<>"$state_dir/ctl" >&3 2>/dev/null || true
+        break
+    done
+
+    log_error "❌ [$ai_name] AI slot acquisition timed out after ${max_wait_seconds}s"
+    return 1
+}
+
+# AI実行スロット取得（python3 がない環境向けのポーリング実装）
+# 終了したプロセスのスロットファイルは待機中に削除する。
+# Args:
+#   $1 - ai_name: AI名
+#   $2 - max_wait_seconds: タイムアウト秒
+#   $3 - owner_pid: スロットを保持するプロセス
+# Returns:
+#   0: スロット取得成功（スロットファイルパスを標準出力に返す）
+#   1: スロット取得失敗（タイムアウト）
+_acquire_ai_slot_polling() {
+    local ai_name=$1
+    local max_wait_seconds=$2
+    local owner_pid=$3
+    local ai_limit
+    ai_limit=$(_ai_slot_limit "$ai_name")
+    local waited=0
+    local slot_file="$AI_SLOTS_DIR/${ai_name}-${owner_pid}-${BASHPID}${RANDOM}"
+    local slot slot_name slot_owner current_slots ai_slots
+
     while true; do
-        # 現在のスロット数をカウント
-        local current_slots=$(ls -1 "$AI_SLOTS_DIR" 2>/dev/null | wc -l)
+        # 現在のスロット数をカウント（終了したプロセスのスロットは回収）
+        current_slots=0
+        ai_slots=0
+        for slot in "$AI_SLOTS_DIR"/*; do
+            [[ -f "$slot" ]] || continue
+            slot_name=${slot##*/}
+            slot_owner=${slot_name#*-}
+            slot_owner=${slot_owner%%-*}
+            if [[ "$slot_owner" =~ ^[0-9]+$ ]] && ! kill -0 "$slot_owner" 2>/dev/null; then
+                rm -f "$slot" 2>/dev/null || true
+                continue
+            fi
+            ((++current_slots))
+            [[ "${slot_name%%-*}" == "$ai_name" ]] && ((++ai_slots))
+        done
 
-        if (( current_slots < MAX_CONCURRENT_AI )); then
+        if (( current_slots < MAX_CONCURRENT_AI )) && { [[ -z "$ai_limit" ]] || (( ai_slots < ai_limit )); }; then
             # スロット取得
-            touch "$slot_file" 2>/dev/null || {
+            echo "$owner_pid" > "$slot_file" 2>/dev/null || {
                 log_error "[$ai_name] Failed to create slot file: $slot_file"
                 return 1
             }
 
             # 再カウント（競合状態チェック）
-            current_slots=$(ls -1 "$AI_SLOTS_DIR" 2>/dev/null | wc -l)
+            _ai_slot_count current_slots
 
             if (( current_slots <= MAX_CONCURRENT_AI )); then
-                # 成功
                 CURRENT_CONCURRENT_AI=$current_slots
                 log_info "✅ [$ai_name] AI slot acquired ($current_slots/$MAX_CONCURRENT_AI)"
-                echo "$slot_file"  # スロットファイルパスを返す
+                echo "$slot_file"
                 return 0
-            else
-                # 競合状態で超過 → ロールバック
-                rm -f "$slot_file" 2>/dev/null || true
-                log_warning "⚠️ [$ai_name] Slot race condition, retrying..."
             fi
+            # 競合状態で超過 → ロールバック
+            rm -f "$slot_file" 2>/dev/null || true
+            log_warning "⚠️ [$ai_name] Slot race condition, retrying..."
         fi
 
         # タイムアウトチェック
@@ -87,10 +222,9 @@ acquire_ai_slot() {
             return 1
         fi
 
-        # 待機
         log_info "⏳ [$ai_name] Waiting for AI slot (current: $current_slots/$MAX_CONCURRENT_AI)..."
         sleep 1
-        ((waited++))
+        ((++waited))
     done
 }
 
@@ -102,29 +236,45 @@ acquire_ai_slot() {
 #   1: スロット解放失敗
 release_ai_slot() {
     local slot_file=$1
-    local ai_name=$(basename "$slot_file" | cut -d'-' -f1)
+    local slot_name=${slot_file##*/}
+    local ai_name=${slot_name%%-*}
+    local ctl="$AI_SLOTS_DIR/.slotd/ctl"
 
-    if [[ -f "$slot_file" ]]; then
+    if [[ ! -f "$slot_file" ]]; then
+        log_warning "⚠️ [$ai_name] Slot file not found: $slot_file"
+        return 1
+    fi
+
+    if _ai_slotd_alive; then
+        # デーモンがファイルを削除し、次の待機者にすぐ割り当てる
+        printf 'release %s\n' "$slot_file" 3<>"$ctl" >&3 2>/dev/null || true
+    fi
+    # デーモンがいない・書き込み後に終了した場合、FIFOに残ったメッセージは
+    # 誰にも読まれないので自分で削除する（スロットファイルは取得ごとに一意）
+    if ! _ai_slotd_alive; then
         rm -f "$slot_file" 2>/dev/null || {
             log_error "[$ai_name] Failed to remove slot file: $slot_file"
             return 1
         }
-
-        local current_slots=$(ls -1 "$AI_SLOTS_DIR" 2>/dev/null | wc -l)
-        CURRENT_CONCURRENT_AI=$current_slots
-
-        log_info "🔓 [$ai_name] AI slot released ($current_slots/$MAX_CONCURRENT_AI)"
-        return 0
-    else
-        log_warning "⚠️ [$ai_name] Slot file not found: $slot_file"
-        return 1
     fi
+
+    _ai_slot_count CURRENT_CONCURRENT_AI
+    log_info "🔓 [$ai_name] AI slot released ($CURRENT_CONCURRENT_AI/$MAX_CONCURRENT_AI)"
+    return 0
 }
 
-# すべてのAIスロットをクリーンアップ
+# このプロセスのAIスロットをクリーンアップ
+# AI_SLOTS_DIR は他のプロセスと共有しているため、削除するのは自分のスロットだけ。
+# デーモンは起動したプロセスからの shutdown だけを受け付ける（待機者には retry を返す）。
 cleanup_ai_slots() {
+    local slot
     log_info "🧹 Cleaning up AI slots..."
-    rm -rf "$AI_SLOTS_DIR" 2>/dev/null || true
+    if [[ -p "$AI_SLOTS_DIR/.slotd/ctl" ]]; then
+        printf 'shutdown %s\n' "$$" 3<>"$AI_SLOTS_DIR/.slotd/ctl" >&3 2>/dev/null || true
+    fi
+    for slot in "$AI_SLOTS_DIR"/*-"$$"-*; do
+        [[ -f "$slot" ]] && rm -f "$slot" 2>/dev/null
+    done
     CURRENT_CONCURRENT_AI=0
     log_info "✓ AI slots cleaned up"
 }
@@ -162,25 +312,22 @@ call_ai_with_slot() {
     local timeout=$3
     local output_file=${4:-""}
 
-    # スロット取得
+    # スロット取得（保持者はこのシェル。異常終了してもデーモンが回収する）
+    local owner_pid=$BASHPID
     local slot_file
-    slot_file=$(acquire_ai_slot "$ai_name") || {
+    slot_file=$(acquire_ai_slot "$ai_name" 60 "$owner_pid") || {
         log_error "[$ai_name] Failed to acquire AI slot, aborting..."
         return 1
     }
 
-    # AI実行（スロット解放をtrapで保証）
-    trap "release_ai_slot '$slot_file'" RETURN
-
+    local exit_code=0
     if [[ -n "$output_file" ]]; then
-        call_ai "$ai_name" "$prompt" "$timeout" > "$output_file" 2>&1
-        local exit_code=$?
+        call_ai "$ai_name" "$prompt" "$timeout" > "$output_file" 2>&1 || exit_code=$?
     else
-        call_ai "$ai_name" "$prompt" "$timeout"
-        local exit_code=$?
+        call_ai "$ai_name" "$prompt" "$timeout" || exit_code=$?
     fi
 
-    # スロット解放（trapで自動実行されるが、明示的にも呼ぶ）
+    # スロット解放
     release_ai_slot "$slot_file"
 
     return $exit_code
@@ -190,7 +337,12 @@ call_ai_with_slot() {
 # エクスポート
 # ============================================================================
 
+export -f _ai_slot_limit
+export -f _ai_slot_count
+export -f _ai_slotd_alive
+export -f _ai_slotd_ensure
 export -f acquire_ai_slot
+export -f _acquire_ai_slot_polling
 export -f release_ai_slot
 export -f cleanup_ai_slots
 export -f show_ai_slot_status
@@ -199,6 +351,8 @@ export -f call_ai_with_slot
 # グローバル変数エクスポート
 export CURRENT_CONCURRENT_AI
 export MAX_CONCURRENT_AI
+export AI_SLOT_LIMITS
 export AI_SLOTS_DIR
+export AI_SLOT_DAEMON
 
 log_info "✓ Resource Limiter library loaded (max concurrent: $MAX_CONCURRENT_AI)"
@@ -64,7 +64,7 @@ fi
 source "$SCRIPT_DIR/lib/join-policy.sh" 2>/dev/null || log_warning "JOIN Policy library not found"
 source "$SCRIPT_DIR/lib/resource-limiter.sh" 2>/dev/null || log_warning "Resource Limiter library not found"
 
-# JOIN待機ポリシー設定（eager | lazy | hybrid）
+# JOIN待機ポリシー設定（eager | lazy | hybrid | dag）
 JOIN_POLICY="${JOIN_POLICY:-hybrid}"
 log_info "✓ JOIN Policy: $JOIN_POLICY"
 
@@ -129,28 +129,31 @@ multi-ai-simple-fork-join() {
     log_info "🔀 Starting Fork-Join execution (simulated)..."
     echo ""
 
-    # FORK-1: Qwen高速プロトタイプ（並列実行）
-    log_phase_start "FORK-1: Qwen - Fast Prototype" "qwen"
-    local qwen_start=$(date +%s)
-    local qwen_output=""
-    (
-        qwen_output=$(call_ai "qwen" "Task: $task\n\nRole: 高速プロトタイプ実装\nTimeout: 300秒" 300 2>&1)
-        echo "$qwen_output" > "$temp_file_qwen"
-    ) &
-    local qwen_pid=$!
-
-    # FORK-2: Droidエンタープライズ実装（並列実行）
-    log_phase_start "FORK-2: Droid - Enterprise Implementation" "droid"
-    local droid_start=$(date +%s)
-    local droid_output=""
-    (
-        droid_output=$(call_ai "droid" "Task: $task\n\nRole: エンタープライズ品質実装\nTimeout: 900秒" 900 2>&1)
-        echo "$droid_output" > "$temp_file_droid"
-    ) &
-    local droid_pid=$!
+    # DAG Policyではスケジューラが依存関係どおりにFORKを起動する
+    if [[ "$JOIN_POLICY" != "dag" ]]; then
+        # FORK-1: Qwen高速プロトタイプ（並列実行）
+        log_phase_start "FORK-1: Qwen - Fast Prototype" "qwen"
+        local qwen_start=$(date +%s)
+        local qwen_output=""
+        (
+            qwen_output=$(call_ai "qwen" "Task: $task\n\nRole: 高速プロトタイプ実装\nTimeout: 300秒" 300 2>&1)
+            echo "$qwen_output" > "$temp_file_qwen"
+        ) &
+        local qwen_pid=$!
 
-    log_info "⏳ Parallel execution started (PIDs: qwen=$qwen_pid, droid=$droid_pid)"
-    echo ""
+        # FORK-2: Droidエンタープライズ実装（並列実行）
+        log_phase_start "FORK-2: Droid - Enterprise Implementation" "droid"
+        local droid_start=$(date +%s)
+        local droid_output=""
+        (
+            droid_output=$(call_ai "droid" "Task: $task\n\nRole: エンタープライズ品質実装\nTimeout: 900秒" 900 2>&1)
+            echo "$droid_output" > "$temp_file_droid"
+        ) &
+        local droid_pid=$!
+
+        log_info "⏳ Parallel execution started (PIDs: qwen=$qwen_pid, droid=$droid_pid)"
+        echo ""
+    fi
 
     # JOIN待機ポリシー選択（Phase 2, Week 15-16）
     case "$JOIN_POLICY" in
@@ -166,6 +169,11 @@ multi-ai-simple-fork-join() {
             join_policy_hybrid $qwen_pid $droid_pid "$temp_file_qwen" "$temp_file_droid" $qwen_start $droid_start 300
             local join_exit=$?
             ;;
+        dag)
+            local join_exit=0
+            join_policy_dag "$PROJECT_ROOT/config/multi-ai-profiles.yaml" "simple-fork-join" \
+                _simple_fork_join_run_node || join_exit=$?
+            ;;
         *)
             log_error "Unknown JOIN_POLICY: $JOIN_POLICY"
             return 1
@@ -197,6 +205,29 @@ multi-ai-simple-fork-join() {
     fi
 }
 
+# Simple Fork-Join のFORK実行（DAG Policy用ランナー）
+# multi-ai-simple-fork-join 内から呼ばれ、task と一時ファイル変数を参照する
+# Args: $1 - node_id, $2 - worker, $3 - timeout
+_simple_fork_join_run_node() {
+    local node_id=$1
+    local worker=$2
+    local timeout=${3:-300}
+
+    case "$worker" in
+        qwen)
+            log_phase_start "${node_id^^}: Qwen - Fast Prototype" "qwen"
+            call_ai "qwen" "Task: $task\n\nRole: 高速プロトタイプ実装\nTimeout: ${timeout}秒" "$timeout" > "$temp_file_qwen" 2>&1
+            ;;
+        droid)
+            log_phase_start "${node_id^^}: Droid - Enterprise Implementation" "droid"
+            call_ai "droid" "Task: $task\n\nRole: エンタープライズ品質実装\nTimeout: ${timeout}秒" "$timeout" > "$temp_file_droid" 2>&1
+            ;;
+        *)
+            log_warning "No runner for worker '$worker' ($node_id), skipping"
+            ;;
+    esac
+}
+
 multi-ai-full-orchestrate() {
     local task="$*"
 
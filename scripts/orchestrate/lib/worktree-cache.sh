@@ -5,10 +5,37 @@
 
 set -euo pipefail
 
+# EPOCHSECONDS・BASHPID・printf '%(...)T' を使用するため Bash 5.0 以上が必要
+if (( BASH_VERSINFO[0] < 5 )); then
+    echo "ERROR: worktree-cache.sh には Bash 5.0 以上が必要です（現在: $BASH_VERSION）" >&2
+    return 1 2>/dev/null || exit 1
+fi
+
 # デフォルト設定
 WORKTREE_CACHE_DIR="${WORKTREE_CACHE_DIR:-.cache/worktrees}"
 WORKTREE_CACHE_TTL="${WORKTREE_CACHE_TTL:-3600}"  # 1時間
 WORKTREE_CACHE_MAX_SIZE="${WORKTREE_CACHE_MAX_SIZE:-524288000}"  # 500MB
+WORKTREE_CACHE_LRU_COMPACT_LINES="${WORKTREE_CACHE_LRU_COMPACT_LINES:-256}"  # ログ圧縮の閾値（行数）
+
+# LRUインデックス（追記専用アクセスログ）
+#   cache-lru.log  : "T <ai> <size_bytes> <epoch>"（アクセス）/ "E <ai>"（削除）を追記
+#   cache-lru.gen  : ログの世代（圧縮・再初期化のたびに更新）
+#   cache-lru.lock : 追記は共有ロック、圧縮・LRU削除は排他ロック（flock）
+#   cache-index.json: 圧縮・TTLクリーンアップ時に書き出すスナップショット
+# プロセス内ではログを開いたままにし、増えた行だけを読んで
+# 双方向リスト（HEAD=最古, TAIL=最新）と合計サイズに反映する
+# 再sourceしても状態（開いているfd）を失わないよう初回のみ初期化
+# （_wt_lru_* は内部関数のためexportしない。子プロセスはこのファイルをsourceする）
+_wt_lru_declare_state() {
+    if [[ -n "${_WT_LRU_PID+x}" ]]; then
+        return 0
+    fi
+    declare -gA _WT_LRU_SIZE=() _WT_LRU_TIME=() _WT_LRU_PREV=() _WT_LRU_NEXT=()
+    declare -g _WT_LRU_HEAD="" _WT_LRU_TAIL="" _WT_LRU_TOTAL=0 _WT_LRU_LINES=0
+    declare -g _WT_LRU_FD="" _WT_LRU_GEN="" _WT_LRU_PID="" _WT_LRU_DIR=""
+    declare -ga WORKTREE_CACHE_EVICTED=()
+}
+_wt_lru_declare_state
 
 # AI別キャッシュディレクトリの取得
 get_cache_dir() {
@@ -50,6 +77,11 @@ EOF
             "{\"cache_dir\":\"$cache_dir\",\"max_size\":$WORKTREE_CACHE_MAX_SIZE}" \
             "Cache initialized" "[]" "worktree-cache"
     fi
+
+    # LRUアクセスログ初期化
+    if [[ ! -f "$cache_dir/cache-lru.gen" ]]; then
+        _wt_lru_init_log
+    fi
 }
 
 # キャッシュ保存（base_ref対応）
@@ -236,96 +268,257 @@ update_cache_metadata() {
     update_lru_index "$ai_name" "$size_bytes"
 }
 
-# LRUインデックス更新
-update_lru_index() {
-    local ai_name="$1"
-    local size_bytes="$2"
-    local cache_index="$WORKTREE_CACHE_DIR/cache-index.json"
+# LRUロック付き実行（$1: -s=共有 / -x=排他）
+# flockがない環境ではロックなしで実行
+_wt_lru_locked() {
+    local mode="$1"
+    shift
 
-    if [[ ! -f "$cache_index" ]]; then
+    if ! command -v flock &>/dev/null; then
+        "$@"
         return
     fi
 
-    if ! command -v jq &>/dev/null; then
-        return
-    fi
-
-    # 既存エントリ削除
-    jq --arg ai "$ai_name" 'del(.entries[] | select(.ai == $ai))' \
-        "$cache_index" > "$cache_index.tmp"
+    {
+        flock "$mode" 9 && "$@"
+    } 9>>"$WORKTREE_CACHE_DIR/cache-lru.lock"
+}
 
-    # 新規エントリ追加（先頭に）
-    jq --arg ai "$ai_name" --arg size "$size_bytes" \
-        '.entries = [{ai: $ai, last_accessed: (now | todate), size_bytes: ($size | tonumber)}] + .entries' \
-        "$cache_index.tmp" > "$cache_index"
+# LRU状態リセット（ログのfdも閉じる）
+_wt_lru_reset() {
+    if [[ -n "$_WT_LRU_FD" ]]; then
+        exec {_WT_LRU_FD}<&-
+    fi
+    _WT_LRU_SIZE=() _WT_LRU_TIME=() _WT_LRU_PREV=() _WT_LRU_NEXT=()
+    _WT_LRU_HEAD="" _WT_LRU_TAIL="" _WT_LRU_TOTAL=0 _WT_LRU_LINES=0
+    _WT_LRU_FD="" _WT_LRU_GEN="" _WT_LRU_PID="" _WT_LRU_DIR=""
+}
 
-    rm -f "$cache_index.tmp"
+# ログ1行をリストに反映（O(1)）
+_wt_lru_apply() {
+    local op="$1"
+    local ai_name="$2"
+    local size_bytes="$3"
+    local accessed_at="$4"
+    local prev next
+
+    [[ -n "$ai_name" ]] || return 0
+
+    # 既存エントリをリストから外す
+    if [[ -n "${_WT_LRU_SIZE[$ai_name]+x}" ]]; then
+        _WT_LRU_TOTAL=$(( _WT_LRU_TOTAL - ${_WT_LRU_SIZE[$ai_name]} ))
+        prev="${_WT_LRU_PREV[$ai_name]}"
+        next="${_WT_LRU_NEXT[$ai_name]}"
+        if [[ -n "$prev" ]]; then _WT_LRU_NEXT[$prev]="$next"; else _WT_LRU_HEAD="$next"; fi
+        if [[ -n "$next" ]]; then _WT_LRU_PREV[$next]="$prev"; else _WT_LRU_TAIL="$prev"; fi
+        unset "_WT_LRU_SIZE[$ai_name]" "_WT_LRU_TIME[$ai_name]" \
+            "_WT_LRU_PREV[$ai_name]" "_WT_LRU_NEXT[$ai_name]"
+    fi
 
-    # サイズ制限チェック
-    check_cache_size_limit
+    [[ "$op" == "T" ]] || return 0
+
+    # 末尾（最新）に追加
+    [[ "$size_bytes" =~ ^[0-9]+$ ]] || size_bytes=0
+    [[ "$accessed_at" =~ ^[0-9]+$ ]] || accessed_at=0
+    _WT_LRU_SIZE[$ai_name]=$size_bytes
+    _WT_LRU_TIME[$ai_name]=$accessed_at
+    _WT_LRU_PREV[$ai_name]="$_WT_LRU_TAIL"
+    _WT_LRU_NEXT[$ai_name]=""
+    if [[ -n "$_WT_LRU_TAIL" ]]; then _WT_LRU_NEXT[$_WT_LRU_TAIL]="$ai_name"; else _WT_LRU_HEAD="$ai_name"; fi
+    _WT_LRU_TAIL="$ai_name"
+    _WT_LRU_TOTAL=$(( _WT_LRU_TOTAL + size_bytes ))
 }
 
-# キャッシュサイズ制限チェック
-check_cache_size_limit() {
+# LRUアクセスログ作成（排他ロック内）
+# 旧形式のcache-index.json（先頭が最新）があれば古い順にログへ移行
+_wt_lru_init_log_locked() {
+    local log="$WORKTREE_CACHE_DIR/cache-lru.log"
+    local gen_file="$WORKTREE_CACHE_DIR/cache-lru.gen"
     local cache_index="$WORKTREE_CACHE_DIR/cache-index.json"
 
-    if [[ ! -f "$cache_index" ]]; then
-        return
+    # 他プロセスが作成済み
+    if [[ -f "$gen_file" ]]; then
+        return 0
     fi
 
-    if ! command -v jq &>/dev/null; then
-        return
+    : > "$log.tmp.$BASHPID"
+    if [[ -f "$cache_index" ]] && command -v jq &>/dev/null; then
+        jq -r '.entries | reverse | .[] |
+            "T \(.ai) \(.size_bytes // 0) \(.last_accessed | try fromdateiso8601 catch 0)"' \
+            "$cache_index" > "$log.tmp.$BASHPID" 2>/dev/null || : > "$log.tmp.$BASHPID"
     fi
+    mv -f "$log.tmp.$BASHPID" "$log"
+    printf '%s-%s-%s\n' "$EPOCHSECONDS" "$BASHPID" "$RANDOM" > "$gen_file"
+}
 
-    local max_size=$(jq -r '.max_size_bytes' "$cache_index")
-    local current_size=$(jq -r '[.entries[].size_bytes] | add // 0' "$cache_index")
+_wt_lru_init_log() {
+    [[ -d "$WORKTREE_CACHE_DIR" ]] || return 1
+    _wt_lru_locked -x _wt_lru_init_log_locked
+}
 
-    # 制限超過チェック
-    if [[ $current_size -gt $max_size ]]; then
-        evict_lru_entries
+# ログの新しい行だけを読み込んで状態を更新
+# 世代が変わった（圧縮・再初期化）・別プロセス（サブシェル）の場合は開き直して再生
+# 追記は1行1回のwriteなので、読み込み途中の行は発生しない
+_wt_lru_sync() {
+    local gen_file="$WORKTREE_CACHE_DIR/cache-lru.gen"
+    local log="$WORKTREE_CACHE_DIR/cache-lru.log"
+    local gen="" op ai_name size_bytes accessed_at
+
+    if [[ ! -f "$gen_file" ]]; then
+        _wt_lru_init_log || return 1
+    fi
+    read -r gen < "$gen_file" || true
+
+    if [[ -z "$_WT_LRU_FD" || "$_WT_LRU_GEN" != "$gen" || "$_WT_LRU_PID" != "$BASHPID" || \
+          "$_WT_LRU_DIR" != "$WORKTREE_CACHE_DIR" ]]; then
+        _wt_lru_reset
+        [[ -r "$log" ]] || return 1
+        exec {_WT_LRU_FD}<"$log"
+        _WT_LRU_GEN="$gen"
+        _WT_LRU_PID="$BASHPID"
+        _WT_LRU_DIR="$WORKTREE_CACHE_DIR"
     fi
+
+    while read -r -u "$_WT_LRU_FD" op ai_name size_bytes accessed_at; do
+        _wt_lru_apply "$op" "$ai_name" "${size_bytes:-0}" "${accessed_at:-0}"
+        _WT_LRU_LINES=$((_WT_LRU_LINES + 1))
+    done
+    return 0
 }
 
-# LRU削除
-evict_lru_entries() {
+# ログへ追記（共有ロック内）
+_wt_lru_append_locked() {
+    printf '%s' "$1" >> "$WORKTREE_CACHE_DIR/cache-lru.log"
+}
+
+# cache-index.json書き出し（排他ロック内、先頭が最新、旧形式と同じ構造）
+# 正はアクセスログなので、書き出しは圧縮時などに限る（ext4では置き換えのたびにflushが走る）
+_wt_lru_write_index() {
+    local cache_index="$WORKTREE_CACHE_DIR/cache-index.json"
+    local ai_name="$_WT_LRU_TAIL"
+    local entries="" last_accessed
+
+    while [[ -n "$ai_name" ]]; do
+        TZ=UTC printf -v last_accessed '%(%Y-%m-%dT%H:%M:%SZ)T' "${_WT_LRU_TIME[$ai_name]}"
+        entries+="${entries:+,}"$'\n'"    {\"ai\": \"$ai_name\", \"last_accessed\": \"$last_accessed\", \"size_bytes\": ${_WT_LRU_SIZE[$ai_name]}}"
+        ai_name="${_WT_LRU_PREV[$ai_name]}"
+    done
+
+    printf '{\n  "max_entries": 7,\n  "current_size_bytes": %d,\n  "max_size_bytes": %d,\n  "entries": [%s\n  ]\n}\n' \
+        "$_WT_LRU_TOTAL" "$WORKTREE_CACHE_MAX_SIZE" "$entries" > "$cache_index"
+}
+
+# ログ圧縮（排他ロック内）: 現在のエントリだけを古い順に書き直す
+_wt_lru_compact_locked() {
+    local log="$WORKTREE_CACHE_DIR/cache-lru.log"
+    local ai_name lines=""
+
+    _wt_lru_sync || return 1
+
+    # 他プロセスが圧縮済み
+    if (( _WT_LRU_LINES <= WORKTREE_CACHE_LRU_COMPACT_LINES + ${#_WT_LRU_SIZE[@]} )); then
+        return 0
+    fi
+
+    ai_name="$_WT_LRU_HEAD"
+    while [[ -n "$ai_name" ]]; do
+        lines+="T $ai_name ${_WT_LRU_SIZE[$ai_name]} ${_WT_LRU_TIME[$ai_name]}"$'\n'
+        ai_name="${_WT_LRU_NEXT[$ai_name]}"
+    done
+
+    printf '%s' "$lines" > "$log.tmp.$BASHPID" && mv -f "$log.tmp.$BASHPID" "$log" || return 1
+    printf '%s-%s-%s\n' "$EPOCHSECONDS" "$BASHPID" "$RANDOM" > "$WORKTREE_CACHE_DIR/cache-lru.gen"
+
+    _wt_lru_sync
+    _wt_lru_write_index
+}
+
+# LRUから削除（ログに"E"を追記）
+remove_from_lru_index() {
+    local ai_name="$1"
+
+    _wt_lru_sync || return 0
+    _wt_lru_locked -s _wt_lru_append_locked "E $ai_name"$'\n' || return 0
+    _wt_lru_sync
+}
+
+# LRUインデックス更新（アクセスログに1行追記、O(1)）
+update_lru_index() {
+    local ai_name="$1"
+    local size_bytes="$2"
     local cache_index="$WORKTREE_CACHE_DIR/cache-index.json"
 
     if [[ ! -f "$cache_index" ]]; then
         return
     fi
 
-    if ! command -v jq &>/dev/null; then
-        return
+    _wt_lru_sync || return 0
+    _wt_lru_locked -s _wt_lru_append_locked "T $ai_name ${size_bytes:-0} $EPOCHSECONDS"$'\n' || return 0
+    _wt_lru_sync
+
+    # ログが伸びたら圧縮
+    if (( _WT_LRU_LINES > WORKTREE_CACHE_LRU_COMPACT_LINES + ${#_WT_LRU_SIZE[@]} )); then
+        _wt_lru_locked -x _wt_lru_compact_locked || true
     fi
 
-    local max_size=$(jq -r '.max_size_bytes' "$cache_index")
+    # サイズ制限チェック
+    check_cache_size_limit
+}
 
-    # 最後のエントリから削除
-    while true; do
-        local current_size=$(jq -r '[.entries[].size_bytes] | add // 0' "$cache_index")
+# キャッシュサイズ制限チェック（合計サイズは実行中カウンタ）
+check_cache_size_limit() {
+    _wt_lru_sync || return 0
 
-        if [[ $current_size -le $max_size ]]; then
-            break
-        fi
+    # 制限超過チェック
+    if (( _WT_LRU_TOTAL > WORKTREE_CACHE_MAX_SIZE )); then
+        evict_lru_entries
+    fi
+}
 
-        # 最古のエントリ取得
-        local oldest_ai=$(jq -r '.entries[-1].ai // ""' "$cache_index")
+# LRU一括削除（排他ロック内）
+# 最古から順に制限内に収まるまで選び、ディレクトリ削除・ログ追記を1回ずつ行う
+_wt_lru_evict_locked() {
+    local ai_name lines="" remaining
+    local -a paths=()
+
+    WORKTREE_CACHE_EVICTED=()
+    _wt_lru_sync || return 0
+
+    remaining=$_WT_LRU_TOTAL
+    ai_name="$_WT_LRU_HEAD"
+    while (( remaining > WORKTREE_CACHE_MAX_SIZE )) && [[ -n "$ai_name" ]]; do
+        WORKTREE_CACHE_EVICTED+=("$ai_name")
+        paths+=("$WORKTREE_CACHE_DIR/$ai_name/template" "$WORKTREE_CACHE_DIR/$ai_name/metadata.json")
+        lines+="E $ai_name"$'\n'
+        remaining=$(( remaining - ${_WT_LRU_SIZE[$ai_name]} ))
+        ai_name="${_WT_LRU_NEXT[$ai_name]}"
+    done
 
-        if [[ -z "$oldest_ai" ]]; then
-            break
-        fi
+    if [[ ${#WORKTREE_CACHE_EVICTED[@]} -eq 0 ]]; then
+        return 0
+    fi
+
+    # キャッシュディレクトリ削除
+    rm -rf "${paths[@]}" 2>/dev/null || true
 
-        # キャッシュディレクトリ削除
-        rm -rf "$WORKTREE_CACHE_DIR/$oldest_ai/template" 2>/dev/null
-        rm -f "$WORKTREE_CACHE_DIR/$oldest_ai/metadata.json" 2>/dev/null
+    # インデックスから削除
+    _wt_lru_append_locked "$lines"
+    _wt_lru_sync
+}
+
+# LRU削除
+evict_lru_entries() {
+    local ai_name
+
+    if [[ ! -d "$WORKTREE_CACHE_DIR" ]]; then
+        return
+    fi
 
-        # インデックスから削除
-        jq --arg ai "$oldest_ai" 'del(.entries[] | select(.ai == $ai))' \
-            "$cache_index" > "$cache_index.tmp"
-        mv "$cache_index.tmp" "$cache_index"
+    _wt_lru_locked -x _wt_lru_evict_locked || return 0
 
+    for ai_name in "${WORKTREE_CACHE_EVICTED[@]}"; do
         vibe_log "worktree-lifecycle" "cache_evict" \
-            "{\"ai\":\"$oldest_ai\"}" \
+            "{\"ai\":\"$ai_name\"}" \
             "LRU cache eviction" "[]" "worktree-cache"
     done
 }
@@ -394,12 +587,12 @@ report_cache_metrics() {
     echo "  Total: $cache_size"
 
     # LRUインデックス情報
-    if [[ -f "$WORKTREE_CACHE_DIR/cache-index.json" ]] && command -v jq &>/dev/null; then
+    if [[ -f "$WORKTREE_CACHE_DIR/cache-index.json" ]] && _wt_lru_sync; then
         echo ""
         echo "LRU Index:"
-        local entries=$(jq -r '.entries | length' "$WORKTREE_CACHE_DIR/cache-index.json")
-        local current_size=$(jq -r '.current_size_bytes' "$WORKTREE_CACHE_DIR/cache-index.json")
-        local max_size=$(jq -r '.max_size_bytes' "$WORKTREE_CACHE_DIR/cache-index.json")
+        local entries=${#_WT_LRU_SIZE[@]}
+        local current_size=$_WT_LRU_TOTAL
+        local max_size=$WORKTREE_CACHE_MAX_SIZE
         echo "  Entries: $entries"
         echo "  Current Size: $(numfmt --to=iec $current_size 2>/dev/null || echo $current_size)"
         echo "  Max Size: $(numfmt --to=iec $max_size 2>/dev/null || echo $max_size)"
@@ -454,12 +647,7 @@ cleanup_old_cache() {
             rm -f "$metadata_file" 2>/dev/null || true
 
             # LRUインデックスから削除
-            local cache_index="$cache_root/cache-index.json"
-            if [[ -f "$cache_index" ]] && command -v jq &>/dev/null; then
-                jq --arg ai "$ai_name" 'del(.entries[] | select(.ai == $ai))' \
-                    "$cache_index" > "${cache_index}.tmp" 2>/dev/null && \
-                mv "${cache_index}.tmp" "$cache_index" 2>/dev/null || true
-            fi
+            remove_from_lru_index "$ai_name" || true
 
             vibe_log "worktree-lifecycle" "cache_cleanup_old" \
                 "{\"ai\":\"$ai_name\",\"age_seconds\":$age}" \
@@ -470,6 +658,7 @@ cleanup_old_cache() {
     done
 
     if [[ $cleaned_count -gt 0 ]]; then
+        _wt_lru_sync && _wt_lru_locked -x _wt_lru_write_index || true
         echo "Cleaned up $cleaned_count old cache entries"
     fi
 
@@ -507,6 +696,7 @@ export -f save_to_cache
 export -f load_from_cache
 export -f cache_lookup
 export -f update_cache_metadata
+export -f remove_from_lru_index
 export -f update_lru_index
 export -f check_cache_size_limit
 export -f evict_lru_entries
@@ -580,10 +580,12 @@ create_all_worktrees() {
 list_worktrees() {
   local format="${1:-table}"  # table | json | simple
 
+  # worktree-pool.shのアイドルスロット（.pool/slots/*）は除外
   case "$format" in
     json)
       git worktree list --porcelain | awk '
         /^worktree / { path=$2 }
+        path ~ /\/\.pool\/slots\// { next }
         /^branch / { branch=$2 }
         /^HEAD / {
           printf "{\"path\":\"%s\",\"branch\":\"%s\",\"head\":\"%s\"}\n", path, branch, $2
@@ -591,10 +593,10 @@ list_worktrees() {
       '
       ;;
     simple)
-      git worktree list | awk '{print $1}'
+      git worktree list | awk '$1 !~ /\/\.pool\/slots\// {print $1}'
       ;;
     table|*)
-      git worktree list
+      git worktree list | awk '$1 !~ /\/\.pool\/slots\//'
       ;;
   esac
 }
@@ -183,16 +183,26 @@ create_worktree() {
         # === Step 5: Worktree作成 ===
         mkdir -p "$(dirname "$worktree_path")"
 
-        # ブランチを事前作成/リセット（Day 4 fix）
-        if git show-ref --verify --quiet "refs/heads/$branch_name"; then
-            git branch -f "$branch_name" "$base_ref" >/dev/null 2>&1 || true
+        local origin="checkout"
+        if [[ "${WORKTREE_POOL_ENABLED:-false}" == "true" ]] && declare -F worktree_pool_checkout >/dev/null; then
+            # プール有効時: フルチェックアウトの代わりにアイドルWorktreeを再利用
+            origin="pool"
+            if ! worktree_pool_checkout "$worktree_path" "$branch_name" "$base_ref" >/dev/null; then
+                echo "ERROR: Failed to check out pooled worktree for $ai_name" >&2
+                exit 1
+            fi
         else
-            git branch "$branch_name" "$base_ref" >/dev/null 2>&1 || true
-        fi
-
-        if ! git worktree add "$worktree_path" "$branch_name" 2>&1; then
-            echo "ERROR: Failed to create worktree for $ai_name" >&2
-            exit 1
+            # ブランチを事前作成/リセット（Day 4 fix）
+            if git show-ref --verify --quiet "refs/heads/$branch_name"; then
+                git branch -f "$branch_name" "$base_ref" >/dev/null 2>&1 || true
+            else
+                git branch "$branch_name" "$base_ref" >/dev/null 2>&1 || true
+            fi
+
+            if ! git worktree add "$worktree_path" "$branch_name" 2>&1; then
+                echo "ERROR: Failed to create worktree for $ai_name" >&2
+                exit 1
+            fi
         fi
 
         # === Step 6: Sparse-Checkout設定 ===
@@ -207,7 +217,7 @@ create_worktree() {
 
         # === Step 7: 監査ログ ===
         log_worktree_event "create" "$ai_name" \
-            "{\"path\": \"$worktree_path\", \"branch\": \"$branch_name\", \"task_id\": \"$task_id\"}" \
+            "{\"path\": \"$worktree_path\", \"branch\": \"$branch_name\", \"task_id\": \"$task_id\", \"origin\": \"$origin\"}" \
             "Worktree created for $ai_name at $worktree_path"
 
         echo "$worktree_path"
@@ -401,8 +411,9 @@ cleanup_worktree() {
 # ===================================================================
 
 # アクティブなWorktree一覧取得
+# （worktree-pool.shのアイドルスロット .pool/slots/* は除外）
 list_active_worktrees() {
-    git worktree list --porcelain | grep -E "^worktree " | sed 's/^worktree //'
+    git worktree list --porcelain | grep -E "^worktree " | sed 's/^worktree //' | grep -v "/\.pool/slots/"
 }
 
 # ===================================================================
@@ -0,0 +1,554 @@
+#!/usr/bin/env bash
+# worktree-metrics-store.sh - メトリクスのインクリメンタル集計ストア
+# 責務：状態・履歴・リソースイベントを書き込み時に日別ロールアップへ集計し、
+#       メトリクス照会を履歴の長さに依存しないコストで返す
+#
+# ロールアップ（$METRICS_ROLLUP_DIR、日付はローカル日付でstates.ndjsonと同じ区切り）
+#   <YYYYMMDD>.log : イベントごとに1行追記する差分（TAB区切り）
+#     ai  <ai> <秒>                          creating→cleaning の所要時間
+#     wf  <wf> <秒> <成功=1/それ以外=0>      execution_end（<wf>はworkflow_id末尾の"-数字"を除いた名前）
+#     res <memory_kb> <memory_total_kb> <disk_bytes> <cpu_load_x100>
+#   <YYYYMMDD>.tsv : 差分を圧縮した "キー<TAB>値" のスナップショット
+#     ai_count|<ai> / ai_sum|<ai> / ai_max|<ai> / ai_hist|<ai>|<上限>
+#     wf_count|<wf> / wf_sum|<wf> / wf_max|<wf> / wf_hist|<wf>|<上限> / wf_success|<wf>
+#     day_total / day_success                            execution_end件数と成功件数
+#     res_samples / res_mem_kb_sum / res_mem_kb_max / res_mem_total_kb_max /
+#     res_disk_bytes_max / res_cpu_load_x100_sum / res_cpu_load_x100_max
+#     （ヒストグラムの上限はMETRICS_DURATION_BUCKETS、超過はinf）
+#   open-<ai>.log  : creatingのepochを追記、cleaningで"-"を追記（最終行が完了待ちのcreating）
+#   .lock          : 追記は共有ロック、圧縮・再構築は排他ロック（flock）
+# 書き込みは1行の追記だけで済み、ファイルの作り直しは照会時の圧縮
+# （終わった日、またはMETRICS_ROLLUP_COMPACT_BYTESを超えた当日の差分）に限られる
+#
+# ストア導入前のログしかない日は、照会時に生ログから一度だけ再構築する
+# （再構築では従来どおり同じ日のファイル内でcreating→cleaningを対応付ける）
+
+set -euo pipefail
+
+# EPOCHSECONDS・printf '%(...)T' を使用するため Bash 5.0 以上が必要
+if (( BASH_VERSINFO[0] < 5 )); then
+    echo "ERROR: worktree-metrics-store.sh には Bash 5.0 以上が必要です（現在: $BASH_VERSION）" >&2
+    return 1 2>/dev/null || exit 1
+fi
+
+# プロジェクトルートの検出（SCRIPT_DIRは読み込み元のものを上書きしない）
+PROJECT_ROOT="${PROJECT_ROOT:-$(cd "$(dirname "${BASH_SOURCE[0]}")/../../.." && pwd)}"
+
+# ============================================================================
+# 設定
+# ============================================================================
+
+# ロールアップディレクトリ
+METRICS_ROLLUP_DIR="${METRICS_ROLLUP_DIR:-${PROJECT_ROOT}/logs/worktree-metrics/rollups}"
+
+# 実行時間ヒストグラムのバケット上限（秒、昇順）
+METRICS_DURATION_BUCKETS="${METRICS_DURATION_BUCKETS:-1 2 3 4 5 6 8 10 12 15 20 25 30 40 50 60 75 90 120 150 180 240 300 360 450 600 750 900 1200 1500 1800 2400 3000 3600 5400 7200 10800 14400 21600 43200 86400}"
+
+# 当日の差分をスナップショットへ圧縮する閾値（バイト）
+METRICS_ROLLUP_COMPACT_BYTES="${METRICS_ROLLUP_COMPACT_BYTES:-65536}"
+
+# ============================================================================
+# 内部ヘルパー
+# ============================================================================
+
+# ロールアップロック付き実行（$1: -s=共有 / -x=排他）
+# flockがない環境ではロックなしで実行
+_metrics_rollup_locked() {
+    local mode="$1"
+    shift
+
+    [[ -d "$METRICS_ROLLUP_DIR" ]] || mkdir -p "$METRICS_ROLLUP_DIR"
+
+    if ! command -v flock &>/dev/null; then
+        "$@"
+        return
+    fi
+
+    {
+        flock "$mode" 9 && "$@"
+    } 9>>"$METRICS_ROLLUP_DIR/.lock"
+}
+
+# 差分を1行追記（共有ロック内で呼ぶ）
+# Usage: _metrics_rollup_append_locked <epoch> <field>...
+_metrics_rollup_append_locked() {
+    local day
+    printf -v day '%(%Y%m%d)T' "$1"
+    shift
+
+    local IFS=$'\t'
+    printf '%s\n' "$*" >> "$METRICS_ROLLUP_DIR/$day.log"
+}
+
+# creating時刻を記録（共有ロック内で呼ぶ）
+_metrics_rollup_open_locked() {
+    local ai="$1"
+    local epoch="$2"
+
+    echo "$epoch" >> "$METRICS_ROLLUP_DIR/open-$ai.log"
+}
+
+# cleaning時の対応付け（共有ロック内で呼ぶ）
+_metrics_rollup_close_locked() {
+    local ai="$1"
+    local epoch="$2"
+    local open_file="$METRICS_ROLLUP_DIR/open-$ai.log"
+
+    [[ -f "$open_file" ]] || return 0
+
+    local start
+    start=$(tail -n 1 "$open_file")
+    [[ "$start" =~ ^[0-9]+$ ]] || return 0
+
+    echo "-" >> "$open_file"
+    if (( epoch >= start )); then
+        _metrics_rollup_append_locked "$epoch" ai "$ai" $(( epoch - start ))
+    fi
+}
+
+# workflow_idからワークフロー名を取得（末尾の"-数字"を除去）
+# Usage: _metrics_workflow_name <workflow_id> <result_var>
+_metrics_workflow_name() {
+    local _mwn_name="$1"
+    local -n _mwn_result="$2"
+
+    while [[ "$_mwn_name" =~ ^(.+)-[0-9]+$ ]]; do
+        _mwn_name="${BASH_REMATCH[1]}"
+    done
+    _mwn_result="$_mwn_name"
+}
+
+# スナップショット（*.tsv）と差分（*.log）を合算（*_maxは最大値、それ以外は合計）
+# Usage: _metrics_rollup_aggregate <key_prefix> <by_day> <file>...
+# Output: "キー<TAB>値"（by_day=1なら "日付<TAB>キー<TAB>値"）
+_metrics_rollup_aggregate() {
+    local prefix="$1"
+    local by_day="$2"
+    shift 2
+
+    LC_ALL=C awk -F'\t' -v prefix="$prefix" -v by_day="$by_day" -v buckets="$METRICS_DURATION_BUCKETS" '
+        function add(k, n) { if (index(k, prefix) == 1) v[day SUBSEP k] += n }
+        function hi(k, n) {
+            if (index(k, prefix) != 1) return
+            if (!((day SUBSEP k) in v) || n > v[day SUBSEP k]) v[day SUBSEP k] = n
+        }
+        function duration(kind, name, sec,    i, b) {
+            b = "inf"
+            for (i = 1; i <= nb; i++) if (sec <= bound[i]) { b = bound[i]; break }
+            add(kind "_count|" name, 1)
+            add(kind "_sum|" name, sec)
+            hi(kind "_max|" name, sec)
+            add(kind "_hist|" name "|" b, 1)
+        }
+        BEGIN { nb = split(buckets, bound, " "); for (i = 1; i <= nb; i++) bound[i] += 0 }
+        FNR == 1 {
+            day = ""
+            if (by_day) { day = FILENAME; sub(/^.*\//, "", day); sub(/\..*$/, "", day) }
+            delta = (FILENAME ~ /\.log$/)
+        }
+        !delta {
+            if ($1 ~ /_max(\||$)/) hi($1, $2 + 0); else add($1, $2 + 0)
+            next
+        }
+        $1 == "ai" { duration("ai", $2, $3 + 0); next }
+        $1 == "wf" {
+            duration("wf", $2, $3 + 0)
+            add("day_total", 1)
+            if ($4 == 1) { add("wf_success|" $2, 1); add("day_success", 1) }
+            next
+        }
+        $1 == "res" {
+            add("res_samples", 1)
+            add("res_mem_kb_sum", $2); hi("res_mem_kb_max", $2 + 0)
+            hi("res_mem_total_kb_max", $3 + 0)
+            hi("res_disk_bytes_max", $4 + 0)
+            add("res_cpu_load_x100_sum", $5); hi("res_cpu_load_x100_max", $5 + 0)
+        }
+        END {
+            for (k in v) {
+                split(k, p, SUBSEP)
+                if (by_day) printf "%s\t%s\t%.0f\n", p[1], p[2], v[k]
+                else printf "%s\t%.0f\n", p[2], v[k]
+            }
+        }
+    ' "$@"
+}
+
+# ============================================================================
+# 集計関数（イベント書き込み時に呼ばれる）
+# ============================================================================
+
+# 状態イベントを集計
+# Usage: metrics_rollup_state_event <ai> <state> [epoch]
+metrics_rollup_state_event() {
+    local ai="$1"
+    local state="$2"
+    local epoch="${3:-$EPOCHSECONDS}"
+
+    case "$state" in
+        creating)
+            _metrics_rollup_locked -s _metrics_rollup_open_locked "$ai" "$epoch"
+            ;;
+        cleaning)
+            _metrics_rollup_locked -s _metrics_rollup_close_locked "$ai" "$epoch"
+            ;;
+    esac
+}
+
+# 実行終了イベントを集計（worktree-history.shのメトリクスフック）
+# Usage: metrics_hook_execution_completed <workflow_id> <duration_seconds> <status> [epoch]
+metrics_hook_execution_completed() {
+    local workflow_id="$1"
+    local duration="${2%%.*}"
+    local status="$3"
+    local epoch="${4:-$EPOCHSECONDS}"
+
+    [[ "$duration" =~ ^[0-9]+$ ]] || duration=0
+
+    local name success=0
+    _metrics_workflow_name "$workflow_id" name
+    [[ "$status" == "success" ]] && success=1
+
+    _metrics_rollup_locked -s _metrics_rollup_append_locked "$epoch" wf "$name" "$duration" "$success"
+}
+
+# リソーススナップショットを集計
+# Usage: metrics_rollup_resource_sample <resource_json> [epoch]
+#   resource_json: get_current_resource_usageの出力
+metrics_rollup_resource_sample() {
+    local json="$1"
+    local epoch="${2:-$EPOCHSECONDS}"
+
+    local mem=0 mem_total=0 disk=0 cpu=0
+    [[ "$json" =~ \"memory_usage_kb\":([0-9]+) ]] && mem="${BASH_REMATCH[1]}"
+    [[ "$json" =~ \"memory_total_kb\":([0-9]+) ]] && mem_total="${BASH_REMATCH[1]}"
+    [[ "$json" =~ \"disk_usage_bytes\":([0-9]+) ]] && disk="${BASH_REMATCH[1]}"
+    # CPU負荷は小数2桁の固定小数点（x100）で保持
+    if [[ "$json" =~ \"cpu_load_1min\":([0-9]+)(\.([0-9]*))? ]]; then
+        local frac="${BASH_REMATCH[3]}00"
+        cpu=$(( 10#${BASH_REMATCH[1]} * 100 + 10#${frac:0:2} ))
+    fi
+
+    _metrics_rollup_locked -s _metrics_rollup_append_locked "$epoch" res "$mem" "$mem_total" "$disk" "$cpu"
+}
+
+# ============================================================================
+# 圧縮・再構築
+# ============================================================================
+
+# 1日分の差分をスナップショットへ圧縮（排他ロック内で呼ぶ）
+_metrics_rollup_compact_locked() {
+    local day="$1"
+    local file="$METRICS_ROLLUP_DIR/$day.tsv"
+    local delta="$METRICS_ROLLUP_DIR/$day.log"
+    local -a inputs=()
+
+    [[ -f "$delta" ]] || return 0
+    [[ -f "$file" ]] && inputs+=("$file")
+    inputs+=("$delta")
+
+    _metrics_rollup_aggregate "" 0 "${inputs[@]}" > "$file.$$"
+    mv -f "$file.$$" "$file"
+    rm -f "$delta"
+}
+
+# 1日分のロールアップを生ログから再構築（排他ロック内で呼ぶ）
+# リソースサンプルは生ログが日別でないため既存の集計を引き継ぐ
+_metrics_rollup_rebuild_day_locked() {
+    local day="$1"
+    local state_file="$PROJECT_ROOT/logs/worktree-states/$day/states.ndjson"
+    local history_file="$PROJECT_ROOT/logs/worktree-history/$day/history.ndjson"
+    local file="$METRICS_ROLLUP_DIR/$day.tsv"
+    local -a inputs=() existing=()
+
+    [[ -f "$state_file" ]] && inputs+=("$state_file")
+    [[ -f "$history_file" ]] && inputs+=("$history_file")
+    [[ -f "$file" ]] && existing+=("$file")
+    [[ -f "$METRICS_ROLLUP_DIR/$day.log" ]] && existing+=("$METRICS_ROLLUP_DIR/$day.log")
+
+    if (( ${#inputs[@]} == 0 && ${#existing[@]} == 0 )); then
+        return 0
+    fi
+
+    : > "$file.$$"
+    if (( ${#existing[@]} > 0 )); then
+        _metrics_rollup_aggregate res_ 0 "${existing[@]}" >> "$file.$$"
+    fi
+
+    if (( ${#inputs[@]} > 0 )); then
+        LC_ALL=C awk -v buckets="$METRICS_DURATION_BUCKETS" '
+            function field(line, name,    v) {
+                if (!match(line, "\"" name "\":\"[^\"]*\"")) return ""
+                v = substr(line, RSTART, RLENGTH)
+                sub("^\"" name "\":\"", "", v)
+                return substr(v, 1, length(v) - 1)
+            }
+            # "YYYY-MM-DDTHH:MM:SSZ" → epoch（UTC、days_from_civil）
+            function epoch(ts,    y, m, d, era, yoe, doy, doe) {
+                if (ts !~ /^[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]T[0-9][0-9]:[0-9][0-9]:[0-9][0-9]/) return -1
+                y = substr(ts, 1, 4) + 0; m = substr(ts, 6, 2) + 0; d = substr(ts, 9, 2) + 0
+                if (m <= 2) y--
+                era = int(y / 400)
+                yoe = y - era * 400
+                doy = int((153 * (m + (m > 2 ? -3 : 9)) + 2) / 5) + d - 1
+                doe = yoe * 365 + int(yoe / 4) - int(yoe / 100) + doy
+                return (era * 146097 + doe - 719468) * 86400 + substr(ts, 12, 2) * 3600 + substr(ts, 15, 2) * 60 + substr(ts, 18, 2)
+            }
+            function record(prefix, name, sec,    i, b) {
+                b = "inf"
+                for (i = 1; i <= nb; i++) if (sec <= bound[i]) { b = bound[i]; break }
+                v[prefix "_count|" name]++
+                v[prefix "_sum|" name] += sec
+                if (!((prefix "_max|" name) in v) || sec > v[prefix "_max|" name]) v[prefix "_max|" name] = sec
+                v[prefix "_hist|" name "|" b]++
+            }
+            BEGIN { nb = split(buckets, bound, " "); for (i = 1; i <= nb; i++) bound[i] += 0 }
+            FNR == 1 { delete open }
+            /"event":"execution_end"/ {
+                name = field($0, "workflow_id")
+                while (match(name, /-[0-9]+$/) && RSTART > 1) name = substr(name, 1, RSTART - 1)
+                sec = 0
+                if (match($0, /"duration":[0-9]+/)) sec = substr($0, RSTART + 11, RLENGTH - 11) + 0
+                record("wf", name, sec)
+                v["day_total"]++
+                if ($0 ~ /"status":"success"/) { v["wf_success|" name]++; v["day_success"]++ }
+                next
+            }
+            /"state":"/ {
+                ai = field($0, "ai"); state = field($0, "state")
+                if (ai == "") next
+                t = epoch(field($0, "timestamp"))
+                if (state == "creating") {
+                    open[ai] = t
+                } else if (state == "cleaning" && (ai in open)) {
+                    if (open[ai] > 0 && t > 0) record("ai", ai, t - open[ai])
+                    delete open[ai]
+                }
+            }
+            END { for (k in v) printf "%s\t%.0f\n", k, v[k] }
+        ' "${inputs[@]}" >> "$file.$$"
+    fi
+
+    mv -f "$file.$$" "$file"
+    rm -f "$METRICS_ROLLUP_DIR/$day.log"
+}
+
+# 照会前の準備（排他ロック内で呼ぶ）
+# Usage: _metrics_rollup_prepare_locked <backfill_days...> -- <compact_days...>
+_metrics_rollup_prepare_locked() {
+    local day
+    while (( $# > 0 )) && [[ "$1" != "--" ]]; do
+        day="$1"
+        shift
+        if [[ ! -f "$METRICS_ROLLUP_DIR/$day.tsv" && ! -f "$METRICS_ROLLUP_DIR/$day.log" ]]; then
+            _metrics_rollup_rebuild_day_locked "$day"
+        fi
+    done
+    (( $# > 0 )) && shift
+
+    for day in "$@"; do
+        _metrics_rollup_compact_locked "$day"
+    done
+
+    # 完了待ちcreatingのログは最終行だけ残す
+    local open_file last
+    for open_file in "$METRICS_ROLLUP_DIR"/open-*.log; do
+        [[ -f "$open_file" ]] || continue
+        if (( $(stat -c %s "$open_file") > 4096 )); then
+            last=$(tail -n 1 "$open_file")
+            echo "$last" > "$open_file.$$"
+            mv -f "$open_file.$$" "$open_file"
+        fi
+    done
+}
+
+# 照会範囲のロールアップファイル一覧を取得（今日からdays日前まで、古い順）
+# 導入前の日の再構築と、終わった日・大きくなった差分の圧縮を先に行う
+# Usage: _metrics_rollup_window <days> <array_var>
+_metrics_rollup_window() {
+    local days="$1"
+    local -n _mrw_files="$2"
+    local -a missing=() compact=()
+    local d day today now="$EPOCHSECONDS"
+    local dir="$METRICS_ROLLUP_DIR"
+
+    printf -v today '%(%Y%m%d)T' "$now"
+    _mrw_files=()
+    for (( d = days; d >= 0; d-- )); do
+        printf -v day '%(%Y%m%d)T' $(( now - d * 86400 ))
+        if [[ -f "$dir/$day.log" ]]; then
+            if [[ "$day" != "$today" ]] || \
+               (( $(stat -c %s "$dir/$day.log") > METRICS_ROLLUP_COMPACT_BYTES )); then
+                compact+=("$day")
+            fi
+        elif [[ ! -f "$dir/$day.tsv" ]] && \
+             [[ -f "$PROJECT_ROOT/logs/worktree-states/$day/states.ndjson" || \
+                -f "$PROJECT_ROOT/logs/worktree-history/$day/history.ndjson" ]]; then
+            missing+=("$day")
+        fi
+        _mrw_files+=("$dir/$day.tsv" "$dir/$day.log")
+    done
+
+    if (( ${#missing[@]} + ${#compact[@]} > 0 )); then
+        _metrics_rollup_locked -x _metrics_rollup_prepare_locked "${missing[@]}" -- "${compact[@]}"
+    fi
+}
+
+# 照会範囲のロールアップを合算
+# Usage: _metrics_rollup_merge <days> [key_prefix] [by_day]
+# Output: "キー<TAB>値" の行（by_day=1なら "日付<TAB>キー<TAB>値"）
+_metrics_rollup_merge() {
+    local days="$1"
+    local prefix="${2:-}"
+    local by_day="${3:-0}"
+    local -a files=() existing=()
+    local f
+
+    _metrics_rollup_window "$days" files
+    for f in "${files[@]}"; do
+        [[ -f "$f" ]] && existing+=("$f")
+    done
+    (( ${#existing[@]} > 0 )) || return 0
+
+    _metrics_rollup_aggregate "$prefix" "$by_day" "${existing[@]}"
+}
+
+# ============================================================================
+# 照会関数
+# ============================================================================
+
+# 実行時間の分位点をJSONで取得
+# Usage: get_duration_percentiles <ai|workflow> [name] [days]
+#   nameを省略すると全AI（全ワークフロー）を名前をキーにしたオブジェクトで返す
+# Output: {"count":N,"avg_sec":N,"p50_sec":N,"p95_sec":N,"p99_sec":N,"max_sec":N}
+#   分位点はバケット内を線形補間した推定値（最大値を超えない）
+get_duration_percentiles() {
+    local kind="$1"
+    local name="${2:-}"
+    local days="${3:-7}"
+    local prefix
+
+    case "$kind" in
+        ai) prefix="ai_" ;;
+        workflow) prefix="wf_" ;;
+        *)
+            echo "Unknown duration kind: $kind (ai|workflow)" >&2
+            return 1
+            ;;
+    esac
+
+    _metrics_rollup_merge "$days" "$prefix" | LC_ALL=C awk -F'\t' -v prefix="$prefix" -v want="$name" -v single="${2:+1}" \
+        -v buckets="$METRICS_DURATION_BUCKETS" '
+        function pct(n, p,    rank, i, c, lower, est) {
+            rank = p * count[n] / 100
+            c = 0
+            for (i = 1; i <= nb[n]; i++) {
+                if (c + hist[n, i] >= rank) {
+                    if (bnd[n, i] == "inf") return max[n]
+                    lower = (bnd[n, i] in below) ? below[bnd[n, i]] : 0
+                    est = lower + (bnd[n, i] - lower) * (rank - c) / hist[n, i]
+                    return est > max[n] ? max[n] : int(est + 0.5)
+                }
+                c += hist[n, i]
+            }
+            return max[n]
+        }
+        # 各バケットの下限（1つ前の上限）
+        BEGIN { nbound = split(buckets, bound, " "); for (i = 2; i <= nbound; i++) below[bound[i]] = bound[i - 1] + 0 }
+        function obj(n) {
+            if (count[n] == 0) return "{\"count\":0,\"avg_sec\":0,\"p50_sec\":0,\"p95_sec\":0,\"p99_sec\":0,\"max_sec\":0}"
+            return sprintf("{\"count\":%d,\"avg_sec\":%d,\"p50_sec\":%d,\"p95_sec\":%d,\"p99_sec\":%d,\"max_sec\":%d}",
+                count[n], int(sum[n] / count[n]), pct(n, 50), pct(n, 95), pct(n, 99), max[n])
+        }
+        {
+            split($1, k, "|")
+            kind = substr(k[1], length(prefix) + 1)
+            n = k[2]
+            if (kind == "count") { count[n] = $2; names[n] = 1 }
+            else if (kind == "sum") sum[n] = $2
+            else if (kind == "max") max[n] = $2
+            else if (kind == "hist") {
+                # バケットを上限の昇順に挿入（infは末尾）
+                b = k[3]; i = ++nb[n]
+                while (i > 1 && (bnd[n, i - 1] == "inf" || (b != "inf" && bnd[n, i - 1] + 0 > b + 0))) {
+                    bnd[n, i] = bnd[n, i - 1]; hist[n, i] = hist[n, i - 1]; i--
+                }
+                bnd[n, i] = b; hist[n, i] = $2
+            }
+        }
+        END {
+            if (single) { print obj(want); exit }
+            out = ""
+            for (n in names) out = out (out == "" ? "" : ",") "\"" n "\":" obj(n)
+            print "{" out "}"
+        }
+    '
+}
+
+# リソースサンプルの集計をJSONで取得
+# Usage: get_resource_rollup [days]
+get_resource_rollup() {
+    local days="${1:-7}"
+    local -A merged=()
+    local key value
+
+    while IFS=$'\t' read -r key value; do
+        merged[$key]="$value"
+    done < <(_metrics_rollup_merge "$days" res_)
+
+    local samples="${merged[res_samples]:-0}"
+    local mem_avg=0 cpu_avg=0
+    if (( samples > 0 )); then
+        mem_avg=$(( ${merged[res_mem_kb_sum]:-0} / samples ))
+        cpu_avg=$(( ${merged[res_cpu_load_x100_sum]:-0} / samples ))
+    fi
+    local cpu_max="${merged[res_cpu_load_x100_max]:-0}"
+
+    printf '{"samples":%d,"memory_usage_kb_avg":%d,"memory_usage_kb_max":%d,"memory_total_kb_max":%d,"disk_usage_bytes_max":%d,"cpu_load_1min_avg":%d.%02d,"cpu_load_1min_max":%d.%02d}\n' \
+        "$samples" "$mem_avg" "${merged[res_mem_kb_max]:-0}" "${merged[res_mem_total_kb_max]:-0}" \
+        "${merged[res_disk_bytes_max]:-0}" $(( cpu_avg / 100 )) $(( cpu_avg % 100 )) \
+        $(( cpu_max / 100 )) $(( cpu_max % 100 ))
+}
+
+# 範囲内のロールアップを生ログから作り直す（ストア導入日の補正や生ログの手動修正後に使用）
+# フックで記録した日付をまたぐcreating→cleaningは、再構築した日では対応付けられない
+# Usage: rebuild_metrics_rollups [days]
+rebuild_metrics_rollups() {
+    local days="${1:-90}"
+    local -a rebuild_days=()
+    local d day now="$EPOCHSECONDS"
+
+    for (( d = days; d >= 0; d-- )); do
+        printf -v day '%(%Y%m%d)T' $(( now - d * 86400 ))
+        rebuild_days+=("$day")
+    done
+
+    _metrics_rollup_locked -x _metrics_rollup_rebuild_days_locked "${rebuild_days[@]}"
+}
+
+_metrics_rollup_rebuild_days_locked() {
+    local day
+    for day in "$@"; do
+        _metrics_rollup_rebuild_day_locked "$day"
+    done
+}
+
+# エクスポート
+export -f _metrics_rollup_locked
+export -f _metrics_rollup_append_locked
+export -f _metrics_rollup_open_locked
+export -f _metrics_rollup_close_locked
+export -f _metrics_workflow_name
+export -f _metrics_rollup_aggregate
+export -f metrics_rollup_state_event
+export -f metrics_hook_execution_completed
+export -f metrics_rollup_resource_sample
+export -f _metrics_rollup_compact_locked
+export -f _metrics_rollup_rebuild_day_locked
+export -f _metrics_rollup_prepare_locked
+export -f _metrics_rollup_window
+export -f _metrics_rollup_merge
+export -f get_duration_percentiles
+export -f get_resource_rollup
+export -f rebuild_metrics_rollups
+export -f _metrics_rollup_rebuild_days_locked
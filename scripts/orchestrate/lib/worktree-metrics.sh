@@ -5,6 +5,12 @@
 
 set -euo pipefail
 
+# EPOCHSECONDS・printf '%(...)T' を使用するため Bash 5.0 以上が必要
+if (( BASH_VERSINFO[0] < 5 )); then
+    echo "ERROR: worktree-metrics.sh には Bash 5.0 以上が必要です（現在: $BASH_VERSION）" >&2
+    return 1 2>/dev/null || exit 1
+fi
+
 # ============================================================================
 # 依存関係のロード
 # ============================================================================
@@ -21,6 +27,9 @@ if [[ -f "$SCRIPT_DIR/worktree-history.sh" ]]; then
     source "$SCRIPT_DIR/worktree-history.sh"
 fi
 
+# worktree-metrics-store.shのロード（日別ロールアップ）
+source "$SCRIPT_DIR/worktree-metrics-store.sh"
+
 # プロジェクトルートの検出
 PROJECT_ROOT="${PROJECT_ROOT:-$(cd "$SCRIPT_DIR/../../.." && pwd)}"
 
@@ -78,38 +87,34 @@ record_resource_usage() {
 
     echo "{\"event\":\"resource_snapshot\",\"label\":\"$label\",${resource_json#\{}" >> "$METRICS_FILE"
 
+    # 日別ロールアップに反映
+    metrics_rollup_resource_sample "$resource_json"
+
     return 0
 }
 
 # ============================================================================
 # 実行時間メトリクス関数
 # ============================================================================
+# 以下の照会はworktree-metrics-store.shの日別ロールアップから答える
+# （生ログの走査は行わず、コストは照会日数のみに比例する）
 
 # ワークフロー別平均実行時間を取得
+# workflowはworkflow_idの前方一致（末尾の"-数字"を除いた名前に対して判定）
 get_workflow_avg_duration() {
     local workflow="$1"
     local days="${2:-7}"
 
     local total_duration=0
     local count=0
+    local key value
 
-    for d in $(seq 0 $days); do
-        local check_date
-        check_date=$(date -d "$d days ago" +%Y%m%d)
-        local history_file="$PROJECT_ROOT/logs/worktree-history/$check_date/history.ndjson"
-
-        if [[ -f "$history_file" ]]; then
-            while IFS= read -r line; do
-                if echo "$line" | grep -q "\"event\":\"execution_end\"" && \
-                   echo "$line" | grep -q "\"workflow_id\":\"$workflow"; then
-                    local duration
-                    duration=$(echo "$line" | grep -o '"duration":[0-9]*' | cut -d':' -f2)
-                    total_duration=$((total_duration + duration))
-                    count=$((count + 1))
-                fi
-            done < "$history_file"
-        fi
-    done
+    while IFS=$'\t' read -r key value; do
+        case "$key" in
+            "wf_count|$workflow"*) count=$((count + value)) ;;
+            "wf_sum|$workflow"*) total_duration=$((total_duration + value)) ;;
+        esac
+    done < <(_metrics_rollup_merge "$days" wf_)
 
     if [[ $count -gt 0 ]]; then
         echo "$((total_duration / count))"
@@ -118,48 +123,21 @@ get_workflow_avg_duration() {
     fi
 }
 
-# AI別平均実行時間を取得
+# AI別平均実行時間を取得（creating→cleaningの所要時間）
 get_ai_avg_duration() {
     local ai="$1"
     local days="${2:-7}"
 
     local total_duration=0
     local count=0
+    local key value
 
-    for d in $(seq 0 $days); do
-        local check_date
-        check_date=$(date -d "$d days ago" +%Y%m%d)
-        local state_file="$PROJECT_ROOT/logs/worktree-states/$check_date/states.ndjson"
-
-        if [[ -f "$state_file" ]]; then
-            local creating_time=""
-            while IFS= read -r line; do
-                if echo "$line" | grep -q "\"ai\":\"$ai\""; then
-                    local state
-                    state=$(echo "$line" | grep -o '"state":"[^"]*"' | cut -d'"' -f4)
-                    local timestamp
-                    timestamp=$(echo "$line" | grep -o '"timestamp":"[^"]*"' | cut -d'"' -f4)
-
-                    if [[ "$state" == "creating" ]]; then
-                        creating_time="$timestamp"
-                    elif [[ "$state" == "cleaning" ]] && [[ -n "$creating_time" ]]; then
-                        local start_sec
-                        start_sec=$(date -d "$creating_time" +%s 2>/dev/null || echo 0)
-                        local end_sec
-                        end_sec=$(date -d "$timestamp" +%s 2>/dev/null || echo 0)
-
-                        if [[ $start_sec -gt 0 ]] && [[ $end_sec -gt 0 ]]; then
-                            local duration=$((end_sec - start_sec))
-                            total_duration=$((total_duration + duration))
-                            count=$((count + 1))
-                        fi
-
-                        creating_time=""
-                    fi
-                fi
-            done < "$state_file"
-        fi
-    done
+    while IFS=$'\t' read -r key value; do
+        case "$key" in
+            "ai_count|$ai") count="$value" ;;
+            "ai_sum|$ai") total_duration="$value" ;;
+        esac
+    done < <(_metrics_rollup_merge "$days" ai_)
 
     if [[ $count -gt 0 ]]; then
         echo "$((total_duration / count))"
@@ -179,25 +157,14 @@ get_workflow_success_rate() {
 
     local success_count=0
     local total_count=0
+    local key value
 
-    for d in $(seq 0 $days); do
-        local check_date
-        check_date=$(date -d "$d days ago" +%Y%m%d)
-        local history_file="$PROJECT_ROOT/logs/worktree-history/$check_date/history.ndjson"
-
-        if [[ -f "$history_file" ]]; then
-            while IFS= read -r line; do
-                if echo "$line" | grep -q "\"event\":\"execution_end\"" && \
-                   echo "$line" | grep -q "\"workflow_id\":\"$workflow"; then
-                    total_count=$((total_count + 1))
-
-                    if echo "$line" | grep -q '"status":"success"'; then
-                        success_count=$((success_count + 1))
-                    fi
-                fi
-            done < "$history_file"
-        fi
-    done
+    while IFS=$'\t' read -r key value; do
+        case "$key" in
+            "wf_count|$workflow"*) total_count=$((total_count + value)) ;;
+            "wf_success|$workflow"*) success_count=$((success_count + value)) ;;
+        esac
+    done < <(_metrics_rollup_merge "$days" wf_)
 
     if [[ $total_count -gt 0 ]]; then
         echo "$((success_count * 100 / total_count))"
@@ -209,29 +176,26 @@ get_workflow_success_rate() {
 # 日別成功率トレンドを取得
 get_daily_success_trend() {
     local days="${1:-30}"
+    local -A day_totals=() day_successes=()
+    local rollup_day key value
+
+    while IFS=$'\t' read -r rollup_day key value; do
+        case "$key" in
+            day_total) day_totals[$rollup_day]="$value" ;;
+            day_success) day_successes[$rollup_day]="$value" ;;
+        esac
+    done < <(_metrics_rollup_merge "$days" day_ 1)
 
     echo "["
     local first=true
+    local now="$EPOCHSECONDS"
 
     for d in $(seq $days -1 0); do
         local check_date
-        check_date=$(date -d "$d days ago" +%Y%m%d)
-        local history_file="$PROJECT_ROOT/logs/worktree-history/$check_date/history.ndjson"
-
-        local success_count=0
-        local total_count=0
-
-        if [[ -f "$history_file" ]]; then
-            while IFS= read -r line; do
-                if echo "$line" | grep -q "\"event\":\"execution_end\""; then
-                    total_count=$((total_count + 1))
-
-                    if echo "$line" | grep -q '"status":"success"'; then
-                        success_count=$((success_count + 1))
-                    fi
-                fi
-            done < "$history_file"
-        fi
+        printf -v check_date '%(%Y%m%d)T' $(( now - d * 86400 ))
+
+        local success_count="${day_successes[$check_date]:-0}"
+        local total_count="${day_totals[$check_date]:-0}"
 
         local success_rate=0
         if [[ $total_count -gt 0 ]]; then
@@ -270,6 +234,11 @@ generate_metrics_summary() {
     local daily_trend
     daily_trend=$(get_daily_success_trend "$days")
 
+    local ai_percentiles workflow_percentiles resource_rollup
+    ai_percentiles=$(get_duration_percentiles ai "" "$days")
+    workflow_percentiles=$(get_duration_percentiles workflow "" "$days")
+    resource_rollup=$(get_resource_rollup "$days")
+
     cat << EOF
 {
   "generated_at": "$(date -u +"%Y-%m-%dT%H:%M:%SZ")",
@@ -281,6 +250,9 @@ generate_metrics_summary() {
   "ai_metrics": {
     "qwen_avg_sec": $qwen_avg
   },
+  "ai_duration_percentiles": $ai_percentiles,
+  "workflow_duration_percentiles": $workflow_percentiles,
+  "resource_rollup": $resource_rollup,
   "success_trend": $daily_trend
 }
 EOF
@@ -6,7 +6,7 @@
 #
 # Team: A (Qwen + Droid)
 # Created: 2025-11-12 (Day 3)
-# Dependencies: worktree-manager.sh, vibe-logger-lib.sh
+# Dependencies: worktree-manager.sh, worktree-pool.sh, vibe-logger-lib.sh
 #
 # Performance Goals:
 #   - Parallel creation: 28s → 7s (75% speedup)
@@ -29,6 +29,7 @@ PROJECT_ROOT="$(cd "$SCRIPT_DIR/../../.." && pwd)"
 
 # Source required libraries
 source "$SCRIPT_DIR/worktree-manager.sh"
+source "$SCRIPT_DIR/worktree-pool.sh"
 source "$PROJECT_ROOT/bin/vibe-logger-lib.sh"
 
 # =========================================
@@ -179,7 +180,7 @@ _create_single_worktree() {
 
     echo "Creating worktree for $ai..."
 
-    # Call worktree-manager.sh API
+    # Call worktree-manager.sh API (checks out from the pool when WORKTREE_POOL_ENABLED=true)
     if worktree_path=$(create_worktree "$ai" "$branch" "$task_id"); then
         echo "✅ Worktree created for $ai: $worktree_path"
         return 0
@@ -193,9 +194,11 @@ _create_single_worktree() {
 export -f _create_single_worktree
 export -f create_worktree
 export -f sanitize_worktree_input
+export -f get_worktree_path
 # Note: sanitize_input from sanitize.sh is sourced by worktree-manager.sh
 export SCRIPT_DIR
 export PROJECT_ROOT
+export WORKTREE_BASE
 
 # =========================================
 # Parallel Worktree Cleanup
@@ -293,6 +296,39 @@ _cleanup_single_worktree() {
 
     echo "Cleaning up worktree for $ai..."
 
+    # Pooled worktrees go back to the pool (reset + clean) instead of being removed.
+    # Only leases taken by this run (same owner pid) are returned; leases of other
+    # owners are left alone, and any other worktree of this AI (e.g. created
+    # before the pool was enabled) is removed with cleanup_worktree.
+    if [[ "$WORKTREE_POOL_ENABLED" == "true" && "$WORKTREE_SHADOW_MODE" != "true" ]]; then
+        local leased_path dir returned=0 removed=0 failed=0
+        local -A other_leases=()
+        while IFS= read -r leased_path; do
+            [[ "$leased_path" == "$WORKTREE_BASE/$ai/"* ]] || continue
+            returned=$((returned + 1))
+            worktree_pool_return "$leased_path" || failed=1
+        done < <(worktree_pool_leases "$WORKTREE_POOL_OWNER_PID")
+
+        while IFS= read -r leased_path; do
+            other_leases[$leased_path]=1
+        done < <(worktree_pool_leases)
+        for dir in "$WORKTREE_BASE/$ai"/*/; do
+            dir="${dir%/}"
+            [[ -d "$dir" && -z "${other_leases[$dir]:-}" ]] || continue
+            removed=$((removed + 1))
+            cleanup_worktree "$ai" "${dir##*/}" "true" || failed=1
+        done
+
+        if [[ $((returned + removed)) -gt 0 ]]; then
+            if [[ $failed -eq 0 ]]; then
+                echo "✅ Worktree cleaned up for $ai (returned to pool: $returned, removed: $removed)"
+                return 0
+            fi
+            echo "❌ Failed to cleanup worktree for $ai (returned to pool: $returned, removed: $removed)" >&2
+            return 1
+        fi
+    fi
+
     # Call worktree-manager.sh API
     if cleanup_worktree "$ai" "$task_id" "true"; then
         echo "✅ Worktree cleaned up for $ai"
@@ -415,6 +451,9 @@ API Functions:
   list_parallel_worktrees
   benchmark_parallel_creation [ai_count]
 
+Worktree Pool (WORKTREE_POOL_ENABLED=$WORKTREE_POOL_ENABLED):
+  $(worktree_pool_status)
+
 Performance:
   Target Speedup: 75% (28s → 7s for 7 AIs)
   Parallel Jobs: $PARALLEL_JOBS
@@ -422,6 +461,7 @@ Performance:
 
 Dependencies:
   - worktree-manager.sh (create/merge/cleanup)
+  - worktree-pool.sh (pre-warmed worktrees, optional)
   - vibe-logger-lib.sh (audit logging)
   - GNU parallel (optional, xargs fallback available)
 EOF
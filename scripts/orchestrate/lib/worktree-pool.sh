@@ -0,0 +1,454 @@
+#!/usr/bin/env bash
+#
+# worktree-pool.sh - Pre-warmed, recyclable worktree pool
+#
+# Purpose: Hand out existing worktrees instead of running `git worktree add`
+#          (a full checkout) for every AI on every run
+#
+# Dependencies: vibe-logger-lib.sh
+#
+# Pool slots are detached worktrees under $WORKTREE_POOL_DIR/slots. A checkout
+# moves an idle slot to the requested path (`git worktree move` is a rename)
+# and points a branch at the target commit there. A return resets and cleans
+# the slot to the pool's base commit and moves it back. Only the files that
+# differ between the commits are rewritten.
+#
+# Slot state is one marker file per slot:
+#   $WORKTREE_POOL_DIR/idle/<slot>    idle, ready to hand out
+#   $WORKTREE_POOL_DIR/leased/<slot>  "<path> <branch> <owner_pid> <epoch>"
+# A slot is claimed by renaming its idle marker, so concurrent checkouts never
+# receive the same slot.
+#
+# API:
+#   worktree_pool_init
+#   worktree_pool_fill [count]
+#   worktree_pool_checkout <target_path> <branch> [base_ref]
+#   worktree_pool_return <path>
+#   worktree_pool_leases [owner_pid]
+#   worktree_pool_health_check
+#   worktree_pool_status
+#   worktree_pool_drain
+#
+
+set -euo pipefail
+
+# EPOCHSECONDS needs Bash 5.0 or later
+if (( BASH_VERSINFO[0] < 5 )); then
+    echo "ERROR: worktree-pool.sh requires Bash 5.0 or later (found $BASH_VERSION)" >&2
+    return 1 2>/dev/null || exit 1
+fi
+
+# =========================================
+# Dependencies
+# =========================================
+
+WORKTREE_POOL_LIB_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="${PROJECT_ROOT:-$(cd "$WORKTREE_POOL_LIB_DIR/../../.." && pwd)}"
+
+if ! declare -F vibe_log >/dev/null 2>&1 && [[ -f "$PROJECT_ROOT/bin/vibe-logger-lib.sh" ]]; then
+    source "$PROJECT_ROOT/bin/vibe-logger-lib.sh"
+fi
+
+# =========================================
+# Configuration
+# =========================================
+
+WORKTREE_POOL_ENABLED="${WORKTREE_POOL_ENABLED:-false}"  # Used by worktree-parallel.sh
+WORKTREE_POOL_REPO="${WORKTREE_POOL_REPO:-$PROJECT_ROOT}"
+WORKTREE_POOL_DIR="${WORKTREE_POOL_DIR:-${WORKTREE_BASE:-$WORKTREE_POOL_REPO/worktrees}/.pool}"
+WORKTREE_POOL_BASE_REF="${WORKTREE_POOL_BASE_REF:-HEAD}"  # Commit idle slots are reset to
+WORKTREE_POOL_LOW="${WORKTREE_POOL_LOW:-2}"    # Refill in the background below this many idle slots
+WORKTREE_POOL_HIGH="${WORKTREE_POOL_HIGH:-7}"  # Fill up to / keep at most this many idle slots
+WORKTREE_POOL_OWNER_PID="${WORKTREE_POOL_OWNER_PID:-$$}"  # Leases outlive parallel/xargs workers
+
+# =========================================
+# Utility Functions
+# =========================================
+
+# Run git in the pool's repository
+_worktree_pool_git() {
+    git -C "$WORKTREE_POOL_REPO" "$@"
+}
+
+# Count idle slots into a variable (no subshell)
+# Usage: _worktree_pool_count_idle <var_name>
+_worktree_pool_count_idle() {
+    local -a markers=("$WORKTREE_POOL_DIR"/idle/*)
+    [[ -e "${markers[0]}" ]] || markers=()
+    printf -v "$1" '%d' "${#markers[@]}"
+}
+
+# Cheap health check of a slot: its .git file still points at an existing
+# admin directory in the repository
+_worktree_pool_slot_ok() {
+    local path="$1"
+    local gitdir=""
+
+    [[ -f "$path/.git" ]] || return 1
+    read -r _ gitdir < "$path/.git" || return 1
+    [[ -n "$gitdir" && -d "$gitdir" ]]
+}
+
+# Restore a full checkout if the lease enabled sparse-checkout
+# (WORKTREE_SPARSE_CHECKOUT=true), so idle slots stay interchangeable
+_worktree_pool_unsparse() {
+    local path="$1"
+
+    [[ "$(git -C "$path" config --get core.sparseCheckout 2>/dev/null)" == "true" ]] || return 0
+    git -C "$path" sparse-checkout disable >/dev/null 2>&1
+}
+
+# Remove a slot and its markers
+_worktree_pool_discard() {
+    local slot="$1"
+    local path="${2:-$WORKTREE_POOL_DIR/slots/$slot}"
+
+    _worktree_pool_git worktree remove --force "$path" >/dev/null 2>&1 || rm -rf "$path"
+    rm -f "$WORKTREE_POOL_DIR/idle/$slot" "$WORKTREE_POOL_DIR/leased/$slot"
+}
+
+# Create one detached slot at the base commit
+# Usage: _worktree_pool_add_slot <var_name>
+_worktree_pool_add_slot() {
+    local new_slot="slot-${EPOCHSECONDS}-${BASHPID}-${RANDOM}"
+
+    if ! _worktree_pool_git worktree add --quiet --detach \
+            "$WORKTREE_POOL_DIR/slots/$new_slot" "$WORKTREE_POOL_BASE_REF" >/dev/null 2>&1; then
+        echo "ERROR [WORKTREE_POOL]: Failed to add slot $new_slot" >&2
+        return 1
+    fi
+    printf -v "$1" '%s' "$new_slot"
+}
+
+# =========================================
+# Pool Management
+# =========================================
+
+# Create the pool directories
+#
+# Usage: worktree_pool_init
+#
+worktree_pool_init() {
+    mkdir -p "$WORKTREE_POOL_DIR/slots" "$WORKTREE_POOL_DIR/idle" "$WORKTREE_POOL_DIR/leased"
+}
+
+# Pre-warm idle slots up to a count
+#
+# Usage: worktree_pool_fill [count]
+#
+# Args:
+#   count: Target number of idle slots (default: WORKTREE_POOL_HIGH)
+#
+# Returns:
+#   0 on success, 1 if a slot could not be created
+#
+worktree_pool_fill() {
+    worktree_pool_init
+    if ! command -v flock >/dev/null 2>&1; then
+        _worktree_pool_fill_locked "$@"
+        return
+    fi
+    # One filler at a time; it recounts after waiting, so fills never overshoot
+    {
+        flock -x 9 && _worktree_pool_fill_locked "$@"
+    } 9>>"$WORKTREE_POOL_DIR/.fill.lock"
+}
+
+# Background refill below the low watermark (skipped while another fill runs)
+_worktree_pool_refill() {
+    if command -v flock >/dev/null 2>&1; then
+        {
+            flock -n 9 && _worktree_pool_fill_locked
+        } 9>>"$WORKTREE_POOL_DIR/.fill.lock"
+    else
+        _worktree_pool_fill_locked
+    fi
+}
+
+_worktree_pool_fill_locked() {
+    local target="${1:-$WORKTREE_POOL_HIGH}"
+    local idle slot added=0
+
+    _worktree_pool_count_idle idle
+    while [[ $idle -lt $target ]]; do
+        _worktree_pool_add_slot slot || return 1
+        : > "$WORKTREE_POOL_DIR/idle/$slot"
+        idle=$((idle + 1))
+        added=$((added + 1))
+    done
+
+    if [[ $added -gt 0 ]]; then
+        vibe_log "worktree-pool" "fill" \
+            "{\"added\": $added, \"idle\": $idle}" \
+            "Pre-warmed $added worktree pool slots" \
+            "{\"next\": [\"checkout\"]}" \
+            "worktree-pool"
+    fi
+}
+
+# Hand out a worktree at a path, checked out on a branch
+#
+# Usage: worktree_pool_checkout <target_path> <branch> [base_ref]
+#
+# Args:
+#   target_path: Where the worktree should live (must not be in use)
+#   branch:      Branch to create or reset at base_ref
+#   base_ref:    Commit to check out (default: WORKTREE_POOL_BASE_REF)
+#
+# Returns:
+#   0 and prints the path on success, 1 on failure
+#
+# Uses an idle slot when one is healthy, otherwise creates one (cold path).
+# Refills the pool in the background once fewer than WORKTREE_POOL_LOW slots
+# are idle.
+#
+worktree_pool_checkout() {
+    local target_path="$1"
+    local branch="$2"
+    local base_ref="${3:-$WORKTREE_POOL_BASE_REF}"
+    local marker slot="" origin="pool" idle base_commit
+
+    # Resolve in the main repository (HEAD inside a slot is the slot's own HEAD)
+    if ! base_commit=$(_worktree_pool_git rev-parse --verify --quiet "${base_ref}^{commit}"); then
+        echo "ERROR [WORKTREE_POOL]: Unknown base ref: $base_ref" >&2
+        return 1
+    fi
+    worktree_pool_init
+
+    # Claim an idle slot (rename is atomic: one process wins each marker)
+    for marker in "$WORKTREE_POOL_DIR"/idle/*; do
+        [[ -e "$marker" ]] || break
+        slot="${marker##*/}"
+        if mv "$marker" "$WORKTREE_POOL_DIR/leased/$slot" 2>/dev/null; then
+            _worktree_pool_slot_ok "$WORKTREE_POOL_DIR/slots/$slot" && break
+            _worktree_pool_discard "$slot"
+        fi
+        slot=""
+    done
+
+    if [[ -z "$slot" ]]; then
+        origin="cold"
+        _worktree_pool_add_slot slot || return 1
+        : > "$WORKTREE_POOL_DIR/leased/$slot"
+    fi
+
+    if [[ -e "$target_path" ]]; then
+        echo "WARNING: Worktree already exists at $target_path, removing..." >&2
+        _worktree_pool_git worktree remove --force "$target_path" >/dev/null 2>&1 || true
+        rm -rf "$target_path"
+    fi
+    mkdir -p "$(dirname "$target_path")"
+
+    if ! _worktree_pool_git worktree move "$WORKTREE_POOL_DIR/slots/$slot" "$target_path" 2>/dev/null ||
+            ! git -C "$target_path" checkout --quiet --force -B "$branch" "$base_commit" 2>/dev/null; then
+        echo "ERROR [WORKTREE_POOL]: Failed to check out $branch at $target_path" >&2
+        _worktree_pool_discard "$slot" "$target_path"
+        _worktree_pool_discard "$slot"
+        return 1
+    fi
+    printf '%s %s %s %s\n' "$target_path" "$branch" "$WORKTREE_POOL_OWNER_PID" "$EPOCHSECONDS" > "$WORKTREE_POOL_DIR/leased/$slot"
+
+    # Low watermark: refill without delaying this checkout. The detached job
+    # must not inherit the caller's lock fds (create_worktree holds the per-AI
+    # flock on fd 200), or it would keep that AI locked until the refill ends.
+    _worktree_pool_count_idle idle
+    if [[ $idle -lt $WORKTREE_POOL_LOW ]]; then
+        ( _worktree_pool_refill >/dev/null 2>&1 200>&- 9>&- & )
+    fi
+
+    vibe_log "worktree-pool" "checkout" \
+        "{\"slot\": \"$slot\", \"path\": \"$target_path\", \"branch\": \"$branch\", \"origin\": \"$origin\", \"idle\": $idle}" \
+        "Checked out worktree pool slot $slot ($origin)" \
+        "{\"next\": [\"return\"]}" \
+        "worktree-pool"
+
+    echo "$target_path"
+}
+
+# Recycle a checked-out worktree back into the pool
+#
+# Usage: worktree_pool_return <path>
+#
+# Args:
+#   path: Path given by worktree_pool_checkout
+#
+# Returns:
+#   0 on success, 1 if the path is not leased from the pool
+#
+# Local changes are discarded and sparse-checkout is disabled. The slot is
+# reset to WORKTREE_POOL_BASE_REF and cleaned, which releases the branch. Above
+# the high watermark, or if the reset fails, the slot is removed instead.
+#
+worktree_pool_return() {
+    local path="$1"
+    local marker slot="" leased_path branch pid since idle action="recycle" base_commit=""
+
+    for marker in "$WORKTREE_POOL_DIR"/leased/*; do
+        [[ -e "$marker" ]] || break
+        leased_path=""
+        read -r leased_path branch pid since < "$marker" || true
+        if [[ "$leased_path" == "$path" ]]; then
+            slot="${marker##*/}"
+            break
+        fi
+    done
+
+    if [[ -z "$slot" ]]; then
+        echo "ERROR [WORKTREE_POOL]: $path is not leased from the pool" >&2
+        return 1
+    fi
+
+    _worktree_pool_count_idle idle
+    if [[ $idle -ge $WORKTREE_POOL_HIGH ]]; then
+        action="remove"
+        _worktree_pool_discard "$slot" "$path"
+    elif base_commit=$(_worktree_pool_git rev-parse --verify --quiet "${WORKTREE_POOL_BASE_REF}^{commit}") &&
+            _worktree_pool_unsparse "$path" &&
+            git -C "$path" checkout --quiet --force --detach "$base_commit" 2>/dev/null &&
+            git -C "$path" clean -qffdx 2>/dev/null &&
+            _worktree_pool_git worktree move "$path" "$WORKTREE_POOL_DIR/slots/$slot" 2>/dev/null; then
+        : > "$marker"
+        mv "$marker" "$WORKTREE_POOL_DIR/idle/$slot"
+    else
+        action="discard"
+        _worktree_pool_discard "$slot" "$path"
+        _worktree_pool_discard "$slot"
+    fi
+
+    vibe_log "worktree-pool" "return" \
+        "{\"slot\": \"$slot\", \"path\": \"$path\", \"action\": \"$action\", \"idle\": $idle}" \
+        "Returned worktree pool slot $slot ($action)" \
+        "{\"next\": [\"checkout\"]}" \
+        "worktree-pool"
+}
+
+# List leased worktree paths, one per line
+#
+# Usage: worktree_pool_leases [owner_pid]
+#
+# Args:
+#   owner_pid: Only list leases taken under this WORKTREE_POOL_OWNER_PID
+#
+worktree_pool_leases() {
+    local owner="${1:-}"
+    local marker leased_path branch pid rest
+
+    for marker in "$WORKTREE_POOL_DIR"/leased/*; do
+        [[ -e "$marker" ]] || break
+        leased_path="" pid=""
+        read -r leased_path branch pid rest < "$marker" || true
+        [[ -n "$leased_path" ]] || continue
+        [[ -z "$owner" || "$pid" == "$owner" ]] || continue
+        echo "$leased_path"
+    done
+}
+
+# Verify every slot and drop broken ones
+#
+# Usage: worktree_pool_health_check
+#
+# Returns:
+#   0 if every slot was healthy, 1 if any slot was dropped or recycled
+#
+# Idle slots must be registered, clean worktrees. Leases whose process has
+# exited are returned to the pool.
+#
+worktree_pool_health_check() {
+    local marker slot path leased_path branch pid since unhealthy=0
+
+    worktree_pool_init
+    _worktree_pool_git worktree prune 2>/dev/null || true
+
+    for marker in "$WORKTREE_POOL_DIR"/idle/*; do
+        [[ -e "$marker" ]] || break
+        slot="${marker##*/}"
+        path="$WORKTREE_POOL_DIR/slots/$slot"
+        if ! _worktree_pool_slot_ok "$path" ||
+                [[ -n "$(git -C "$path" status --porcelain --ignored 2>/dev/null || echo broken)" ]]; then
+            # Claim it first so a concurrent checkout cannot receive it
+            mv "$marker" "$WORKTREE_POOL_DIR/leased/$slot" 2>/dev/null || continue
+            _worktree_pool_discard "$slot"
+            unhealthy=$((unhealthy + 1))
+        fi
+    done
+
+    for marker in "$WORKTREE_POOL_DIR"/leased/*; do
+        [[ -e "$marker" ]] || break
+        leased_path="" pid=""
+        read -r leased_path branch pid since < "$marker" || true
+        if [[ -n "$pid" ]] && ! kill -0 "$pid" 2>/dev/null; then
+            worktree_pool_return "$leased_path" >/dev/null 2>&1 || _worktree_pool_discard "${marker##*/}" "$leased_path"
+            unhealthy=$((unhealthy + 1))
+        fi
+    done
+
+    # Slots without a marker (e.g. a crash between add and marking)
+    for path in "$WORKTREE_POOL_DIR"/slots/*; do
+        [[ -e "$path" ]] || break
+        slot="${path##*/}"
+        if [[ ! -e "$WORKTREE_POOL_DIR/idle/$slot" && ! -e "$WORKTREE_POOL_DIR/leased/$slot" ]]; then
+            _worktree_pool_discard "$slot"
+            unhealthy=$((unhealthy + 1))
+        fi
+    done
+
+    vibe_log "worktree-pool" "health-check" \
+        "{\"unhealthy\": $unhealthy}" \
+        "Worktree pool health check: $unhealthy slots dropped or recycled" \
+        "{\"action\": \"fill\"}" \
+        "worktree-pool"
+
+    [[ $unhealthy -eq 0 ]]
+}
+
+# Print idle/leased slot counts
+#
+# Usage: worktree_pool_status
+#
+worktree_pool_status() {
+    local idle leased
+    local -a markers=("$WORKTREE_POOL_DIR"/leased/*)
+
+    [[ -e "${markers[0]}" ]] || markers=()
+    leased=${#markers[@]}
+    _worktree_pool_count_idle idle
+    echo "idle: $idle, leased: $leased, watermarks: $WORKTREE_POOL_LOW/$WORKTREE_POOL_HIGH"
+}
+
+# Remove every idle slot
+#
+# Usage: worktree_pool_drain
+#
+worktree_pool_drain() {
+    local marker slot
+
+    for marker in "$WORKTREE_POOL_DIR"/idle/*; do
+        [[ -e "$marker" ]] || break
+        slot="${marker##*/}"
+        mv "$marker" "$WORKTREE_POOL_DIR/leased/$slot" 2>/dev/null || continue
+        _worktree_pool_discard "$slot"
+    done
+    _worktree_pool_git worktree prune 2>/dev/null || true
+}
+
+# Export for parallel/xargs subshells
+export -f _worktree_pool_git
+export -f _worktree_pool_count_idle
+export -f _worktree_pool_slot_ok
+export -f _worktree_pool_unsparse
+export -f _worktree_pool_discard
+export -f _worktree_pool_add_slot
+export -f worktree_pool_init
+export -f worktree_pool_fill
+export -f _worktree_pool_refill
+export -f _worktree_pool_fill_locked
+export -f worktree_pool_checkout
+export -f worktree_pool_return
+export -f worktree_pool_leases
+export -f worktree_pool_health_check
+export -f worktree_pool_status
+export -f worktree_pool_drain
+export WORKTREE_POOL_ENABLED WORKTREE_POOL_REPO WORKTREE_POOL_DIR WORKTREE_POOL_BASE_REF
+export WORKTREE_POOL_LOW WORKTREE_POOL_HIGH WORKTREE_POOL_OWNER_PID
+
+# End of worktree-pool.sh
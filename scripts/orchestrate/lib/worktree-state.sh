@@ -5,6 +5,12 @@
 
 set -euo pipefail
 
+# EPOCHSECONDS・printf '%(...)T' を使用するため Bash 5.0 以上が必要
+if (( BASH_VERSINFO[0] < 5 )); then
+    echo "ERROR: worktree-state.sh には Bash 5.0 以上が必要です（現在: $BASH_VERSION）" >&2
+    return 1 2>/dev/null || exit 1
+fi
+
 # State transition validation
 # Valid transitions: none → creating → active → cleaning → none
 
@@ -19,6 +25,10 @@ if [[ -f "$SCRIPT_DIR/worktree-errors.sh" ]]; then
     source "$SCRIPT_DIR/worktree-errors.sh"
 fi
 
+if [[ -f "$SCRIPT_DIR/worktree-metrics-store.sh" ]]; then
+    source "$SCRIPT_DIR/worktree-metrics-store.sh"
+fi
+
 # Define valid states
 VALID_STATES=("none" "creating" "active" "cleaning")
 
@@ -109,8 +119,9 @@ update_worktree_state() {
     fi
     
     # Get current timestamp in ISO 8601 format
+    local epoch="$EPOCHSECONDS"
     local timestamp
-    timestamp=$(date -u +"%Y-%m-%dT%H:%M:%SZ")
+    TZ=UTC printf -v timestamp '%(%Y-%m-%dT%H:%M:%SZ)T' "$epoch"
     
     # Prepare the NDJSON line
     local ndjson_line="{\"timestamp\":\"$timestamp\",\"ai\":\"$ai\",\"state\":\"$state\""
@@ -141,6 +152,11 @@ update_worktree_state() {
     # Write the NDJSON line to the file ensuring it's a single line
     echo "$ndjson_line" >> "$state_file"
     
+    # Roll the event up into the metrics store (durations are paired there)
+    if command -v metrics_rollup_state_event >/dev/null 2>&1; then
+        metrics_rollup_state_event "$ai" "$state" "$epoch" || true
+    fi
+    
     # Log the state update
     if command -v log_info >/dev/null 2>&1; then
         log_info "Updated worktree state for AI $ai: $state"
@@ -2,9 +2,15 @@
 #
 # worktree-benchmark.sh
 # Phase 3.2: GNU Parallel vs 基本的な並列処理のベンチマーク
+# Worktreeプール: コールド作成 vs プールからのチェックアウト
 #
 # Usage:
-#   bash scripts/worktree-benchmark.sh
+#   bash scripts/worktree-benchmark.sh [--pool-only]
+#
+# 環境変数:
+#   POOL_BENCH_RUNS   プール比較の反復回数（デフォルト: 5）
+#   POOL_BENCH_FILES  プール比較用の合成リポジトリのファイル数（デフォルト: 30000）
+#   POOL_BENCH_REPO   合成リポジトリの代わりに使うリポジトリ（例: $PROJECT_ROOT）
 #
 
 set -euo pipefail
@@ -15,11 +21,99 @@ PROJECT_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 # worktree-core.shをソース
 source "$PROJECT_ROOT/scripts/orchestrate/lib/worktree-core.sh"
 
+# ミリ秒単位の経過時間（フォークなし）
+elapsed_ms() {
+  local end=$EPOCHREALTIME
+  printf -v "$1" '%d' $(( (${end/./} - ${2/./}) / 1000 ))
+}
+
+# 合成リポジトリ作成（fast-importで作業ツリーを書かずにコミットだけ作る）
+create_bench_repo() {
+  local repo="$1"
+  local files="$2"
+  local i content
+
+  git init --quiet "$repo"
+  {
+    printf 'commit refs/heads/bench-base\ncommitter Bench <bench@example.com> 0 +0000\ndata 5\nbench\n'
+    for ((i=0; i<files; i++)); do
+      printf -v content 'module %d\n%*s\n' "$i" 1000 "line $((i * 7919 % 1000003))"
+      printf 'M 644 inline src/d%d/f%d.txt\ndata %d\n%s\n' $((i / 100)) "$i" "${#content}" "$content"
+    done
+  } | git -C "$repo" fast-import --quiet
+}
+
+# コールド作成（git worktree add/remove）とプール（checkout/return）の比較
+run_pool_benchmark() {
+  local runs="${POOL_BENCH_RUNS:-5}"
+  local files="${POOL_BENCH_FILES:-30000}"
+  local bench_dir repo base_ref i start ms path
+  local cold_add=0 cold_remove=0 pool_checkout=0 pool_return=0
+
+  bench_dir="$(mktemp -d)"
+  if [[ -n "${POOL_BENCH_REPO:-}" ]]; then
+    repo="$POOL_BENCH_REPO"
+    base_ref="HEAD"
+  else
+    repo="$bench_dir/repo"
+    base_ref="bench-base"
+    create_bench_repo "$repo" "$files"
+  fi
+  (
+    export WORKTREE_POOL_REPO="$repo"
+    export WORKTREE_POOL_DIR="$bench_dir/pool"
+    export WORKTREE_POOL_BASE_REF="$base_ref"
+    export WORKTREE_POOL_LOW=0 WORKTREE_POOL_HIGH=1
+    source "$PROJECT_ROOT/scripts/orchestrate/lib/worktree-pool.sh"
+
+    echo "━━━ テスト0: コールド作成 vs Worktreeプール（${runs}回） ━━━"
+    echo "リポジトリ: $repo ($(git -C "$repo" ls-tree -r --name-only "$base_ref" | wc -l) files)"
+    worktree_pool_fill 1 >/dev/null 2>&1
+
+    for ((i=0; i<runs; i++)); do
+      path="$bench_dir/cold-$i"
+      start=$EPOCHREALTIME
+      git -C "$repo" worktree add --quiet -B "bench/pool-cold-$i" "$path" "$base_ref" >/dev/null 2>&1
+      elapsed_ms ms "$start"; cold_add=$((cold_add + ms))
+      start=$EPOCHREALTIME
+      git -C "$repo" worktree remove --force "$path" >/dev/null 2>&1
+      elapsed_ms ms "$start"; cold_remove=$((cold_remove + ms))
+
+      path="$bench_dir/leased-$i"
+      start=$EPOCHREALTIME
+      worktree_pool_checkout "$path" "bench/pool-leased-$i" "$base_ref" >/dev/null 2>&1
+      elapsed_ms ms "$start"; pool_checkout=$((pool_checkout + ms))
+      start=$EPOCHREALTIME
+      worktree_pool_return "$path" >/dev/null 2>&1
+      elapsed_ms ms "$start"; pool_return=$((pool_return + ms))
+    done
+
+    worktree_pool_drain >/dev/null 2>&1
+    for ((i=0; i<runs; i++)); do
+      git -C "$repo" branch -D "bench/pool-cold-$i" "bench/pool-leased-$i" >/dev/null 2>&1 || true
+    done
+
+    printf "  %-28s %10s %10s\n" "" "acquire" "release"
+    printf "  %-28s %8dms %8dms\n" "cold (worktree add/remove)" $((cold_add / runs)) $((cold_remove / runs))
+    printf "  %-28s %8dms %8dms\n" "pool (checkout/return)" $((pool_checkout / runs)) $((pool_return / runs))
+    echo ""
+    echo "  📊 取得レイテンシ: $((cold_add / runs))ms → $((pool_checkout / runs))ms" \
+      "($(( cold_add / (pool_checkout > 0 ? pool_checkout : 1) ))x)"
+    echo ""
+  )
+  rm -rf "$bench_dir"
+}
+
 echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 echo "  Worktree並列処理ベンチマーク"
 echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 echo ""
 
+run_pool_benchmark
+if [[ "${1:-}" == "--pool-only" ]]; then
+  exit 0
+fi
+
 # 前提条件チェック
 if ! command -v hyperfine &>/dev/null; then
   echo "警告: hyperfineが見つかりません"
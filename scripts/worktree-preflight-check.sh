@@ -93,10 +93,10 @@ fi
 # Bashバージョンチェック
 log_info "Bashバージョンをチェック中..."
 bash_version=${BASH_VERSION%%.*}
-if [[ $bash_version -ge 4 ]]; then
-    log_success "Bash $BASH_VERSION (>= 4.0が必要)"
+if [[ $bash_version -ge 5 ]]; then
+    log_success "Bash $BASH_VERSION (>= 5.0が必要)"
 else
-    log_error "Bash $BASH_VERSION は要件を満たしていません（>= 4.0が必要）"
+    log_error "Bash $BASH_VERSION は要件を満たしていません（>= 5.0が必要）"
 fi
 
 echo ""
@@ -0,0 +1,98 @@
+#!/usr/bin/env bash
+# テスト共通ヘルパー
+# tests/test-*.sh の先頭で source して使用する
+#
+#   source "$(dirname "${BASH_SOURCE[0]}")/lib/test-helpers.sh"
+#   test_init my-test               # TEST_DIR を作成（終了時に削除）
+#   assert_eq "name" expected actual
+#   test_summary                    # 結果を表示して終了
+#
+# スタブAIを使うテスト:
+#   test_stub_root                  # 仮のPROJECT_ROOT（STUB_ROOT）とPATHを用意
+#   test_stub_ai qwen <<'EOF'       # $STUB_ROOT/bin/qwen-wrapper.sh を作成
+#   ...
+#   EOF
+
+set -uo pipefail
+# Note: -e を外して失敗しても続行する
+
+REPO_ROOT="$(cd "$(dirname "${BASH_SOURCE[0]}")/../.." && pwd -P)"
+
+# カラー出力（multi-ai-core.sh と同じ変数。定義済みなら上書きしない）
+if [[ ! -v RED ]]; then
+    if [[ -t 1 ]] && [[ -z "${NO_COLOR:-}" ]]; then
+        RED='\033[0;31m'
+        GREEN='\033[0;32m'
+        BLUE='\033[0;34m'
+        YELLOW='\033[0;33m'
+        CYAN='\033[0;36m'
+        MAGENTA='\033[0;35m'
+        NC='\033[0m'
+    else
+        RED='' GREEN='' BLUE='' YELLOW='' CYAN='' MAGENTA='' NC=''
+    fi
+fi
+
+TESTS_RUN=0
+TESTS_FAILED=0
+TEST_DIR=""
+
+# テスト用の一時ディレクトリを作成し、終了時に削除する
+# Args:
+#   $1 - name: ディレクトリ名の接頭辞（/tmp/<name>-XXXXXX）
+test_init() {
+    TEST_DIR="$(mktemp -d "/tmp/$1-XXXXXX")"
+    trap 'rm -rf "$TEST_DIR"' EXIT
+}
+
+# スタブのwrapperを置く仮のPROJECT_ROOTを用意する
+# STUB_ROOT/bin にwrapper、TEST_DIR/path にCLI（PATH先頭）、TEST_DIR/out に出力
+test_stub_root() {
+    STUB_ROOT="$TEST_DIR/root"
+    mkdir -p "$STUB_ROOT/bin" "$TEST_DIR/path" "$TEST_DIR/out"
+
+    export PATH="$TEST_DIR/path:$PATH"
+    export PROJECT_ROOT="$STUB_ROOT"
+    export WRAPPER_NON_INTERACTIVE=1
+    export MULTI_AI_INIT=test
+}
+
+# スタブAIのwrapperを標準入力の内容で作成する
+# Args:
+#   $1 - ai: AI名（<ai>-wrapper.sh と PATH上の <ai> を作成）
+test_stub_ai() {
+    local ai="$1"
+
+    cat > "$STUB_ROOT/bin/${ai}-wrapper.sh"
+    chmod +x "$STUB_ROOT/bin/${ai}-wrapper.sh"
+    # check_ai_available 用（PATH上にCLIが存在すること）
+    ln -sf "$STUB_ROOT/bin/${ai}-wrapper.sh" "$TEST_DIR/path/$ai"
+}
+
+assert_eq() {
+    local test_name="$1"
+    local expected="$2"
+    local actual="$3"
+
+    TESTS_RUN=$((TESTS_RUN + 1))
+    if [[ "$expected" == "$actual" ]]; then
+        echo -e "${GREEN}[PASS]${NC} $test_name"
+    else
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        echo -e "${RED}[FAIL]${NC} $test_name (expected: $expected, actual: $actual)"
+    fi
+}
+
+# 結果を表示して終了する（全件成功なら0）
+# sourceしたライブラリがEXIT trapを置き換えることがあるため、TEST_DIRはここでも削除する
+test_summary() {
+    [[ -z "$TEST_DIR" ]] || rm -rf "$TEST_DIR"
+
+    echo ""
+    if [[ $TESTS_FAILED -eq 0 ]]; then
+        echo -e "${GREEN}All $TESTS_RUN tests passed${NC}"
+        exit 0
+    fi
+    echo -e "${RED}$TESTS_FAILED/$TESTS_RUN tests failed${NC}"
+    exit 1
+}
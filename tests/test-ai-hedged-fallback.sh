@@ -0,0 +1,135 @@
+#!/usr/bin/env bash
+# call_ai_with_fallback / call_ai 自動フォールバックのヘッジ実行テスト
+# スタブAI CLIで、プライマリがp95を超えたらフォールバックを並走させ、
+# 先に成功した結果を採用して負けた側を終了させることを検証
+
+source "$(dirname "${BASH_SOURCE[0]}")/lib/test-helpers.sh"
+
+# テスト環境（スタブのwrapperを置いた仮のPROJECT_ROOT）
+test_init multi-ai-hedge-test
+test_stub_root
+FINISHED_LOG="$TEST_DIR/stub-finished.log"
+
+# スタブAI: <ai>.delay の秒数だけ待って応答する（"fail" なら即失敗）
+# 最後まで実行されたら FINISHED_LOG に記録（終了させられた側は記録されない）
+for ai in qwen droid; do
+    test_stub_ai "$ai" <<EOF
+#!/usr/bin/env bash
+delay=\$(cat "$TEST_DIR/${ai}.delay")
+[[ "\$delay" == "fail" ]] && exit 1
+sleep "\$delay"
+echo "$ai" >> "$FINISHED_LOG"
+echo "$ai answer"
+EOF
+done
+
+export AI_CACHE_ENABLED=0
+export AI_HEDGE_ENABLED=true
+export AI_HEDGE_BUDGET=2
+
+# ログ関数はmulti-ai-core.shのものを使用
+cd "$TEST_DIR"
+source "$REPO_ROOT/scripts/orchestrate/orchestrate-multi-ai.sh" >/dev/null 2>&1
+set +e
+
+hedge_calls() {
+    awk '$NF == "hedge" { n++ } END { print n + 0 }' "$API_CALL_LOG" 2>/dev/null || echo 0
+}
+
+finished() {
+    awk -v ai="$1" '$0 == ai { n++ } END { print n + 0 }' "$FINISHED_LOG" 2>/dev/null || echo 0
+}
+
+stub_running() {
+    pgrep -f "$STUB_ROOT/bin/$1-wrapper.sh" >/dev/null && echo running || echo stopped
+}
+
+# run_hedged <qwen_delay> <droid_delay> <name>: 所要時間(ms)を ELAPSED_MS に設定
+run_hedged() {
+    echo "$1" > "$TEST_DIR/qwen.delay"
+    echo "$2" > "$TEST_DIR/droid.delay"
+    local start=${EPOCHREALTIME/./}
+    call_ai_with_fallback qwen droid "Review the hedging test" 30 "$TEST_DIR/out/$3.txt" >/dev/null 2>&1
+    RUN_EXIT=$?
+    ELAPSED_MS=$(( (${EPOCHREALTIME/./} - start) / 1000 ))
+}
+
+# テスト1: 履歴が足りない間はヘッジしない（従来どおり逐次）
+for i in 1 2 3 4 5; do
+    run_hedged 0.1 0.1 "warmup-$i"
+done
+assert_eq "no hedge without latency history" 0 "$(hedge_calls)"
+assert_eq "latency history recorded per execution" 5 "$(wc -l < "$AI_LATENCY_LOG_DIR/qwen.log")"
+p95=$(get_ai_latency_p95 qwen)
+echo -e "${CYAN}[INFO]${NC} qwen p95: ${p95}ms"
+assert_eq "p95 is known after AI_HEDGE_MIN_SAMPLES calls" true "$([[ "$p95" -ge 100 ]] && echo true || echo false)"
+
+# テスト2: プライマリが遅い → ヘッジが勝ち、プライマリは終了させられる
+before=$(finished qwen)
+run_hedged 5 0.2 slow-primary
+assert_eq "hedged call succeeds" 0 "$RUN_EXIT"
+assert_eq "hedge result is used" "droid answer" "$(cat "$TEST_DIR/out/slow-primary.txt")"
+assert_eq "hedge counted against the API call log" 1 "$(hedge_calls)"
+assert_eq "result arrives well before the slow primary" true "$([[ $ELAPSED_MS -lt 3000 ]] && echo true || echo false)"
+assert_eq "losing primary is terminated" stopped "$(stub_running qwen)"
+assert_eq "losing primary never finished" "$before" "$(finished qwen)"
+assert_eq "censored primary latency is recorded" 6 "$(wc -l < "$AI_LATENCY_LOG_DIR/qwen.log")"
+
+# テスト3: ヘッジ後にプライマリが先に成功 → ヘッジ側を終了させる
+sleep 0.2
+before=$(finished droid)
+run_hedged 1 5 primary-wins
+assert_eq "primary result is used" "qwen answer" "$(cat "$TEST_DIR/out/primary-wins.txt")"
+assert_eq "hedge was launched" 2 "$(hedge_calls)"
+assert_eq "losing hedge is terminated" stopped "$(stub_running droid)"
+assert_eq "losing hedge never finished" "$before" "$(finished droid)"
+
+# テスト4: 予算を使い切ったらヘッジせずにプライマリを待つ
+run_hedged 1 0.1 budget-exhausted
+assert_eq "no hedge beyond AI_HEDGE_BUDGET" 2 "$(hedge_calls)"
+assert_eq "primary result without hedge" "qwen answer" "$(cat "$TEST_DIR/out/budget-exhausted.txt")"
+
+# テスト5: レート制限に達していればヘッジ予算は確保できない
+AI_HEDGE_BUDGET=100
+API_RATE_LIMIT=1 ai_hedge_claim_budget droid >/dev/null 2>&1
+assert_eq "hedge refused at the API rate limit" 1 "$?"
+assert_eq "refused hedge is not logged" 2 "$(hedge_calls)"
+
+# テスト6: プライマリがヘッジ前に失敗 → 従来どおりフォールバック（予算は使わない）
+run_hedged fail 0.1 primary-fails
+assert_eq "fallback after a fast failure" "droid answer" "$(cat "$TEST_DIR/out/primary-fails.txt")"
+assert_eq "fast failure does not spend the hedge budget" 2 "$(hedge_calls)"
+
+# テスト7: 両方失敗したら失敗を返す
+AI_HEDGE_BUDGET=100
+run_hedged fail fail both-fail
+assert_eq "failure when primary and fallback fail" true "$([[ $RUN_EXIT -ne 0 ]] && echo true || echo false)"
+
+# テスト8: call_ai の自動フォールバック（ENABLE_AI_FALLBACK）もヘッジ経由
+api_calls() {
+    awk -v ai="$1" '$2 == ai && $NF == "call_ai" { n++ } END { print n + 0 }' "$API_CALL_LOG" 2>/dev/null || echo 0
+}
+sleep 0.2
+echo 5 > "$TEST_DIR/qwen.delay"
+echo 0.2 > "$TEST_DIR/droid.delay"
+hedges_before=$(hedge_calls)
+calls_before=$(api_calls qwen)
+start=${EPOCHREALTIME/./}
+call_ai qwen "Review the hedging test" 30 "$TEST_DIR/out/call-ai.txt" >/dev/null 2>&1
+RUN_EXIT=$?
+ELAPSED_MS=$(( (${EPOCHREALTIME/./} - start) / 1000 ))
+assert_eq "call_ai hedges to the first fallback AI" 0 "$RUN_EXIT"
+assert_eq "call_ai uses the hedge result" "droid answer" "$(cat "$TEST_DIR/out/call-ai.txt")"
+assert_eq "call_ai hedge counted" $((hedges_before + 1)) "$(hedge_calls)"
+assert_eq "call_ai result arrives before the slow primary" true "$([[ $ELAPSED_MS -lt 3000 ]] && echo true || echo false)"
+assert_eq "call_ai primary is logged once" $((calls_before + 1)) "$(api_calls qwen)"
+assert_eq "call_ai losing primary is terminated" stopped "$(stub_running qwen)"
+
+# テスト9: call_ai でプライマリが即失敗 → フォールバックAIで1回だけ再実行
+before=$(finished droid)
+echo fail > "$TEST_DIR/qwen.delay"
+call_ai qwen "Review the hedging test" 30 "$TEST_DIR/out/call-ai-fails.txt" >/dev/null 2>&1
+assert_eq "call_ai falls back after a fast failure" "droid answer" "$(cat "$TEST_DIR/out/call-ai-fails.txt")"
+assert_eq "call_ai fallback runs once" $((before + 1)) "$(finished droid)"
+
+test_summary
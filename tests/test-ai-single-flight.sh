@@ -0,0 +1,83 @@
+#!/usr/bin/env bash
+# call_ai シングルフライト重複排除テスト
+# スタブAI CLIで、同一(AI, プロンプト)の同時呼び出しがAI実行1回に集約されることを検証
+
+source "$(dirname "${BASH_SOURCE[0]}")/lib/test-helpers.sh"
+
+# テスト設定
+CONCURRENT_CALLS="${1:-6}"
+STUB_DELAY="${2:-2}"
+
+# テスト環境（スタブのwrapperを置いた仮のPROJECT_ROOT）
+test_init multi-ai-single-flight-test
+test_stub_root
+CALL_LOG="$TEST_DIR/stub-calls.log"
+
+# スタブAI: 呼び出しを記録し、STUB_DELAY秒後に固定の応答を返す
+test_stub_ai qwen <<EOF
+#!/usr/bin/env bash
+echo "\$\$" >> "$CALL_LOG"
+sleep "$STUB_DELAY"
+echo "stub answer for: \${2:-stdin}"
+EOF
+
+export AI_CACHE_DIR="$TEST_DIR/ai-results"
+export ENABLE_AI_FALLBACK=false
+
+# ログ関数はmulti-ai-core.shのものを使用
+cd "$TEST_DIR"
+source "$REPO_ROOT/scripts/orchestrate/orchestrate-multi-ai.sh" >/dev/null 2>&1
+set +e
+
+stub_calls() {
+    if [[ -f "$CALL_LOG" ]]; then
+        wc -l < "$CALL_LOG" | tr -d ' '
+    else
+        echo 0
+    fi
+}
+
+echo -e "${CYAN}[INFO]${NC} $CONCURRENT_CALLS concurrent identical calls (stub delay: ${STUB_DELAY}s)"
+
+# テスト1: 同時呼び出し → AI実行は1回、残りは合流
+PROMPT="Summarize the single-flight test"
+pids=()
+for ((i = 0; i < CONCURRENT_CALLS; i++)); do
+    call_ai qwen "$PROMPT" 30 "$TEST_DIR/out/result-$i.txt" >/dev/null 2>&1 &
+    pids+=($!)
+done
+failed=0
+for pid in "${pids[@]}"; do
+    wait "$pid" || failed=$((failed + 1))
+done
+
+assert_eq "all concurrent calls succeed" 0 "$failed"
+assert_eq "stub AI executed exactly once" 1 "$(stub_calls)"
+
+identical=0
+for ((i = 0; i < CONCURRENT_CALLS; i++)); do
+    cmp -s "$TEST_DIR/out/result-0.txt" "$TEST_DIR/out/result-$i.txt" && identical=$((identical + 1))
+done
+assert_eq "every caller received the same result" "$CONCURRENT_CALLS" "$identical"
+assert_eq "result is the stub answer" "stub answer for: $PROMPT" "$(cat "$TEST_DIR/out/result-0.txt")"
+
+stats=$(ai_cache_stats)
+echo -e "${CYAN}[INFO]${NC} cache stats: $stats"
+assert_eq "miss counter" 1 "$(jq -r '.misses' <<< "$stats")"
+assert_eq "hit + coalesced counters" $((CONCURRENT_CALLS - 1)) "$(jq -r '.hits + .coalesced' <<< "$stats")"
+
+# テスト2: 完了後の同一呼び出しはキャッシュから返る
+call_ai qwen "$PROMPT" 30 "$TEST_DIR/out/result-again.txt" >/dev/null 2>&1
+assert_eq "later identical call is served from the store" 1 "$(stub_calls)"
+assert_eq "hit counter increments" $(( $(jq -r '.hits' <<< "$stats") + 1 )) "$(ai_cache_stats | jq -r '.hits')"
+
+# テスト3: 異なるプロンプトは合流しない
+call_ai qwen "A different prompt" 30 "$TEST_DIR/out/result-other.txt" >/dev/null 2>&1
+assert_eq "different prompt executes separately" 2 "$(stub_calls)"
+
+# テスト4: サイズ上限を超えると最も古い結果から削除
+AI_CACHE_MAX_SIZE=$(( $(wc -c < "$TEST_DIR/out/result-other.txt") + 1 ))
+call_ai qwen "A third prompt" 30 "$TEST_DIR/out/result-third.txt" >/dev/null 2>&1
+assert_eq "store is bounded by AI_CACHE_MAX_SIZE" 1 "$(ai_cache_stats | jq -r '.entries')"
+
+test_summary
@@ -0,0 +1,72 @@
+#!/usr/bin/env bash
+# markdown-parser.sh 回帰テスト
+# tests/fixtures/markdown-reviews/*.md の変換結果が expected/ の JSON と一致することを検証
+# （expected/ は従来の多パス実装の出力。@PROJECT_ROOT@ はリポジトリの実パスに置換して比較）
+
+source "$(dirname "${BASH_SOURCE[0]}")/lib/test-helpers.sh"
+
+FIXTURES_DIR="$REPO_ROOT/tests/fixtures/markdown-reviews"
+
+# expected/ はCロケールで生成（説明文の200文字切り詰めはロケール依存）
+export LC_ALL=C
+
+# テスト環境
+test_init markdown-parser-test
+export VIBE_LOG_DIR="$TEST_DIR/logs"
+
+source "$REPO_ROOT/scripts/lib/markdown-parser.sh" >/dev/null 2>&1
+set +e
+
+# assert_matches_expected <test_name> <actual.json> <expected.json>
+assert_matches_expected() {
+    local test_name="$1"
+    local actual_file="$2"
+    local expected_file="$3"
+
+    TESTS_RUN=$((TESTS_RUN + 1))
+    if diff <(sed "s|@PROJECT_ROOT@|$REPO_ROOT|g" "$expected_file") "$actual_file" > "$TEST_DIR/diff.txt" 2>&1; then
+        echo -e "${GREEN}[PASS]${NC} $test_name"
+    else
+        TESTS_FAILED=$((TESTS_FAILED + 1))
+        echo -e "${RED}[FAIL]${NC} $test_name"
+        head -20 "$TEST_DIR/diff.txt"
+    fi
+}
+
+fixture_count=$(find "$FIXTURES_DIR" -maxdepth 1 -name '*.md' | wc -l | tr -d ' ')
+echo -e "${CYAN}[INFO]${NC} $fixture_count fixtures in $FIXTURES_DIR"
+
+# テスト1: ディレクトリ一括変換（1回の呼び出し）が従来の出力と一致
+parse_markdown_review_dir "$FIXTURES_DIR" "$TEST_DIR/batch" >/dev/null 2>&1
+assert_eq "batch conversion succeeds" 0 "$?"
+for md in "$FIXTURES_DIR"/*.md; do
+    name="$(basename "$md" .md)"
+    assert_matches_expected "batch: $name" "$TEST_DIR/batch/$name.json" "$FIXTURES_DIR/expected/$name.json"
+done
+
+# テスト2: --security-metadata は従来の enrich_security_metadata 後の出力と一致
+parse_markdown_review_dir "$FIXTURES_DIR" "$TEST_DIR/security" --security-metadata >/dev/null 2>&1
+assert_eq "batch conversion with security metadata succeeds" 0 "$?"
+for md in "$FIXTURES_DIR"/*.md; do
+    name="$(basename "$md" .md)"
+    assert_matches_expected "security: $name" "$TEST_DIR/security/$name.json" "$FIXTURES_DIR/expected/$name.security.json"
+done
+
+# テスト3: 単一ファイル変換も同じ出力
+parse_markdown_review "$FIXTURES_DIR/claude-review.md" "$TEST_DIR/single/claude-review.json" >/dev/null 2>&1
+assert_eq "single file conversion succeeds" 0 "$?"
+assert_matches_expected "single: claude-review" "$TEST_DIR/single/claude-review.json" "$FIXTURES_DIR/expected/claude-review.json"
+
+# テスト4: 不正な入力は失敗として返し、他のファイルの変換は続行
+mkdir -p "$TEST_DIR/mixed"
+cp "$FIXTURES_DIR/headers-only.md" "$TEST_DIR/mixed/"
+: > "$TEST_DIR/mixed/empty.md"
+parse_markdown_review_dir "$TEST_DIR/mixed" "$TEST_DIR/mixed-out" >/dev/null 2>&1
+assert_eq "empty review makes the batch fail" 1 "$?"
+assert_matches_expected "valid review in a failing batch is still converted" \
+    "$TEST_DIR/mixed-out/headers-only.json" "$FIXTURES_DIR/expected/headers-only.json"
+
+parse_markdown_review "$TEST_DIR/missing.md" "$TEST_DIR/missing.json" >/dev/null 2>&1
+assert_eq "missing input fails" 1 "$?"
+
+test_summary
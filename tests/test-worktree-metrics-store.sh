@@ -0,0 +1,93 @@
+#!/usr/bin/env bash
+# worktree-metrics-store.sh テスト
+# イベント書き込み時の日別ロールアップ、生ログからの再構築、分位点照会を検証
+
+source "$(dirname "${BASH_SOURCE[0]}")/lib/test-helpers.sh"
+
+# テスト環境（ログは仮のPROJECT_ROOT配下に書き出す）
+test_init worktree-metrics-store-test
+export PROJECT_ROOT="$TEST_DIR"
+export VIBE_LOG_DIR="$TEST_DIR/logs/vibe"
+
+cd "$TEST_DIR"
+source "$REPO_ROOT/scripts/orchestrate/lib/worktree-metrics.sh" >/dev/null 2>&1
+set +e
+
+# テスト1: ストア導入前の生ログは照会時に再構築される（従来の集計と同じ値）
+past_day=$(date -d "2 days ago" +%Y%m%d)
+mkdir -p "logs/worktree-states/$past_day" "logs/worktree-history/$past_day"
+cat > "logs/worktree-states/$past_day/states.ndjson" <<'EOF'
+{"timestamp":"2025-11-08T10:00:00Z","ai":"qwen","state":"creating","branch":"b"}
+{"timestamp":"2025-11-08T10:00:05Z","ai":"qwen","state":"active"}
+{"timestamp":"2025-11-08T10:01:40Z","ai":"qwen","state":"cleaning"}
+{"timestamp":"2025-11-08T23:55:00Z","ai":"qwen","state":"creating"}
+{"timestamp":"2025-11-09T00:00:00Z","ai":"qwen","state":"cleaning"}
+{"timestamp":"2025-11-08T12:00:00Z","ai":"gemini","state":"cleaning"}
+EOF
+cat > "logs/worktree-history/$past_day/history.ndjson" <<'EOF'
+{"timestamp":"2025-11-08T10:00:00Z","event":"execution_start","workflow_id":"multi-ai-full-orchestrate-1234","task":"t","ais":["qwen"]}
+{"timestamp":"2025-11-08T10:05:00Z","event":"execution_end","workflow_id":"multi-ai-full-orchestrate-1234","status":"success","duration":300,"metrics":{}}
+{"timestamp":"2025-11-08T11:00:00Z","event":"execution_end","workflow_id":"multi-ai-full-orchestrate-5678","status":"failure","duration":101,"metrics":{}}
+{"timestamp":"2025-11-08T12:00:00Z","event":"execution_end","workflow_id":"multi-ai-review-42","status":"success","duration":60,"metrics":{}}
+EOF
+
+assert_eq "AI average from backfilled raw logs" 200 "$(get_ai_avg_duration qwen 7)"
+assert_eq "unpaired cleaning is ignored" 0 "$(get_ai_avg_duration gemini 7)"
+assert_eq "workflow average matches workflow_id prefix" 200 "$(get_workflow_avg_duration multi-ai-full-orchestrate 7)"
+assert_eq "workflow success rate" 66 "$(get_workflow_success_rate multi-ai 7)"
+assert_eq "backfilled day is rolled up once" true \
+    "$([[ -f "$METRICS_ROLLUP_DIR/$past_day.tsv" ]] && echo true || echo false)"
+assert_eq "window outside the backfilled day" 0 "$(get_workflow_avg_duration multi-ai-full-orchestrate 1)"
+
+# テスト2: イベント書き込み時の集計（creating→cleaningの対応付け）
+now=$EPOCHSECONDS
+metrics_rollup_state_event claude creating $(( now - 90 ))
+metrics_rollup_state_event claude active $(( now - 80 ))
+metrics_rollup_state_event claude cleaning "$now"
+metrics_rollup_state_event claude cleaning "$now"
+assert_eq "AI duration from state events" 90 "$(get_ai_avg_duration claude 0)"
+assert_eq "pending creating is cleared" "-" "$(tail -n 1 "$METRICS_ROLLUP_DIR/open-claude.log")"
+
+update_worktree_state codex creating "" >/dev/null 2>&1
+update_worktree_state codex active "" >/dev/null 2>&1
+update_worktree_state codex cleaning "" >/dev/null 2>&1
+assert_eq "update_worktree_state feeds the rollups" 1 \
+    "$(get_duration_percentiles ai codex 0 | jq '.count')"
+
+# テスト3: 分位点（バケット内を線形補間、最大値で打ち切り）
+for duration in $(seq 1 100); do
+    metrics_hook_execution_completed "bench-$duration" "$duration" success
+done
+assert_eq "workflow percentiles" '{"count":100,"avg_sec":50,"p50_sec":50,"p95_sec":100,"p99_sec":100,"max_sec":100}' \
+    "$(get_duration_percentiles workflow bench 0)"
+assert_eq "unknown workflow has empty percentiles" 0 "$(get_duration_percentiles workflow none 0 | jq '.count')"
+
+# テスト4: 並行書き込みでも集計が欠けない
+for i in $(seq 1 20); do
+    metrics_hook_execution_completed "parallel-$i" 5 success &
+done
+wait
+assert_eq "concurrent completions are all counted" 20 "$(get_duration_percentiles workflow parallel 0 | jq '.count')"
+
+# テスト5: 日別成功率トレンド
+record_worktree_execution_end "trend-1" "failure" 10 '{}' >/dev/null 2>&1
+trend=$(get_daily_success_trend 2)
+assert_eq "trend covers every day in the window" 3 "$(jq 'length' <<< "$trend")"
+assert_eq "trend total for the backfilled day" 3 "$(jq '.[0].total' <<< "$trend")"
+assert_eq "trend success rate for today" 99 "$(jq '.[2].success_rate' <<< "$trend")"
+
+# テスト6: リソースサンプルと再構築
+metrics_rollup_resource_sample '{"disk_usage_bytes":5000000000,"memory_usage_kb":1000,"memory_total_kb":4000,"cpu_load_1min":0.5}'
+metrics_rollup_resource_sample '{"disk_usage_bytes":10,"memory_usage_kb":3000,"memory_total_kb":4000,"cpu_load_1min":1.25}'
+expected_resources='{"samples":2,"memory_usage_kb_avg":2000,"memory_usage_kb_max":3000,"memory_total_kb_max":4000,"disk_usage_bytes_max":5000000000,"cpu_load_1min_avg":0.87,"cpu_load_1min_max":1.25}'
+assert_eq "resource rollup" "$expected_resources" "$(get_resource_rollup 0)"
+
+rebuild_metrics_rollups 3
+assert_eq "rebuild keeps resource samples" "$expected_resources" "$(get_resource_rollup 0)"
+assert_eq "rebuild recomputes backfilled day" 200 "$(get_ai_avg_duration qwen 7)"
+
+summary=$(generate_metrics_summary 7 2>/dev/null)
+assert_eq "summary is valid JSON with percentiles" 2 \
+    "$(jq '.workflow_duration_percentiles["multi-ai-full-orchestrate"].count' <<< "$summary")"
+
+test_summary